@@ -1,7 +1,104 @@
+"""
+최적화 로그 분석
+- 구조화 이벤트 로그(.jsonl, optimize_parameters / reversal_backtest --events): pandas/NumPy 벡터 연산으로 집계
+- 기존 텍스트 로그(.txt): 정규식 파싱 (구조화 로그 도입 이전 결과 호환용)
+"""
 import re
 import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backtester.event_log import EVENT_COMBO, EVENT_START, EVENT_ENTRY, EVENT_EXIT
+
+# 텍스트 로그 분석 시 조합별 초기 자본
+LEGACY_INITIAL_CAPITAL = 2300.0
+
+
+def load_events(file_path: str) -> pd.DataFrame:
+    """이벤트 로그 로드 (열 단위 DataFrame)"""
+    events = pd.read_json(file_path, lines=True, dtype=False)
+    if "combo" not in events.columns:
+        events["combo"] = 0
+    events["combo"] = events["combo"].fillna(0).astype(int)
+    return events
+
+
+def analyze_events(events: pd.DataFrame) -> pd.DataFrame:
+    """
+    조합별 실현 자본 곡선 집계 (벡터 연산)
+    - 초기 자본: 조합 내 심볼별 START 자본 합
+    - 자본 변화: ENTRY(-진입 수수료), EXIT(청산 수수료 차감 후 손익)의 누적 합
+    Returns:
+        combo, params, initial_capital, final_capital, min_capital, max_drawdown_pct, trades, total_fee
+    """
+    starts = events.loc[events["event"] == EVENT_START].groupby("combo")["capital"].sum()
+
+    flows = events.loc[events["event"].isin([EVENT_ENTRY, EVENT_EXIT]), ["seq", "combo", "event", "delta", "fee"]]
+    flows = flows.sort_values(["combo", "seq"], kind="stable")
+    initial = flows["combo"].map(starts).fillna(0.0).to_numpy()
+    equity = flows.groupby("combo")["delta"].cumsum().to_numpy() + initial
+
+    # 초기 자본을 최고점 후보에 포함한 낙폭
+    peak = np.maximum(pd.Series(equity, index=flows.index).groupby(flows["combo"]).cummax().to_numpy(), initial)
+    flows = flows.assign(
+        equity=equity,
+        drawdown=np.where(peak > 0, equity / peak - 1.0, 0.0),
+        is_exit=(flows["event"] == EVENT_EXIT).to_numpy()
+    )
+
+    summary = flows.groupby("combo").agg(
+        final_capital=("equity", "last"),
+        min_capital=("equity", "min"),
+        max_drawdown=("drawdown", "min"),
+        trades=("is_exit", "sum"),
+        total_fee=("fee", "sum"),
+    )
+    summary = summary.reindex(starts.index.union(summary.index))
+    summary.insert(0, "initial_capital", starts.reindex(summary.index).fillna(0.0))
+    # 거래가 없는 조합은 초기 자본 유지
+    summary["final_capital"] = summary["final_capital"].fillna(summary["initial_capital"])
+    summary["min_capital"] = np.minimum(summary["min_capital"].fillna(summary["initial_capital"]), summary["initial_capital"])
+    summary["max_drawdown_pct"] = summary.pop("max_drawdown").fillna(0.0) * 100
+    summary["trades"] = summary["trades"].fillna(0).astype(int)
+    summary["total_fee"] = summary["total_fee"].fillna(0.0)
+
+    combos = events.loc[events["event"] == EVENT_COMBO, ["combo", "params"]].drop_duplicates("combo").set_index("combo")["params"]
+    summary.insert(0, "params", combos.reindex(summary.index).map(_format_params).fillna(""))
+    return summary.reset_index()
+
+
+def _format_params(params) -> str:
+    if not isinstance(params, dict):
+        return ""
+    return ", ".join(
+        f"{k}:{v:.1%}" if isinstance(v, float) else f"{k}:{v}" for k, v in params.items()
+    )
+
+
+def print_summary(summary: pd.DataFrame):
+    print(f"{'Combo':<5} | {'Parameters':<60} | {'Final Cap':<10} | {'Min Cap (Drawdown)':<20} | {'MDD':<8} | {'Trades':<6}")
+    print("-" * 126)
+    for c in summary.itertuples(index=False):
+        print(f"{c.combo:<5} | {c.params:<60} | ${c.final_capital:<9.2f} | ${c.min_capital:<18.2f} | {c.max_drawdown_pct:>6.2f}% | {c.trades:<6}")
+
+
+def parse_events(file_path: str) -> pd.DataFrame:
+    """구조화 이벤트 로그 분석 및 출력"""
+    print(f"Analyzing {file_path}...")
+    started = time.perf_counter()
+    summary = analyze_events(load_events(file_path))
+    elapsed = time.perf_counter() - started
+    print_summary(summary)
+    print(f"\n{len(summary)} combinations analyzed in {elapsed * 1000:.1f} ms")
+    return summary
+
 
 def parse_log(file_path):
+    """기존 텍스트 로그 분석 (정규식, 구조화 로그 도입 이전 결과용)"""
     print(f"Analyzing {file_path}...")
     
     with open(file_path, 'r', encoding='utf-8') as f:
@@ -12,7 +109,7 @@ def parse_log(file_path):
     
     # Regex Patterns
     combo_start_pattern = re.compile(r"Testing combination (\d+)/(\d+)")
-    params_pattern = re.compile(r"1X Stop Loss: (.*), 2X Stop Loss: (.*), Take Profit: (.*)")
+    params_pattern = re.compile(r"1X Stop Loss: (.*), 2X Stop Loss: (.*), Take Profit: ([^,]*)")
     
     # 📈 [2024-01-09 19:30] TSLA -> TSLL 롱 진입 @ $13.14 x 161.00 (수수료: $5.29)
     entry_pattern = re.compile(r"📈 \[(.*)\] .* -> (.*) (롱|숏) 진입 @ \$([\d.]+) x ([\d.]+) \(수수료: \$([\d.]+)\)")
@@ -20,7 +117,7 @@ def parse_log(file_path):
     # 🔒 [2024-01-11 15:30] TSLL LONG 청산 @ $13.14 $12.41 (손익: -5.56%, 수수료: $5.00) - STOP_LOSS
     exit_pattern = re.compile(r"🔒 \[(.*)\] (.*) (LONG|SHORT) 청산 @ \$([\d.]+) \$([\d.]+) \(손익: .*, 수수료: \$([\d.]+)\)")
 
-    initial_capital = 2300.0
+    initial_capital = LEGACY_INITIAL_CAPITAL
     
     for line in lines:
         # Check for new combination
@@ -122,7 +219,8 @@ def parse_log(file_path):
         print(f"{c['id']:<5} | {c['params']:<60} | ${c['capital']:<9.2f} | ${c['min_capital']:<18.2f} | {c['trades']:<6}")
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        parse_log(sys.argv[1])
+    path = sys.argv[1] if len(sys.argv) > 1 else "optimization_log_tsla_only_long.txt"
+    if path.endswith(".jsonl"):
+        parse_events(path)
     else:
-        parse_log("optimization_log_tsla_only_long.txt")
+        parse_log(path)
@@ -0,0 +1,114 @@
+"""
+다종목 시계열 시간축 정렬 (as-of)
+- 종목별 인덱스에 searchsorted 를 한 번만 적용하여 기준 시간축 각 시각 이하의 마지막 행 위치를 계산 (forward-fill)
+- 정렬된 값 배열 / 경과 시간 / stale(그 시각에 실제 봉이 없어 이전 값 사용) 플래그 제공
+- 백테스트 루프는 정수 위치로만 인덱싱, 종목 수 제한 없음
+"""
+from typing import Dict, Iterable, Optional
+import numpy as np
+import pandas as pd
+
+_NAT = np.iinfo(np.int64).min
+
+
+def build_index(indexes: Iterable[pd.DatetimeIndex], how: str = "intersection") -> pd.DatetimeIndex:
+    """
+    기준 시간축 생성 (정렬됨)
+    :param how: intersection (모든 종목에 봉이 있는 시각) / union (어느 한 종목이라도 봉이 있는 시각)
+    """
+    if how not in ("intersection", "union"):
+        raise ValueError(f"Unsupported alignment: {how}")
+    result = None
+    for index in indexes:
+        if result is None:
+            result = index
+        else:
+            result = getattr(result, how)(index)
+    if result is None:
+        raise ValueError("no index to align")
+    return result.sort_values()
+
+
+def asof_positions(source: pd.DatetimeIndex, target: pd.DatetimeIndex) -> np.ndarray:
+    """target 각 시각 이하의 마지막 source 행 위치 (이전 데이터가 없으면 -1, source 는 오름차순)"""
+    return source.searchsorted(target, side="right").astype(np.int64) - 1
+
+
+def exact_positions(source: pd.DatetimeIndex, target: pd.DatetimeIndex) -> np.ndarray:
+    """target 시각과 정확히 일치하는 source 행 위치 (없으면 -1)"""
+    pos = asof_positions(source, target)
+    hit = pos >= 0
+    hit[hit] = source.as_unit("ns").asi8[pos[hit]] == target.as_unit("ns").asi8[hit]
+    return np.where(hit, pos, -1)
+
+
+class AlignedSeries:
+    """기준 시간축에 as-of 정렬된 종목별 위치 / 값 배열"""
+
+    def __init__(self, index: pd.DatetimeIndex, frames: Dict[str, pd.DataFrame]):
+        """
+        :param index: 기준 시간축 (오름차순)
+        :param frames: 이름 -> DatetimeIndex 를 가진 DataFrame (오름차순)
+        """
+        self.index = index
+        self.frames = frames
+        self.positions = {name: asof_positions(frame.index, index) for name, frame in frames.items()}
+        self._index_ns = index.as_unit("ns").asi8
+        self._values = {}
+
+    @property
+    def names(self):
+        return list(self.frames)
+
+    def counts(self, name: str) -> np.ndarray:
+        """각 시각까지 사용 가능한 행 수 (해당 종목 데이터를 [:count] 로 자르면 as-of 시점 데이터)"""
+        return self.positions[name] + 1
+
+    def values(self, name: str, column: str) -> np.ndarray:
+        """as-of 값 배열 (이전 데이터가 없으면 NaN, 결과는 캐시)"""
+        key = (name, column)
+        cached = self._values.get(key)
+        if cached is None:
+            pos = self.positions[name]
+            source = self.frames[name][column].to_numpy(dtype=np.float64)
+            cached = source[np.clip(pos, 0, None)] if len(source) else np.full(len(pos), np.nan)
+            if (pos < 0).any():
+                cached = np.where(pos >= 0, cached, np.nan)
+            self._values[key] = cached
+        return cached
+
+    def __getitem__(self, key) -> np.ndarray:
+        name, column = key
+        return self.values(name, column)
+
+    def age(self, name: str) -> np.ndarray:
+        """기준 시각 - 사용한 봉 시각 (timedelta64[ns], 이전 데이터가 없으면 NaT)"""
+        pos = self.positions[name]
+        source_ns = self.frames[name].index.as_unit("ns").asi8
+        age = np.full(len(pos), _NAT, dtype=np.int64)
+        ok = pos >= 0
+        age[ok] = self._index_ns[ok] - source_ns[pos[ok]]
+        return age.view("timedelta64[ns]")
+
+    def stale(self, name: str, max_age: Optional[pd.Timedelta] = None) -> np.ndarray:
+        """
+        stale 플래그
+        :param max_age: None 이면 그 시각에 실제 봉이 없으면 stale, 주어지면 경과 시간이 이보다 길 때만 stale
+        """
+        age = self.age(name)
+        missing = np.isnat(age)
+        limit = np.timedelta64(0, "ns") if max_age is None else np.timedelta64(pd.Timedelta(max_age).value, "ns")
+        return missing | (age.view(np.int64) > limit.astype(np.int64))
+
+
+def align_asof(frames: Dict[str, pd.DataFrame], index: Optional[pd.DatetimeIndex] = None,
+               how: str = "intersection") -> AlignedSeries:
+    """
+    여러 종목을 하나의 시간축에 as-of 정렬
+    :param frames: 이름 -> DataFrame (DatetimeIndex)
+    :param index: 기준 시간축 (없으면 how 로 생성)
+    :param how: 기준 시간축 생성 방식 (intersection / union)
+    """
+    if index is None:
+        index = build_index((frame.index for frame in frames.values()), how=how)
+    return AlignedSeries(index, frames)
@@ -0,0 +1,134 @@
+"""
+Range reads on time-sorted OHLCV CSV files (data/{source}/{symbol}/{interval}.csv).
+Rows are located by bisecting byte offsets on the leading datetime field, so a date window
+(plus warm-up rows) is parsed without touching the rest of the file.
+"""
+import io
+import os
+from typing import Callable, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Naive timestamps in the CSV files are KST (same assumption as prepare_dataset)
+FILE_TZ = "Asia/Seoul"
+_BLOCK = 1 << 16
+_ORDER_PROBES = 16
+
+
+def parse_stamp(field: str, tz: str = FILE_TZ) -> pd.Timestamp:
+    stamp = pd.Timestamp(field)
+    return stamp.tz_localize(tz) if stamp.tz is None else stamp
+
+
+def _line_stamp(line: bytes) -> pd.Timestamp:
+    return parse_stamp(line.split(b",", 1)[0].decode())
+
+
+def _next_line(f, offset: int, data_start: int) -> Tuple[int, bytes]:
+    """(start, text) of the first line starting at or after offset"""
+    if offset <= data_start:
+        f.seek(data_start)
+    else:
+        f.seek(offset - 1)
+        f.readline()
+    return f.tell(), f.readline()
+
+
+def _bisect(f, data_start: int, size: int, after: Callable[[pd.Timestamp], bool]) -> int:
+    """Byte offset of the first line whose timestamp satisfies after() (size if none)"""
+    lo, hi = data_start, size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        pos, line = _next_line(f, mid, data_start)
+        if not line.strip() or after(_line_stamp(line)):
+            hi = mid
+        else:
+            lo = pos + len(line)
+    return _next_line(f, lo, data_start)[0] if lo < size else size
+
+
+def _rows_before(f, offset: int, data_start: int, count: int) -> int:
+    """Byte offset of the line count rows before the line starting at offset"""
+    end = offset
+    while count > 0 and end > data_start:
+        base = max(data_start, end - _BLOCK)
+        f.seek(base)
+        buf = np.frombuffer(f.read(end - base), dtype=np.uint8)
+        starts = base + np.flatnonzero(buf == 10) + 1
+        starts = starts[starts != offset]
+        if base == data_start:
+            starts = np.r_[data_start, starts]
+        if len(starts) >= count:
+            return int(starts[-count])
+        count -= len(starts)
+        end = base
+    return data_start
+
+
+class CsvInfo:
+    """Header / first / last row of a data file (reads a few lines, no parsing of the body)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            self.header = f.readline()
+            self.data_start = f.tell()
+            first = f.readline()
+            f.seek(max(self.data_start, self.size - _BLOCK))
+            tail = f.read().rstrip(b"\r\n")
+        last = tail[tail.rfind(b"\n") + 1:] if b"\n" in tail else tail
+        self.columns = self.header.decode().strip().split(",")
+        self.first = _line_stamp(first) if first.strip() else None
+        self.last = _line_stamp(last) if first.strip() else None
+        self._seekable = None
+
+    @property
+    def seekable(self) -> bool:
+        """
+        Range reads need a leading datetime column in ascending order.
+        Checked on evenly spaced probe lines (catches shuffled files and reversed download batches).
+        """
+        if self._seekable is None:
+            self._seekable = (
+                self.columns[0] == "datetime" and self.first is not None
+                and self.first <= self.last and self._probes_sorted()
+            )
+        return self._seekable
+
+    def _probes_sorted(self) -> bool:
+        offsets = np.linspace(self.data_start, self.size, _ORDER_PROBES + 2)[1:-1].astype(np.int64)
+        stamps = [self.first]
+        with open(self.path, "rb") as f:
+            for offset in offsets:
+                _, line = _next_line(f, int(offset), self.data_start)
+                if line.strip():
+                    stamps.append(_line_stamp(line))
+        stamps.append(self.last)
+        return all(a <= b for a, b in zip(stamps, stamps[1:]))
+
+
+def read_range(
+    path: str,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+    warmup: int = 0,
+    usecols: Iterable[str] = None,
+    info: CsvInfo = None
+) -> Optional[pd.DataFrame]:
+    """
+    Raw rows from `warmup` rows before the first row >= start up to the last row <= end.
+    Returns None if the file cannot be range-read (caller reads the whole file).
+    """
+    info = info or CsvInfo(path)
+    if not info.seekable:
+        return None
+    with open(path, "rb") as f:
+        lo = info.data_start if start is None else _bisect(f, info.data_start, info.size, lambda ts: ts >= start)
+        lo = _rows_before(f, lo, info.data_start, warmup)
+        hi = info.size if end is None else _bisect(f, info.data_start, info.size, lambda ts: ts > end)
+        f.seek(lo)
+        body = f.read(max(hi - lo, 0))
+    usecols = None if usecols is None else [c for c in info.columns if c in set(usecols) | {"datetime"}]
+    return pd.read_csv(io.BytesIO(info.header + body), usecols=usecols)
@@ -1,24 +1,149 @@
 import pandas as pd
 import os
+import sys
 import logging
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backtester.csv_range import FILE_TZ, CsvInfo, read_range
+from config.settings import DATASET_WARMUP_BARS, INDICATOR_BACKEND
+from data_fetcher.bar_pyramid import BarPyramid
+from data_fetcher.catalog import get_catalog
+from strategy.indicator_cache import indicator_cache
+from strategy.indicators import ta_macd_kernel, ta_rsi_kernel
+
 logger = logging.getLogger(__name__)
 
-def prepare_dataset(symbol: str, interval: str, tz: str = "UTC", ind_params: dict = None, source: str = "kis") -> pd.DataFrame:
+
+def _indicator_backend(backend: str, rsi_len: int, fast: int, slow: int, sig: int):
+    """
+    Returns a frame -> {'rsi', 'macd', 'macd_signal', 'macd_hist'} function for the configured backend.
+    'native' uses the NumPy kernels in strategy.indicators (same formulas as pandas_ta, no import cost).
+    'pandas_ta' uses the DataFrame accessor; falls back to native if pandas_ta is not installed.
+    The function name doubles as the indicator cache name so the backends never share cache files.
+    """
+    def native(frame: pd.DataFrame) -> dict:
+        close = frame['close'].to_numpy(dtype=float)
+        macd, signal, hist = ta_macd_kernel(close, fast, slow, sig)
+        return {
+            "rsi": ta_rsi_kernel(close, rsi_len),
+            "macd": macd,
+            "macd_signal": signal,
+            "macd_hist": hist,
+        }
+
+    if backend != "pandas_ta":
+        return native
+
+    try:
+        import pandas_ta as ta  # noqa: F401 (registers the DataFrame.ta accessor)
+    except ImportError:
+        logger.warning("pandas_ta not installed. Using native RSI/MACD backend.")
+        return native
+
+    def pandas_ta(frame: pd.DataFrame) -> dict:
+        # pandas_ta default names: RSI_14, MACD_12_26_9, MACDs_12_26_9, MACDh_12_26_9
+        # -> normalized to 'rsi', 'macd', 'macd_signal', 'macd_hist'
+        rsi = frame.ta.rsi(length=rsi_len)
+        macd = frame.ta.macd(fast=fast, slow=slow, signal=sig)
+        return {
+            "rsi": rsi.to_numpy(dtype=float),
+            "macd": macd[f"MACD_{fast}_{slow}_{sig}"].to_numpy(dtype=float),
+            "macd_signal": macd[f"MACDs_{fast}_{slow}_{sig}"].to_numpy(dtype=float),
+            "macd_hist": macd[f"MACDh_{fast}_{slow}_{sig}"].to_numpy(dtype=float),
+        }
+
+    return pandas_ta
+
+
+INDICATOR_COLUMNS = ("rsi", "macd", "macd_signal", "macd_hist")
+
+
+def dataset_path(symbol: str, interval: str, source: str = "kis") -> str:
+    """
+    Path of the CSV for symbol/interval, deriving it from a finer downloaded interval if needed (e.g. 1h from 5m).
+    """
+    file_path = f"data/{source}/{symbol}/{interval}.csv"
+    if os.path.exists(file_path):
+        return file_path
+    try:
+        return BarPyramid(source, symbol).ensure(interval)
+    except (FileNotFoundError, ValueError):
+        raise FileNotFoundError(f"Data file for {symbol} ({interval}) not found at {file_path}")
+
+
+def dataset_info(symbol: str, interval: str, source: str = "kis", tz: str = "UTC") -> dict:
+    """
+    Available date range of a dataset without parsing it.
+    Answered from the data catalog when its entry is current, otherwise from the header, first and last line.
+    :return: {'path', 'start', 'end', 'columns', 'bytes', 'rows'} (start/end as Timestamps in tz, rows None if unknown)
+    """
+    file_path = dataset_path(symbol, interval, source)
+    info = CsvInfo(file_path)
+    if info.first is None:
+        raise ValueError(f"Data file for {symbol} ({interval}) has no rows")
+    entry = get_catalog().fresh(source, symbol, interval)
+    rows = None
+    if entry is not None and entry["first_ts"]:
+        start, end, rows = pd.Timestamp(entry["first_ts"]), pd.Timestamp(entry["last_ts"]), entry["rows"]
+    elif info.seekable:
+        start, end = info.first, info.last
+    else:
+        # Unsorted file (e.g. interrupted incremental download): scan once and keep it in the catalog
+        entry = get_catalog().record(source, symbol, interval, file_path)
+        start, end, rows = pd.Timestamp(entry["first_ts"]), pd.Timestamp(entry["last_ts"]), entry["rows"]
+    if tz:
+        start, end = start.tz_convert(tz), end.tz_convert(tz)
+    return {"path": file_path, "start": start, "end": end, "columns": info.columns[1:], "bytes": info.size, "rows": rows}
+
+
+def _bound(value, tz: str):
+    """Range bound as a Timestamp in the dataset's timezone (naive bounds are read in tz, like index >= 'YYYY-MM-DD')"""
+    if value is None:
+        return None
+    stamp = pd.Timestamp(value)
+    return stamp.tz_localize(tz or FILE_TZ) if stamp.tz is None else stamp
+
+
+def prepare_dataset(
+    symbol: str,
+    interval: str,
+    tz: str = "UTC",
+    ind_params: dict = None,
+    source: str = "kis",
+    start=None,
+    end=None,
+    columns: list = None,
+    warmup: int = None
+) -> pd.DataFrame:
     """
     Prepares a dataset for backtesting.
     :param ind_params: Dictionary of indicator parameters (e.g. {'rsi': {'length': 5}})
     :param source: 'kis' or 'yfinance'
+    :param start: first timestamp to return (inclusive, naive values are in tz); None = from the beginning
+    :param end: last timestamp to return (inclusive); None = to the end
+    :param columns: columns to return (None = all file columns + indicators). Indicators are only
+                    computed if one of INDICATOR_COLUMNS is requested.
+    :param warmup: rows before start loaded for indicator warm-up and dropped afterwards
+                   (default DATASET_WARMUP_BARS when indicators are computed)
+    Only the requested window (plus warm-up) is read from sorted files; unsorted files are read whole.
     """
     if ind_params is None:
         ind_params = {}
 
-    file_path = f"data/{source}/{symbol}/{interval}.csv"
-    
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Data file for {symbol} ({interval}) not found at {file_path}")
-    
-    df = pd.read_csv(file_path)
+    file_path = dataset_path(symbol, interval, source)
+    start, end = _bound(start, tz), _bound(end, tz)
+    want_indicators = columns is None or any(c in INDICATOR_COLUMNS for c in columns)
+    if warmup is None:
+        warmup = DATASET_WARMUP_BARS if want_indicators else 0
+    usecols = None if columns is None else set(columns) | {'datetime', 'open', 'high', 'low', 'close'}
+
+    df = None
+    if start is not None or end is not None:
+        df = read_range(file_path, start, end, warmup=warmup if start is not None else 0, usecols=usecols)
+        if df is not None and 'datetime' in df.columns and not pd.to_datetime(df['datetime']).is_monotonic_increasing:
+            df = None
+    if df is None:
+        df = pd.read_csv(file_path, usecols=(lambda c: c in usecols) if usecols is not None else None)
     
     # Parse datetime
     if 'datetime' in df.columns:
@@ -40,47 +165,39 @@ def prepare_dataset(symbol: str, interval: str, tz: str = "UTC", ind_params: dic
     # Drop duplicates
     df = df[~df.index.duplicated(keep='last')]
     
-    # Connect Pandas TA
-    try:
-        import pandas_ta as ta
-        
-        # RSI
-        rsi_len = ind_params.get('rsi', {}).get('length', 14)
-        df.ta.rsi(length=rsi_len, append=True)
-        
-        # MACD
-        macd_cfg = ind_params.get('macd', {})
-        df.ta.macd(fast=macd_cfg.get('fast', 12), 
-                   slow=macd_cfg.get('slow', 26), 
-                   signal=macd_cfg.get('signal', 9), 
-                   append=True)
-        
-        # Rename MACD columns to lowercase if needed or standard 'macd', 'macd_signal', 'macd_hist'
-        # pandas_ta default names: MACD_12_26_9, MACDs_12_26_9, MACDh_12_26_9
-        # Normalize
-        # We need to explicitly find valid cols because len might change numbers in name
-        
-        # Dynamic rename based on config
-        fast = macd_cfg.get('fast', 12)
-        slow = macd_cfg.get('slow', 26)
-        sig = macd_cfg.get('signal', 9)
-        
-        df.rename(columns={
-            f"RSI_{rsi_len}": "rsi",
-            f"MACD_{fast}_{slow}_{sig}": "macd",
-            f"MACDs_{fast}_{slow}_{sig}": "macd_signal",
-            f"MACDh_{fast}_{slow}_{sig}": "macd_hist"
-        }, inplace=True)
-        
-    except ImportError:
-        logger.warning("pandas_ta not installed. RSI/MACD skipped.")
-    except Exception as e:
-        logger.error(f"Failed to calculate indicators: {e}")
+    # RSI/MACD columns (indicator columns are cached on disk, keyed by data fingerprint + params)
+    if want_indicators:
+        try:
+            rsi_len = ind_params.get('rsi', {}).get('length', 14)
+            macd_cfg = ind_params.get('macd', {})
+            fast = macd_cfg.get('fast', 12)
+            slow = macd_cfg.get('slow', 26)
+            sig = macd_cfg.get('signal', 9)
+
+            compute = _indicator_backend(INDICATOR_BACKEND, rsi_len, fast, slow, sig)
+            indicator_columns = indicator_cache.load_or_compute(
+                df, source, symbol, interval, compute.__name__,
+                {"rsi": rsi_len, "macd": [fast, slow, sig]},
+                compute=compute
+            )
+            for name, values in indicator_columns.items():
+                df[name] = values
+
+        except Exception as e:
+            logger.error(f"Failed to calculate indicators: {e}")
     
     # Basic data integrity check
     # Close should not be 0 or NaN
     df = df[df['close'] > 0]
     df.dropna(subset=['open', 'high', 'low', 'close'], inplace=True)
+
+    # Requested window (drops the warm-up rows)
+    if start is not None:
+        df = df[df.index >= start]
+    if end is not None:
+        df = df[df.index <= end]
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
     
     logger.info(f"Prepared {len(df)} records for {symbol} ({interval}) in {tz} with indicators")
 
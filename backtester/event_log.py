@@ -0,0 +1,131 @@
+"""
+백테스트 구조화 이벤트 로그 (JSON lines)
+- 진입/청산/시작/파라미터 조합/자본 스냅샷을 한 줄에 하나씩 기록
+- 모든 행이 같은 키 집합을 공유하므로 pandas.read_json(lines=True)로 바로 열 단위 분석 가능
+- analyze_optimization_log.py 가 이 파일을 벡터 연산으로 집계 (텍스트 로그 정규식 파싱 대체)
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import List, Optional
+
+# 이벤트 종류
+EVENT_COMBO = "COMBO"     # 파라미터 조합 시작 (params)
+EVENT_START = "START"     # 심볼 백테스트 시작 (초기 자본)
+EVENT_ENTRY = "ENTRY"     # 진입 (delta = -진입 수수료)
+EVENT_EXIT = "EXIT"       # 청산 (delta = 청산 수수료 차감 후 손익)
+EVENT_EQUITY = "EQUITY"   # 봉 단위 평가 자본 스냅샷 (선택)
+
+# 공통 열 (없는 값은 null)
+EVENT_FIELDS = (
+    "seq", "event", "combo", "symbol", "time", "side", "etf", "entry_price", "price",
+    "quantity", "fee", "pnl", "pnl_pct", "delta", "capital", "equity", "reason", "params"
+)
+
+
+class TradeEventLog:
+    """구조화 이벤트 기록기 (버퍼링, 스레드 안전)"""
+
+    def __init__(self, path: str, buffer_size: int = 1000, equity_snapshots: bool = False, append: bool = False):
+        """
+        :param path: 저장 경로 (.jsonl)
+        :param buffer_size: 이 개수만큼 모이면 파일에 기록
+        :param equity_snapshots: 봉 단위 평가 자본(EQUITY) 기록 여부 (파일 크기가 커짐)
+        :param append: 기존 파일에 이어서 기록
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self.equity_snapshots = equity_snapshots
+        self._buffer = []
+        self._seq = 0
+        self._context = {}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def set_context(self, **fields):
+        """이후 모든 이벤트에 붙일 공통 필드 설정 (None 이면 제거)"""
+        for key, value in fields.items():
+            if value is None:
+                self._context.pop(key, None)
+            else:
+                self._context[key] = value
+
+    @contextmanager
+    def bind(self, **fields):
+        """with 블록 동안만 공통 필드 적용"""
+        previous = dict(self._context)
+        self.set_context(**fields)
+        try:
+            yield self
+        finally:
+            self._context = previous
+
+    def emit(self, event: str, **fields):
+        """이벤트 1건 기록"""
+        with self._lock:
+            self._seq += 1
+            row = dict.fromkeys(EVENT_FIELDS)
+            row.update(self._context)
+            row.update(fields)
+            row["seq"] = self._seq
+            row["event"] = event
+            if hasattr(row["time"], "isoformat"):
+                row["time"] = row["time"].isoformat()
+            self._buffer.append(json.dumps(row, ensure_ascii=False, default=str))
+            if len(self._buffer) >= self.buffer_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._file.flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_locked()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_event_log(path: Optional[str], **kwargs) -> Optional[TradeEventLog]:
+    """경로가 주어졌을 때만 이벤트 로그 생성"""
+    return TradeEventLog(path, **kwargs) if path else None
+
+
+def merge_event_logs(parts: List[str], path: str, remove: bool = True):
+    """
+    병렬 실행에서 나뉜 이벤트 파일을 주어진 순서대로 하나로 합침 (seq 재부여)
+    :param parts: 부분 파일 경로 (순서 유지)
+    :param remove: 병합 후 부분 파일 삭제
+    """
+    seq = 0
+    with open(path, "w", encoding="utf-8") as out:
+        for part in parts:
+            if not os.path.exists(part):
+                continue
+            with open(part, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    row = json.loads(line)
+                    seq += 1
+                    row["seq"] = seq
+                    out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            if remove:
+                os.remove(part)
@@ -0,0 +1,285 @@
+"""
+배열 기반 거래 장부 / 자본 곡선
+- 봉마다 dict + Timestamp 를 쌓는 대신 미리 할당한 NumPy 열(int64 ns 시각, float64 값)에 기록
+- 거래는 구조화 배열 1행 (방향/청산 사유는 정수 코드, 심볼은 문자열 표 인덱스)
+- 기존 코드 호환: 인덱싱/반복 시 dict 로 변환, append(dict) 허용
+- DataFrame 은 to_frame() 호출 시에만 생성
+"""
+from typing import Dict, Iterator, List
+import numpy as np
+import pandas as pd
+
+# 포지션 방향 코드
+SIDE_LONG = 1
+SIDE_SHORT = -1
+_SIDE_NAMES = {SIDE_LONG: "LONG", SIDE_SHORT: "SHORT"}
+_SIDE_CODES = {"LONG": SIDE_LONG, "SHORT": SIDE_SHORT}
+
+# 청산 사유 코드 (알 수 없는 사유는 장부별로 뒤에 추가)
+EXIT_REASONS = (
+    "STOP_LOSS",
+    "TAKE_PROFIT",
+    "FORCE_CLOSE_TRADING_DAY_LIMIT",
+    "FINAL_CLOSE",
+    "REVERSAL",
+)
+
+TRADE_DTYPE = np.dtype([
+    ("entry_ns", "i8"),
+    ("exit_ns", "i8"),
+    ("symbol", "i4"),
+    ("side", "i1"),
+    ("reason", "i2"),
+    ("entry_price", "f8"),
+    ("exit_price", "f8"),
+    ("quantity", "f8"),
+    ("pnl", "f8"),
+    ("pnl_pct", "f8"),
+    ("fee", "f8"),
+])
+
+_NAT = np.iinfo(np.int64).min
+
+
+def to_ns(value) -> int:
+    """datetime / Timestamp -> UTC int64 ns (None 은 NaT)"""
+    if value is None:
+        return _NAT
+    ns = getattr(value, "value", None)  # pd.Timestamp.value 는 단위와 무관하게 ns
+    if ns is None:
+        ns = pd.Timestamp(value).value
+    return ns
+
+
+def _grow(array: np.ndarray, needed: int) -> np.ndarray:
+    capacity = max(needed, len(array) * 2, 16)
+    grown = np.empty(capacity, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class _TimeZoneMixin:
+    """첫 기록의 시간대를 보관하여 dict/DataFrame 변환 시 복원"""
+    _tz = None
+
+    def _remember_tz(self, value):
+        if self._tz is None and value is not None:
+            self._tz = getattr(value, "tzinfo", None) or "UTC"
+
+    def _timestamp(self, ns: int):
+        if ns == _NAT:
+            return None
+        ts = pd.Timestamp(ns, unit="ns", tz="UTC")
+        return ts.tz_convert(self._tz) if self._tz not in (None, "UTC") else ts
+
+    def _index(self, ns: np.ndarray) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(ns.astype("datetime64[ns]")).tz_localize("UTC")
+        return index.tz_convert(self._tz) if self._tz not in (None, "UTC") else index
+
+
+class EquityCurve(_TimeZoneMixin):
+    """봉 단위 평가 자본 (시각 ns + 자본 float64 열)"""
+
+    def __init__(self, capacity: int = 0):
+        self._times = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    def reserve(self, capacity: int):
+        """예상 봉 수만큼 미리 할당"""
+        if capacity > len(self._times):
+            self._times = _grow(self._times[:self._size], capacity)
+            self._values = _grow(self._values[:self._size], capacity)
+
+    def append(self, time, capital: float = None):
+        """기록 (append({'time', 'capital'}) 형태도 허용)"""
+        if isinstance(time, dict):
+            time, capital = time["time"], time["capital"]
+        if self._size == len(self._times):
+            self.reserve(self._size + 1)
+        if self._tz is None:
+            self._remember_tz(time)
+        self._times[self._size] = to_ns(time)
+        self._values[self._size] = capital
+        self._size += 1
+
+    @property
+    def times_ns(self) -> np.ndarray:
+        return self._times[:self._size]
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values[:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._size))]
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("equity curve index out of range")
+        return {"time": self._timestamp(int(self._times[i])), "capital": float(self._values[i])}
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(self._size):
+            yield self[i]
+
+    def to_series(self) -> pd.Series:
+        return pd.Series(self.values.copy(), index=self._index(self.times_ns), name="capital")
+
+    def to_frame(self) -> pd.DataFrame:
+        return self.to_series().rename_axis("time").to_frame()
+
+    @classmethod
+    def from_arrays(cls, times_ns: np.ndarray, values: np.ndarray, tz=None) -> "EquityCurve":
+        curve = cls(0)
+        curve._times = np.asarray(times_ns, dtype=np.int64).copy()
+        curve._values = np.asarray(values, dtype=np.float64).copy()
+        curve._size = len(curve._times)
+        curve._tz = tz
+        return curve
+
+
+class TradeLedger(_TimeZoneMixin):
+    """거래 장부 (구조화 배열, 1거래 = 1행)"""
+
+    def __init__(self, capacity: int = 64):
+        self._rows = np.empty(capacity, dtype=TRADE_DTYPE)
+        self._size = 0
+        self._symbols: List[str] = []
+        self._symbol_codes: Dict[str, int] = {}
+        self._reasons: List[str] = list(EXIT_REASONS)
+        self._reason_codes: Dict[str, int] = {r: i for i, r in enumerate(self._reasons)}
+
+    def _symbol_code(self, symbol) -> int:
+        symbol = symbol or ""
+        code = self._symbol_codes.get(symbol)
+        if code is None:
+            code = self._symbol_codes[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return code
+
+    def _reason_code(self, reason) -> int:
+        code = self._reason_codes.get(reason)
+        if code is None:
+            code = self._reason_codes[reason] = len(self._reasons)
+            self._reasons.append(reason)
+        return code
+
+    def record(self, entry_time, exit_time, symbol, side: str, entry_price: float, exit_price: float,
+               quantity: float, pnl: float, pnl_pct: float, fee: float, reason: str):
+        """거래 1건 기록"""
+        if self._size == len(self._rows):
+            self._rows = _grow(self._rows[:self._size], self._size + 1)
+        if self._tz is None:
+            self._remember_tz(exit_time)
+        self._rows[self._size] = (
+            to_ns(entry_time), to_ns(exit_time), self._symbol_code(symbol), _SIDE_CODES.get(side, 0),
+            self._reason_code(reason), entry_price or 0.0, exit_price or 0.0, quantity or 0.0,
+            pnl, pnl_pct, fee or 0.0
+        )
+        self._size += 1
+
+    def append(self, trade: dict):
+        """기존 trade_history.append(dict) 호환"""
+        self.record(
+            trade.get("entry_time"), trade.get("exit_time"), trade.get("symbol"), trade.get("side"),
+            trade.get("entry_price"), trade.get("exit_price"), trade.get("quantity"),
+            trade.get("pnl", 0.0), trade.get("pnl_pct", 0.0), trade.get("fee"), trade.get("reason", "")
+        )
+
+    @property
+    def rows(self) -> np.ndarray:
+        return self._rows[:self._size]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """metrics.trade_arrays 와 같은 열 구성 (복사 없이 뷰 반환)"""
+        rows = self.rows
+        return {
+            "pnl": rows["pnl"],
+            "fee": rows["fee"],
+            "quantity": rows["quantity"],
+            "entry_price": rows["entry_price"],
+            "exit_price": rows["exit_price"],
+            "is_long": rows["side"] == SIDE_LONG,
+            "reason": np.array(self._reasons, dtype=object)[rows["reason"]] if self._size else np.empty(0, dtype=object),
+            "entry_ns": rows["entry_ns"],
+            "exit_ns": rows["exit_ns"],
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._size))]
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("trade ledger index out of range")
+        row = self._rows[i]
+        return {
+            "entry_time": self._timestamp(int(row["entry_ns"])),
+            "exit_time": self._timestamp(int(row["exit_ns"])),
+            "symbol": self._symbols[row["symbol"]],
+            "side": _SIDE_NAMES.get(int(row["side"])),
+            "entry_price": float(row["entry_price"]),
+            "exit_price": float(row["exit_price"]),
+            "quantity": float(row["quantity"]),
+            "pnl": float(row["pnl"]),
+            "pnl_pct": float(row["pnl_pct"]),
+            "fee": float(row["fee"]),
+            "reason": self._reasons[row["reason"]],
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(self._size):
+            yield self[i]
+
+    @classmethod
+    def merge(cls, ledgers) -> "TradeLedger":
+        """여러 장부를 청산 시각 순으로 합침 (심볼/사유 코드 재매핑)"""
+        merged = cls(capacity=max(sum(len(l) for l in ledgers), 1))
+        parts = []
+        for ledger in ledgers:
+            if not len(ledger):
+                continue
+            merged._remember_tz(ledger[0]["exit_time"])
+            rows = ledger.rows.copy()
+            symbol_map = np.array([merged._symbol_code(s) for s in ledger._symbols], dtype=np.int32)
+            reason_map = np.array([merged._reason_code(r) for r in ledger._reasons], dtype=np.int16)
+            rows["symbol"] = symbol_map[rows["symbol"]]
+            rows["reason"] = reason_map[rows["reason"]]
+            parts.append(rows)
+        if parts:
+            rows = np.concatenate(parts)
+            rows = rows[np.argsort(rows["exit_ns"], kind="stable")]
+            merged._rows[:len(rows)] = rows
+            merged._size = len(rows)
+        return merged
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame 변환 (방향/사유/심볼은 category)"""
+        rows = self.rows
+        return pd.DataFrame({
+            "entry_time": self._index(rows["entry_ns"]),
+            "exit_time": self._index(rows["exit_ns"]),
+            "symbol": pd.Categorical.from_codes(rows["symbol"], self._symbols) if self._symbols else pd.Categorical([]),
+            "side": pd.Categorical(np.where(rows["side"] == SIDE_LONG, "LONG", "SHORT"), categories=["LONG", "SHORT"]),
+            "entry_price": rows["entry_price"],
+            "exit_price": rows["exit_price"],
+            "quantity": rows["quantity"],
+            "pnl": rows["pnl"],
+            "pnl_pct": rows["pnl_pct"],
+            "fee": rows["fee"],
+            "reason": pd.Categorical.from_codes(rows["reason"], self._reasons),
+        })
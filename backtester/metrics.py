@@ -0,0 +1,288 @@
+"""
+백테스트 성과 지표 (NumPy 벡터 연산)
+- 자본 곡선: 총 수익률, CAGR, 변동성, Sharpe, Sortino, 최대 낙폭(MDD), Calmar
+- 거래 배열: 승률, 평균 수익/손실, Profit Factor, 기대값, 최대 수익/손실, 수수료, 방향별/청산 사유별 통계
+- 노출도(포지션 보유 봉 비율), 회전율(거래 대금 / 평균 자본)
+- batch_equity_metrics: 여러 파라미터 조합의 자본 곡선(2차원 배열)을 한 번에 계산
+- rank_results: 결과 표를 지표 기준으로 정렬 (최적화 / 워크포워드 공용)
+"""
+from typing import Dict, Iterable, Optional, Sequence
+import numpy as np
+import pandas as pd
+from backtester.ledger import EquityCurve
+
+NS_PER_YEAR = 365.25 * 24 * 3600 * 1e9
+
+# 거래 청산 사유 (통계 키 이름)
+EXIT_REASON_KEYS = {
+    "STOP_LOSS": "stop_loss",
+    "TAKE_PROFIT": "take_profit",
+    "FORCE_CLOSE_TRADING_DAY_LIMIT": "force_close",
+}
+
+
+def _to_ns(values) -> np.ndarray:
+    """datetime 목록 -> UTC 기준 int64 ns 배열"""
+    if isinstance(values, np.ndarray) and values.dtype == np.int64:
+        return values
+    if len(values) == 0:
+        return np.empty(0, dtype=np.int64)
+    index = pd.DatetimeIndex(pd.to_datetime(list(values), utc=True))
+    return index.as_unit("ns").asi8
+
+
+def trade_arrays(trades: Sequence[dict]) -> Dict[str, np.ndarray]:
+    """trade_history(dict 목록) -> 열 단위 배열"""
+    n = len(trades)
+    pnl = np.fromiter((t.get("pnl", 0.0) for t in trades), dtype=float, count=n)
+    fee = np.fromiter((t.get("fee", 0.0) or 0.0 for t in trades), dtype=float, count=n)
+    quantity = np.fromiter((t.get("quantity", 0.0) or 0.0 for t in trades), dtype=float, count=n)
+    entry_price = np.fromiter((t.get("entry_price", 0.0) or 0.0 for t in trades), dtype=float, count=n)
+    exit_price = np.fromiter((t.get("exit_price", 0.0) or 0.0 for t in trades), dtype=float, count=n)
+    is_long = np.fromiter((t.get("side") == "LONG" for t in trades), dtype=bool, count=n)
+    reasons = np.array([t.get("reason", "") for t in trades], dtype=object)
+    return {
+        "pnl": pnl,
+        "fee": fee,
+        "quantity": quantity,
+        "entry_price": entry_price,
+        "exit_price": exit_price,
+        "is_long": is_long,
+        "reason": reasons,
+        "entry_ns": _to_ns([t["entry_time"] for t in trades]) if n and "entry_time" in trades[0] else np.empty(0, dtype=np.int64),
+        "exit_ns": _to_ns([t["exit_time"] for t in trades]) if n and "exit_time" in trades[0] else np.empty(0, dtype=np.int64),
+    }
+
+
+def _pnl_stats(pnl: np.ndarray, prefix: str = "") -> dict:
+    """손익 배열 통계"""
+    wins = pnl > 0
+    losses = ~wins
+    n = pnl.size
+    n_win = int(wins.sum())
+    win_sum = float(pnl[wins].sum())
+    loss_sum = float(pnl[losses].sum())
+    return {
+        f"{prefix}trades": n,
+        f"{prefix}wins": n_win,
+        f"{prefix}losses": n - n_win,
+        f"{prefix}win_rate": (n_win / n * 100) if n else 0.0,
+        f"{prefix}avg_profit": (win_sum / n_win) if n_win else 0.0,
+        f"{prefix}avg_loss": (loss_sum / (n - n_win)) if n - n_win else 0.0,
+        f"{prefix}max_profit": float(pnl.max()) if n else 0.0,
+        f"{prefix}max_loss": float(pnl.min()) if n else 0.0,
+        f"{prefix}pnl": float(pnl.sum()),
+    }
+
+
+def _as_trade_arrays(trades) -> Dict[str, np.ndarray]:
+    if isinstance(trades, dict):
+        return trades
+    if hasattr(trades, "arrays"):
+        return trades.arrays()
+    return trade_arrays(trades)
+
+
+def trade_metrics(trades, by_side: bool = True) -> dict:
+    """거래 단위 지표 (TradeLedger, trade_history 또는 trade_arrays 결과)"""
+    arr = _as_trade_arrays(trades)
+    pnl = arr["pnl"]
+    result = _pnl_stats(pnl)
+
+    gross_profit = float(pnl[pnl > 0].sum())
+    gross_loss = float(-pnl[pnl <= 0].sum())
+    result["profit_factor"] = (gross_profit / gross_loss) if gross_loss > 0 else (np.inf if gross_profit > 0 else 0.0)
+    result["expectancy"] = float(pnl.mean()) if pnl.size else 0.0
+    result["total_fee"] = float(arr["fee"].sum())
+
+    if by_side:
+        for side, mask in (("long_", arr["is_long"]), ("short_", ~arr["is_long"])):
+            side_pnl = pnl[mask]
+            result.update(_pnl_stats(side_pnl, side))
+            # 청산 사유별 건수 (손실/수익 구분)
+            side_reasons = arr["reason"][mask]
+            side_wins = side_pnl > 0
+            for reason, key in EXIT_REASON_KEYS.items():
+                hit = side_reasons == reason
+                result[f"{side}{key}_win"] = int((hit & side_wins).sum())
+                result[f"{side}{key}_loss"] = int((hit & ~side_wins).sum())
+    return result
+
+
+def _drawdown(equity: np.ndarray):
+    peak = np.maximum.accumulate(equity, axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = np.where(peak > 0, equity / peak - 1.0, 0.0)
+    return dd, peak
+
+
+def equity_metrics(equity, times=None, periods_per_year: Optional[float] = None, risk_free: float = 0.0) -> dict:
+    """
+    자본 곡선 지표
+    :param equity: 봉 단위 평가 자본 배열
+    :param times: 봉 시각 (연환산 주기 추정 및 CAGR 계산용)
+    :param periods_per_year: 연간 봉 수 (없으면 times 로 추정, 둘 다 없으면 252)
+    :param risk_free: 봉 단위 무위험 수익률
+    """
+    equity = np.asarray(equity, dtype=float)
+    if equity.size < 2:
+        return {
+            "total_return_pct": 0.0, "cagr_pct": 0.0, "volatility_pct": 0.0, "sharpe": 0.0,
+            "sortino": 0.0, "max_drawdown_pct": 0.0, "max_drawdown_amount": 0.0, "calmar": 0.0,
+        }
+
+    times_ns = _to_ns(times) if times is not None else None
+    years = None
+    if times_ns is not None and times_ns.size == equity.size:
+        span = (times_ns[-1] - times_ns[0]) / NS_PER_YEAR
+        if span > 0:
+            years = span
+            if periods_per_year is None:
+                periods_per_year = (equity.size - 1) / span
+    if periods_per_year is None:
+        periods_per_year = 252
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(equity) / equity[:-1]
+    returns = returns[np.isfinite(returns)] - risk_free
+
+    mean = returns.mean() if returns.size else 0.0
+    std = returns.std(ddof=1) if returns.size > 1 else 0.0
+    downside = np.minimum(returns, 0.0)
+    downside_dev = np.sqrt((downside ** 2).mean()) if returns.size else 0.0
+    ann = np.sqrt(periods_per_year)
+
+    dd, peak = _drawdown(equity)
+    max_dd = float(dd.min())
+    total_return = equity[-1] / equity[0] - 1.0 if equity[0] else 0.0
+    cagr = ((equity[-1] / equity[0]) ** (1.0 / years) - 1.0) if years and equity[0] > 0 and equity[-1] > 0 else total_return
+
+    return {
+        "total_return_pct": total_return * 100,
+        "cagr_pct": cagr * 100,
+        "volatility_pct": std * ann * 100,
+        "sharpe": (mean / std * ann) if std > 0 else 0.0,
+        "sortino": (mean / downside_dev * ann) if downside_dev > 0 else 0.0,
+        "max_drawdown_pct": max_dd * 100,
+        "max_drawdown_amount": float((equity - peak).min()),
+        "calmar": (cagr / -max_dd) if max_dd < 0 else 0.0,
+    }
+
+
+def exposure(times, entry_times, exit_times) -> float:
+    """포지션 보유 중인 봉 비율 (진입 시각 <= t < 청산 시각)"""
+    times_ns = _to_ns(times)
+    if times_ns.size == 0 or len(entry_times) == 0:
+        return 0.0
+    entry_ns = _to_ns(entry_times)
+    exit_ns = _to_ns(exit_times)
+    counts = np.zeros(times_ns.size + 1, dtype=np.int64)
+    np.add.at(counts, np.searchsorted(times_ns, entry_ns, side="left"), 1)
+    np.add.at(counts, np.searchsorted(times_ns, exit_ns, side="left"), -1)
+    return float((np.cumsum(counts[:-1]) > 0).mean())
+
+
+def _equity_arrays(equity_curve):
+    """자본 곡선 -> (시각 ns, 자본) 배열"""
+    if hasattr(equity_curve, "times_ns"):
+        return equity_curve.times_ns, equity_curve.values
+    times_ns = _to_ns([e["time"] for e in equity_curve])
+    equity = np.fromiter((e["capital"] for e in equity_curve), dtype=float, count=len(equity_curve))
+    return times_ns, equity
+
+
+def compute_metrics(
+    equity_curve: Sequence[dict],
+    trades: Sequence[dict],
+    initial_capital: Optional[float] = None,
+    periods_per_year: Optional[float] = None
+) -> dict:
+    """
+    전체 성과표 (ReversalBacktester 결과용)
+    :param equity_curve: EquityCurve 또는 [{'time', 'capital'}] 봉 단위 평가 자본
+    :param trades: TradeLedger 또는 trade_history
+    :param initial_capital: 초기 자본 (곡선 맨 앞에 추가하여 첫 봉 손익 반영)
+    """
+    times_ns, equity = _equity_arrays(equity_curve)
+    if initial_capital is not None and equity.size:
+        equity = np.concatenate(([initial_capital], equity))
+        times_ns = np.concatenate((times_ns[:1], times_ns))
+
+    arr = _as_trade_arrays(trades)
+    result = trade_metrics(arr)
+    result.update(equity_metrics(equity, times_ns if times_ns.size else None, periods_per_year))
+
+    result["exposure_pct"] = exposure(times_ns, arr["entry_ns"], arr["exit_ns"]) * 100 if arr["entry_ns"].size else 0.0
+    traded_notional = float((arr["quantity"] * (arr["entry_price"] + arr["exit_price"])).sum())
+    mean_equity = float(equity.mean()) if equity.size else 0.0
+    result["turnover"] = traded_notional / mean_equity if mean_equity > 0 else 0.0
+    return result
+
+
+def combine_equity_curves(curves: Iterable) -> EquityCurve:
+    """여러 심볼의 자본 곡선을 시각 기준으로 합산 (빈 구간은 직전 값 유지)"""
+    series = []
+    for curve in curves:
+        if len(curve) == 0:
+            continue
+        times_ns, values = _equity_arrays(curve)
+        s = pd.Series(values, index=times_ns)
+        series.append(s[~s.index.duplicated(keep="last")])
+    if not series:
+        return EquityCurve()
+    frame = pd.concat(series, axis=1).sort_index().ffill().bfill()
+    return EquityCurve.from_arrays(frame.index.to_numpy(dtype=np.int64), frame.to_numpy().sum(axis=1))
+
+
+def batch_equity_metrics(equity_matrix, periods_per_year: float = 252) -> Dict[str, np.ndarray]:
+    """
+    여러 자본 곡선을 한 번에 계산 (행 = 파라미터 조합, 열 = 같은 시각의 봉)
+    Returns: 지표명 -> 조합별 값 배열
+    """
+    equity = np.asarray(equity_matrix, dtype=float)
+    if equity.ndim == 1:
+        equity = equity[np.newaxis, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(equity, axis=1) / equity[:, :-1]
+    returns = np.where(np.isfinite(returns), returns, 0.0)
+
+    ann = np.sqrt(periods_per_year)
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1, ddof=1) if returns.shape[1] > 1 else np.zeros(len(equity))
+    downside_dev = np.sqrt((np.minimum(returns, 0.0) ** 2).mean(axis=1))
+    dd, _ = _drawdown(equity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total_return = equity[:, -1] / equity[:, 0] - 1.0
+        sharpe = np.where(std > 0, mean / std * ann, 0.0)
+        sortino = np.where(downside_dev > 0, mean / downside_dev * ann, 0.0)
+    max_dd = dd.min(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        calmar = np.where(max_dd < 0, total_return / -max_dd, 0.0)
+    return {
+        "total_return_pct": total_return * 100,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "max_drawdown_pct": max_dd * 100,
+        "calmar": calmar,
+    }
+
+
+def rank_results(results: pd.DataFrame, by: Sequence[str] = ("total_pnl",), ascending: Sequence[bool] = None) -> pd.DataFrame:
+    """
+    결과 표 정렬 (NumPy lexsort, 첫 키 우선)
+    :param by: 정렬 지표 (예: ("sharpe", "total_pnl"))
+    :param ascending: 지표별 오름차순 여부 (기본: 모두 내림차순, max_drawdown_pct 는 값이 클수록 좋음)
+    """
+    if isinstance(by, str):
+        by = (by,)
+    if ascending is None:
+        ascending = [False] * len(by)
+    if results.empty:
+        return results
+    keys = []
+    for col, asc in zip(reversed(by), reversed(list(ascending))):
+        values = results[col].to_numpy(dtype=float)
+        values = np.where(np.isnan(values), -np.inf if not asc else np.inf, values)
+        keys.append(values if asc else -values)
+    order = np.lexsort(keys)
+    return results.iloc[order].reset_index(drop=True)
@@ -28,6 +28,11 @@ KIS_BASE_URL = KIS_REAL_BASE_URL
 # ========== Telegram 설정 ==========
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
+TELEGRAM_ASYNC_SEND = True         # 백그라운드 스레드 발송 (False면 호출 시점에 동기 발송)
+TELEGRAM_QUEUE_SIZE = 100          # 대기 메시지 최대 개수 (주문/오류 알림은 초과해도 버리지 않음)
+TELEGRAM_RATE_LIMIT_PER_SEC = 1    # 채팅방당 발송 속도 제한 (Telegram 권장 1건/초)
+TELEGRAM_BATCH_MAX_CHARS = 4000    # 묶음 발송 최대 길이 (Telegram 메시지 한도 4096자)
+TELEGRAM_SEND_RETRIES = 3          # 발송 실패 시 재시도 횟수
 
 # ========== 거래소 API 설정 ==========
 # 예시: Alpaca, Interactive Brokers 등
@@ -38,6 +43,9 @@ BASE_URL = os.getenv("BASE_URL", "https://paper-api.alpaca.markets")  # Paper tr
 # ========== 거래 대상 ==========
 # 원본 주식 코드를 기준으로 2x ETF LONG/SHORT를 스위칭
 # 구조: {"ORIGINAL": 원본주식, "LONG": 2x 롱 ETF, "SHORT": 2x 숏 ETF}
+# 선택 항목 (종목 쌍별 재정의, 없으면 REVERSAL_STRATEGY_PARAMS 값 사용):
+#   "LONG_HOLD_DAYS" / "SHORT_HOLD_DAYS": 최대 보유 거래일
+#   "EXIT_ALLOWED_STATUSES": 손절/익절 청산을 허용할 장 상태 목록
 TARGET_SYMBOLS = [
     {
         "ORIGINAL": "COIN",  # 원본 주식: BitCoin
@@ -51,7 +59,9 @@ TARGET_SYMBOLS = [
         "LONG": "TSLL",      # 2x 롱 ETF: Direxion Daily TSLA Bull 2X Shares
         "LONG_MULTIPLE": "2",
         "SHORT": "TSLZ",     # 1x 숏 ETF: Direxion Daily TSLA Bear 1X Shares
-        "SHORT_MULTIPLE": "-2"
+        "SHORT_MULTIPLE": "-2",
+        "LONG_HOLD_DAYS": 3,  # LONG: 3 거래일, SHORT: 1 거래일 (tesla_reversal_trading_bot 과 동일)
+        "SHORT_HOLD_DAYS": 1
     },
     {
         "ORIGINAL": "AMZN",# 원본 주식: Amazon
@@ -72,7 +82,10 @@ TARGET_SYMBOLS = [
         "LONG": "NVDX",      # 2x 롱 ETF: T-Rex 2X Long Nvidia Daily Target ETF
         "LONG_MULTIPLE": "2",
         "SHORT": "NVDQ",      # 2x 숏 ETF: T-Rex 2X Inverse Nvidia Daily Target ETF
-        "SHORT_MULTIPLE": "-2"
+        "SHORT_MULTIPLE": "-2",
+        "LONG_HOLD_DAYS": 5,  # LONG: 5 거래일, SHORT: 1 거래일
+        "SHORT_HOLD_DAYS": 1,
+        "EXIT_ALLOWED_STATUSES": ["REGULAR"]  # 손절/익절은 정규장에서만 청산
     }
 ]
 
@@ -284,6 +297,7 @@ def get_etf_by_original(original_symbol: str):
 TRADING_START_HOUR = 17  # 오후 5시 (한국시간 기준)
 TRADING_END_HOUR = 5     # 새벽 5시 (익일)
 TRADING_TIMEZONE = "Asia/Seoul"
+SCHEDULER_JOB_TIMEOUT_SEC = 300  # 스케줄 작업 1회 실행 제한 시간 (초)
 
 # ========== 손익 기준 ==========
 # 사용자 원안
@@ -328,9 +342,54 @@ MACD_SIGNAL = 9
 POSITION_SIZE_PCT = 0.95  # 사용 가능 자금의 95% 사용
 MIN_TRADE_AMOUNT = 100    # 최소 거래 금액
 
+# ========== API 호출 설정 ==========
+# 여러 종목 봇이 하나의 계정을 공유하므로 계정 단위로 초당 호출 수 제한 (KIS 실전 20건/초, 모의 2건/초)
+KIS_RATE_LIMIT_PER_SEC = 18
+KIS_PAPER_RATE_LIMIT_PER_SEC = 2
+PRICE_CACHE_TTL_SEC = 5  # 같은 종목 현재가 재조회 방지 (초)
+
+# ========== 주문 체결 추적 설정 ==========
+ORDER_FILL_TIMEOUT_SEC = 30    # 체결 대기 제한 시간 (초과 시 미체결 잔량 취소)
+ORDER_POLL_INITIAL_SEC = 0.5   # 첫 체결 조회 간격 (이후 2배씩 증가)
+ORDER_POLL_MAX_SEC = 4         # 체결 조회 최대 간격
+ORDER_SUBMIT_RETRIES = 3       # 주문 접수 실패 시 재시도 횟수
+
+# ========== 상태 저장 설정 ==========
+STATE_FSYNC_MODE = "batch"      # always: 저장마다 fsync / batch: 간격마다 fsync / never
+STATE_FSYNC_INTERVAL_SEC = 1.0  # batch 모드 fsync 간격 (초)
+STATE_COMPACT_EVERY = 200       # 저널 기록 수가 이 값을 넘으면 스냅샷으로 압축
+
 # ========== 로깅 설정 ==========
 LOG_LEVEL = "INFO"
 LOG_FILE = "trading_bot.log"
+LOG_DIR = "logs"
+LOG_MAX_BYTES = 20 * 1024 * 1024   # 파일 크기 기준 교체 (0이면 크기 제한 없음)
+LOG_ROTATE_WHEN = "midnight"       # 시간 기준 교체 주기 (TimedRotatingFileHandler when)
+LOG_BACKUP_COUNT = 14              # 보관할 교체 파일 수
+LOG_JSON_ENABLED = False           # 구조화 JSON lines 로그 동시 기록
+LOG_JSON_FILE = "trading_bot.jsonl"
+LOG_QUEUE_SIZE = 10000             # 쓰기 대기 로그 최대 개수 (초과 시 INFO 이하부터 폐기)
+
+# ========== 지연 시간 계측 설정 ==========
+LATENCY_METRICS_ENABLED = True       # 단계별 지연 시간 집계 (False면 계측 생략)
+LATENCY_REPORT_INTERVAL_MIN = 60     # 로그 요약/덤프 주기 (분)
+LATENCY_DUMP_DIR = "logs"            # latency.json / latency.prom 저장 위치
+
+# ========== 거래일 캘린더 설정 ==========
+CALENDAR_CACHE_DIR = "data/calendar"  # 거래일 / 장 구분 캐시 (.npz) 저장 위치
+CALENDAR_START_DATE = "2015-01-01"    # 캐시 기본 구간 (벗어나는 요청은 구간을 넓혀 다시 계산)
+CALENDAR_END_DATE = "2030-12-31"
+
+# ========== 지표 캐시 설정 ==========
+INDICATOR_CACHE_ENABLED = True               # 백테스트 지표를 디스크에 캐시 (False면 매번 계산)
+INDICATOR_CACHE_DIR = "data/indicator_cache"  # 캐시 (.npz) 저장 위치
+INDICATOR_BACKEND = "pandas_ta"              # 데이터셋 RSI/MACD 계산: "pandas_ta" / "native" (NumPy, pandas_ta 와 같은 계산식)
+                                             # native 기본값 전환은 test_matches_pandas_ta 로 일치 확인 후 (pandas_ta 미설치 시 native 로 대체)
+
+# ========== 데이터셋 로딩 설정 ==========
+DATASET_WARMUP_BARS = 200  # 기간 지정 로딩 시 지표 워밍업용으로 시작일 이전에 더 읽는 봉 수 (반환 전 제거)
+DATA_CATALOG_PATH = "data/catalog.db"  # 데이터 파일 목록 / 기간 / 행 수 / 체크섬 인덱스 (SQLite, 파일 쓰기 시 갱신)
+DATA_QUALITY_DIR = "data/quality"      # 수집 직후 품질 검사 보고서 (누락 구간 / 이상치, JSON) 저장 위치
 
 # ========== 테스트 모드 ==========
 PAPER_TRADING = True  # Paper trading 모드
@@ -370,7 +429,11 @@ REVERSAL_REVERSE_RISK_FACTOR = 0.8  # 반전시 진입 자본 비율 (기존보
 REVERSAL_COOLDOWN_PERIOD = 1  # 반전 후 추가 거래 금지 기간 (일)
 REVERSAL_REVERSAL_LIMIT = 1 # 24시간내 최대 전환 횟수
 
-# 5. 로그 및 모니터링 파라미터
+# 5. 포트폴리오 백테스트 (공유 자본)
+PORTFOLIO_MAX_POSITIONS = 0  # 동시 보유 최대 심볼 수 (0 = 제한 없음)
+PORTFOLIO_POSITION_BUDGET_PCT = 0.0  # 1회 진입 예산 (포트폴리오 평가액 대비, 0 = 1/심볼 수)
+
+# 6. 로그 및 모니터링 파라미터
 REVERSAL_LOG_LEVEL = "INFO"  # 로그 상세도: DEBUG, INFO, WARN
 REVERSAL_ALERT_CHANNEL = None  # 알림 수단: Telegram, Slack 등
 REVERSAL_RECORD_TRADES = True  # 거래 기록 저장 여부
@@ -8,26 +8,57 @@ from datetime import datetime
 from typing import Optional, Dict
 import sys
 import os
+import threading
+import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.logger import logger
 from trading.kis_api import KisApi
+from utils.latency import timed
 
 class DataFetcher:
     """시장 데이터 수집 클래스 (KIS API)"""
     
-    def __init__(self, kis_client: Optional[KisApi] = None):
+    def __init__(self, kis_client: Optional[KisApi] = None, cache_ttl: float = 0):
         """
         :param kis_client: 외부에서 주입된 KisApi 인스턴스 (없으면 내부 생성)
+        :param cache_ttl: 현재가 캐시 유지 시간(초). 0이면 캐시 미사용
         """
         if kis_client:
             self.kis = kis_client
         else:
             # 기본값: 실전 투자 (주의: 모의투자 시 외부 주입 권장)
             self.kis = KisApi(is_paper_trading=False)
+
+        # 여러 봇이 같은 원본/ETF 종목을 조회할 때 API 중복 호출 방지
+        self.cache_ttl = cache_ttl
+        self._price_cache: Dict[str, tuple] = {}
+        self._cache_lock = threading.Lock()
     
+    @timed("data.get_realtime_price")
     def get_realtime_price(self, symbol: str) -> Optional[float]:
-        """실시간 가격 조회"""
-        return self.kis.get_current_price(symbol)
+        """실시간 가격 조회 (cache_ttl 이내 재조회는 캐시 사용)"""
+        if self.cache_ttl <= 0:
+            return self.kis.get_current_price(symbol)
+
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._price_cache.get(symbol)
+            if cached and now - cached[1] < self.cache_ttl:
+                return cached[0]
+
+        price = self.kis.get_current_price(symbol)
+        if price:
+            with self._cache_lock:
+                self._price_cache[symbol] = (price, now)
+        return price
+
+    def invalidate_price_cache(self, symbol: Optional[str] = None):
+        """현재가 캐시 삭제 (주문 직후 등 최신 가격이 필요할 때)"""
+        with self._cache_lock:
+            if symbol is None:
+                self._price_cache.clear()
+            else:
+                self._price_cache.pop(symbol, None)
         #"""실시간 가격 조회 (KIS 우선 -> 실패시 yfinance)"""
         # price = self.kis.get_current_price(symbol)
         # if price:
@@ -55,6 +86,7 @@ class DataFetcher:
             
         #return None
     
+    @timed("data.get_historical_data")
     def get_historical_data(
         self, 
         symbol: str, 
@@ -155,6 +187,7 @@ class DataFetcher:
         # (구현 간소화를 위해 get_historical_data 호출)
         return self.get_historical_data(symbol, period="1d", interval=interval)
     
+    @timed("data.get_market_status")
     def get_market_status(self, symbol: str) -> Dict[str, any]:
         """시장 상태 정보 조회"""
         # KIS API로 상세 정보 조회 (현재가, 전일비 등)
@@ -0,0 +1,125 @@
+import os
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .resampler import SessionAnchor, interval_minutes, is_resumable, resample_csv
+
+logger = logging.getLogger(__name__)
+
+# Intervals the pyramid knows about, finest first
+PYRAMID_INTERVALS = ["1m", "5m", "10m", "15m", "30m", "1h", "1d", "1w", "1mo"]
+DEFAULT_LEVELS = ["5m", "15m", "30m", "1h", "1d"]
+
+
+def _sort_minutes(interval: str) -> int:
+    minutes = interval_minutes(interval)
+    if minutes is None:
+        return 7 * 1440 if interval.endswith("w") else 31 * 1440
+    return minutes
+
+
+def can_derive(base: str, target: str) -> bool:
+    """True if target bars can be built exactly from base bars (base bins nest inside target bins)"""
+    base_minutes, target_minutes = interval_minutes(base), interval_minutes(target)
+    if base_minutes is None or base == target:
+        return False
+    if target_minutes is None:
+        return base_minutes <= 1440 and 1440 % base_minutes == 0
+    return target_minutes > base_minutes and target_minutes % base_minutes == 0
+
+
+class BarPyramid:
+    """
+    Coarser intervals materialized from the finest downloaded interval of one symbol.
+    Files live next to the downloads (data/{source}/{symbol}/{interval}.csv), so anything that
+    reads those paths (prepare_dataset, backtests) sees derived intervals like downloaded ones.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        symbol: str,
+        root: str = "data",
+        session: Optional[SessionAnchor] = None,
+        tz: str = "Asia/Seoul"
+    ):
+        self.source = source
+        self.symbol = symbol
+        self.root = root
+        self.session = session
+        self.tz = tz
+
+    def path(self, interval: str) -> str:
+        return os.path.join(self.root, self.source, str(self.symbol), f"{interval}.csv")
+
+    def available(self) -> List[str]:
+        """Intervals stored on disk, finest first"""
+        folder = os.path.join(self.root, self.source, str(self.symbol))
+        if not os.path.isdir(folder):
+            return []
+        names = [name[:-4] for name in os.listdir(folder) if name.endswith(".csv")]
+        return sorted((name for name in names if name in PYRAMID_INTERVALS), key=_sort_minutes)
+
+    def base_interval(self) -> Optional[str]:
+        """Finest interval on disk (the source for every derived level)"""
+        available = self.available()
+        return available[0] if available else None
+
+    def update(self, levels: Iterable[str] = None, keep: Iterable[str] = ()) -> Dict[str, int]:
+        """
+        Derives every level coarser than the base interval, only recomputing bars from the last
+        stored bar of each level onwards. Returns {interval: bars written}.
+        Existing files the pyramid cannot resume (e.g. downloads rewritten with indicator columns)
+        are never rebuilt from the base.
+        :param keep: Intervals that are downloaded, not derived (left untouched even if resumable)
+        """
+        base = self.base_interval()
+        if base is None:
+            return {}
+        levels = DEFAULT_LEVELS if levels is None else levels
+        keep = set(keep)
+        targets = {}
+        for interval in levels:
+            if interval in keep or not can_derive(base, interval):
+                continue
+            path = self.path(interval)
+            if os.path.exists(path) and not is_resumable(path, interval, self.session, self.tz):
+                logger.info(f"Keeping {path} (not a derived file)")
+                continue
+            targets[interval] = path
+        if not targets:
+            return {}
+        return resample_csv(self.path(base), targets, session=self.session, tz=self.tz, incremental=True)
+
+    def _is_stale(self, interval: str, base: str) -> bool:
+        path = self.path(interval)
+        if os.path.getmtime(self.path(base)) <= os.path.getmtime(path):
+            return False
+        # Only refresh files the pyramid can resume (plain OHLCV layout); leave other files untouched
+        return is_resumable(path, interval, self.session, self.tz)
+
+    def ensure(self, interval: str) -> str:
+        """
+        Path of an up-to-date CSV for interval, deriving or refreshing it from the base interval if needed.
+        Raises FileNotFoundError if it is neither stored nor derivable.
+        """
+        path = self.path(interval)
+        base = self.base_interval()
+        derivable = base is not None and can_derive(base, interval)
+        if os.path.exists(path):
+            if derivable and self._is_stale(interval, base):
+                resample_csv(self.path(base), {interval: path}, session=self.session, tz=self.tz, incremental=True)
+            return path
+        if not derivable:
+            raise FileNotFoundError(f"No data for {self.symbol} ({interval}) and no finer interval to derive it from")
+        logger.info(f"Deriving {self.symbol} {interval} from {base}")
+        resample_csv(self.path(base), {interval: path}, session=self.session, tz=self.tz)
+        return path
+
+    def load(self, interval: str) -> pd.DataFrame:
+        """OHLCV bars for any interval (raw CSV columns, datetime index as stored)"""
+        frame = pd.read_csv(self.ensure(interval), index_col="datetime")
+        frame.index = pd.to_datetime(frame.index)
+        return frame
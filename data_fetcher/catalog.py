@@ -0,0 +1,298 @@
+import os
+import sys
+import sqlite3
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import DATA_CATALOG_PATH
+
+logger = logging.getLogger(__name__)
+
+# Naive timestamps in the data files are KST (same assumption as prepare_dataset)
+FILE_TZ = "Asia/Seoul"
+
+_COLUMNS = [
+    "source", "symbol", "interval", "path", "rows", "first_ts", "last_ts",
+    "gaps", "max_gap_min", "tz", "checksum", "size", "mtime", "updated_at"
+]
+
+
+# Breaks at least this long are treated as market closes, not gaps
+SESSION_BREAK_MIN = 240
+
+
+def _is_interval(name: str) -> bool:
+    from .resampler import interval_minutes  # resampler imports this module
+    try:
+        interval_minutes(name)
+        return True
+    except ValueError:
+        return False
+
+
+def _interval_minutes(interval: str) -> Optional[int]:
+    from .resampler import interval_minutes
+    return interval_minutes(interval) if _is_interval(interval) else None
+
+
+def scan_file(path: str, interval: str) -> dict:
+    """
+    Statistics of one data file: rows, first/last timestamp, gaps, timezone and checksum.
+    A gap is a step between consecutive intraday bars longer than the interval but shorter than
+    SESSION_BREAK_MIN (longer breaks are overnight / weekend closes).
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+
+    stamps = pd.read_csv(path, usecols=[0]).iloc[:, 0]
+    parsed = pd.to_datetime(stamps)
+    if parsed.dtype == object:
+        parsed = pd.to_datetime(stamps, utc=True)  # mixed UTC offsets
+    index = pd.DatetimeIndex(parsed)
+    if index.tz is None:
+        tz = FILE_TZ
+        index = index.tz_localize(FILE_TZ) if len(index) else index
+    else:
+        tz = str(index.tz)
+    index = index.sort_values()
+
+    gaps, max_gap = 0, 0.0
+    step = _interval_minutes(interval)
+    if len(index) > 1 and step and step < 1440:
+        deltas = np.diff(index.as_unit("ns").asi8) / 60e9
+        intraday = deltas[(deltas > step) & (deltas < SESSION_BREAK_MIN)]
+        gaps = int(len(intraday))
+        max_gap = float(intraday.max()) if gaps else 0.0
+
+    stat = os.stat(path)
+    return {
+        "path": path,
+        "rows": int(len(index)),
+        "first_ts": index[0].isoformat() if len(index) else None,
+        "last_ts": index[-1].isoformat() if len(index) else None,
+        "gaps": gaps,
+        "max_gap_min": max_gap,
+        "tz": tz,
+        "checksum": hasher.hexdigest(),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+    }
+
+
+class DataCatalog:
+    """
+    Index of the local market-data store (data/{source}/{symbol}/{interval}.csv) in SQLite.
+    One row per (source, symbol, interval). Writers call record() after writing a file; readers
+    call get()/list() which answer from the index and only rescan a file whose size/mtime changed.
+    """
+
+    def __init__(self, db_path: str = None, root: str = "data"):
+        self.db_path = db_path or DATA_CATALOG_PATH
+        self.root = root
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _get_connection(self):
+        if not os.path.exists(self.db_path):
+            self._init_db()  # relative path under a different working directory / deleted file
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS datasets (
+                    source TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    rows INTEGER,
+                    first_ts TEXT,
+                    last_ts TEXT,
+                    gaps INTEGER,
+                    max_gap_min REAL,
+                    tz TEXT,
+                    checksum TEXT,
+                    size INTEGER,
+                    mtime REAL,
+                    updated_at TEXT,
+                    PRIMARY KEY (source, symbol, interval)
+                )
+            """)
+
+    def path(self, source: str, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, source, str(symbol), f"{interval}.csv")
+
+    def record(self, source: str, symbol: str, interval: str, path: str = None) -> Optional[dict]:
+        """Scans the file and stores its entry (removes the entry if the file is gone)"""
+        path = path or self.path(source, symbol, interval)
+        if not os.path.exists(path):
+            self.remove(source, symbol, interval)
+            return None
+        entry = {"source": source, "symbol": str(symbol), "interval": interval}
+        entry.update(scan_file(path, interval))
+        entry["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._get_connection() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO datasets ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [entry[c] for c in _COLUMNS]
+            )
+        return entry
+
+    def _store_parts(self, path: str) -> Optional[List[str]]:
+        """[source, symbol, file name] if path is a data file directly under {root}/{source}/{symbol}/"""
+        root = os.path.abspath(self.root)
+        path = os.path.abspath(path)
+        if os.path.commonpath([root, path]) != root:
+            return None
+        parts = os.path.relpath(path, root).split(os.sep)
+        return parts if len(parts) == 3 and parts[-1].endswith(".csv") else None
+
+    def in_store(self, path: str) -> bool:
+        return self._store_parts(path) is not None
+
+    def record_path(self, path: str) -> Optional[dict]:
+        """record() for a path laid out as {root}/{source}/{symbol}/{interval}.csv"""
+        parts = self._store_parts(path)
+        if parts is None:
+            raise ValueError(f"Not a data store path: {path}")
+        return self.record(parts[0], parts[1], parts[2][:-4], path)
+
+    def remove(self, source: str, symbol: str, interval: str):
+        with self._lock, self._get_connection() as conn:
+            conn.execute(
+                "DELETE FROM datasets WHERE source = ? AND symbol = ? AND interval = ?",
+                (source, str(symbol), interval)
+            )
+
+    def get(self, source: str, symbol: str, interval: str, refresh: bool = True) -> Optional[dict]:
+        """
+        Entry for one dataset (None if unknown). With refresh, a file changed or created outside
+        the catalog is rescanned; an unchanged file costs one primary-key lookup and one stat.
+        """
+        with self._get_connection() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM datasets WHERE source = ? AND symbol = ? AND interval = ?",
+                (source, str(symbol), interval)
+            ).fetchone()
+        entry = dict(zip(_COLUMNS, row)) if row else None
+        if not refresh:
+            return entry
+        path = entry["path"] if entry else self.path(source, symbol, interval)
+        if not os.path.exists(path):
+            if entry:
+                self.remove(source, symbol, interval)
+            return None
+        stat = os.stat(path)
+        if entry is None or entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime:
+            entry = self.record(source, symbol, interval, path)
+        return entry
+
+    def fresh(self, source: str, symbol: str, interval: str) -> Optional[dict]:
+        """Entry only if it still matches the file on disk (never scans)"""
+        entry = self.get(source, symbol, interval, refresh=False)
+        if entry is None or not os.path.exists(entry["path"]):
+            return None
+        stat = os.stat(entry["path"])
+        return entry if entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime else None
+
+    def list(self, source: str = None, symbol: str = None, interval: str = None) -> List[dict]:
+        """Entries matching the given filters (no file access)"""
+        clauses, args = [], []
+        for name, value in (("source", source), ("symbol", symbol), ("interval", interval)):
+            if value is not None:
+                clauses.append(f"{name} = ?")
+                args.append(str(value))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM datasets{where} ORDER BY source, symbol, interval", args
+            ).fetchall()
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def date_range(self, source: str, symbol: str, interval: str):
+        """(first, last) Timestamps of a dataset, or None"""
+        entry = self.get(source, symbol, interval)
+        if not entry or not entry["first_ts"]:
+            return None
+        return pd.Timestamp(entry["first_ts"]), pd.Timestamp(entry["last_ts"])
+
+    def rebuild(self, source: str = None) -> Dict[str, int]:
+        """Rescans the store (all sources or one) and drops entries whose files are gone"""
+        counts = {"recorded": 0, "removed": 0}
+        sources = [source] if source else (
+            sorted(d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d)))
+            if os.path.isdir(self.root) else []
+        )
+        for src in sources:
+            src_dir = os.path.join(self.root, src)
+            if not os.path.isdir(src_dir):
+                continue
+            for symbol in sorted(os.listdir(src_dir)):
+                sym_dir = os.path.join(src_dir, symbol)
+                if not os.path.isdir(sym_dir):
+                    continue
+                for name in sorted(os.listdir(sym_dir)):
+                    if name.endswith(".csv") and _is_interval(name[:-4]):
+                        try:
+                            self.record(src, symbol, name[:-4], os.path.join(sym_dir, name))
+                            counts["recorded"] += 1
+                        except Exception as e:
+                            logger.warning(f"Catalog scan failed for {sym_dir}/{name}: {e}")
+        for entry in self.list(source=source):
+            if not os.path.exists(entry["path"]):
+                self.remove(entry["source"], entry["symbol"], entry["interval"])
+                counts["removed"] += 1
+        return counts
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> DataCatalog:
+    """Process-wide catalog instance (created on first use)"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = DataCatalog()
+        return _catalog
+
+
+def record_write(path: str):
+    """
+    Updates the catalog after a data file was written (never fails the write itself).
+    Files outside the catalog's data root (temporary / ad-hoc destinations) are not recorded.
+    """
+    try:
+        catalog = get_catalog()
+        if catalog.in_store(path):
+            catalog.record_path(path)
+    except Exception as e:
+        logger.warning(f"Catalog update failed for {path}: {e}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Local market-data catalog")
+    parser.add_argument("--rebuild", action="store_true", help="Rescan data/ before listing")
+    parser.add_argument("--source", default=None, help="Only this source (kis / yfinance)")
+    args = parser.parse_args()
+
+    catalog = get_catalog()
+    if args.rebuild:
+        logger.info(f"Catalog rebuild: {catalog.rebuild(args.source)}")
+    for entry in catalog.list(source=args.source):
+        print(f"{entry['source']:<9} {entry['symbol']:<8} {entry['interval']:<4} {entry['rows']:>8} rows  "
+              f"{entry['first_ts']} ~ {entry['last_ts']}  gaps {entry['gaps']}")
@@ -6,6 +6,8 @@ import logging
 import datetime
 from .auth import KisAuth
 from .utils import get_base_url, date_to_str, str_to_date
+from .catalog import record_write
+from .quality import merge_bars
 
 logger = logging.getLogger(__name__)
 
@@ -26,19 +28,7 @@ class KisFetcher:
         
         logger.info(f"Fetching {symbol} ({interval}) from {start_date} to {end_date}...")
 
-        if interval in ["1d", "1w", "1mo"]:
-            # Basic routing: 6-digit numeric = Domestic, otherwise Overseas (Assumption)
-            if symbol.isdigit() and len(symbol) == 6:
-                df = await self._fetch_period_data(symbol, interval, start_date, end_date)
-            else:
-                # Assume Overseas (US)
-                df = await self._fetch_overseas_period_data(symbol, interval, start_date, end_date)
-        else:
-             # Minute data (1m, 30m, etc.)
-             if symbol.isdigit() and len(symbol) == 6:
-                df = await self._fetch_minute_data(symbol, interval, start_date, end_date)
-             else:
-                df = await self._fetch_overseas_minute_data(symbol, interval, start_date, end_date)
+        df = await self._fetch_range(symbol, interval, start_date, end_date)
 
         if df is not None and not df.empty:
             self._save_data(symbol, interval, df)
@@ -47,6 +37,43 @@ class KisFetcher:
             logger.warning(f"No data fetched for {symbol}")
             return None
 
+    async def _fetch_range(self, symbol, interval, start_date, end_date, save_batches=True):
+        """
+        Routes a [start_date, end_date] request to the matching API.
+        :param save_batches: Overseas minute data only - write batches to the data file while paginating
+                             (False keeps the stored file untouched, used by refetch_ranges)
+        """
+        if interval in ["1d", "1w", "1mo"]:
+            # Basic routing: 6-digit numeric = Domestic, otherwise Overseas (Assumption)
+            if symbol.isdigit() and len(symbol) == 6:
+                return await self._fetch_period_data(symbol, interval, start_date, end_date)
+            # Assume Overseas (US)
+            return await self._fetch_overseas_period_data(symbol, interval, start_date, end_date)
+        # Minute data (1m, 30m, etc.)
+        if symbol.isdigit() and len(symbol) == 6:
+            return await self._fetch_minute_data(symbol, interval, start_date, end_date)
+        return await self._fetch_overseas_minute_data(symbol, interval, start_date, end_date, save_batches=save_batches)
+
+    async def refetch_ranges(self, symbol, interval, windows):
+        """
+        Re-downloads only the given windows [(start, end)] (from quality.plan_refetch) and merges the
+        bars that are still missing into the stored file. Existing rows are kept as they are.
+        The KIS chart APIs page backwards from the latest bar, so one request reaching back to the
+        earliest window is made and only rows inside the windows are merged.
+        :return: Number of bars added
+        """
+        if not windows:
+            return 0
+        file_path = f"data/kis/{symbol}/{interval}.csv"
+        # Windows are tz-aware; the KIS APIs and files use naive KST
+        start = min(w[0] for w in windows).tz_convert("Asia/Seoul").tz_localize(None).to_pydatetime()
+        end = max(w[1] for w in windows).tz_convert("Asia/Seoul").tz_localize(None).to_pydatetime()
+        logger.info(f"Re-fetching {len(windows)} missing range(s) of {symbol} ({interval}) between {start} and {end}...")
+        df = await self._fetch_range(symbol, interval, start, end, save_batches=False)
+        added = merge_bars(file_path, df, windows)
+        logger.info(f"Merged {added} re-fetched bars into {file_path}")
+        return added
+
     def _calculate_start_date(self, period, end_date):
         if period.endswith("y"):
             years = int(period[:-1])
@@ -184,9 +211,10 @@ class KisFetcher:
         logger.warning(f"Could not find {symbol} in NAS, NYS, AMS or API error.")
         return None
 
-    async def _fetch_overseas_minute_data(self, symbol, interval, start_date, end_date):
+    async def _fetch_overseas_minute_data(self, symbol, interval, start_date, end_date, save_batches=True):
         """
         Fetch Overseas (US) Minute/Hour data using HHDFS76950200.
+        :param save_batches: Replace the data file and append each batch to it while paginating
         """
         path = "/uapi/overseas-price/v1/quotations/inquire-time-itemchartprice"
         url = f"{self.base_url}{path}"
@@ -209,7 +237,7 @@ class KisFetcher:
         # Clean up existing file before starting incremental fetch
         # This prevents mixing old/corrupt data if the process was interrupted previously.
         file_path = f"data/kis/{symbol}/{interval}.csv"
-        if os.path.exists(file_path):
+        if save_batches and os.path.exists(file_path):
             try:
                 os.remove(file_path)
                 logger.info(f"Removed stale file {file_path} before start.")
@@ -311,7 +339,8 @@ class KisFetcher:
                                 temp_df.set_index('datetime', inplace=True)
                                 temp_df.sort_index(inplace=True)
                                 
-                                self._append_to_file(symbol, interval, temp_df)
+                                if save_batches:
+                                    self._append_to_file(symbol, interval, temp_df)
 
                                 if records and batch_max == records[-1]['datetime']:
                                     logger.warning("Infinite loop detected: Batch max matches previous record. Stopping.")
@@ -566,6 +595,7 @@ class KisFetcher:
             
         logger.info(f"Writing {len(df)} records to {file_path}...")
         df.to_csv(file_path)
+        record_write(file_path)
         logger.info(f"Successfully saved data to {file_path}")
 
     async def download_all(self, symbols, interval, period="1y"):
@@ -0,0 +1,365 @@
+"""
+Data-quality pass run right after a fetch.
+
+Checks one OHLCV file against the trading calendar (vectorized, no per-bar loops):
+- anomalies: duplicate / unsorted timestamps, non-positive or NaN closes, inconsistent OHLC,
+  negative volume, return spikes
+- coverage: bars the calendar expects (trading days x allowed sessions) that are missing,
+  grouped into contiguous ranges that can be re-fetched on their own
+- timezone: a constant hour shift that lines the bars up with the session much better than the
+  stored timestamps (KIS files are naive KST, yfinance files are converted to Asia/Seoul)
+- DST: days whose first bar moved by one hour against the usual session start
+"""
+import os
+import sys
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import DATA_QUALITY_DIR
+from utils.market_calendar import classify_sessions, get_calendar, session_mask
+from .catalog import record_write
+from .resampler import OHLCV_COLUMNS, interval_minutes
+
+logger = logging.getLogger(__name__)
+
+# Naive timestamps in the data files are KST (same assumption as prepare_dataset)
+FILE_TZ = "Asia/Seoul"
+EXCHANGE_TZ = {"US": "America/New_York", "KR": "Asia/Seoul"}
+
+SPIKE_SIGMA = 12.0         # |log return| above this many robust sigmas ...
+SPIKE_MIN_RETURN = 0.2     # ... and above 20% is a spike
+TZ_SUSPECT_MARGIN = 0.25   # share of in-session bars a shifted clock must gain to be reported
+TZ_SAMPLE_BARS = 20000     # timezone check runs on the most recent bars only
+
+_NS_PER_MIN = 60 * 10**9
+
+
+def market_of(symbol: str) -> str:
+    """6-digit numeric symbols are KRX listings, everything else is treated as US"""
+    symbol = str(symbol)
+    return "KR" if symbol.isdigit() and len(symbol) == 6 else "US"
+
+
+@dataclass
+class QualityReport:
+    source: str
+    symbol: str
+    interval: str
+    market: str
+    rows: int = 0
+    first: Optional[str] = None
+    last: Optional[str] = None
+    duplicates: int = 0
+    unsorted: int = 0
+    bad_prices: int = 0
+    ohlc_errors: int = 0
+    negative_volume: int = 0
+    spikes: int = 0
+    spike_times: List[str] = field(default_factory=list)
+    expected: int = 0
+    missing: int = 0
+    off_grid: int = 0
+    off_session: int = 0
+    missing_ranges: List[Dict] = field(default_factory=list)
+    tz_offset_hours: int = 0
+    dst_shift_days: int = 0
+    issues: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["ok"] = self.ok
+        return data
+
+    def summary(self) -> str:
+        head = f"{self.source}/{self.symbol}/{self.interval}: {self.rows} rows, {self.missing}/{self.expected} expected bars missing"
+        return head + (f" | {'; '.join(self.issues)}" if self.issues else " | ok")
+
+
+def _file_index(stamps) -> pd.DatetimeIndex:
+    """Parsed timestamps in the file's own clock (naive stays naive; mixed offsets -> Asia/Seoul)"""
+    parsed = pd.to_datetime(stamps)
+    if parsed.dtype == object:
+        parsed = pd.to_datetime(stamps, utc=True).tz_convert(FILE_TZ)
+    return pd.DatetimeIndex(parsed)
+
+
+def _utc_index(stamps) -> pd.DatetimeIndex:
+    """Parsed timestamps as UTC (naive values are KST)"""
+    index = _file_index(stamps)
+    if index.tz is None:
+        index = index.tz_localize(FILE_TZ)
+    return index.tz_convert("UTC")
+
+
+def _runs(positions: np.ndarray) -> List[Tuple[int, int]]:
+    """[(first, last)] of consecutive runs in a sorted integer array"""
+    if not len(positions):
+        return []
+    breaks = np.flatnonzero(np.diff(positions) != 1)
+    starts = np.r_[0, breaks + 1]
+    ends = np.r_[breaks, len(positions) - 1]
+    return list(zip(positions[starts].tolist(), positions[ends].tolist()))
+
+
+def _in_session(utc: pd.DatetimeIndex, market: str, sessions: Sequence[str]) -> np.ndarray:
+    return session_mask(classify_sessions(utc, market), sessions)
+
+
+def _check_anomalies(report: QualityReport, frame: pd.DataFrame, utc: pd.DatetimeIndex):
+    ns = utc.as_unit("ns").asi8
+    report.duplicates = int(pd.Index(ns).duplicated().sum())
+    report.unsorted = int((np.diff(ns) < 0).sum())
+
+    close = pd.to_numeric(frame["close"], errors="coerce").to_numpy(float)
+    report.bad_prices = int((~(close > 0)).sum())  # NaN compares False
+    if {"open", "high", "low"}.issubset(frame.columns):
+        o, h, l = (pd.to_numeric(frame[c], errors="coerce").to_numpy(float) for c in ("open", "high", "low"))
+        tol = 1e-9 * np.abs(close)
+        with np.errstate(invalid="ignore"):
+            bad = (h < np.fmax(o, close) - tol) | (l > np.fmin(o, close) + tol) | (h < l - tol)
+        report.ohlc_errors = int(bad.sum())
+    if "volume" in frame.columns:
+        report.negative_volume = int((pd.to_numeric(frame["volume"], errors="coerce").to_numpy(float) < 0).sum())
+
+    valid = close > 0
+    if valid.sum() > 2:
+        returns = np.diff(np.log(close[valid]))
+        sigma = 1.4826 * np.median(np.abs(returns - np.median(returns)))
+        hits = np.flatnonzero((np.abs(returns) > SPIKE_SIGMA * sigma) & (np.abs(returns) > SPIKE_MIN_RETURN))
+        report.spikes = int(len(hits))
+        report.spike_times = [utc[valid][i + 1].isoformat() for i in hits[:10]]
+
+
+def _check_intraday(report: QualityReport, utc: pd.DatetimeIndex, step_min: int, sessions: Sequence[str]):
+    step = step_min * _NS_PER_MIN
+    present = np.unique(utc.as_unit("ns").asi8)
+    # Bars sit on a fixed phase of the UTC clock (e.g. :30 for US hourly bars starting 09:30 ET)
+    phase = int(np.bincount((present % step // _NS_PER_MIN).astype(np.int64)).argmax()) * _NS_PER_MIN
+    start = present[0] - (present[0] - phase) % step
+    grid_ns = start + step * np.arange((present[-1] - start) // step + 1, dtype=np.int64)  # exact (no float length)
+    grid = pd.DatetimeIndex(grid_ns, tz="UTC")
+
+    # A bar is expected if it starts in, or reaches into, an allowed session of a trading day
+    allowed = _in_session(grid, report.market, sessions)
+    if step_min > 1:
+        allowed |= _in_session(grid + pd.Timedelta(minutes=step_min - 1), report.market, sessions)
+    calendar = get_calendar(report.market, grid[0].date() - pd.Timedelta(days=1), grid[-1].date() + pd.Timedelta(days=1))
+    trading = calendar.ordinals(grid.tz_convert(EXCHANGE_TZ[report.market])) >= 0
+    expected = grid_ns[allowed & trading]
+
+    on_grid = (present - phase) % step == 0
+    missing = ~np.isin(expected, present, assume_unique=True)
+    report.expected = int(len(expected))
+    report.missing = int(missing.sum())
+    report.off_grid = int((~on_grid).sum())
+    report.off_session = int((on_grid & ~np.isin(present, expected, assume_unique=True)).sum())
+    report.missing_ranges = [
+        {
+            "start": pd.Timestamp(expected[a], tz="UTC").tz_convert(FILE_TZ).isoformat(),
+            "end": pd.Timestamp(expected[b] + step, tz="UTC").tz_convert(FILE_TZ).isoformat(),
+            "bars": b - a + 1,
+        }
+        for a, b in _runs(np.flatnonzero(missing))
+    ]
+
+    # Session labels repeat every 24h, so the trading-day check is what tells -11h from +13h
+    sample = utc[-TZ_SAMPLE_BARS:]
+    share = {}
+    for hours in range(-14, 15):
+        shifted = sample + pd.Timedelta(hours=hours)
+        on_day = calendar.ordinals(shifted.tz_convert(EXCHANGE_TZ[report.market])) >= 0
+        share[hours] = (_in_session(shifted, report.market, ("REGULAR",)) & on_day).mean()
+    best = max(share, key=lambda h: (share[h], -abs(h)))
+    if best != 0 and share[best] > share[0] + TZ_SUSPECT_MARGIN:
+        report.tz_offset_hours = best
+
+    if report.market == "US":
+        # First bar of each exchange day in ET minutes; a +-60 jump against the usual start is a DST slip
+        local = pd.DatetimeIndex(present, tz="UTC").tz_convert(EXCHANGE_TZ["US"])
+        wall = local.tz_localize(None).as_unit("ns").asi8
+        days = wall // (1440 * _NS_PER_MIN)
+        _, first = np.unique(days, return_index=True)
+        minutes = (wall[first] // _NS_PER_MIN % 1440).astype(np.int64)
+        if len(minutes) > 1:
+            usual = np.bincount(minutes).argmax()
+            report.dst_shift_days = int((np.abs(minutes - usual) == 60).sum())
+
+
+def _check_daily(report: QualityReport, frame_index: pd.DatetimeIndex):
+    # Daily bars are labelled by session date in the file's own clock
+    wall = frame_index.tz_localize(None) if frame_index.tz is not None else frame_index
+    present = np.unique(wall.to_numpy().astype("datetime64[D]"))
+    calendar = get_calendar(report.market, present[0], present[-1])
+    expected = np.array(calendar.trading_days(present[0], present[-1]), dtype="datetime64[D]")
+    missing = ~np.isin(expected, present, assume_unique=True)
+    report.expected = int(len(expected))
+    report.missing = int(missing.sum())
+    report.off_session = int((calendar.ordinals(present) < 0).sum())
+    report.missing_ranges = [
+        {
+            "start": pd.Timestamp(expected[a]).tz_localize(FILE_TZ).isoformat(),
+            "end": (pd.Timestamp(expected[b]) + pd.Timedelta(days=1)).tz_localize(FILE_TZ).isoformat(),
+            "bars": b - a + 1,
+        }
+        for a, b in _runs(np.flatnonzero(missing))
+    ]
+
+
+def validate_frame(
+    frame: pd.DataFrame,
+    interval: str,
+    symbol: str = "",
+    source: str = "",
+    market: str = None,
+    sessions: Sequence[str] = ("REGULAR",)
+) -> QualityReport:
+    """
+    Quality report for raw OHLCV rows as stored (DatetimeIndex or a leading datetime column).
+    :param sessions: Session labels (utils.market_calendar.SESSION_LABELS) the source is expected to cover
+    """
+    if "datetime" in frame.columns:
+        frame = frame.set_index("datetime")
+    report = QualityReport(source, str(symbol), interval, market or market_of(symbol), rows=len(frame))
+    if frame.empty:
+        report.issues.append("no rows")
+        return report
+
+    index = _file_index(frame.index)
+    utc = (index.tz_localize(FILE_TZ) if index.tz is None else index).tz_convert("UTC")
+    _check_anomalies(report, frame, utc)
+    ordered = utc.sort_values()
+    report.first = ordered[0].tz_convert(FILE_TZ).isoformat()
+    report.last = ordered[-1].tz_convert(FILE_TZ).isoformat()
+
+    step = interval_minutes(interval)
+    if step is not None and step < 1440:
+        _check_intraday(report, utc, step, sessions)
+    elif step == 1440:
+        _check_daily(report, index)
+
+    for count, label in (
+        (report.duplicates, "duplicate timestamps"),
+        (report.unsorted, "out-of-order rows"),
+        (report.bad_prices, "missing / non-positive closes"),
+        (report.ohlc_errors, "inconsistent OHLC"),
+        (report.negative_volume, "negative volume"),
+        (report.spikes, "return spikes"),
+        (report.off_grid, "bars off the interval grid"),
+        (report.missing, "missing bars"),
+        (report.dst_shift_days, "days shifted by one hour (DST)"),
+    ):
+        if count:
+            report.issues.append(f"{count} {label}")
+    if report.tz_offset_hours:
+        report.issues.append(f"timestamps look shifted by {report.tz_offset_hours:+d}h against the {report.market} session")
+    return report
+
+
+def validate_file(path: str, interval: str = None, **kwargs) -> QualityReport:
+    """validate_frame() for a file laid out as .../{source}/{symbol}/{interval}.csv"""
+    parts = os.path.normpath(path).split(os.sep)
+    interval = interval or parts[-1][:-4]
+    kwargs.setdefault("symbol", parts[-2] if len(parts) > 1 else "")
+    kwargs.setdefault("source", parts[-3] if len(parts) > 2 else "")
+    frame = pd.read_csv(path, index_col=0)
+    return validate_frame(frame, interval, **kwargs)
+
+
+def save_report(report: QualityReport, root: str = None) -> str:
+    """Writes the report to {root}/{source}/{symbol}/{interval}.json"""
+    path = os.path.join(root or DATA_QUALITY_DIR, report.source, report.symbol, f"{report.interval}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report.to_dict(), f, indent=2)
+    return path
+
+
+def plan_refetch(report: QualityReport, pad_bars: int = 1, join_bars: int = 6,
+                 max_windows: int = None) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """
+    Fetch windows covering only the missing ranges: each range padded by pad_bars on both sides,
+    ranges closer than join_bars bars merged into one request. Windows are Asia/Seoul timestamps.
+    With max_windows, the most recent windows are kept.
+    """
+    step = interval_minutes(report.interval)
+    if step is None or not report.missing_ranges:
+        return []
+    pad = pd.Timedelta(minutes=step * pad_bars)
+    join = pd.Timedelta(minutes=step * join_bars)
+    windows: List[List[pd.Timestamp]] = []
+    for gap in report.missing_ranges:
+        start = pd.Timestamp(gap["start"]).tz_convert(FILE_TZ) - pad
+        end = pd.Timestamp(gap["end"]).tz_convert(FILE_TZ) + pad
+        if windows and start - windows[-1][1] <= join:
+            windows[-1][1] = max(windows[-1][1], end)
+        else:
+            windows.append([start, end])
+    if max_windows is not None:
+        windows = windows[-max_windows:]
+    return [(start, end) for start, end in windows]
+
+
+def merge_bars(path: str, frame: pd.DataFrame, windows: Sequence[Tuple[pd.Timestamp, pd.Timestamp]]) -> int:
+    """
+    Adds the rows of a re-fetched frame that fall inside the windows and are not stored yet.
+    Existing rows are never replaced. Returns the number of rows added.
+    """
+    if frame is None or frame.empty or not os.path.exists(path):
+        return 0
+    stored = pd.read_csv(path, index_col=0)
+    stored.index = _file_index(stored.index)
+    stored_utc = _utc_index(stored.index)
+    utc = _utc_index(frame.index)
+    inside = np.zeros(len(frame), dtype=bool)
+    for start, end in windows:
+        inside |= (utc >= start) & (utc < end)
+    new = frame[inside & ~utc.isin(stored_utc)]
+    new = new[~new.index.duplicated()]
+    if new.empty:
+        return 0
+
+    columns = [c for c in stored.columns if c in new.columns] or OHLCV_COLUMNS
+    added = new[columns].copy()
+    # New rows are written in the stored clock (naive KST for KIS, tz-aware for yfinance)
+    added_utc = _utc_index(added.index)
+    added.index = (added_utc.tz_convert(FILE_TZ).tz_localize(None) if stored.index.tz is None
+                   else added_utc.tz_convert(stored.index.tz))
+    merged = pd.concat([stored, added]).sort_index(kind="stable")
+    merged.index.name = stored.index.name or "datetime"
+    tmp = f"{path}.tmp"
+    merged.to_csv(tmp)
+    os.replace(tmp, path)
+    record_write(path)
+    return int(len(added))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Data-quality report for stored OHLCV files")
+    parser.add_argument("--source", default="kis", help="Data source (kis / yfinance)")
+    parser.add_argument("--symbols", nargs="+", required=True, help="Symbols to check")
+    parser.add_argument("--interval", default="1h", help="Interval file to check")
+    parser.add_argument("--sessions", nargs="+", default=["REGULAR"], help="Sessions the data should cover")
+    args = parser.parse_args()
+
+    for sym in args.symbols:
+        file_path = os.path.join("data", args.source, sym, f"{args.interval}.csv")
+        if not os.path.exists(file_path):
+            logger.warning(f"No data file {file_path}")
+            continue
+        result = validate_file(file_path, sessions=args.sessions)
+        print(result.summary())
+        for gap in result.missing_ranges[:20]:
+            print(f"  missing {gap['bars']:>5} bars  {gap['start']} ~ {gap['end']}")
@@ -1,9 +1,41 @@
+import os
+import re
+import shutil
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
 import pandas as pd
 
+from .catalog import record_write
+
+logger = logging.getLogger(__name__)
+
+# Map interval strings to pandas resample rules (pandas >= 2.2 aliases; "T"/"H"/"M" are deprecated/removed)
+RULE_MAP = {
+    "1m": "1min",
+    "5m": "5min",
+    "10m": "10min",
+    "15m": "15min",
+    "30m": "30min",
+    "1h": "1h",
+    "1d": "1D",
+    "1w": "1W",
+    "1mo": "1ME"
+}
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+_NS_PER_MIN = 60 * 10**9
+_NS_PER_DAY = 1440 * _NS_PER_MIN
+_INTERVAL_RE = re.compile(r"^(\d+)(m|min|h|d|w|mo)$")
+
+
 def convert_interval(df: pd.DataFrame, target_interval: str) -> pd.DataFrame:
     """
     Resamples the dataframe to the target interval.
-    
+
     :param df: Input DataFrame (must have DatetimeIndex and ohlcv columns)
     :param target_interval: Target interval string (e.g., "5m", "1h", "1d")
     :return: Resampled DataFrame
@@ -11,25 +43,8 @@ def convert_interval(df: pd.DataFrame, target_interval: str) -> pd.DataFrame:
     if df.empty:
         return df
 
-    # Map target_interval to pandas resample rule
-    # pandas rules: T=min, H=hour, D=day
-    rule_map = {
-        "1m": "1T",
-        "5m": "5T",
-        "10m": "10T",
-        "15m": "15T",
-        "30m": "30T",
-        "1h": "1H",
-        "1d": "1D",
-        "1w": "1W",
-        "1mo": "1M"
-    }
-    
-    rule = rule_map.get(target_interval, target_interval)
-    
-    # Check if we need to parse interval manually (e.g., if user passed "2h")
-    # For now, rely on map or direct pandas compatibility if simple
-    
+    rule = RULE_MAP.get(target_interval, target_interval)
+
     aggregation = {
         'open': 'first',
         'high': 'max',
@@ -37,13 +52,331 @@ def convert_interval(df: pd.DataFrame, target_interval: str) -> pd.DataFrame:
         'close': 'last',
         'volume': 'sum'
     }
-    
+
     # Resample
     resampled_df = df.resample(rule).agg(aggregation)
-    
+
     # Drop rows with NaN (if any, though time gaps might produce them, we usually want to keep or drop depending on strategy)
     # Usually for OHLCV, if no trades, we might drop or forward fill.
     # Standard practice: Drop empty bins (market closed)
     resampled_df.dropna(inplace=True)
-    
+
     return resampled_df
+
+
+def interval_minutes(interval: str) -> Optional[int]:
+    """
+    Bar length in minutes for intraday/daily intervals ("5m" -> 5, "1h" -> 60, "1d" -> 1440).
+    Returns None for calendar intervals ("1w", "1mo") whose length varies.
+    """
+    match = _INTERVAL_RE.match(interval)
+    if not match:
+        raise ValueError(f"Unsupported interval: {interval}")
+    count, unit = int(match.group(1)), match.group(2)
+    if unit in ("w", "mo"):
+        return None
+    return count * {"m": 1, "min": 1, "h": 60, "d": 1440}[unit]
+
+
+@dataclass(frozen=True)
+class SessionAnchor:
+    """
+    Trading session used to anchor bars (e.g. US regular hours 09:30-16:00 America/New_York).
+    Bars start at the session open in exchange time, the last bar is cut at the close,
+    and rows outside the session are dropped. A bar length >= the session gives one bar per session.
+    """
+    tz: str
+    open: str
+    close: str
+
+    @property
+    def open_minute(self) -> int:
+        hour, minute = self.open.split(":")
+        return int(hour) * 60 + int(minute)
+
+    @property
+    def close_minute(self) -> int:
+        hour, minute = self.close.split(":")
+        return int(hour) * 60 + int(minute)
+
+
+US_REGULAR = SessionAnchor("America/New_York", "09:30", "16:00")
+KR_REGULAR = SessionAnchor("Asia/Seoul", "09:00", "15:30")
+SESSIONS = {"us": US_REGULAR, "kr": KR_REGULAR}
+
+
+def _wall_ns(index: pd.DatetimeIndex, tz: Optional[str] = None) -> np.ndarray:
+    """Wall-clock nanoseconds (in tz if given, else in the index's own timezone)"""
+    if tz is not None:
+        index = index.tz_convert(tz)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+class _Target:
+    """Bin assignment for one target interval"""
+
+    def __init__(self, interval: str, session: Optional[SessionAnchor] = None):
+        self.interval = interval
+        self.session = session
+        self.minutes = interval_minutes(interval)
+        if self.minutes is None:
+            unit = interval[-2:] if interval.endswith("mo") else interval[-1]
+            if int(interval[:-len(unit)]) != 1:
+                raise ValueError(f"Only single-period calendar intervals are supported: {interval}")
+            self.period = "M" if unit == "mo" else "W"
+
+    def keys(self, index: pd.DatetimeIndex):
+        """
+        Monotonic bin key per row (int64) and a mask of rows to keep.
+        Keys are wall-clock ns of the bin label in the bin's own clock (see label()).
+        """
+        keep = np.ones(len(index), dtype=bool)
+        if self.session is not None:
+            wall = _wall_ns(index, self.session.tz)
+            day = wall - wall % _NS_PER_DAY
+            offset = (wall - day) // _NS_PER_MIN - self.session.open_minute
+            keep = (offset >= 0) & (offset < self.session.close_minute - self.session.open_minute)
+            if self.minutes is not None:
+                step = min(self.minutes, 1440)
+                return day + (self.session.open_minute + offset // step * step) * _NS_PER_MIN, keep
+            index = index.tz_convert(self.session.tz)
+
+        if self.minutes is None:
+            # Calendar bins labelled like pandas "W"/"ME": week-ending Sunday / month-end date
+            periods = index.tz_localize(None) if index.tz is not None else index
+            labels = periods.to_period(self.period).end_time.normalize()
+            return labels.as_unit("ns").asi8, keep
+        if self.minutes % 1440 == 0:
+            wall = _wall_ns(index)
+            step = self.minutes * _NS_PER_MIN
+            return wall - wall % step, keep
+        # Intraday bins are aligned in absolute time (no duplicate/missing wall-clock hours at DST changes)
+        ns = index.as_unit("ns").asi8
+        step = self.minutes * _NS_PER_MIN
+        return ns - ns % step, keep
+
+    def label(self, keys: np.ndarray, tz) -> pd.DatetimeIndex:
+        """Bin keys -> DatetimeIndex in the input timezone"""
+        index = pd.DatetimeIndex(keys.astype("datetime64[ns]"))
+        if self.session is not None:
+            index = index.tz_localize(self.session.tz)
+            return index.tz_convert(tz) if tz is not None else index.tz_localize(None)
+        if self.minutes is not None and self.minutes % 1440 != 0:
+            index = index.tz_localize("UTC")
+            return index.tz_convert(tz) if tz is not None else index.tz_localize(None)
+        return index.tz_localize(tz) if tz is not None else index
+
+
+class ChunkedResampler:
+    """
+    Streaming OHLCV resampler.
+    Feed time-sorted chunks with update(); each call returns the bars completed so far per target.
+    The last (possibly partial) bar of every target is carried into the next chunk, so results are
+    identical to resampling the whole series at once while only one chunk is held in memory.
+    Call finish() after the last chunk to flush the open bars.
+    """
+
+    def __init__(self, intervals: Iterable[str], session: Optional[SessionAnchor] = None):
+        self.targets = {interval: _Target(interval, session) for interval in intervals}
+        self._partial: Dict[str, Optional[dict]] = {interval: None for interval in self.targets}
+        self._tz = None
+        self._last_ns = None
+
+    def update(self, chunk: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        if chunk.empty:
+            return {interval: self._frame(interval, []) for interval in self.targets}
+        chunk = chunk.dropna(subset=OHLCV_COLUMNS[:4])
+        index = pd.DatetimeIndex(chunk.index)
+        if not index.is_monotonic_increasing:
+            raise ValueError("Chunks must be sorted by time")
+        first_ns = int(index[:1].as_unit("ns").asi8[0]) if len(index) else None
+        if self._last_ns is not None and first_ns is not None and first_ns < self._last_ns:
+            raise ValueError("Chunks must be fed in time order")
+        if len(index):
+            self._last_ns = int(index[-1:].as_unit("ns").asi8[0])
+        self._tz = index.tz
+
+        columns = {col: chunk[col].to_numpy() for col in OHLCV_COLUMNS}
+        return {interval: self._aggregate(interval, index, columns) for interval in self.targets}
+
+    def finish(self) -> Dict[str, pd.DataFrame]:
+        out = {}
+        for interval, partial in self._partial.items():
+            out[interval] = self._frame(interval, [partial] if partial is not None else [])
+            self._partial[interval] = None
+        return out
+
+    def _aggregate(self, interval: str, index: pd.DatetimeIndex, columns: dict) -> pd.DataFrame:
+        target = self.targets[interval]
+        keys, keep = target.keys(index)
+        if not keep.all():
+            keys = keys[keep]
+            columns = {col: values[keep] for col, values in columns.items()}
+        if not len(keys):
+            return self._frame(interval, [])
+
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+        bars = {
+            "key": keys[starts],
+            "open": columns["open"][starts],
+            "high": np.maximum.reduceat(columns["high"], starts),
+            "low": np.minimum.reduceat(columns["low"], starts),
+            "close": columns["close"][ends - 1],
+            "volume": np.add.reduceat(columns["volume"], starts),
+        }
+
+        # Merge the carried bar into the first bar of this chunk if it is the same bin
+        partial = self._partial[interval]
+        completed = []
+        if partial is not None:
+            if partial["key"] == bars["key"][0]:
+                bars["open"][0] = partial["open"]
+                bars["high"][0] = max(partial["high"], bars["high"][0])
+                bars["low"][0] = min(partial["low"], bars["low"][0])
+                bars["volume"][0] += partial["volume"]
+            else:
+                completed.append(partial)
+
+        last = len(bars["key"]) - 1
+        self._partial[interval] = {name: values[last] for name, values in bars.items()}
+        return self._frame(interval, completed, {name: values[:last] for name, values in bars.items()})
+
+    def _frame(self, interval: str, rows: List[dict], bars: Optional[dict] = None) -> pd.DataFrame:
+        parts = {name: [row[name] for row in rows] for name in ["key"] + OHLCV_COLUMNS}
+        if bars is not None:
+            parts = {name: np.concatenate([np.asarray(parts[name], dtype=bars[name].dtype), bars[name]])
+                     for name in parts}
+        keys = np.asarray(parts.pop("key"), dtype=np.int64)
+        index = self.targets[interval].label(keys, self._tz)
+        index.name = "datetime"
+        return pd.DataFrame(parts, index=index, columns=OHLCV_COLUMNS)
+
+
+def read_csv_chunks(path: str, chunksize: int = 200_000, tz: str = "Asia/Seoul") -> Iterator[pd.DataFrame]:
+    """
+    Reads an OHLCV CSV (data/{source}/{symbol}/{interval}.csv layout) in chunks with a DatetimeIndex.
+    Naive timestamps are assumed to be in tz (KIS data is KST), matching prepare_dataset;
+    chunk.attrs["naive"] records whether the file had naive timestamps.
+    """
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        stamps = pd.to_datetime(chunk.pop("datetime"))
+        if not isinstance(stamps.dtype, pd.DatetimeTZDtype) and stamps.dtype == object:
+            # Mixed UTC offsets (e.g. across DST changes)
+            stamps = pd.to_datetime(stamps, utc=True)
+        index = pd.DatetimeIndex(stamps)
+        naive = index.tz is None
+        if naive and tz:
+            index = index.tz_localize(tz)
+        chunk.index = index
+        chunk.index.name = "datetime"
+        chunk.attrs["naive"] = naive
+        yield chunk
+
+
+def _last_line(path: str):
+    """(byte offset of the last line, last line text) of a text file, or (None, None) if it has no data rows"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        block = min(end, 1 << 16)
+        f.seek(end - block)
+        tail = f.read(block).rstrip(b"\r\n")
+    newline = tail.rfind(b"\n")
+    if newline < 0:
+        return None, None  # header only
+    return end - block + newline + 1, tail[newline + 1:].decode()
+
+
+def _resume_point(path: str, target: "_Target", tz: str):
+    """
+    Where an incremental update of an existing resampled file restarts:
+    (offset to truncate the file at, bin key of its last bar) or None to rebuild the file.
+    The last bar may have been partial, so it is dropped and recomputed.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        header = f.readline().strip()
+    if header != ",".join(["datetime"] + OHLCV_COLUMNS):
+        return None  # other layout (e.g. indicator columns added) -> rebuild
+    offset, line = _last_line(path)
+    if not line:
+        return None
+    stamp = pd.Timestamp(line.split(",")[0])
+    if stamp.tz is None and tz:
+        stamp = stamp.tz_localize(tz)
+    keys, _ = target.keys(pd.DatetimeIndex([stamp]))
+    return offset, int(keys[0])
+
+
+def is_resumable(path: str, interval: str, session: Optional[SessionAnchor] = None, tz: str = "Asia/Seoul") -> bool:
+    """True if resample_csv(..., incremental=True) can extend path instead of rebuilding it"""
+    return _resume_point(path, _Target(interval, session), tz) is not None
+
+
+def resample_csv(
+    src_path: str,
+    targets: Dict[str, str],
+    session: Optional[SessionAnchor] = None,
+    chunksize: int = 200_000,
+    tz: str = "Asia/Seoul",
+    incremental: bool = False
+) -> Dict[str, int]:
+    """
+    Resamples a (large) OHLCV CSV into several intervals in one pass with bounded memory.
+    :param targets: {interval: destination csv path}
+    :param session: optional SessionAnchor for session-anchored bars
+    :param incremental: keep existing destination bars and only recompute from their last (possibly
+                        partial) bar onwards; otherwise destinations are overwritten
+    :return: {interval: bars written}
+    """
+    resamplers = {interval: ChunkedResampler([interval], session=session) for interval in targets}
+    tmp_paths = {interval: f"{path}.tmp" for interval, path in targets.items()}
+    written = {interval: 0 for interval in targets}
+    has_header = {interval: False for interval in targets}
+    start_keys = {}
+    naive = None
+
+    for interval, path in tmp_paths.items():
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(path):
+            os.remove(path)
+        resume = _resume_point(targets[interval], resamplers[interval].targets[interval], tz) if incremental else None
+        if resume is not None:
+            offset, start_keys[interval] = resume
+            shutil.copyfile(targets[interval], path)
+            os.truncate(path, offset)
+            has_header[interval] = True
+
+    def write(interval: str, frame: pd.DataFrame):
+        if frame.empty:
+            return
+        if naive and frame.index.tz is not None:
+            frame.index = frame.index.tz_convert(tz).tz_localize(None)
+            frame.index.name = "datetime"
+        frame.to_csv(tmp_paths[interval], mode="a" if has_header[interval] else "w", header=not has_header[interval])
+        has_header[interval] = True
+        written[interval] += len(frame)
+
+    for chunk in read_csv_chunks(src_path, chunksize=chunksize, tz=tz):
+        if naive is None:
+            # Keep the source timestamp format (naive KST stays naive KST)
+            naive = chunk.attrs.get("naive", False)
+        for interval, resampler in resamplers.items():
+            part = chunk
+            if interval in start_keys:
+                keys, _ = resampler.targets[interval].keys(pd.DatetimeIndex(chunk.index))
+                part = chunk[keys >= start_keys[interval]]
+            write(interval, resampler.update(part)[interval])
+    for interval, resampler in resamplers.items():
+        write(interval, resampler.finish()[interval])
+
+    for interval, path in targets.items():
+        if has_header[interval]:
+            os.replace(tmp_paths[interval], path)
+            record_write(path)
+            logger.info(f"Resampled {src_path} -> {path} ({written[interval]} bars)")
+    return written
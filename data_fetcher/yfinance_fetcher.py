@@ -4,6 +4,8 @@ import os
 import logging
 import asyncio
 from datetime import datetime, timedelta
+from .catalog import record_write
+from .quality import merge_bars
 
 logger = logging.getLogger(__name__)
 
@@ -55,44 +57,7 @@ class YFinanceFetcher:
                     logger.warning(f"No data found for {symbol}")
                     continue
                 
-                # Create standard dataframe structure
-                # yfinance MultiIndex columns if single ticker?
-                # If single ticker, columns are just Open, High...
-                # If updated yf, it might return MultiIndex regardless.
-                
-                if isinstance(df.columns, pd.MultiIndex):
-                     # Extract level if symbol is top level
-                     # Usually for single download it might be (Price, Ticker) or just Price
-                     # Let's check.
-                     # Recent yfinance often keeps Ticker level even for single.
-                     try:
-                         df = df.xs(symbol, axis=1, level=1)
-                     except:
-                         pass # Maybe not multiindex or different structure
-                
-                # Normalize columns
-                df.columns = [c.lower() for c in df.columns]
-                # rename "adj close" -> "adj_close" if exists
-                # If auto_adjust=True, 'close' is already adjusted? 
-                # Wait, auto_adjust=True replaces Open/High/Low/Close with adjusted values.
-                
-                # Ensure we have ohlcv
-                if 'volume' not in df.columns:
-                    df['volume'] = 0
-                
-                # Reset index to get datetime column if it's index
-                if isinstance(df.index, pd.DatetimeIndex):
-                    df.index.name = 'datetime'
-                    # Standardize Timezone to KST (Asia/Seoul) to match KIS data
-                    # YFinance usually returns UTC or America/New_York
-                    # We convert to Asia/Seoul
-                    if df.index.tz is None:
-                        # If naive, assume UTC if coming from yf with auto_adjust? 
-                        # Usually YF is timezone aware these days. 
-                        # If naive, localize to UTC first then convert.
-                        df.index = df.index.tz_localize('UTC')
-                    
-                    df.index = df.index.tz_convert('Asia/Seoul')
+                df = self._normalize(symbol, df)
                 
                 # Save
                 self._save_data(symbol, interval, df)
@@ -103,6 +68,78 @@ class YFinanceFetcher:
             except Exception as e:
                 logger.error(f"Failed to fetch {symbol} from YFinance: {e}")
 
+    def _normalize(self, symbol, df):
+        """Lower-case OHLCV columns with a DatetimeIndex in Asia/Seoul (same layout as KIS files)"""
+        # Create standard dataframe structure
+        # yfinance MultiIndex columns if single ticker?
+        # If single ticker, columns are just Open, High...
+        # If updated yf, it might return MultiIndex regardless.
+
+        if isinstance(df.columns, pd.MultiIndex):
+             # Extract level if symbol is top level
+             # Usually for single download it might be (Price, Ticker) or just Price
+             # Let's check.
+             # Recent yfinance often keeps Ticker level even for single.
+             try:
+                 df = df.xs(symbol, axis=1, level=1)
+             except:
+                 pass # Maybe not multiindex or different structure
+
+        # Normalize columns
+        df.columns = [c.lower() for c in df.columns]
+        # rename "adj close" -> "adj_close" if exists
+        # If auto_adjust=True, 'close' is already adjusted? 
+        # Wait, auto_adjust=True replaces Open/High/Low/Close with adjusted values.
+
+        # Ensure we have ohlcv
+        if 'volume' not in df.columns:
+            df['volume'] = 0
+
+        # Reset index to get datetime column if it's index
+        if isinstance(df.index, pd.DatetimeIndex):
+            df.index.name = 'datetime'
+            # Standardize Timezone to KST (Asia/Seoul) to match KIS data
+            # YFinance usually returns UTC or America/New_York
+            # We convert to Asia/Seoul
+            if df.index.tz is None:
+                # If naive, assume UTC if coming from yf with auto_adjust? 
+                # Usually YF is timezone aware these days. 
+                # If naive, localize to UTC first then convert.
+                df.index = df.index.tz_localize('UTC')
+
+            df.index = df.index.tz_convert('Asia/Seoul')
+
+        return df
+
+    async def refetch_ranges(self, symbol, interval, windows):
+        """
+        Re-downloads only the given windows [(start, end)] (from quality.plan_refetch) and merges the
+        bars that are still missing into the stored file. Existing rows are kept as they are.
+        :return: Number of bars added
+        """
+        file_path = f"data/yfinance/{symbol}/{interval}.csv"
+        added = 0
+        for start, end in windows:
+            try:
+                df = yf.download(
+                    tickers=symbol,
+                    start=start.tz_convert("UTC").tz_localize(None),
+                    end=end.tz_convert("UTC").tz_localize(None),
+                    interval=interval,
+                    auto_adjust=False,
+                    prepost=True,
+                    progress=False
+                )
+                if df.empty:
+                    logger.warning(f"No data found for {symbol} between {start} and {end}")
+                    continue
+                added += merge_bars(file_path, self._normalize(symbol, df), [(start, end)])
+                await asyncio.sleep(0.5)
+            except Exception as e:
+                logger.error(f"Failed to re-fetch {symbol} {start} ~ {end} from YFinance: {e}")
+        logger.info(f"Merged {added} re-fetched bars into {file_path}")
+        return added
+
     def _save_data(self, symbol, interval, df):
         dir_path = f"data/yfinance/{symbol}"
         os.makedirs(dir_path, exist_ok=True)
@@ -112,4 +149,5 @@ class YFinanceFetcher:
             os.remove(file_path)
             
         df.to_csv(file_path)
+        record_write(file_path)
         logger.info(f"Saved {symbol} to {file_path} ({len(df)} rows)")
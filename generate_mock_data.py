@@ -2,45 +2,60 @@ import numpy as np
 import pandas as pd
 from typing import List, Dict, Optional
 import os
+import sys
 from datetime import time
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from config.settings import TARGET_SYMBOLS
+from data_fetcher.catalog import record_write
+from utils.market_calendar import get_calendar
+
+# Source directory of generated store data (never mixed into downloaded kis / yfinance data)
+MOCK_SOURCE = "mock"
+
+# Bar length in minutes of the supported intraday intervals
+INTERVAL_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "1h": 60}
+
+# US regular session: 09:30 - 16:00 ET (390 minutes)
+SESSION_OPEN_MINUTE = 9 * 60 + 30
+SESSION_MINUTES = 390
+
+
+def session_timestamps(business_days: pd.DatetimeIndex, interval: str) -> pd.DatetimeIndex:
+    """Bar start times of every session (days x bars per day, built without a Python loop)"""
+    step = INTERVAL_MINUTES[interval]
+    periods_per_day = -(-SESSION_MINUTES // step)  # 1h: 09:30, 10:30, ... 15:30 (7 bars)
+    offsets = (SESSION_OPEN_MINUTE + step * np.arange(periods_per_day)) * np.timedelta64(1, "m")
+    days = business_days.normalize().to_numpy().astype("datetime64[ns]")
+    return pd.DatetimeIndex((days[:, None] + offsets[None, :].astype("timedelta64[ns]")).ravel())
+
+
 class MockDataGenerator:
-    def __init__(self, days: int = 252, start_price: float = 100.0, interval: str = "1d"):
+    def __init__(self, days: int = 252, start_price: float = 100.0, interval: str = "1d",
+                 start: str = "2024-01-01", seed: int = 42):
         self.days = days
         self.start_price = start_price
         self.interval = interval
-        
-        # Calculate periods per day and total periods
+        self.seed = seed
+
+        if interval != "1d" and interval not in INTERVAL_MINUTES:
+            raise ValueError(f"Unsupported interval: {interval}")
+
+        business_days = self._business_days(start, days)
         if interval == "1d":
             self.periods_per_day = 1
-            self.dates = pd.date_range(start="2024-01-01", periods=days, freq="B")
+            self.dates = business_days
         else:
-            # US Market hours: 09:30 - 16:00 (6.5 hours = 390 minutes)
-            if interval == "1h":
-                self.periods_per_day = 7 # 09:30, 10:30, ... 15:30 (approx)
-                freq = "1h"
-            elif interval == "30m":
-                self.periods_per_day = 13 # 390 / 30 = 13
-                freq = "30min"
-            elif interval == "2m":
-                self.periods_per_day = 195 # 390 / 2 = 195
-                freq = "2min"
-            else:
-                 raise ValueError(f"Unsupported interval: {interval}")
-            
-            # Generate Intraday Dates
-            business_days = pd.date_range(start="2024-01-01", periods=days, freq="B")
-            timestamps = []
-            for date in business_days:
-                # Create range for a single day
-                day_start = date.replace(hour=9, minute=30)
-                # We want exactly periods_per_day points
-                day_range = pd.date_range(start=day_start, periods=self.periods_per_day, freq=freq)
-                timestamps.extend(day_range)
-            
-            self.dates = pd.to_datetime(timestamps)
+            # Intraday bars over the US regular session
+            self.periods_per_day = -(-SESSION_MINUTES // INTERVAL_MINUTES[interval])
+            self.dates = session_timestamps(business_days, interval)
 
         self.total_periods = len(self.dates)
+        # Session number of every bar (0 .. days-1)
+        self.day_index = np.repeat(np.arange(len(business_days)), self.periods_per_day)
+
+    def _business_days(self, start: str, days: int) -> pd.DatetimeIndex:
+        return pd.date_range(start=start, periods=days, freq="B")
 
     def _generate_noise(self, volatility: float) -> np.ndarray:
         return np.random.normal(0, volatility, self.total_periods)
@@ -95,7 +110,7 @@ class MockDataGenerator:
         }
 
     def generate_scenario(self, scenario_type: str) -> pd.DataFrame:
-        np.random.seed(42) # For reproducibility
+        np.random.seed(self.seed) # For reproducibility
         
         t = np.linspace(0, 1, self.total_periods)
         close_prices = np.zeros(self.total_periods)
@@ -170,13 +185,10 @@ class MockDataGenerator:
             # 10. Event Shock
             trend = np.zeros(self.total_periods)
             shocks = [int(self.total_periods * 0.2), int(self.total_periods * 0.5), int(self.total_periods * 0.8)]
-            current_shock = 0.0
-            
-            for i in range(self.total_periods):
-                # Spread shock over a few periods for intraday smoothness if needed, but keeping it sharp for now
-                if i in shocks:
-                   current_shock += np.random.choice([-0.15, 0.15]) 
-                trend[i] = current_shock
+            # Sharp level shifts that persist after each shock
+            for i in shocks:
+                trend[i] += np.random.choice([-0.15, 0.15])
+            trend = np.cumsum(trend)
             
             volatility = 0.015 * vol_scale
             close_prices = self.start_price * (1 + trend + self._generate_noise(volatility))
@@ -197,6 +209,161 @@ class MockDataGenerator:
         
         return df
 
+class EtfTripleGenerator(MockDataGenerator):
+    """
+    Correlated original / leveraged long / inverse ETF paths for load and benchmark tests.
+    - Originals share one market factor (pairwise return correlation = market_correlation)
+    - ETFs reset their leverage every session, so volatility decay comes from the daily
+      compounding itself; the expense ratio is charged pro rata through the session
+    - Every path draws from its own seeded stream: the same seed gives the same data
+      regardless of how many or which triples are generated
+    """
+
+    def __init__(self, days: int = 252, start_price: float = 100.0, interval: str = "1m",
+                 start: str = "2024-01-02", seed: int = 42, annual_volatility: float = 0.45,
+                 annual_drift: float = 0.08, market_correlation: float = 0.6, expense_ratio: float = 0.0095):
+        super().__init__(days=days, start_price=start_price, interval=interval, start=start, seed=seed)
+        self.annual_volatility = annual_volatility
+        self.annual_drift = annual_drift
+        self.market_correlation = market_correlation
+        self.expense_ratio = expense_ratio
+        self.bar_in_day = np.tile(np.arange(self.periods_per_day), len(self.dates) // self.periods_per_day)
+        self.first_bar = self.bar_in_day == 0
+        self.last_bar = self.bar_in_day == self.periods_per_day - 1
+        self._market = self._rng(0).standard_normal(self.total_periods)
+
+    def _business_days(self, start: str, days: int) -> pd.DatetimeIndex:
+        # NYSE trading days (holidays excluded) so the data passes the calendar checks
+        end = pd.Timestamp(start) + pd.Timedelta(days=days * 2 + 14)
+        return pd.DatetimeIndex(get_calendar("US", start, end).trading_days(start, end)[:days])
+
+    def _rng(self, stream: int) -> np.random.Generator:
+        return np.random.default_rng([self.seed, stream])
+
+    def _original(self, rng: np.random.Generator, start_price: float) -> Dict[str, np.ndarray]:
+        """Underlying OHLCV: overnight gap into each session open, then per-bar GBM steps"""
+        bars_per_year = 252 * self.periods_per_day
+        sigma = self.annual_volatility / np.sqrt(bars_per_year)
+        rho = self.market_correlation
+        z = np.sqrt(rho) * self._market + np.sqrt(1 - rho) * rng.standard_normal(self.total_periods)
+        intrabar = (self.annual_drift / bars_per_year - 0.5 * sigma ** 2) + sigma * z
+        # Overnight gap on the same correlated shock (keeps the cross-symbol correlation at rho)
+        gap = np.where(self.first_bar, 0.5 * self.annual_volatility / np.sqrt(252) * z, 0.0)
+        gap[0] = 0.0
+
+        log_close = np.log(start_price) + np.cumsum(gap + intrabar)
+        close = np.exp(log_close)
+        opens = close * np.exp(-intrabar)
+        wick = np.abs(rng.standard_normal((2, self.total_periods))) * sigma * 0.5
+        high = np.maximum(opens, close) * np.exp(wick[0])
+        low = np.minimum(opens, close) * np.exp(-wick[1])
+        volume = rng.lognormal(np.log(1000000 / self.periods_per_day), 0.5, self.total_periods) * (1 + np.abs(z))
+        return {"open": opens, "high": high, "low": low, "close": close, "volume": volume.astype(np.int64)}
+
+    def _leveraged(self, base: Dict[str, np.ndarray], multiple: float, start_price: float,
+                   rng: np.random.Generator) -> Dict[str, np.ndarray]:
+        """Daily-reset leveraged ETF on the underlying (multiple < 0 for inverse ETFs)"""
+        close = base["close"]
+        day_close = close[self.last_bar]
+        reference = np.r_[base["open"][0], day_close[:-1]]  # previous session close
+        daily_fee = self.expense_ratio / 252
+        day_factor = np.maximum(1 + multiple * (day_close / reference - 1) - daily_fee, 1e-4)
+        nav_close = start_price * np.cumprod(day_factor)
+        nav_reference = np.r_[start_price, nav_close[:-1]]
+
+        ref = reference[self.day_index]
+        nav = nav_reference[self.day_index]
+        fee = daily_fee * (self.bar_in_day + 1) / self.periods_per_day
+
+        def price(underlying):
+            return nav * np.maximum(1 + multiple * (underlying / ref - 1) - fee, 1e-4)
+
+        high, low = (base["high"], base["low"]) if multiple > 0 else (base["low"], base["high"])
+        volume = base["volume"] * rng.lognormal(0, 0.3, self.total_periods)
+        return {
+            "open": price(base["open"]), "high": price(high), "low": price(low),
+            "close": price(close), "volume": volume.astype(np.int64)
+        }
+
+    def generate_triple(self, index: int, target: dict) -> Dict[str, pd.DataFrame]:
+        """
+        OHLCV frames (naive ET index) for one TARGET_SYMBOLS entry.
+        :param index: Position of the triple; selects its random streams
+        """
+        rng = self._rng(index + 1)
+        start_price = self.start_price * np.exp(rng.uniform(-1, 1))
+        base = self._original(rng, start_price)
+        legs = {target["ORIGINAL"]: base}
+        for side in ("LONG", "SHORT"):
+            multiple = float(target[f"{side}_MULTIPLE"])
+            legs[target[side]] = self._leveraged(base, multiple, rng.uniform(10, 60), rng)
+        dates = pd.Index(self.dates, name="datetime")
+        return {symbol: pd.DataFrame(columns, index=dates) for symbol, columns in legs.items()}
+
+    def write_store(self, targets: List[dict], root: str = "data", source: str = MOCK_SOURCE,
+                    force: bool = False) -> List[str]:
+        """
+        Writes every triple to {root}/{source}/{symbol}/{interval}.csv in the fetcher layout
+        (naive KST timestamps) and records the files in the data catalog.
+        Refuses to overwrite existing files (checked before anything is written) unless force is set.
+        """
+        def path_of(symbol):
+            return os.path.join(root, source, symbol, f"{self.interval}.csv")
+
+        existing = [path_of(t[side]) for t in targets for side in ("ORIGINAL", "LONG", "SHORT")
+                    if os.path.exists(path_of(t[side]))]
+        if existing and not force:
+            raise FileExistsError(
+                f"{len(existing)} data file(s) already exist (e.g. {existing[0]}); use force=True / --force to overwrite"
+            )
+
+        kst = self.dates.tz_localize("America/New_York").tz_convert("Asia/Seoul").tz_localize(None)
+        paths = []
+        for i, target in enumerate(targets):
+            for symbol, df in self.generate_triple(i, target).items():
+                df.index = pd.Index(kst, name="datetime")
+                path = path_of(symbol)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                df.to_csv(path, float_format="%.4f")
+                record_write(path)
+                paths.append(path)
+            print(f"  Generated {target['ORIGINAL']} / {target['LONG']} / {target['SHORT']} ({self.total_periods} bars each)")
+        return paths
+
+
+def synthetic_targets(count: int, long_multiple: str = "2", short_multiple: str = "-1") -> List[dict]:
+    """TARGET_SYMBOLS-style entries for made-up triples (SYN000 / SYN000L / SYN000S ...)"""
+    return [
+        {
+            "ORIGINAL": f"SYN{i:03d}",
+            "LONG": f"SYN{i:03d}L",
+            "LONG_MULTIPLE": long_multiple,
+            "SHORT": f"SYN{i:03d}S",
+            "SHORT_MULTIPLE": short_multiple
+        }
+        for i in range(count)
+    ]
+
+
+def generate_benchmark_store(targets: Optional[List[dict]] = None, synthetic: int = 0, years: float = 1.0,
+                             interval: str = "1m", root: str = "data", source: str = MOCK_SOURCE,
+                             start: str = "2024-01-02", seed: int = 42, force: bool = False) -> List[dict]:
+    """
+    Fills the local data store with benchmark data so backtests, resampling and the optimizer
+    run offline at production scale (e.g. reversal_backtest.py --source mock).
+    :param targets: TARGET_SYMBOLS-style entries (default: config TARGET_SYMBOLS)
+    :param synthetic: Number of extra SYN### triples
+    :param source: Source directory; kept apart from downloaded kis / yfinance data by default
+    :param force: Overwrite existing files
+    :return: Entries written (pass to PortfolioBacktester / optimizer as targets)
+    """
+    targets = list(TARGET_SYMBOLS if targets is None else targets) + synthetic_targets(synthetic)
+    generator = EtfTripleGenerator(days=int(round(252 * years)), interval=interval, start=start, seed=seed)
+    print(f"\nGenerating {len(targets)} ETF triples ({interval}, {generator.days} sessions) into {root}/{source}...")
+    generator.write_store(targets, root=root, source=source, force=force)
+    return targets
+
+
 def generate_all_scenarios(output_dir: str = "mock_data"):
     scenarios = [
         "steady_uptrend",
@@ -228,4 +395,34 @@ def generate_all_scenarios(output_dir: str = "mock_data"):
             print(f"  Generated {filename} ({len(df)} rows)")
 
 if __name__ == "__main__":
-    generate_all_scenarios()
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Mock scenario CSVs or benchmark data for the local data store")
+    parser.add_argument("--store", action="store_true", help="Write correlated original / long / inverse ETF triples into the data store")
+    parser.add_argument("--synthetic", type=int, default=0, help="--store: extra SYN### triples on top of the configured targets")
+    parser.add_argument("--synthetic-only", action="store_true", help="--store: skip the configured TARGET_SYMBOLS")
+    parser.add_argument("--years", type=float, default=1.0, help="--store: years of sessions to generate")
+    parser.add_argument("--interval", default="1m", help="--store: bar interval (1m, 2m, 5m, 15m, 30m, 1h, 1d)")
+    parser.add_argument("--start", default="2024-01-02", help="--store: first session date")
+    parser.add_argument("--root", default="data", help="--store: data store root")
+    parser.add_argument("--source", default=MOCK_SOURCE, help="--store: source directory under the root")
+    parser.add_argument("--force", action="store_true", help="--store: overwrite existing data files")
+    parser.add_argument("--seed", type=int, default=42, help="--store: random seed")
+    parser.add_argument("--targets-out", default=None, help="--store: write the generated targets (JSON) to this path")
+    args = parser.parse_args()
+
+    if args.store:
+        try:
+            written = generate_benchmark_store(
+                targets=[] if args.synthetic_only else None, synthetic=args.synthetic, years=args.years,
+                interval=args.interval, root=args.root, source=args.source, start=args.start, seed=args.seed,
+                force=args.force
+            )
+        except FileExistsError as e:
+            sys.exit(str(e))
+        if args.targets_out:
+            with open(args.targets_out, "w") as f:
+                json.dump(written, f, indent=2)
+    else:
+        generate_all_scenarios()
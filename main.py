@@ -1,7 +1,6 @@
 """
 메인 거래 봇 실행 파일
 """
-import time
 from datetime import datetime
 import sys
 import os
@@ -271,11 +270,9 @@ class TradingBot:
             self.force_close_all_positions
         )
         
-        # 메인 루프
+        # 메인 루프 (asyncio 스케줄러, stop 호출 시 종료)
         try:
-            while self.is_running:
-                self.scheduler.run()
-                time.sleep(1)
+            self.scheduler.run()
         except KeyboardInterrupt:
             logger.info("거래 봇 종료 요청")
             self.stop()
@@ -284,6 +281,7 @@ class TradingBot:
         """봇 종료"""
         logger.info("거래 봇 종료 중...")
         self.is_running = False
+        self.scheduler.stop()
         
         # 모든 포지션 청산
         positions = self.trader.position_manager.get_all_positions()
@@ -0,0 +1,179 @@
+"""
+통합 전환 매매 봇 (KIS API 버전)
+TARGET_SYMBOLS 의 모든 종목 쌍을 하나의 asyncio 루프에서 운용
+- KIS 클라이언트(토큰/호출 제한), 가격 캐시, 텔레그램 알림을 모든 종목이 공유
+- 종목 쌍별 상태(포지션/자본금/쿨다운)는 별도 상태 파일에 저장
+"""
+import asyncio
+from datetime import datetime
+import sys
+import os
+import pytz
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.settings import (
+    TARGET_SYMBOLS, REVERSAL_STRATEGY_PARAMS, PAPER_TRADING,
+    TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, PRICE_CACHE_TTL_SEC
+)
+from data.data_fetcher import DataFetcher
+from trading.kis_api import KisApi
+from trading.order_executor import OrderExecutor
+from trading.symbol_reversal_bot import SymbolReversalTradingBot
+from utils.logger import logger
+from utils.telegram_notifier import TelegramNotifier
+from utils.state_manager import TradeStateManager
+from utils.async_scheduler import AsyncScheduler, IntervalTrigger, Clock
+from utils.latency import register_report_job
+
+# 토큰 갱신 체크 주기 (시간)
+TOKEN_CHECK_INTERVAL_HOURS = 11
+
+
+def get_state_file(target_config: dict) -> str:
+    """종목 쌍별 상태 파일 이름"""
+    return f"bot_state_{target_config['ORIGINAL']}_{target_config['LONG']}_{target_config['SHORT']}.json"
+
+
+class MultiReversalTradingBot:
+    """여러 종목 쌍 전환 매매 통합 실행 엔진"""
+
+    def __init__(self, target_symbols: list = None, params: dict = None, is_paper_trading: bool = True, clock: Clock = None):
+        """
+        :param target_symbols: 운용할 종목 쌍 목록 (기본값: settings.TARGET_SYMBOLS)
+        :param params: 공통 전략 파라미터 (종목별로 복사하여 symbol 설정)
+        :param is_paper_trading: 모의투자 여부
+        :param clock: 스케줄러 시계 (테스트 시 ManualClock 주입)
+        """
+        self.target_symbols = target_symbols if target_symbols is not None else TARGET_SYMBOLS
+        self.timezone = pytz.timezone("Asia/Seoul")
+        self.is_running = False
+        self.scheduler = AsyncScheduler(clock=clock)
+
+        # 공유 리소스: 계정당 하나의 토큰/호출 제한기, 가격 캐시, 주문 실행기, 알림
+        self.kis = KisApi(is_paper_trading=is_paper_trading)
+        self.data_fetcher = DataFetcher(kis_client=self.kis, cache_ttl=PRICE_CACHE_TTL_SEC)
+        self.order_executor = OrderExecutor(self.kis)
+        prefix = "모의 투자" if is_paper_trading else "실 투자"
+        self.notifier = TelegramNotifier(token=TELEGRAM_BOT_TOKEN, chat_id=TELEGRAM_CHAT_ID, prefix=prefix)
+
+        base_params = params or REVERSAL_STRATEGY_PARAMS
+        self.bots = []
+        for target_config in self.target_symbols:
+            # 보유 기간/청산 허용 장 상태는 TARGET_SYMBOLS 항목의 선택 값으로 종목 쌍별 재정의
+            bot_params = base_params.copy()
+            bot_params["symbol"] = target_config["ORIGINAL"]
+            bot = SymbolReversalTradingBot(
+                target_config=target_config,
+                params=bot_params,
+                is_paper_trading=is_paper_trading,
+                kis=self.kis,
+                data_fetcher=self.data_fetcher,
+                notifier=self.notifier,
+                state_manager=TradeStateManager(get_state_file(target_config)),
+                order_executor=self.order_executor,
+                long_hold_days=target_config.get("LONG_HOLD_DAYS"),
+                short_hold_days=target_config.get("SHORT_HOLD_DAYS"),
+                exit_allowed_statuses=target_config.get("EXIT_ALLOWED_STATUSES"),
+                notify_init=False
+            )
+            self.bots.append(bot)
+
+        logger.info(f"통합 전환 매매 봇 초기화: {len(self.bots)}개 종목 쌍")
+
+        mode_str = "모의 투자" if is_paper_trading else "실전 투자"
+        pairs = "\n".join(f"• {b.original_symbol}: {b.etf_long} / {b.etf_short}" for b in self.bots)
+        self.notifier.send_message(
+            f"🚀 <b>통합 전환 매매 봇 초기화 ({mode_str})</b>\n\n"
+            f"{pairs}\n"
+            f"• 시간: {datetime.now(self.timezone).strftime('%Y-%m-%d %H:%M:%S')}"
+        )
+
+    def _active_bots(self):
+        """거래 중단(최대 손실 초과 등)되지 않은 봇 목록"""
+        return [bot for bot in self.bots if bot.is_running]
+
+    def sync_all_with_account(self):
+        """계좌 잔고를 1회만 조회하여 모든 봇 상태 동기화 (예수금은 종목 쌍 수로 균등 배분)"""
+        balance_data = self.kis.get_overseas_stock_balance()
+        if not balance_data:
+            logger.warning("계좌 정보 동기화 실패 (API 응답 없음)")
+            return
+
+        actual_balance = self.kis.get_balance()
+        per_bot_balance = actual_balance / len(self.bots) if self.bots and actual_balance > 0 else 0
+
+        for bot in self.bots:
+            try:
+                bot.sync_internal_state_with_account(balance_data=balance_data, actual_balance=per_bot_balance)
+            except Exception as e:
+                logger.error(f"[{bot.bot_name}] 계좌 동기화 실패: {e}")
+
+    async def _run_all(self, method_name: str):
+        """모든 활성 봇의 작업을 스레드에서 동시 실행 (한 종목의 오류가 다른 종목을 막지 않음)"""
+        bots = self._active_bots()
+        results = await asyncio.gather(
+            *(asyncio.to_thread(getattr(bot, method_name)) for bot in bots),
+            return_exceptions=True
+        )
+        for bot, result in zip(bots, results):
+            if isinstance(result, Exception):
+                logger.error(f"[{bot.bot_name}] {method_name} 실패: {result}")
+
+    async def run_async(self):
+        """통합 봇 실행 (asyncio 스케줄러)"""
+        logger.info(f"통합 전환 매매 봇 시작 (Targets: {[b.original_symbol for b in self.bots]})")
+
+        # 시작 시 계좌 상태 동기화
+        await asyncio.to_thread(self.sync_all_with_account)
+
+        self.is_running = True
+        for bot in self.bots:
+            bot.is_running = True
+            # 봇별 작업은 봇 단위 그룹으로 직렬화되고, 서로 다른 봇은 동시에 실행됨
+            bot.register_jobs(self.scheduler, include_token_check=False)
+
+        # 토큰 갱신 체크 (모든 봇이 같은 KIS 인스턴스를 공유하므로 1회만 등록)
+        self.scheduler.add_job(
+            self.kis.ensure_valid_token,
+            IntervalTrigger(hours=TOKEN_CHECK_INTERVAL_HOURS),
+            name="check_token_renewal"
+        )
+
+        # 단계별 지연 시간 주기 보고 (로그 + logs/latency.json, latency.prom)
+        register_report_job(self.scheduler)
+
+        # 초기 1회 실행
+        logger.info("봇 시작 시 초기 1회 전략 실행...")
+        await self._run_all("execute_trading_strategy")
+
+        await self.scheduler.run()
+
+    def run(self):
+        """통합 봇 실행"""
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            logger.info("봇 종료 요청")
+            self.stop()
+
+    def stop(self):
+        """통합 봇 종료 (모든 종목 포지션 청산)"""
+        logger.info("통합 봇 종료 중...")
+        self.is_running = False
+        self.scheduler.stop()
+        for bot in self.bots:
+            try:
+                bot.stop()
+            except Exception as e:
+                logger.error(f"[{bot.bot_name}] 종료 처리 실패: {e}")
+        self.order_executor.shutdown(wait=False)
+        # 대기 중인 청산/종료 알림 발송 후 발송 스레드 종료
+        self.notifier.close()
+        logger.info("통합 봇 종료 완료")
+
+
+if __name__ == "__main__":
+    # KIS API 사용을 위해 .env 확인 필요
+    bot = MultiReversalTradingBot(params=REVERSAL_STRATEGY_PARAMS.copy(), is_paper_trading=PAPER_TRADING)
+    bot.run()
@@ -11,16 +11,22 @@ from itertools import product
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config.settings import TARGET_SYMBOLS, REVERSAL_STRATEGY_PARAMS
+from config.settings import TARGET_SYMBOLS, REVERSAL_STRATEGY_PARAMS, RSI_PERIOD, MACD_FAST, MACD_SLOW, MACD_SIGNAL
 from reversal_backtest import ReversalBacktester
-from utils.logger import logger
+from backtester.event_log import open_event_log, EVENT_COMBO
+from backtester.metrics import trade_metrics, equity_metrics, combine_equity_curves, rank_results
+from utils.logger import logger, set_quiet
 
 def optimize_parameters(
     source="yfinance",
     start_date=None,
     end_date=None,
     test_symbols=None,
-    interval="1h"
+    interval="1h",
+    events_file=None,
+    rank_by=("total_pnl",),
+    rsi_periods=None,
+    macd_params=None
 ):
     """
     파라미터 그리드 서치를 통한 최적화
@@ -31,6 +37,10 @@ def optimize_parameters(
         end_date: 백테스트 종료일 (None이면 전체 데이터)
         test_symbols: 테스트할 심볼 리스트 (None이면 전체)
         interval: 데이터 간격
+        events_file: 구조화 거래 이벤트(JSONL) 저장 경로 (None이면 이벤트 기록 안 함)
+        rank_by: 결과 정렬 지표 (예: ("sharpe", "total_pnl"))
+        rsi_periods: 탐색할 RSI 기간 목록 (None이면 RSI_PERIOD 고정)
+        macd_params: 탐색할 MACD (fast, slow, signal) 목록 (None이면 settings 기본값 고정)
     """
     
     # 테스트할 파라미터 범위 정의
@@ -38,7 +48,13 @@ def optimize_parameters(
         "1x_stop_loss": [-0.03, -0.05, -0.08],
         "2x_stop_loss": [-0.05, -0.08, -0.10],
         "take_profit": [0.10, 0.15, 0.20, 0.25, 0.30, 0.35],
+        # 지표 파라미터: 전체 변형을 심볼별로 한 번에 계산(행렬, 디스크 캐시)하고 조합마다 열만 선택
+        "rsi_period": list(rsi_periods) if rsi_periods else [RSI_PERIOD],
+        "macd": [tuple(p) for p in macd_params] if macd_params else [(MACD_FAST, MACD_SLOW, MACD_SIGNAL)],
     }
+    indicator_grid = None
+    if len(param_grid["rsi_period"]) > 1 or len(param_grid["macd"]) > 1:
+        indicator_grid = {"rsi_periods": param_grid["rsi_period"], "macd": param_grid["macd"]}
     
     # 테스트할 심볼 선택 (전체는 시간이 오래 걸리므로 샘플링)
     if test_symbols is None:
@@ -53,13 +69,13 @@ def optimize_parameters(
     
     # 날짜 범위 설정
     if start_date is None or end_date is None:
-        from backtester.engine import prepare_dataset
+        from backtester.engine import dataset_info
         try:
-            sample_data = prepare_dataset(test_symbols[0]["ORIGINAL"], interval, source=source)
+            info = dataset_info(test_symbols[0]["ORIGINAL"], interval, source=source)
             if start_date is None:
-                start_date = sample_data.index.min().strftime("%Y-%m-%d")
+                start_date = info["start"].strftime("%Y-%m-%d")
             if end_date is None:
-                end_date = sample_data.index.max().strftime("%Y-%m-%d")
+                end_date = info["end"].strftime("%Y-%m-%d")
         except Exception as e:
             logger.error(f"Could not read date range: {e}")
             return
@@ -74,29 +90,37 @@ def optimize_parameters(
     param_combinations = list(product(
         param_grid["1x_stop_loss"],
         param_grid["2x_stop_loss"],
-        param_grid["take_profit"]
+        param_grid["take_profit"],
+        param_grid["rsi_period"],
+        param_grid["macd"]
     ))
     
     logger.info(f"Total combinations to test: {len(param_combinations)}")
     
+    # 구조화 이벤트 로그 (analyze_optimization_log.py 로 분석, 경로가 주어졌을 때만 기록)
+    event_log = open_event_log(events_file)
+    if event_log:
+        logger.info(f"Trade events: {events_file}")
+    
     results = []
     
     # 각 파라미터 조합에 대해 백테스트 실행
-    for idx, (stop_1x, stop_2x, take_profit) in enumerate(param_combinations, 1):
+    for idx, (stop_1x, stop_2x, take_profit, rsi_period, macd) in enumerate(param_combinations, 1):
         logger.info(f"\n{'='*70}")
         logger.info(f"Testing combination {idx}/{len(param_combinations)}")
-        logger.info(f"1X Stop Loss: {stop_1x:.1%}, 2X Stop Loss: {stop_2x:.1%}, Take Profit: {take_profit:.1%}")
+        logger.info(f"1X Stop Loss: {stop_1x:.1%}, 2X Stop Loss: {stop_2x:.1%}, Take Profit: {take_profit:.1%}, RSI: {rsi_period}, MACD: {macd}")
         logger.info(f"{'='*70}")
         
-        total_pnl = 0
-        total_trades = 0
-        total_fee = 0
+        if event_log:
+            event_log.set_context(combo=idx)
+            event_log.emit(EVENT_COMBO, params={
+                "1x_stop_loss": stop_1x, "2x_stop_loss": stop_2x, "take_profit": take_profit,
+                "rsi_period": rsi_period, "macd": list(macd)
+            })
         
-        # 상세 통계용 변수
-        stats = {
-            "LONG": {"count": 0, "wins": 0, "losses": 0, "pnl": 0, "win_pnl": 0, "loss_pnl": 0, "stop_loss": 0, "take_profit": 0, "force_close_win": 0, "force_close_loss": 0},
-            "SHORT": {"count": 0, "wins": 0, "losses": 0, "pnl": 0, "win_pnl": 0, "loss_pnl": 0, "stop_loss": 0, "take_profit": 0, "force_close_win": 0, "force_close_loss": 0}
-        }
+        total_pnl = 0
+        all_trades = []
+        equity_curves = []
         
         # 각 심볼에 대해 백테스트
         for target_item in test_symbols:
@@ -114,9 +138,13 @@ def optimize_parameters(
             params["2x_stop_loss_rate"] = stop_2x
             params["take_profit_rate"] = take_profit
             params["reverse_trigger"] = False
+            params["rsi_period"] = rsi_period
+            params["macd"] = macd
+            if indicator_grid:
+                params["indicator_grid"] = indicator_grid
             
             try:
-                backtester = ReversalBacktester(params=params, source=source)
+                backtester = ReversalBacktester(params=params, source=source, event_log=event_log)
                 
                 result = backtester.run_backtest(
                     original_symbol=original_symbol,
@@ -130,33 +158,9 @@ def optimize_parameters(
                 )
                 
                 if result:
-                    trades = result.get('trades', [])
                     total_pnl += result.get('total_pnl', 0)
-                    total_trades += len(trades)
-                    total_fee += result.get('total_fee', 0)
-                    
-                    for t in trades:
-                        side = t['side'] # 'LONG' or 'SHORT'
-                        pnl = t['pnl']
-                        reason = t['reason']
-                        
-                        stats[side]["count"] += 1
-                        stats[side]["pnl"] += pnl
-                        
-                        if pnl > 0:
-                            stats[side]["wins"] += 1
-                            stats[side]["win_pnl"] += pnl
-                            if reason == "TAKE_PROFIT":
-                                stats[side]["take_profit"] += 1
-                            elif reason == "FORCE_CLOSE_TRADING_DAY_LIMIT":
-                                stats[side]["force_close_win"] += 1
-                        else:
-                            stats[side]["losses"] += 1
-                            stats[side]["loss_pnl"] += pnl
-                            if reason == "STOP_LOSS":
-                                stats[side]["stop_loss"] += 1
-                            elif reason == "FORCE_CLOSE_TRADING_DAY_LIMIT":
-                                stats[side]["force_close_loss"] += 1
+                    all_trades.extend(result.get('trades', []))
+                    equity_curves.append(result.get('equity_curve', []))
                                 
             except Exception as e:
                 logger.error(f"Error testing {original_symbol}: {e}")
@@ -164,60 +168,65 @@ def optimize_parameters(
                 logger.error(traceback.format_exc())
                 continue
         
-        # 결과 계산
-        total_wins = stats["LONG"]["wins"] + stats["SHORT"]["wins"]
-        win_rate = (total_wins / total_trades * 100) if total_trades > 0 else 0
+        # 결과 계산 (심볼별 거래/자본 곡선을 합쳐 벡터 연산)
+        m = trade_metrics(all_trades)
+        combined = combine_equity_curves(equity_curves)
+        m.update(equity_metrics(combined.values, combined.times_ns))
+        total_trades = m["trades"]
+        total_fee = m["total_fee"]
+        win_rate = m["win_rate"]
         avg_pnl = total_pnl / len(test_symbols) if test_symbols else 0
         
-        long_win_rate = (stats["LONG"]["wins"] / stats["LONG"]["count"]) if stats["LONG"]["count"] > 0 else 0
-        short_win_rate = (stats["SHORT"]["wins"] / stats["SHORT"]["count"]) if stats["SHORT"]["count"] > 0 else 0
-        
-        avg_long_win = (stats["LONG"]["win_pnl"] / stats["LONG"]["wins"]) if stats["LONG"]["wins"] > 0 else 0
-        avg_long_loss = (stats["LONG"]["loss_pnl"] / stats["LONG"]["losses"]) if stats["LONG"]["losses"] > 0 else 0
-        avg_short_win = (stats["SHORT"]["win_pnl"] / stats["SHORT"]["wins"]) if stats["SHORT"]["wins"] > 0 else 0
-        avg_short_loss = (stats["SHORT"]["loss_pnl"] / stats["SHORT"]["losses"]) if stats["SHORT"]["losses"] > 0 else 0
-        
         res_entry = {
             "1x_stop_loss": stop_1x,
             "2x_stop_loss": stop_2x,
             "take_profit": take_profit,
+            "rsi_period": rsi_period,
+            "macd": "/".join(str(v) for v in macd),
             "total_pnl": total_pnl,
             "avg_pnl": avg_pnl,
             "win_rate": win_rate,
             "total_trades": int(total_trades),
             "total_fee": total_fee,
+            "sharpe": m["sharpe"],
+            "sortino": m["sortino"],
+            "max_drawdown_pct": m["max_drawdown_pct"],
+            "profit_factor": m["profit_factor"],
             
-            "long_trades": int(stats["LONG"]["count"]),
-            "long_win_rate": long_win_rate * 100,
-            "long_avg_profit": avg_long_win,
-            "long_avg_loss": avg_long_loss,
-            "long_stop_loss": int(stats["LONG"]["stop_loss"]),
-            "long_fc_loss": int(stats["LONG"]["force_close_loss"]),
-            "long_take_profit": int(stats["LONG"]["take_profit"]),
-            "long_fc_win": int(stats["LONG"]["force_close_win"]),
+            "long_trades": m["long_trades"],
+            "long_win_rate": m["long_win_rate"],
+            "long_avg_profit": m["long_avg_profit"],
+            "long_avg_loss": m["long_avg_loss"],
+            "long_stop_loss": m["long_stop_loss_loss"],
+            "long_fc_loss": m["long_force_close_loss"],
+            "long_take_profit": m["long_take_profit_win"],
+            "long_fc_win": m["long_force_close_win"],
             
-            "short_trades": int(stats["SHORT"]["count"]),
-            "short_win_rate": short_win_rate * 100,
-            "short_avg_profit": avg_short_win,
-            "short_avg_loss": avg_short_loss,
-            "short_stop_loss": int(stats["SHORT"]["stop_loss"]),
-            "short_fc_loss": int(stats["SHORT"]["force_close_loss"]),
-            "short_take_profit": int(stats["SHORT"]["take_profit"]),
-            "short_fc_win": int(stats["SHORT"]["force_close_win"]),
+            "short_trades": m["short_trades"],
+            "short_win_rate": m["short_win_rate"],
+            "short_avg_profit": m["short_avg_profit"],
+            "short_avg_loss": m["short_avg_loss"],
+            "short_stop_loss": m["short_stop_loss_loss"],
+            "short_fc_loss": m["short_force_close_loss"],
+            "short_take_profit": m["short_take_profit_win"],
+            "short_fc_win": m["short_force_close_win"],
         }
         results.append(res_entry)
         
-        logger.info(f"Result: PnL=${total_pnl:.2f}, Win={win_rate/100:.1%} ({total_wins}/{total_trades}), Fee=${total_fee:.2f}")
-        logger.info(f" LONG: Trades={stats['LONG']['count']}, Win={long_win_rate:.1%}, AvgP=${avg_long_win:.2f}, AvgL=${avg_long_loss:.2f}")
-        logger.info(f"       Exit L: SL={stats['LONG']['stop_loss']}, FC_L={stats['LONG']['force_close_loss']} | Exit P: TP={stats['LONG']['take_profit']}, FC_P={stats['LONG']['force_close_win']}")
-        logger.info(f" SHORT: Trades={stats['SHORT']['count']}, Win={short_win_rate:.1%}, AvgP=${avg_short_win:.2f}, AvgL=${avg_short_loss:.2f}")
-        logger.info(f"       Exit L: SL={stats['SHORT']['stop_loss']}, FC_L={stats['SHORT']['force_close_loss']} | Exit P: TP={stats['SHORT']['take_profit']}, FC_P={stats['SHORT']['force_close_win']}")
+        logger.info(f"Result: PnL=${total_pnl:.2f}, Win={win_rate/100:.1%} ({m['wins']}/{total_trades}), Fee=${total_fee:.2f}, Sharpe={m['sharpe']:.2f}, MDD={m['max_drawdown_pct']:.2f}%")
+        logger.info(f" LONG: Trades={m['long_trades']}, Win={m['long_win_rate']/100:.1%}, AvgP=${m['long_avg_profit']:.2f}, AvgL=${m['long_avg_loss']:.2f}")
+        logger.info(f"       Exit L: SL={m['long_stop_loss_loss']}, FC_L={m['long_force_close_loss']} | Exit P: TP={m['long_take_profit_win']}, FC_P={m['long_force_close_win']}")
+        logger.info(f" SHORT: Trades={m['short_trades']}, Win={m['short_win_rate']/100:.1%}, AvgP=${m['short_avg_profit']:.2f}, AvgL=${m['short_avg_loss']:.2f}")
+        logger.info(f"       Exit L: SL={m['short_stop_loss_loss']}, FC_L={m['short_force_close_loss']} | Exit P: TP={m['short_take_profit_win']}, FC_P={m['short_force_close_win']}")
+    
+    if event_log:
+        event_log.close()
     
     # 결과를 DataFrame으로 변환
     df_results = pd.DataFrame(results)
     
-    # 결과 정렬 (총 수익 기준)
-    df_results = df_results.sort_values("total_pnl", ascending=False)
+    # 결과 정렬 (기본: 총 수익 기준)
+    df_results = rank_results(df_results, by=rank_by)
     
     # 결과 저장
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -233,8 +242,8 @@ def optimize_parameters(
     print("="*160)
     # 필요한 컬럼만 선택해서 출력
     display_cols = [
-        "1x_stop_loss", "2x_stop_loss", "take_profit", "total_pnl", "win_rate", "total_trades", "total_fee",
-        "long_win_rate", "short_win_rate", "long_avg_profit", "long_avg_loss", "short_avg_profit", "short_avg_loss"
+        "1x_stop_loss", "2x_stop_loss", "take_profit", "rsi_period", "macd", "total_pnl", "win_rate", "total_trades", "total_fee",
+        "sharpe", "sortino", "max_drawdown_pct", "long_win_rate", "short_win_rate", "long_avg_profit", "long_avg_loss", "short_avg_profit", "short_avg_loss"
     ]
     print(df_results[display_cols].head(50).to_string(index=False))
     
@@ -244,7 +253,9 @@ def optimize_parameters(
     print("BEST PARAMETERS")
     print("="*100)
     print(f"1X Stop Loss/2X/TP: {best['1x_stop_loss']:.1%}/{best['2x_stop_loss']:.1%}/{best['take_profit']:.1%}")
+    print(f"RSI / MACD:         {int(best['rsi_period'])} / {best['macd']}")
     print(f"Total PnL/Fee:      ${best['total_pnl']:.2f} / ${best['total_fee']:.2f}")
+    print(f"Sharpe/Sortino/MDD: {best['sharpe']:.2f} / {best['sortino']:.2f} / {best['max_drawdown_pct']:.2f}%")
     print(f"Win Rate (T/L/S):   {best['win_rate']:.1f}% / {best['long_win_rate']:.1f}% / {best['short_win_rate']:.1f}%")
     print(f"Total Trades (L/S): {int(best['total_trades'])} ({int(best['long_trades'])}/{int(best['short_trades'])})")
     print(f"Long Avg P/L:       ${best['long_avg_profit']:.2f} / ${best['long_avg_loss']:.2f}")
@@ -265,16 +276,28 @@ if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="Optimize trading strategy parameters")
-    parser.add_argument("--source", type=str, choices=["kis", "yfinance"], default="yfinance", help="Data source")
+    parser.add_argument("--source", type=str, choices=["kis", "yfinance", "mock"], default="yfinance", help="Data source")
     parser.add_argument("--start-date", type=str, default=None, help="Start date (YYYY-MM-DD)")
     parser.add_argument("--end-date", type=str, default=None, help="End date (YYYY-MM-DD)")
     parser.add_argument("--symbols", nargs="+", default=None, help="Symbols to test (default: TSLA, GOOGL, AAPL)")
+    parser.add_argument("--quiet", action="store_true", help="Drop per-bar/per-trade backtest log output")
+    parser.add_argument("--events", type=str, default=None, help="Write structured trade events (JSONL) to this path (default: off)")
+    parser.add_argument("--rank-by", nargs="+", default=["total_pnl"], help="Ranking metrics, first has priority (e.g. sharpe total_pnl)")
+    parser.add_argument("--rsi-periods", nargs="+", type=int, default=None, help="RSI periods to sweep (e.g. 3 5 7 14)")
+    parser.add_argument("--macd", nargs="+", default=None, help="MACD fast/slow/signal triples to sweep (e.g. 12/26/9 8/21/5)")
     
     args = parser.parse_args()
     
+    if args.quiet:
+        set_quiet(True)
+    
     results = optimize_parameters(
         source=args.source,
         start_date=args.start_date,
         end_date=args.end_date,
-        test_symbols=args.symbols
+        test_symbols=args.symbols,
+        events_file=args.events,
+        rank_by=args.rank_by,
+        rsi_periods=args.rsi_periods,
+        macd_params=[tuple(int(v) for v in m.split("/")) for m in args.macd] if args.macd else None
     )
@@ -4,20 +4,34 @@ Reverse/Flip Trading Strategy 백테스트 실행
 """
 import sys
 import os
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-import pandas as pd
+import numpy as np
 import argparse
+import logging
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config.settings import TARGET_SYMBOLS, get_etf_by_original, REVERSAL_STRATEGY_PARAMS
+from config.settings import (
+    TARGET_SYMBOLS, get_etf_by_original, REVERSAL_STRATEGY_PARAMS,
+    PORTFOLIO_MAX_POSITIONS, PORTFOLIO_POSITION_BUDGET_PCT, LOG_DIR
+)
 from data.data_fetcher import DataFetcher
-from backtester.engine import prepare_dataset
+from backtester.engine import dataset_info, prepare_dataset
+from backtester.event_log import TradeEventLog, open_event_log, merge_event_logs, EVENT_START, EVENT_ENTRY, EVENT_EXIT, EVENT_EQUITY
+from backtester.metrics import compute_metrics
+from backtester.ledger import EquityCurve, TradeLedger
+from backtester.alignment import align_asof, build_index, exact_positions
 from strategy.reversal_strategy import ReversalStrategy
 from strategy.signal_generator import SignalType
-from utils.logger import logger
+from utils.logger import logger, set_quiet, console_to, disable_file_logging
+from utils.market_calendar import get_calendar, is_us_dst, session_mask
 import pytz
-import pandas_market_calendars as mcal
+
+# 봉/거래 단위 출력 전용 로거 (--quiet 시 폐기)
+bar_logger = logger.getChild("backtest")
 
 import warnings
 warnings.filterwarnings(
@@ -25,15 +39,38 @@ warnings.filterwarnings(
     message=".*break_start.*break_end.*"
 )
 
+def print_risk_metrics(m: dict):
+    """위험/성과 지표 출력"""
+    print(f"\n📉 위험/성과 지표")
+    print(f"  Sharpe:        {m['sharpe']:>12.2f}")
+    print(f"  Sortino:       {m['sortino']:>12.2f}")
+    print(f"  최대 낙폭:     {m['max_drawdown_pct']:>11.2f}% (${m['max_drawdown_amount']:,.2f})")
+    print(f"  노출도:        {m['exposure_pct']:>11.2f}%")
+    print(f"  회전율:        {m['turnover']:>12.2f}x")
+    print(f"  Profit Factor: {m['profit_factor']:>12.2f}")
+
+
 class ReversalBacktester:
     """전환 매매 전략 백테스트 클래스"""
     
-    def __init__(self, params: dict = None, source: str = "kis"):
+    def __init__(self, params: dict = None, source: str = "kis", event_log: TradeEventLog = None):
         # self.data_fetcher = DataFetcher() # Deprecated
         self.strategy = ReversalStrategy(params=params)
         self.source = source
+        # 구조화 이벤트 로그 (진입/청산/자본 스냅샷, 없으면 기록 안 함)
+        self.event_log = event_log
+        self.symbol = None
         self.trades = []
-        self.equity_curve = []
+        # 봉 단위 자본 / 거래 기록은 배열 기반 (필요 시 to_frame())
+        self.equity_curve = EquityCurve()
+        self.strategy.trade_history = TradeLedger()
+        self.metrics = None
+        # 시간축 정렬 데이터 (load_data 에서 설정)
+        self.common_index = None
+        self._sessions = None             # 봉별 장 구분 (Categorical, common_index 와 같은 길이)
+        self._tradable = None             # 봉별 진입 가능 여부 (정규장 마스크)
+        self.position_value = 0.0
+        self.mark_price = None
         self.fee_rate = 0.0025  # 거래 수수료율 (예: 0.25%)
         # Timezone 설정
         self.timezone = pytz.timezone("Asia/Seoul")
@@ -51,96 +88,28 @@ class ReversalBacktester:
 
     def build_trading_calendar(self, start_dt, end_dt, market: str):
         """
-        거래일 캘린더를 1회 생성
+        거래일 캘린더 설정 (공용 캐시에서 구간만 잘라 사용)
         """
-        if market == "US":
-            cal = mcal.get_calendar("NYSE")
-        elif market == "KR":
-            cal = mcal.get_calendar("XKRX")
-        else:
-            raise ValueError(f"Unsupported market: {market}")
-
-        schedule = cal.schedule(
-            start_date=start_dt.date(),
-            end_date=end_dt.date()
-        )
-
-        self.trading_days = list(schedule.index.date)
+        calendar = get_calendar(market, start_dt, end_dt)
+        self.trading_days = calendar.trading_days(start_dt, end_dt)
         self.trading_day_index = {
             d: i for i, d in enumerate(self.trading_days)
         }
+        return calendar
 
     def _is_dst(self, dt: datetime) -> bool:
         """
         주어진 날짜(dt)가 미국 DST(서머타임) 적용 기간인지 확인.
-        dt는 timezone-aware(Asia/Seoul 등) 또는 native datetime일 수 있음.
-        기준은 US/Eastern 시간으로 변환하여 확인.
+        dt는 timezone-aware(Asia/Seoul 등) 또는 native datetime일 수 있음 (naive는 한국 시간으로 간주).
         """
-        eastern = pytz.timezone('US/Eastern')
-        
-        # dt가 timezone 정보가 없다면, 한국 시간으로 가정하고 localize
-        if dt.tzinfo is None:
-            dt = self.timezone.localize(dt)
-            
-        # US/Eastern으로 변환
-        dt_eastern = dt.astimezone(eastern)
-        return bool(dt_eastern.dst())
+        return is_us_dst(dt)
 
     def _get_market_status(self, dt: datetime) -> str:
         """
-        주어진 시간(dt)의 시장 상태 반환.
-        dt는 timezone-aware여야 하며, 이를 Korea Standard Time(KST)으로 변환하여
-        00:00~24:00 기준 분(minute)을 계산해 상태를 판별한다.
+        주어진 시간(dt)의 시장 상태 반환 (KST 기준 분 + 서머타임 여부로 조회).
+        봉 단위 반복에서는 load_data 에서 미리 계산한 self._sessions / self._tradable 을 사용.
         """
-        if dt.tzinfo is None:
-            # naive라면 KST localizing (가정)
-            dt = self.timezone.localize(dt)
-        
-        # KST로 변환
-        dt_kr = dt.astimezone(self.timezone)
-        
-        current_time = dt_kr.time()
-        curr_min = current_time.hour * 60 + current_time.minute
-        
-        if self.market == "KR":
-             # KR Market: 09:00 ~ 15:30
-             # Pre: 08:30 ~ 09:00
-             # Post: 15:30 ~ 18:00 (TimeWatch 등)
-             if 540 <= curr_min < 930: return "REGULAR" # 09:00 ~ 15:30
-             if 510 <= curr_min < 540: return "PREMARKET" # 08:30 ~ 09:00
-             if 930 <= curr_min < 1080: return "AFTERMARKET" # 15:30 ~ 18:00
-             return "CLOSED"
-        else:
-            # US Market
-            is_dst = self._is_dst(dt)
-            
-            if is_dst: # Summer Time (US DST Active)
-                # Daytime: 10:00 ~ 17:00 (Visual check, usually market open 09:30 ET => 22:30 KST)
-                # 09:30 ET = 22:30 KST = 1350 min
-                if 600 <= curr_min < 1020: return "DAYTIME"
-                # Premarket: 17:00 ~ 22:30
-                if 1020 <= curr_min < 1350: return "PREMARKET"
-                # Regular: 22:30 ~ 05:00 (Next day)
-                # 22:30 = 1350, 24:00 = 1440. 05:00 = 300.
-                if 1350 <= curr_min or curr_min < 300: return "REGULAR"
-                # Aftermarket: 05:00 ~ 07:00
-                if 300 <= curr_min < 420: return "AFTERMARKET"
-                # Extended: 07:00 ~ 09:00
-                if 420 <= curr_min < 540: return "EXTENDED"
-            else: # Winter Time (US DST Inactive)
-                # Daytime: 10:00 ~ 18:00
-                if 600 <= curr_min < 1080: return "DAYTIME"
-                # Premarket: 18:00 ~ 23:30
-                if 1080 <= curr_min < 1410: return "PREMARKET"
-                # Regular: 23:30 ~ 06:00 (Next day)
-                # 23:30 = 1410. 06:00 = 360.
-                if 1410 <= curr_min or curr_min < 360: return "REGULAR"
-                # Aftermarket: 06:00 ~ 07:00
-                if 360 <= curr_min < 420: return "AFTERMARKET"
-                # Extended: 07:00 ~ 09:00
-                if 420 <= curr_min < 540: return "EXTENDED"
-                
-        return "CLOSED"
+        return get_calendar(self.market).session_of(dt)
     
     def run_backtest(
         self,
@@ -171,273 +140,308 @@ class ReversalBacktester:
         print(f"초기 자본: ${self.strategy.initial_capital:.2f}")
         print(f"{'='*70}\n")
         
+        if not self.load_data(original_symbol, etf_long, etf_long_multiple, etf_short, etf_short_multiple,
+                              start_date, end_date, interval):
+            return None
+
+        self.equity_curve.reserve(len(self.common_index))
+
+        # 백테스트 실행
+        for i in range(50, len(self.common_index)):
+            if not self.step(i):
+                continue
+            current_time = self.common_index[i]
+
+            # 자본 추적
+            estimated_capital = self.strategy.capital + self.position_value
+            self.equity_curve.append(current_time, estimated_capital)
+            if self.event_log and self.event_log.equity_snapshots:
+                self.event_log.emit(EVENT_EQUITY, symbol=original_symbol, time=current_time, equity=estimated_capital)
+
+            # Max Drawdown Check
+            if self.strategy.check_max_drawdown(self.mark_price):
+                logger.warning("⛔ Max Drawdown Limit Reached! Stopping Backtest at %s", current_time)
+                break
+        
+        # 마지막 포지션 청산
+        if self.finish():
+            # 마지막 청산 결과를 자본 곡선에 반영
+            self.equity_curve.append(self.common_index[-1], self.strategy.capital)
+        
+        # 성과 지표 (자본 곡선 + 거래 배열)
+        self.metrics = compute_metrics(self.equity_curve, self.strategy.trade_history, self.strategy.initial_capital)
+
+        # 결과 출력
+        self._print_results()
+        
+        return {
+            'trades': self.strategy.trade_history,
+            'reversals': self.strategy.reversal_history,
+            'equity_curve': self.equity_curve,
+            'final_capital': self.strategy.capital,
+            'total_pnl': self.strategy.capital - self.strategy.initial_capital,
+            'total_fee': self.metrics['total_fee'],
+            'metrics': self.metrics
+        }
+
+    def load_data(
+        self,
+        original_symbol: str,
+        etf_long: str,
+        etf_long_multiple: str,
+        etf_short: str,
+        etf_short_multiple: str,
+        start_date: str,
+        end_date: str,
+        interval: str = "1h"
+    ) -> bool:
+        """
+        데이터 로드 및 공통 시간축 정렬
+        - 봉마다 DataFrame 을 자르지 않도록 원본 길이 / ETF 종가 / 지표를 시간축 기준 배열로 미리 계산
+        """
         # 데이터 수집 (로컬 CSV 로드)
         print(f"데이터 로딩 중 (Local CSV from {self.source})...")
         try:
-            # prepare_dataset loads data and applies indicators if needed
-            original_data = prepare_dataset(original_symbol, interval, source=self.source)
-            etf_long_data = prepare_dataset(etf_long, interval, source=self.source)
-            etf_short_data = prepare_dataset(etf_short, interval, source=self.source)
+            # prepare_dataset reads only the start_date..end_date window and the requested columns.
+            # Signals come from precompute_indicators, so no dataset RSI/MACD (and no warm-up rows) here.
+            original_data = prepare_dataset(original_symbol, interval, source=self.source, start=start_date, end=end_date,
+                                            columns=["open", "high", "low", "close", "volume"])
+            etf_long_data = prepare_dataset(etf_long, interval, source=self.source, start=start_date, end=end_date,
+                                            columns=["close"])
+            etf_short_data = prepare_dataset(etf_short, interval, source=self.source, start=start_date, end=end_date,
+                                             columns=["close"])
 
         except Exception as e:
             print(f"❌ 데이터 로딩 실패: {e}")
-            return None
-        
-        # 날짜 필터링
-        original_data.index = pd.to_datetime(original_data.index)
-        etf_long_data.index = pd.to_datetime(etf_long_data.index)
-        etf_short_data.index = pd.to_datetime(etf_short_data.index)
-        
-        mask_original = (original_data.index >= start_date) & (original_data.index <= end_date)
-        mask_long = (etf_long_data.index >= start_date) & (etf_long_data.index <= end_date)
-        mask_short = (etf_short_data.index >= start_date) & (etf_short_data.index <= end_date)
-        
-        original_data = original_data.loc[mask_original].copy()
-        etf_long_data = etf_long_data.loc[mask_long].copy()
-        etf_short_data = etf_short_data.loc[mask_short].copy()
+            return False
         
         if original_data.empty or etf_long_data.empty or etf_short_data.empty:
             print("❌ 지정된 기간에 데이터가 없습니다")
-            return None
+            return False
         
         print(f"✅ 데이터 수집 완료: 원본 {len(original_data)}개, 롱 {len(etf_long_data)}개, 숏 {len(etf_short_data)}개\n")
         
-        # 공통 인덱스
-        common_index = original_data.index.intersection(etf_long_data.index).intersection(etf_short_data.index)
-        common_index = common_index.sort_values()
+        # 공통 인덱스 + as-of 정렬 (종목별 searchsorted 1회)
+        aligned = align_asof(
+            {"original": original_data, "long": etf_long_data, "short": etf_short_data},
+            how="intersection"
+        )
+        self.common_index = aligned.index
+        if len(self.common_index) == 0:
+            print("❌ 공통 시간대 데이터가 없습니다")
+            return False
+
+        self.symbol = original_symbol
+        self.etf_long = etf_long
+        self.etf_long_multiple = etf_long_multiple
+        self.etf_short = etf_short
+        self.etf_short_multiple = etf_short_multiple
+
+        # 봉별 원본 데이터 길이 / ETF as-of 종가 (루프는 정수 위치로만 조회)
+        self._original_len = aligned.counts("original")
+        self._long_close = aligned["long", "close"]
+        self._short_close = aligned["short", "close"]
+        # 신호 지표는 전체 구간을 한 번에 계산 (과거 값만 쓰는 지표이므로 봉별 계산과 동일, 디스크 캐시)
+        self._indicators = self.strategy.signal_generator.precompute_indicators(
+            original_data, cache_key=(self.source, original_symbol, interval)
+        )
+
+        if self.event_log:
+            self.event_log.emit(EVENT_START, symbol=original_symbol, capital=self.strategy.initial_capital)
         
         # Market Detection
         self.market = "KR" if original_symbol.isdigit() and len(original_symbol) == 6 else "US"
 
-        # 거래일 캘린더 생성 (1회)
-        self.build_trading_calendar(
-            start_dt=common_index[0],
-            end_dt=common_index[-1],
+        # 거래일 캘린더 (공용 캐시) + 봉별 장 구분 (전체 시간축을 한 번에 분류)
+        calendar = self.build_trading_calendar(
+            start_dt=self.common_index[0],
+            end_dt=self.common_index[-1],
             market=self.market
         )
+        self._sessions = calendar.session_labels(self.common_index)
+        # 주간거래는 제외 (데이터가 보통 미국장 기준일 것임. KIS API 로직 따름)
+        self._tradable = session_mask(self._sessions, allowed=("REGULAR",))
+        return True
+
+    def step(self, i: int) -> bool:
+        """
+        공통 시간축 i 번째 봉 처리 (신호 → 진입 → 손절/익절/강제청산)
+        처리 후 self.position_value(포지션 평가액), self.mark_price(보유 ETF 현재가) 갱신
+        Returns: 봉을 처리했으면 True (데이터 부족 시 False)
+        """
+        current_time = self.common_index[i]
+        original_len = self._original_len[i]
+
+        if original_len < 50:
+            return False
         
-        # 백테스트 실행
-        for i in range(50, len(common_index)):
-            current_time = common_index[i]
-            
-            # 원본 주식 데이터 (신호 생성용)
-            original_mask = original_data.index <= current_time
-            original_current_data = original_data.loc[original_mask]
-
-            # LONG/SHORT ETF 데이터
-            etf_long_mask = etf_long_data.index <= current_time
-            etf_short_mask = etf_short_data.index <= current_time
-            etf_long_current_data = etf_long_data.loc[etf_long_mask]
-            etf_short_current_data = etf_short_data.loc[etf_short_mask]
-            
-            if len(original_current_data) < 50:
-                continue
-            
-            # ETF 가격 조회
-            try:
-                etf_long_price = etf_long_data.loc[etf_long_data.index <= current_time, 'close'].iloc[-1]
-                etf_short_price = etf_short_data.loc[etf_short_data.index <= current_time, 'close'].iloc[-1]
-            except (IndexError, KeyError):
-                continue
-            
-            # 신호 생성
-            #print(f"📈 신호 생성 시도 [{current_time.strftime('%Y-%m-%d %H:%M')}] ")
-            signal_data = self.strategy.signal_generator.generate_signal(
-                original_current_data,
-                self.strategy.current_position
+        # ETF 가격 조회
+        etf_long_price = self._long_close[i]
+        etf_short_price = self._short_close[i]
+        
+        # 신호 생성
+        signal_data = self.strategy.signal_generator.generate_signal_at(
+            self._indicators,
+            original_len,
+            self.strategy.current_position
+        )
+        
+        # 시장 시간 체크
+        is_tradable = self._tradable[i]
+        
+        # 디버깅용 출력 (초반)
+        if i < 60 and bar_logger.isEnabledFor(logging.DEBUG):
+             bar_logger.debug("DEBUG: %s Status=%s Tradable=%s DST=%s", current_time, self._sessions[i], is_tradable, self._is_dst(current_time))
+        
+        signal = signal_data['signal']
+        confidence = signal_data['confidence']
+        
+        # 포지션이 없는 경우 진입 (거래 가능 시간에만)
+        #if not self.strategy.current_position and is_tradable:
+        if (
+            not self.strategy.current_position
+            and is_tradable
+            and (
+                self.cooldown_until_date is None
+                or current_time.date() >= self.cooldown_until_date
             )
+        ):
+            if signal == SignalType.BUY and confidence > 0.5:
+                quantity = self.strategy.calculate_position_size(etf_long_price, is_reversal=False)
+                if quantity > 0:
+                    trade_amount = etf_long_price * quantity
+                    fee = trade_amount * self.fee_rate
+                    self.strategy.capital -= (trade_amount + fee)
+                    
+                    self.strategy.current_position = "LONG"
+                    self.strategy.current_etf_symbol = self.etf_long
+                    self.strategy.entry_price = etf_long_price
+                    self.strategy.entry_time = current_time
+                    self.strategy.entry_quantity = quantity
+                    
+                    bar_logger.info("📈 [%s] %s -> %s 롱 진입 @ $%.2f x %.2f (수수료: $%.2f)", current_time.strftime('%Y-%m-%d %H:%M'), self.symbol, self.etf_long, etf_long_price, quantity, fee)
+                    self._emit_entry(current_time, "LONG", self.etf_long, etf_long_price, quantity, fee)
+
+                    # === 강제청산 날짜 계산 (LONG) ===
+                    entry_date = current_time.date()
+                    idx = self.trading_day_index.get(entry_date)
+
+                    if idx is not None:
+                        max_hold_days_long = 5
+                        close_idx = idx + max_hold_days_long
+                        if close_idx < len(self.trading_days):
+                            self.forced_close_date = self.trading_days[close_idx]
+                        else:
+                            self.forced_close_date = self.trading_days[-1]
             
-            # 시장 시간 체크
-            market_status = self._get_market_status(current_time)
-            #is_tradable = market_status in ["PREMARKET", "REGULAR"] # 주간거래는 제외(데이터가 보통 미국장 기준일 것임. KIS API 로직 따름)
-            is_tradable = market_status in ["REGULAR"] # 주간거래는 제외(데이터가 보통 미국장 기준일 것임. KIS API 로직 따름)
-            
-            # 디버깅용 출력 (초반)
-            if i < 60:
-                 print(f"DEBUG: {current_time} Status={market_status} Tradable={is_tradable} DST={self._is_dst(current_time)}")
-            
-            signal = signal_data['signal']
-            confidence = signal_data['confidence']
-            
-            # 포지션이 없는 경우 진입 (거래 가능 시간에만)
-            #if not self.strategy.current_position and is_tradable:
-            if (
-                not self.strategy.current_position
-                and is_tradable
-                and (
-                    self.cooldown_until_date is None
-                    or current_time.date() >= self.cooldown_until_date
-                )
-            ):
-                if signal == SignalType.BUY and confidence > 0.5:
-                    quantity = self.strategy.calculate_position_size(etf_long_price, is_reversal=False)
-                    if quantity > 0:
-                        trade_amount = etf_long_price * quantity
-                        fee = trade_amount * self.fee_rate
-                        self.strategy.capital -= (trade_amount + fee)
-                        
-                        self.strategy.current_position = "LONG"
-                        self.strategy.current_etf_symbol = etf_long
-                        self.strategy.entry_price = etf_long_price
-                        self.strategy.entry_time = current_time
-                        self.strategy.entry_quantity = quantity
-                        
-                        print(f"📈 [{current_time.strftime('%Y-%m-%d %H:%M')}] {original_symbol} -> {etf_long} 롱 진입 @ ${etf_long_price:.2f} x {quantity:.2f} (수수료: ${fee:.2f})")
-
-                        # === 강제청산 날짜 계산 (LONG) ===
-                        entry_date = current_time.date()
-                        idx = self.trading_day_index.get(entry_date)
-
-                        if idx is not None:
-                            max_hold_days_long = 5
-                            close_idx = idx + max_hold_days_long
-                            if close_idx < len(self.trading_days):
-                                self.forced_close_date = self.trading_days[close_idx]
-                            else:
-                                self.forced_close_date = self.trading_days[-1]
-                
-                elif signal == SignalType.SELL and confidence > 0.5:
-                    quantity = self.strategy.calculate_position_size(etf_short_price, is_reversal=False)
-                    if quantity > 0:
-                        trade_amount = etf_short_price * quantity
-                        fee = trade_amount * self.fee_rate
-                        self.strategy.capital -= (trade_amount + fee)
-                        
-                        self.strategy.current_position = "SHORT"
-                        self.strategy.current_etf_symbol = etf_short
-                        self.strategy.entry_price = etf_short_price
-                        self.strategy.entry_time = current_time
-                        self.strategy.entry_quantity = quantity
-                        
-                        print(f"📉 [{current_time.strftime('%Y-%m-%d %H:%M')}] {original_symbol} -> {etf_short} 숏 진입 @ ${etf_short_price:.2f} x {quantity:.2f} (수수료: ${fee:.2f})")
-
-                        # === 강제청산 날짜 계산 (SHORT) ===
-                        entry_date = current_time.date()
-                        idx = self.trading_day_index.get(entry_date)
-
-                        if idx is not None:
-                            max_hold_days_short = 1
-                            close_idx = idx + max_hold_days_short
-                            if close_idx < len(self.trading_days):
-                                self.forced_close_date = self.trading_days[close_idx]
-                            else:
-                                self.forced_close_date = self.trading_days[-1]
+            elif signal == SignalType.SELL and confidence > 0.5:
+                quantity = self.strategy.calculate_position_size(etf_short_price, is_reversal=False)
+                if quantity > 0:
+                    trade_amount = etf_short_price * quantity
+                    fee = trade_amount * self.fee_rate
+                    self.strategy.capital -= (trade_amount + fee)
+                    
+                    self.strategy.current_position = "SHORT"
+                    self.strategy.current_etf_symbol = self.etf_short
+                    self.strategy.entry_price = etf_short_price
+                    self.strategy.entry_time = current_time
+                    self.strategy.entry_quantity = quantity
+                    
+                    bar_logger.info("📉 [%s] %s -> %s 숏 진입 @ $%.2f x %.2f (수수료: $%.2f)", current_time.strftime('%Y-%m-%d %H:%M'), self.symbol, self.etf_short, etf_short_price, quantity, fee)
+                    self._emit_entry(current_time, "SHORT", self.etf_short, etf_short_price, quantity, fee)
+
+                    # === 강제청산 날짜 계산 (SHORT) ===
+                    entry_date = current_time.date()
+                    idx = self.trading_day_index.get(entry_date)
+
+                    if idx is not None:
+                        max_hold_days_short = 1
+                        close_idx = idx + max_hold_days_short
+                        if close_idx < len(self.trading_days):
+                            self.forced_close_date = self.trading_days[close_idx]
+                        else:
+                            self.forced_close_date = self.trading_days[-1]
+        
+        # 포지션 모니터링
+        if self.strategy.current_position:
+            current_etf_price = etf_long_price if self.strategy.current_position == "LONG" else etf_short_price
+            current_etf_multiple = self.etf_long_multiple if self.strategy.current_position == "LONG" else self.etf_short_multiple
+            # 손절/익절 확인
+            exit_reason = self.strategy.check_stop_loss_take_profit2(current_etf_price, current_etf_multiple)
             
-            # 포지션 모니터링
-            if self.strategy.current_position:
-                current_etf_price = etf_long_price if self.strategy.current_position == "LONG" else etf_short_price
-                current_etf_multiple = etf_long_multiple if self.strategy.current_position == "LONG" else etf_short_multiple
-                # 손절/익절 확인
-                exit_reason = self.strategy.check_stop_loss_take_profit2(current_etf_price, current_etf_multiple)
-                
-                if exit_reason:
-                    # 손절/익절인 경우 무조건 청산 (전환 안함)
-                    #if exit_reason == "STOP_LOSS":
-                    #    self._close_position(current_time, current_etf_price, exit_reason)
-                    if exit_reason == "STOP_LOSS":
-                        self._close_position(current_time, current_etf_price, exit_reason)
-
-                        # === STOP_LOSS 쿨다운 설정 (4 거래일) ===
-                        stop_date = current_time.date()
-                        idx = self.trading_day_index.get(stop_date)
-
-                        if idx is not None:
-                            cooldown_days = 4
-                            cooldown_idx = idx + cooldown_days
-                            if cooldown_idx < len(self.trading_days):
-                                self.cooldown_until_date = self.trading_days[cooldown_idx]
-                            else:
-                                self.cooldown_until_date = self.trading_days[-1]
-
-                        print(f"⛔ STOP_LOSS 쿨다운 시작 → {self.cooldown_until_date}")
-                    elif exit_reason == "TAKE_PROFIT":
-                        # 익절인 경우 청산
-                        self._close_position(current_time, current_etf_price, exit_reason)
-                    else:
-                        # 기타 사유 청산
-                        print(f"기타 사유 청산 → {exit_reason}")
-                        self._close_position(current_time, current_etf_price, exit_reason)
-
-                # === 거래일 기준 강제청산 ===
-                if self.strategy.current_position and self.forced_close_date:
-                    # 손익 판단 (강제청산 직전 기준)
-                    is_loss = current_etf_price < self.strategy.entry_price
-                    if current_time.date() >= self.forced_close_date:
-                        self._close_position(
-                            current_time,
-                            current_etf_price,
-                            "FORCE_CLOSE_TRADING_DAY_LIMIT"
-                        )
-                        # === FORCE_CLOSE 손실 시 쿨다운 1 거래일 ===
-                        #if is_loss:
-                        #    force_close_date = current_time.date()
-                        #    idx = self.trading_day_index.get(force_close_date)
-
-                        #    if idx is not None:
-                        #        cooldown_days = 1
-                        #        cooldown_idx = idx + cooldown_days
-                        #        if cooldown_idx < len(self.trading_days):
-                        #            self.cooldown_until_date = self.trading_days[cooldown_idx]
-                        #        else:
-                        #            self.cooldown_until_date = self.trading_days[-1]
-
-                        #    print(f"⚠️ FORCE_CLOSE 손실 → 쿨다운 1일 적용 ({self.cooldown_until_date})")
-
-            # 자본 추적
-            if self.strategy.current_position and self.strategy.entry_price:
-                if self.strategy.current_position == "LONG":
-                    current_etf_price = etf_long_price
+            if exit_reason:
+                # 손절/익절인 경우 무조건 청산 (전환 안함)
+                if exit_reason == "STOP_LOSS":
+                    self._close_position(current_time, current_etf_price, exit_reason)
+
+                    # === STOP_LOSS 쿨다운 설정 (4 거래일) ===
+                    stop_date = current_time.date()
+                    idx = self.trading_day_index.get(stop_date)
+
+                    if idx is not None:
+                        cooldown_days = 4
+                        cooldown_idx = idx + cooldown_days
+                        if cooldown_idx < len(self.trading_days):
+                            self.cooldown_until_date = self.trading_days[cooldown_idx]
+                        else:
+                            self.cooldown_until_date = self.trading_days[-1]
+
+                    bar_logger.info("⛔ STOP_LOSS 쿨다운 시작 → %s", self.cooldown_until_date)
+                elif exit_reason == "TAKE_PROFIT":
+                    # 익절인 경우 청산
+                    self._close_position(current_time, current_etf_price, exit_reason)
                 else:
-                    current_etf_price = etf_short_price
-
-                pnl_pct = ((current_etf_price - self.strategy.entry_price) / self.strategy.entry_price) * 100
-                
-                pnl = self.strategy.entry_quantity * self.strategy.entry_price * (pnl_pct / 100)
-                estimated_capital = self.strategy.capital + self.strategy.entry_quantity * self.strategy.entry_price + pnl
+                    # 기타 사유 청산
+                    bar_logger.info("기타 사유 청산 → %s", exit_reason)
+                    self._close_position(current_time, current_etf_price, exit_reason)
+
+            # === 거래일 기준 강제청산 ===
+            if self.strategy.current_position and self.forced_close_date:
+                if current_time.date() >= self.forced_close_date:
+                    self._close_position(
+                        current_time,
+                        current_etf_price,
+                        "FORCE_CLOSE_TRADING_DAY_LIMIT"
+                    )
+
+        # 포지션 평가
+        if self.strategy.current_position and self.strategy.entry_price:
+            if self.strategy.current_position == "LONG":
+                current_etf_price = etf_long_price
             else:
-                estimated_capital = self.strategy.capital
-            
-            self.equity_curve.append({
-                'time': current_time,
-                'capital': estimated_capital
-            })
+                current_etf_price = etf_short_price
 
-            # Max Drawdown Check
-            current_close_price = None
-            if self.strategy.current_position:
-                 if self.strategy.current_position == "LONG":
-                     current_close_price = etf_long_price
-                 else:
-                     current_close_price = etf_short_price
-
-            if self.strategy.check_max_drawdown(current_close_price):
-                print(f"⛔ Max Drawdown Limit Reached! Stopping Backtest at {current_time}")
-                break
-        
-        # 마지막 포지션 청산
-        if self.strategy.current_position:
-            final_time = common_index[-1]
-            try:
-                if self.strategy.current_position == "LONG":
-                    final_price = etf_long_data.loc[etf_long_data.index <= final_time, 'close'].iloc[-1]
-                else:
-                    final_price = etf_short_data.loc[etf_short_data.index <= final_time, 'close'].iloc[-1]
-                
-                self._close_position(final_time, final_price, "FINAL_CLOSE")
-            except (IndexError, KeyError):
-                pass
-        
-        # 결과 출력
-        self._print_results()
-        
-        return {
-            'trades': self.strategy.trade_history,
-            'reversals': self.strategy.reversal_history,
-            'equity_curve': self.equity_curve,
-            'final_capital': self.strategy.capital,
-            'total_pnl': self.strategy.capital - self.strategy.initial_capital,
-            'total_fee': sum(t.get('fee', 0) for t in self.strategy.trade_history)
-        }
+            pnl_pct = ((current_etf_price - self.strategy.entry_price) / self.strategy.entry_price) * 100
+            
+            pnl = self.strategy.entry_quantity * self.strategy.entry_price * (pnl_pct / 100)
+            self.position_value = self.strategy.entry_quantity * self.strategy.entry_price + pnl
+            self.mark_price = current_etf_price
+        else:
+            self.position_value = 0.0
+            self.mark_price = None
+        return True
+
+    def finish(self) -> bool:
+        """마지막 봉 가격으로 남은 포지션 청산 (청산했으면 True)"""
+        if not self.strategy.current_position:
+            return False
+        final_time = self.common_index[-1]
+        if self.strategy.current_position == "LONG":
+            final_price = self._long_close[-1]
+        else:
+            final_price = self._short_close[-1]
+        self._close_position(final_time, final_price, "FINAL_CLOSE")
+        self.position_value = 0.0
+        self.mark_price = None
+        return True
+
+    def _emit_entry(self, entry_time, side: str, etf: str, price: float, quantity: float, fee: float):
+        """진입 이벤트 기록 (진입 수수료만큼 실현 자본 감소)"""
+        if self.event_log:
+            self.event_log.emit(
+                EVENT_ENTRY, symbol=self.symbol, time=entry_time, side=side, etf=etf, price=price,
+                quantity=quantity, fee=fee, delta=-fee, capital=self.strategy.capital
+            )
 
     def _close_position(self, exit_time, exit_price: float, reason: str):
         """포지션 청산"""
@@ -452,22 +456,23 @@ class ReversalBacktester:
         pnl = self.strategy.entry_quantity * self.strategy.entry_price * (pnl_pct / 100)
         self.strategy.capital += self.strategy.entry_quantity * self.strategy.entry_price + pnl - fee
         
-        trade_record = {
-            'entry_time': self.strategy.entry_time,
-            'exit_time': exit_time,
-            'symbol': self.strategy.current_etf_symbol,
-            'side': self.strategy.current_position,
-            'entry_price': self.strategy.entry_price,
-            'exit_price': exit_price,
-            'quantity': self.strategy.entry_quantity,
-            'pnl': pnl - fee,
-            'pnl_pct': pnl_pct,
-            'fee': fee,
-            'reason': reason
-        }
-        self.strategy.trade_history.append(trade_record)
+        self.strategy.trade_history.record(
+            self.strategy.entry_time, exit_time, self.strategy.current_etf_symbol, self.strategy.current_position,
+            self.strategy.entry_price, exit_price, self.strategy.entry_quantity, pnl - fee, pnl_pct, fee, reason
+        )
+        if self.event_log:
+            self.event_log.emit(
+                EVENT_EXIT, symbol=self.symbol, time=exit_time, side=self.strategy.current_position,
+                etf=self.strategy.current_etf_symbol, entry_price=self.strategy.entry_price, price=exit_price,
+                quantity=self.strategy.entry_quantity, fee=fee, pnl=pnl - fee, pnl_pct=pnl_pct,
+                delta=pnl - fee, capital=self.strategy.capital, reason=reason
+            )
         
-        print(f"🔒 [{exit_time.strftime('%Y-%m-%d %H:%M')}] {self.strategy.current_etf_symbol} {self.strategy.current_position} 청산 @ ${self.strategy.entry_price:.2f} ${exit_price:.2f} (손익: {pnl_pct:.2f}%, 수수료: ${fee:.2f}) - {reason}")
+        bar_logger.info(
+            "🔒 [%s] %s %s 청산 @ $%.2f $%.2f (손익: %.2f%%, 수수료: $%.2f) - %s",
+            exit_time.strftime('%Y-%m-%d %H:%M'), self.strategy.current_etf_symbol, self.strategy.current_position,
+            self.strategy.entry_price, exit_price, pnl_pct, fee, reason
+        )
         
         # 포지션 초기화
         self.strategy.current_position = None
@@ -489,15 +494,14 @@ class ReversalBacktester:
         print("📊 전환 매매 전략 백테스트 결과")
         print(f"{'='*70}\n")
         
-        total_trades = len(self.strategy.trade_history)
+        m = self.metrics or compute_metrics(self.equity_curve, self.strategy.trade_history, self.strategy.initial_capital)
+        total_trades = m['trades']
         total_reversals = len(self.strategy.reversal_history)
-        winning_trades = [t for t in self.strategy.trade_history if t['pnl'] > 0]
-        losing_trades = [t for t in self.strategy.trade_history if t['pnl'] < 0]
         
-        total_pnl = sum(t['pnl'] for t in self.strategy.trade_history)
+        total_pnl = m['pnl']
         total_pnl_pct = (total_pnl / self.strategy.initial_capital) * 100
         
-        win_rate = (len(winning_trades) / total_trades * 100)
+        win_rate = m['win_rate']
         
         print(f"💰 자본 변화")
         print(f"  초기 자본:     ${self.strategy.initial_capital:>12,.2f}")
@@ -508,16 +512,16 @@ class ReversalBacktester:
         print(f"\n📈 거래 통계")
         print(f"  총 거래 횟수:  {total_trades:>12}회")
         print(f"  전환 매매 횟수: {total_reversals:>12}회")
-        print(f"  승리 거래:     {len(winning_trades):>12}회 ({win_rate:>6.2f}%)")
-        print(f"  손실 거래:     {len(losing_trades):>12}회 ({100-win_rate:>6.2f}%)")
+        print(f"  승리 거래:     {m['wins']:>12}회 ({win_rate:>6.2f}%)")
+        print(f"  손실 거래:     {m['losses']:>12}회 ({100-win_rate:>6.2f}%)")
         
-        if winning_trades:
-            avg_win = sum(t['pnl'] for t in winning_trades) / len(winning_trades)
-            print(f"  평균 수익:     ${avg_win:>12,.2f}")
+        if m['wins']:
+            print(f"  평균 수익:     ${m['avg_profit']:>12,.2f}")
         
-        if losing_trades:
-            avg_loss = sum(t['pnl'] for t in losing_trades) / len(losing_trades)
-            print(f"  평균 손실:     ${avg_loss:>12,.2f}")
+        if m['losses']:
+            print(f"  평균 손실:     ${m['avg_loss']:>12,.2f}")
+
+        print_risk_metrics(m)
         
         print(f"\n{'='*70}\n")
 
@@ -539,15 +543,390 @@ class ReversalBacktester:
         
         print(f"\n{'='*70}\n")
 
+class PortfolioBacktester:
+    """
+    공유 자본 포트폴리오 백테스트
+    - 모든 심볼(원본 + ETF)을 하나의 시간축에 정렬하여 동시에 시뮬레이션
+    - 각 심볼 전략은 ReversalBacktester.step 을 그대로 사용하고, 현금은 공유 풀에서 차감/환급
+    - 위험 한도: 동시 보유 심볼 수, 1회 진입 예산(포트폴리오 평가액 대비 비율), 포트폴리오 최대 낙폭
+    """
+
+    def __init__(
+        self,
+        targets: list,
+        params: dict = None,
+        source: str = "kis",
+        capital: float = None,
+        max_positions: int = PORTFOLIO_MAX_POSITIONS,
+        position_budget_pct: float = PORTFOLIO_POSITION_BUDGET_PCT,
+        event_log: TradeEventLog = None
+    ):
+        """
+        :param targets: TARGET_SYMBOLS 형식의 심볼 목록
+        :param params: 심볼 공통 전략 파라미터
+        :param capital: 공유 자본 (기본: 심볼별 자본 x 심볼 수)
+        :param max_positions: 동시 보유 최대 심볼 수 (0 이면 제한 없음)
+        :param position_budget_pct: 1회 진입 예산 비율 (0 이면 1/심볼 수)
+        """
+        self.targets = targets
+        self.params = params if params is not None else REVERSAL_STRATEGY_PARAMS.copy()
+        self.source = source
+        self.event_log = event_log
+        self.initial_capital = capital if capital else self.params.get("capital", 2000) * len(targets)
+        self.cash = self.initial_capital
+        self.max_positions = max_positions or 0
+        self.position_budget_pct = position_budget_pct or (1.0 / max(len(targets), 1))
+        self.max_drawdown = self.params.get("max_drawdown", 0.05)
+        self.legs = []
+        self.position_value = 0.0   # 보유 포지션 평가액 합계
+        self.open_positions = 0     # 보유 중인 심볼 수
+        self.equity_curve = EquityCurve()
+        self.metrics = None
+
+    def _build_legs(self, start_date: str, end_date: str, interval: str):
+        for target_item in self.targets:
+            params = self.params.copy()
+            params["symbol"] = target_item["ORIGINAL"]
+            leg = ReversalBacktester(params=params, source=self.source, event_log=self.event_log)
+            ok = leg.load_data(
+                target_item["ORIGINAL"], target_item["LONG"], target_item["LONG_MULTIPLE"],
+                target_item["SHORT"], target_item["SHORT_MULTIPLE"], start_date, end_date, interval
+            )
+            if ok:
+                self.legs.append(leg)
+            else:
+                logger.warning("포트폴리오 제외 (데이터 없음): %s", target_item["ORIGINAL"])
+
+    def run(self, start_date: str, end_date: str, interval: str = "1h"):
+        """포트폴리오 백테스트 실행"""
+        print(f"\n{'='*70}")
+        print(f"포트폴리오 백테스트 시작: {len(self.targets)}개 심볼, 공유 자본 ${self.initial_capital:,.2f}")
+        print(f"기간: {start_date} ~ {end_date}")
+        print(f"{'='*70}\n")
+
+        self._build_legs(start_date, end_date, interval)
+        if not self.legs:
+            print("❌ 실행 가능한 심볼이 없습니다")
+            return None
+
+        # 마스터 시간축 + 심볼별 위치 행렬 (없는 봉은 -1)
+        master = build_index((leg.common_index for leg in self.legs), how="union")
+        positions = np.vstack([exact_positions(leg.common_index, master) for leg in self.legs])
+        # 봉마다 처리할 심볼 목록 (각 심볼의 워밍업 50봉 이후)
+        active = positions >= 50
+        self.equity_curve.reserve(len(master) + 1)
+
+        for t in np.flatnonzero(active.any(axis=0)):
+            current_time = master[t]
+            for k in np.flatnonzero(active[:, t]):
+                self._step_leg(self.legs[k], int(positions[k, t]))
+
+            equity = self.cash + self.position_value
+            self.equity_curve.append(current_time, equity)
+            if self.event_log and self.event_log.equity_snapshots:
+                self.event_log.emit(EVENT_EQUITY, symbol="PORTFOLIO", time=current_time, equity=equity)
+
+            drawdown = (self.initial_capital - equity) / self.initial_capital
+            if drawdown >= self.max_drawdown:
+                logger.warning("⛔ Portfolio Max Drawdown Limit Reached (%.2f%%)! Stopping at %s", drawdown * 100, current_time)
+                break
+
+        # 남은 포지션 청산
+        closed = False
+        for leg in self.legs:
+            before = leg.strategy.capital
+            if leg.finish():
+                self.cash += leg.strategy.capital - before
+                closed = True
+        self.position_value = 0.0
+        self.open_positions = 0
+        if closed:
+            self.equity_curve.append(max(leg.common_index[-1] for leg in self.legs), self.cash)
+
+        trades = TradeLedger.merge([leg.strategy.trade_history for leg in self.legs])
+        self.metrics = compute_metrics(self.equity_curve, trades, self.initial_capital)
+        self._print_results()
+
+        return {
+            'trades': trades,
+            'equity_curve': self.equity_curve,
+            'final_capital': self.cash,
+            'total_pnl': self.cash - self.initial_capital,
+            'total_fee': self.metrics['total_fee'],
+            'metrics': self.metrics,
+            'symbols': {leg.symbol: leg.strategy.trade_history for leg in self.legs}
+        }
+
+    def _step_leg(self, leg: "ReversalBacktester", i: int):
+        """공유 현금으로 심볼 1봉 처리 (진입 가능 금액 = 위험 한도 내 예산)"""
+        was_open = bool(leg.strategy.current_position)
+        if was_open:
+            budget = self.cash
+        elif self.max_positions and self.open_positions >= self.max_positions:
+            budget = 0.0  # 최소 거래 금액 미만 -> 진입 불가
+        else:
+            equity = self.cash + self.position_value
+            budget = max(min(self.cash, equity * self.position_budget_pct), 0.0)
+        previous_value = leg.position_value
+        leg.strategy.capital = budget
+        leg.step(i)
+        self.cash += leg.strategy.capital - budget
+        # 보유 수 / 평가액 합계는 변화분만 반영 (심볼 수와 무관하게 O(1))
+        self.position_value += leg.position_value - previous_value
+        self.open_positions += bool(leg.strategy.current_position) - was_open
+
+    def _print_results(self):
+        """포트폴리오 결과 출력"""
+        m = self.metrics
+        print(f"\n{'='*70}")
+        print("📊 포트폴리오 백테스트 결과")
+        print(f"{'='*70}\n")
+        total_pnl = self.cash - self.initial_capital
+        pnl_sign = "+" if total_pnl >= 0 else ""
+        print(f"💰 자본 변화")
+        print(f"  초기 자본:     ${self.initial_capital:>12,.2f}")
+        print(f"  최종 자본:     ${self.cash:>12,.2f}")
+        print(f"  총 손익:       {pnl_sign}${total_pnl:>11,.2f} ({pnl_sign}{total_pnl / self.initial_capital * 100:>6.2f}%)")
+        print(f"\n📈 거래 통계")
+        print(f"  총 거래 횟수:  {m['trades']:>12}회")
+        print(f"  승률:          {m['win_rate']:>11.2f}%")
+        print(f"  총 수수료:     ${m['total_fee']:>12,.2f}")
+        print_risk_metrics(m)
+        print(f"\n📋 심볼별 손익")
+        for leg in self.legs:
+            pnl = float(leg.strategy.trade_history.rows['pnl'].sum())
+            print(f"  {leg.symbol:<8} 거래 {len(leg.strategy.trade_history):>4}회 | 손익 ${pnl:>10,.2f}")
+        print(f"\n{'='*70}\n")
+
+
+def write_symbol_result(f, index: int, total: int, target_item: dict, results):
+    """심볼 1개 결과를 결과 파일에 기록"""
+    original_symbol = target_item["ORIGINAL"]
+    etf_long = target_item["LONG"]
+    etf_long_multiple = target_item["LONG_MULTIPLE"]
+    etf_short = target_item["SHORT"]
+    etf_short_multiple = target_item["SHORT_MULTIPLE"]
+
+    f.write(f"[{index+1}/{total}] {original_symbol} 결과\n")
+    f.write(f"LONG: {etf_long} ({etf_long_multiple}) / SHORT: {etf_short} ({etf_short_multiple})\n")
+
+    if results:
+        trades = results['trades']
+        # 전체 통계
+        win_rate = 0
+        winning_trades = [t for t in trades if t['pnl'] > 0]
+        if trades:
+            win_rate = (len(winning_trades) / len(trades) * 100)
+
+        f.write(f"총 거래: {len(trades)}회\n")
+        f.write(f"전환 매매: {len(results['reversals'])}회\n")
+        f.write(f"승률: {win_rate:.2f}% ({len(winning_trades)}/{len(trades)})\n")
+        f.write(f"최종 자본: ${results['final_capital']:,.2f}\n")
+        f.write(f"총 손익: ${results['total_pnl']:,.2f}\n")
+        f.write(f"총 수수료: ${results['total_fee']:,.2f}\n")
+        m = results['metrics']
+        f.write(f"Sharpe: {m['sharpe']:.2f} / Sortino: {m['sortino']:.2f} / 최대 낙폭: {m['max_drawdown_pct']:.2f}%\n")
+        f.write(f"노출도: {m['exposure_pct']:.2f}% / 회전율: {m['turnover']:.2f}x\n")
+
+        # LONG/SHORT 상세 통계
+        long_trades = [t for t in trades if t['side'] == 'LONG']
+        short_trades = [t for t in trades if t['side'] == 'SHORT']
+
+        def calculate_stats(trade_list):
+            if not trade_list:
+                return "거래 없음", 0, 0, 0, None, None
+
+            wins = [t for t in trade_list if t['pnl'] > 0]
+            win_rate = (len(wins) / len(trade_list) * 100)
+
+            max_profit_trade = max(trade_list, key=lambda x: x['pnl'])
+            max_loss_trade = min(trade_list, key=lambda x: x['pnl'])
+
+            max_profit = max_profit_trade['pnl']
+            max_loss = max_loss_trade['pnl']
+
+            return f"{win_rate:.2f}% ({len(wins)}/{len(trade_list)})", len(trade_list), max_profit, max_loss, max_profit_trade, max_loss_trade
+
+        long_win_rate, long_count, long_max_profit, long_max_loss, long_max_trade, long_min_trade = calculate_stats(long_trades)
+        short_win_rate, short_count, short_max_profit, short_max_loss, short_max_trade, short_min_trade = calculate_stats(short_trades)
+
+        f.write(f"\n[LONG ETF: {etf_long}]\n")
+        f.write(f"  거래 횟수: {long_count}회\n")
+        f.write(f"  승률: {long_win_rate}\n")
+        f.write(f"  최대 수익: ${long_max_profit:.2f}")
+        if long_max_trade:
+            f.write(f" (진입: ${long_max_trade['entry_price']:.2f}, 청산: ${long_max_trade['exit_price']:.2f}, 수량: {long_max_trade['quantity']:.2f})")
+        f.write("\n")
+        f.write(f"  최대 손실: ${long_max_loss:.2f}")
+        if long_min_trade:
+            f.write(f" (진입: ${long_min_trade['entry_price']:.2f}, 청산: ${long_min_trade['exit_price']:.2f}, 수량: {long_min_trade['quantity']:.2f})")
+        f.write("\n")
+
+        f.write(f"\n[SHORT ETF: {etf_short}]\n")
+        f.write(f"  거래 횟수: {short_count}회\n")
+        f.write(f"  승률: {short_win_rate}\n")
+        f.write(f"  최대 수익: ${short_max_profit:.2f}")
+        if short_max_trade:
+            f.write(f" (진입: ${short_max_trade['entry_price']:.2f}, 청산: ${short_max_trade['exit_price']:.2f}, 수량: {short_max_trade['quantity']:.2f})")
+        f.write("\n")
+        f.write(f"  최대 손실: ${short_max_loss:.2f}")
+        if short_min_trade:
+            f.write(f" (진입: ${short_min_trade['entry_price']:.2f}, 청산: ${short_min_trade['exit_price']:.2f}, 수량: {short_min_trade['quantity']:.2f})")
+        f.write("\n")
+
+    else:
+        f.write("거래 없음 또는 데이터 부족\n")
+
+    f.write("-" * 50 + "\n\n")
+
+
+def run_symbol(index: int, total: int, target_item: dict, source: str, start_date: str, end_date: str,
+               interval: str, event_log: TradeEventLog = None):
+    """심볼 1개 독립 백테스트 (순차 실행 / 프로세스 풀 공용)"""
+    original_symbol = target_item["ORIGINAL"]
+    etf_long = target_item["LONG"]
+    etf_long_multiple = target_item["LONG_MULTIPLE"]
+    etf_short = target_item["SHORT"]
+    etf_short_multiple = target_item["SHORT_MULTIPLE"]
+    
+    # 전략 파라미터 설정
+    params = REVERSAL_STRATEGY_PARAMS.copy()
+    params["symbol"] = original_symbol
+    params["reverse_trigger"] = False
+    params["reverse_mode"] = "full"
+    
+    backtester = ReversalBacktester(params=params, source=source, event_log=event_log)
+    
+    print(f"\n{'='*20} [{index+1}/{total}] {original_symbol} 백테스트 시작 {'='*20}")
+    print(f"LONG: {etf_long} ({etf_long_multiple}) / SHORT: {etf_short} ({etf_short_multiple})")
+    
+    return backtester.run_backtest(
+        original_symbol=original_symbol,
+        etf_long=etf_long,
+        etf_long_multiple=etf_long_multiple,
+        etf_short=etf_short,
+        etf_short_multiple=etf_short_multiple,
+        start_date=start_date,
+        end_date=end_date,
+        interval=interval
+    )
+
+
+def _run_symbol_worker(index: int, total: int, target_item: dict, source: str, start_date: str, end_date: str,
+                       interval: str, output_path: str, events_path: str = None,
+                       equity_snapshots: bool = False, quiet: bool = False):
+    """
+    프로세스 풀 작업: 심볼별 stdout/콘솔 로그를 output_path 로 분리
+    이벤트 로그는 심볼별 임시 파일에 기록 후 부모 프로세스가 순서대로 병합
+    공유 로그 파일(logs/)은 부모 프로세스만 기록 (작업 프로세스마다 같은 파일을 열고 교체하지 않도록)
+    """
+    disable_file_logging()
+    if quiet:
+        set_quiet(True)
+    event_log = open_event_log(events_path, equity_snapshots=equity_snapshots)
+    try:
+        with open(output_path, "w", encoding="utf-8") as out, contextlib.redirect_stdout(out), console_to(out):
+            return run_symbol(index, total, target_item, source, start_date, end_date, interval, event_log)
+    finally:
+        if event_log:
+            event_log.close()
+
+
+def run_parallel(args, result_file: str, start_date: str, end_date: str, interval: str, jobs: int):
+    """--jobs N: 심볼별 독립 백테스트를 프로세스 풀에서 실행, 결과 파일은 원래 심볼 순서로 기록"""
+    total = len(TARGET_SYMBOLS)
+    output_dir = os.path.join(LOG_DIR, "backtest")
+    os.makedirs(output_dir, exist_ok=True)
+    event_parts = []
+
+    # spawn: 부모의 로그 쓰기 스레드/파일 핸들을 물려받지 않도록 새 인터프리터에서 시작
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = []
+        for i, target_item in enumerate(TARGET_SYMBOLS):
+            symbol = target_item["ORIGINAL"]
+            output_path = os.path.join(output_dir, f"{args.source}_{symbol}.log")
+            events_path = f"{args.events}.{i}.part" if args.events else None
+            if events_path:
+                event_parts.append(events_path)
+            futures.append(pool.submit(
+                _run_symbol_worker, i, total, target_item, args.source, start_date, end_date, interval,
+                output_path, events_path, args.equity_snapshots, args.quiet
+            ))
+        print(f"🚀 {total}개 심볼 병렬 백테스트 시작 (workers={jobs}, 심볼별 출력: {output_dir})")
+
+        # 완료 순서와 무관하게 원래 순서대로 기록
+        for i, (target_item, future) in enumerate(zip(TARGET_SYMBOLS, futures)):
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.error(f"{target_item['ORIGINAL']} 백테스트 실패: {e}")
+                results = None
+            with open(result_file, "a", encoding="utf-8") as f:
+                write_symbol_result(f, i, total, target_item, results)
+            if results:
+                print(f"✅ {target_item['ORIGINAL']} 완료: 총 손익 ${results['total_pnl']:,.2f}")
+
+    if args.events:
+        merge_event_logs(event_parts, args.events)
+        print(f"📝 거래 이벤트 로그: {args.events}")
+    print(f"\n🎉 모든 백테스트 완료! 결과가 {result_file}에 저장되었습니다.")
+
+
+def run_portfolio(args, result_file: str, start_date: str, end_date: str, interval: str, event_log):
+    """--portfolio: 전체 심볼을 공유 자본으로 동시 시뮬레이션"""
+    params = REVERSAL_STRATEGY_PARAMS.copy()
+    params["reverse_trigger"] = False
+    params["reverse_mode"] = "full"
+
+    portfolio = PortfolioBacktester(
+        TARGET_SYMBOLS, params=params, source=args.source, capital=args.capital,
+        max_positions=args.max_positions, position_budget_pct=args.position_budget, event_log=event_log
+    )
+    results = portfolio.run(start_date, end_date, interval)
+
+    with open(result_file, "a", encoding="utf-8") as f:
+        f.write(f"[PORTFOLIO] {len(TARGET_SYMBOLS)}개 심볼, 공유 자본 ${portfolio.initial_capital:,.2f}\n")
+        if results:
+            m = results['metrics']
+            f.write(f"총 거래: {m['trades']}회\n")
+            f.write(f"승률: {m['win_rate']:.2f}% ({m['wins']}/{m['trades']})\n")
+            f.write(f"최종 자본: ${results['final_capital']:,.2f}\n")
+            f.write(f"총 손익: ${results['total_pnl']:,.2f}\n")
+            f.write(f"총 수수료: ${results['total_fee']:,.2f}\n")
+            f.write(f"Sharpe: {m['sharpe']:.2f} / Sortino: {m['sortino']:.2f} / 최대 낙폭: {m['max_drawdown_pct']:.2f}%\n")
+            f.write(f"노출도: {m['exposure_pct']:.2f}% / 회전율: {m['turnover']:.2f}x\n")
+            for symbol, ledger in results['symbols'].items():
+                f.write(f"  {symbol}: {len(ledger)}회, 손익 ${float(ledger.rows['pnl'].sum()):,.2f}\n")
+        else:
+            f.write("거래 없음 또는 데이터 부족\n")
+        f.write("-" * 50 + "\n\n")
+
+    if event_log:
+        event_log.close()
+        print(f"📝 거래 이벤트 로그: {args.events}")
+    print(f"\n🎉 포트폴리오 백테스트 완료! 결과가 {result_file}에 저장되었습니다.")
+
+
 def main():
     """백테스트 메인 함수"""
     parser = argparse.ArgumentParser()
-    parser.add_argument("--source", type=str, choices=["kis", "yfinance"], default="kis", help="Data source")
+    parser.add_argument("--source", type=str, choices=["kis", "yfinance", "mock"], default="kis", help="Data source")
     parser.add_argument("--start-date", type=str, default=None, help="Backtest start date (YYYY-MM-DD). Default: 1 year ago")
     parser.add_argument("--end-date", type=str, default=None, help="Backtest end date (YYYY-MM-DD). Default: today")
     parser.add_argument("--use-all-data", action="store_true", help="Use all available data from files (ignores start/end date)")
+    parser.add_argument("--quiet", action="store_true", help="Drop per-bar/per-trade log output (warnings and summary only)")
+    parser.add_argument("--events", type=str, default=None, help="Write structured trade events (JSONL) to this path")
+    parser.add_argument("--equity-snapshots", action="store_true", help="Include per-bar equity snapshots in --events output")
+    parser.add_argument("--jobs", type=int, default=1, help="Run independent per-symbol backtests in N worker processes")
+    parser.add_argument("--portfolio", action="store_true", help="Simulate all symbols together against one shared capital pool")
+    parser.add_argument("--capital", type=float, default=None, help="Portfolio shared capital (default: per-symbol capital x symbols)")
+    parser.add_argument("--max-positions", type=int, default=PORTFOLIO_MAX_POSITIONS, help="Portfolio: max symbols held at once (0 = unlimited)")
+    parser.add_argument("--position-budget", type=float, default=PORTFOLIO_POSITION_BUDGET_PCT, help="Portfolio: per-entry budget as a fraction of equity (0 = 1/symbols)")
     args = parser.parse_args()
 
+    if args.quiet:
+        set_quiet(True)
+
     # 결과 파일 초기화 (source에 따라 다른 파일명 사용)
     result_file = f"{args.source}_result.txt"
     with open(result_file, "w", encoding="utf-8") as f:
@@ -562,9 +941,9 @@ def main():
         # 첫 번째 심볼의 데이터로 날짜 범위 확인
         first_symbol = TARGET_SYMBOLS[0]["ORIGINAL"]
         try:
-            sample_data = prepare_dataset(first_symbol, interval, source=args.source)
-            start_date = sample_data.index.min().strftime("%Y-%m-%d")
-            end_date = sample_data.index.max().strftime("%Y-%m-%d")
+            info = dataset_info(first_symbol, interval, source=args.source)
+            start_date = info["start"].strftime("%Y-%m-%d")
+            end_date = info["end"].strftime("%Y-%m-%d")
             logger.info(f"Using all available data: {start_date} to {end_date}")
         except Exception as e:
             logger.warning(f"Could not read date range from data files: {e}. Using default 1 year.")
@@ -584,110 +963,29 @@ def main():
             start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
     
     total_symbols = len(TARGET_SYMBOLS)
+    if args.jobs > 1 and not args.portfolio:
+        run_parallel(args, result_file, start_date, end_date, interval, min(args.jobs, total_symbols))
+        return
+
+    event_log = open_event_log(args.events, equity_snapshots=args.equity_snapshots)
+
+    if args.portfolio:
+        run_portfolio(args, result_file, start_date, end_date, interval, event_log)
+        return
 
     for i, target_item in enumerate(TARGET_SYMBOLS):
-        original_symbol = target_item["ORIGINAL"]
-        etf_long = target_item["LONG"]
-        etf_long_multiple = target_item["LONG_MULTIPLE"]
-        etf_short = target_item["SHORT"]
-        etf_short_multiple = target_item["SHORT_MULTIPLE"]
-        
-        # 전략 파라미터 설정
-        params = REVERSAL_STRATEGY_PARAMS.copy()
-        params["symbol"] = original_symbol
-        params["reverse_trigger"] = False
-        params["reverse_mode"] = "full"
-        
-        backtester = ReversalBacktester(params=params, source=args.source)
-        
-        print(f"\n{'='*20} [{i+1}/{total_symbols}] {original_symbol} 백테스트 시작 {'='*20}")
-        print(f"LONG: {etf_long} ({etf_long_multiple}) / SHORT: {etf_short} ({etf_short_multiple})")
-        
-        results = backtester.run_backtest(
-            original_symbol=original_symbol,
-            etf_long=etf_long,
-            etf_long_multiple=etf_long_multiple,
-            etf_short=etf_short,
-            etf_short_multiple=etf_short_multiple,
-            start_date=start_date,
-            end_date=end_date,
-            interval=interval
-        )
+        results = run_symbol(i, total_symbols, target_item, args.source, start_date, end_date, interval, event_log)
         
         # 결과 파일에 누적
         with open(result_file, "a", encoding="utf-8") as f:
-            f.write(f"[{i+1}/{total_symbols}] {original_symbol} 결과\n")
-            f.write(f"LONG: {etf_long} ({etf_long_multiple}) / SHORT: {etf_short} ({etf_short_multiple})\n")
-            
-            if results:
-                trades = results['trades']
-                # 전체 통계
-                win_rate = 0
-                winning_trades = [t for t in trades if t['pnl'] > 0]
-                if trades:
-                    win_rate = (len(winning_trades) / len(trades) * 100)
-                
-                f.write(f"총 거래: {len(trades)}회\n")
-                f.write(f"전환 매매: {len(results['reversals'])}회\n")
-                f.write(f"승률: {win_rate:.2f}% ({len(winning_trades)}/{len(trades)})\n")
-                f.write(f"최종 자본: ${results['final_capital']:,.2f}\n")
-                f.write(f"총 손익: ${results['total_pnl']:,.2f}\n")
-                f.write(f"총 수수료: ${results['total_fee']:,.2f}\n")
-                
-                # LONG/SHORT 상세 통계
-                long_trades = [t for t in trades if t['side'] == 'LONG']
-                short_trades = [t for t in trades if t['side'] == 'SHORT']
-                
-                def calculate_stats(trade_list):
-                    if not trade_list:
-                        return "거래 없음", 0, 0, 0, None, None
-                    
-                    wins = [t for t in trade_list if t['pnl'] > 0]
-                    win_rate = (len(wins) / len(trade_list) * 100)
-                    
-                    max_profit_trade = max(trade_list, key=lambda x: x['pnl'])
-                    max_loss_trade = min(trade_list, key=lambda x: x['pnl'])
-                    
-                    max_profit = max_profit_trade['pnl']
-                    max_loss = max_loss_trade['pnl']
-                    
-                    return f"{win_rate:.2f}% ({len(wins)}/{len(trade_list)})", len(trade_list), max_profit, max_loss, max_profit_trade, max_loss_trade
-
-                long_win_rate, long_count, long_max_profit, long_max_loss, long_max_trade, long_min_trade = calculate_stats(long_trades)
-                short_win_rate, short_count, short_max_profit, short_max_loss, short_max_trade, short_min_trade = calculate_stats(short_trades)
-                
-                f.write(f"\n[LONG ETF: {etf_long}]\n")
-                f.write(f"  거래 횟수: {long_count}회\n")
-                f.write(f"  승률: {long_win_rate}\n")
-                f.write(f"  최대 수익: ${long_max_profit:.2f}")
-                if long_max_trade:
-                    f.write(f" (진입: ${long_max_trade['entry_price']:.2f}, 청산: ${long_max_trade['exit_price']:.2f}, 수량: {long_max_trade['quantity']:.2f})")
-                f.write("\n")
-                f.write(f"  최대 손실: ${long_max_loss:.2f}")
-                if long_min_trade:
-                    f.write(f" (진입: ${long_min_trade['entry_price']:.2f}, 청산: ${long_min_trade['exit_price']:.2f}, 수량: {long_min_trade['quantity']:.2f})")
-                f.write("\n")
-                
-                f.write(f"\n[SHORT ETF: {etf_short}]\n")
-                f.write(f"  거래 횟수: {short_count}회\n")
-                f.write(f"  승률: {short_win_rate}\n")
-                f.write(f"  최대 수익: ${short_max_profit:.2f}")
-                if short_max_trade:
-                    f.write(f" (진입: ${short_max_trade['entry_price']:.2f}, 청산: ${short_max_trade['exit_price']:.2f}, 수량: {short_max_trade['quantity']:.2f})")
-                f.write("\n")
-                f.write(f"  최대 손실: ${short_max_loss:.2f}")
-                if short_min_trade:
-                    f.write(f" (진입: ${short_min_trade['entry_price']:.2f}, 청산: ${short_min_trade['exit_price']:.2f}, 수량: {short_min_trade['quantity']:.2f})")
-                f.write("\n")
-
-            else:
-                f.write("거래 없음 또는 데이터 부족\n")
-            
-            f.write("-" * 50 + "\n\n")
+            write_symbol_result(f, i, total_symbols, target_item, results)
         
         if results:
-            print(f"✅ {original_symbol} 완료: 총 손익 ${results['total_pnl']:,.2f}")
+            print(f"✅ {target_item['ORIGINAL']} 완료: 총 손익 ${results['total_pnl']:,.2f}")
             
+    if event_log:
+        event_log.close()
+        print(f"📝 거래 이벤트 로그: {args.events}")
     print(f"\n🎉 모든 백테스트 완료! 결과가 {result_file}에 저장되었습니다.")
 
 if __name__ == "__main__":
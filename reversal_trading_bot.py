@@ -2,7 +2,6 @@
 전환 매매 전략 실행 봇
 Reverse/Flip Trading Strategy를 사용하는 거래 봇
 """
-import time
 from datetime import datetime
 import sys
 import os
@@ -277,11 +276,9 @@ class ReversalTradingBot:
             self.force_close_all_positions
         )
         
-        # 메인 루프
+        # 메인 루프 (asyncio 스케줄러, stop 호출 시 종료)
         try:
-            while self.is_running:
-                self.scheduler.run()
-                time.sleep(1)
+            self.scheduler.run()
         except KeyboardInterrupt:
             logger.info("전환 매매 봇 종료 요청")
             self.stop()
@@ -290,6 +287,7 @@ class ReversalTradingBot:
         """봇 종료"""
         logger.info("전환 매매 봇 종료 중...")
         self.is_running = False
+        self.scheduler.stop()
         
         # 모든 포지션 청산
         if self.strategy.current_position and self.strategy.current_etf_symbol:
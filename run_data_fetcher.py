@@ -5,7 +5,9 @@ import argparse
 import json
 from data_fetcher.auth import KisAuth
 from data_fetcher.fetcher import KisFetcher
-from data_fetcher.resampler import convert_interval
+from data_fetcher.resampler import SESSIONS, resample_csv
+from data_fetcher.bar_pyramid import BarPyramid, DEFAULT_LEVELS
+from data_fetcher.quality import plan_refetch, save_report, validate_file
 from backtester.engine import prepare_dataset
 
 # Configure logging
@@ -31,7 +33,10 @@ async def main():
     parser.add_argument("--symbols", nargs="+", default=fetch_cfg.get("symbols", ["005930"]), help="List of stock symbols")
     parser.add_argument("--interval", default=fetch_cfg.get("interval", "1h"), help="Interval (1m, 5m, 1h, 1d)")
     parser.add_argument("--period", default=fetch_cfg.get("period", "1y"), help="Period (1y, 7d, etc.)")
-    parser.add_argument("--resample", action="store_true", help="Perform resampling demo")
+    parser.add_argument("--resample", action="store_true", help="Resample the downloaded interval into --resample-to intervals (chunked, one pass)")
+    parser.add_argument("--resample-to", nargs="+", default=["5m", "30m", "1h", "1d"], help="Target intervals for --resample")
+    parser.add_argument("--session", choices=sorted(SESSIONS), default=None, help="Anchor resampled bars to regular session hours (us: 09:30-16:00 ET, kr: 09:00-15:30 KST)")
+    parser.add_argument("--skip-quality", action="store_true", help="Skip the post-fetch gap / anomaly check and targeted re-fetch")
     parser.add_argument("--source", type=str, choices=["kis", "yfinance"], default="kis", help="Data source: 'kis' or 'yfinance'")
     
     args = parser.parse_args()
@@ -63,7 +68,57 @@ async def main():
         await fetcher.download_all(args.symbols, args.interval, args.period)
         
     
-    # 3. Apply Indicators and Save
+    # 2. Quality pass: gap / anomaly report per symbol, then re-fetch only the missing ranges
+    quality_cfg = config.get("quality", {})
+    if quality_cfg.get("enabled", True) and not args.skip_quality:
+        sessions = quality_cfg.get("sessions", ["REGULAR"])
+        for sym in args.symbols:
+            path = f"data/{args.source}/{sym}/{args.interval}.csv"
+            if not os.path.exists(path):
+                continue
+            try:
+                report = validate_file(path, sessions=sessions)
+                windows = plan_refetch(
+                    report,
+                    pad_bars=quality_cfg.get("pad_bars", 1),
+                    max_windows=quality_cfg.get("max_refetch_windows", 20)
+                )
+                if windows and quality_cfg.get("refetch", True):
+                    if await fetcher.refetch_ranges(sym, args.interval, windows):
+                        report = validate_file(path, sessions=sessions)
+                report_path = save_report(report)
+                log = logger.info if report.ok else logger.warning
+                log(f"Data quality {report.summary()} (report: {report_path})")
+            except Exception as e:
+                logger.error(f"Failed quality check for {sym}: {e}")
+
+    # 3. Resample raw bars into coarser intervals (before indicator columns are added)
+    if args.resample:
+        for sym in args.symbols:
+            src_path = f"data/{args.source}/{sym}/{args.interval}.csv"
+            targets = {
+                interval: f"data/{args.source}/{sym}/{interval}.csv"
+                for interval in args.resample_to if interval != args.interval
+            }
+            try:
+                resample_csv(src_path, targets, session=SESSIONS.get(args.session))
+            except Exception as e:
+                logger.error(f"Failed to resample {sym}: {e}")
+
+    # 4. Bar pyramid: derive coarser intervals from the finest stored one (only new bars)
+    pyramid_cfg = config.get("pyramid", {})
+    if pyramid_cfg.get("enabled", True):
+        levels = pyramid_cfg.get("levels", DEFAULT_LEVELS)
+        for sym in args.symbols:
+            try:
+                pyramid = BarPyramid(args.source, sym, session=SESSIONS.get(pyramid_cfg.get("session")))
+                written = pyramid.update(levels, keep=[args.interval])
+                if written:
+                    logger.info(f"Bar pyramid for {sym} (base {pyramid.base_interval()}): {written}")
+            except Exception as e:
+                logger.error(f"Failed to update bar pyramid for {sym}: {e}")
+
+    # 5. Apply Indicators and Save
     # The user wants RSI/MACD in the saved CSV.
     ind_settings = config.get("indicators", {})
     logger.info(f"Applying indicators with settings: {ind_settings}")
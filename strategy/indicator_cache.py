@@ -0,0 +1,140 @@
+"""
+지표 계산 디스크 캐시
+- 키: (source, symbol, interval, 지표 이름, 파라미터, 첫 봉 시각) -> .npz 파일 1개
+- 파일에는 계산에 사용한 입력 데이터 지문(봉 수 + 시각/입력 열 해시)과 지표 열을 함께 저장
+- 입력이 같으면 그대로 로드, 뒤에 봉만 추가되었으면(앞부분 지문 일치) extend 함수로 꼬리만 이어서 계산
+- 반복 백테스트 / 최적화 워커는 같은 데이터의 지표를 다시 계산하지 않음
+"""
+import hashlib
+import json
+import os
+from typing import Callable, Dict, Iterable, Optional
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import INDICATOR_CACHE_DIR, INDICATOR_CACHE_ENABLED
+from utils.logger import logger
+
+# 캐시 파일 형식이 바뀌면 올려서 기존 캐시 무효화
+_CACHE_VERSION = 1
+
+Columns = Dict[str, np.ndarray]
+
+
+def params_key(params: Optional[dict]) -> str:
+    """파라미터 dict -> 짧은 해시 (키 순서 무관)"""
+    text = json.dumps(params or {}, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def _inputs(data: pd.DataFrame, inputs: Iterable[str]) -> np.ndarray:
+    index_ns = pd.DatetimeIndex(data.index).as_unit("ns").asi8
+    columns = [data[c].to_numpy(dtype=np.float64) for c in inputs]
+    return np.column_stack([index_ns.view(np.float64)] + columns) if len(data) else np.empty((0, 1 + len(columns)))
+
+
+def fingerprint(matrix: np.ndarray) -> str:
+    """입력 행렬(시각 + 입력 열) 해시"""
+    return hashlib.blake2b(np.ascontiguousarray(matrix).tobytes(), digest_size=16).hexdigest()
+
+
+class IndicatorCache:
+    """지표 열 디스크 캐시 (프로세스 간 공유, 원자적 저장)"""
+
+    def __init__(self, root: str = None, enabled: bool = None):
+        self.root = root if root is not None else INDICATOR_CACHE_DIR
+        self.enabled = INDICATOR_CACHE_ENABLED if enabled is None else enabled
+        self.hits = 0
+        self.extends = 0
+        self.misses = 0
+
+    def path(self, source: str, symbol: str, interval: str, name: str, params: dict, first_ns: int) -> str:
+        return os.path.join(
+            self.root, source, str(symbol), interval, f"{name}_{params_key(params)}_{first_ns}.npz"
+        )
+
+    def _load(self, path: str) -> Optional[dict]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as cached:
+                if int(cached["version"]) != _CACHE_VERSION:
+                    return None
+                return {
+                    "rows": int(cached["rows"]),
+                    "fingerprint": str(cached["fingerprint"]),
+                    "columns": {key[4:]: cached[key] for key in cached.files if key.startswith("col_")},
+                }
+        except Exception as e:
+            logger.warning(f"지표 캐시 로드 실패 ({path}): {e}")
+            return None
+
+    def _save(self, path: str, rows: int, digest: str, columns: Columns):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+            np.savez(
+                tmp_path,
+                version=_CACHE_VERSION,
+                rows=rows,
+                fingerprint=digest,
+                **{f"col_{key}": np.asarray(value) for key, value in columns.items()}
+            )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"지표 캐시 저장 실패 ({path}): {e}")
+
+    def load_or_compute(
+        self,
+        data: pd.DataFrame,
+        source: str,
+        symbol: str,
+        interval: str,
+        name: str,
+        params: dict,
+        compute: Callable[[pd.DataFrame], Optional[Columns]],
+        extend: Callable[[pd.DataFrame, Columns, int], Optional[Columns]] = None,
+        inputs: Iterable[str] = ("close",),
+    ) -> Optional[Columns]:
+        """
+        캐시된 지표 열 반환 (없거나 입력이 바뀌었으면 계산 후 저장)
+        :param compute: data -> {열 이름: 길이 len(data) 배열} (계산 불가 시 None, 저장 안 함)
+        :param extend: (data, 캐시된 열, 캐시 봉 수 n) -> data[n:] 구간 열 (None 이면 전체 재계산)
+        :param inputs: 지문에 포함할 입력 열 (지표가 사용하는 열)
+        """
+        if not self.enabled or data is None or len(data) == 0:
+            return compute(data)
+
+        inputs = tuple(inputs)
+        matrix = _inputs(data, inputs)
+        first_ns = int(pd.DatetimeIndex(data.index[:1]).as_unit("ns").asi8[0])
+        path = self.path(source, symbol, interval, name, params, first_ns)
+        cached = self._load(path)
+
+        if cached is not None and cached["rows"] <= len(data) \
+                and fingerprint(matrix[:cached["rows"]]) == cached["fingerprint"]:
+            rows = cached["rows"]
+            if rows == len(data):
+                self.hits += 1
+                return cached["columns"]
+            tail = extend(data, cached["columns"], rows) if extend is not None else None
+            if tail is not None:
+                self.extends += 1
+                columns = {
+                    key: np.concatenate([value, tail[key]]) for key, value in cached["columns"].items()
+                }
+                self._save(path, len(data), fingerprint(matrix), columns)
+                logger.debug(f"지표 캐시 확장: {symbol} {interval} {name} (+{len(data) - rows}봉)")
+                return columns
+
+        self.misses += 1
+        columns = compute(data)
+        if columns is not None:
+            self._save(path, len(data), fingerprint(matrix), columns)
+        return columns
+
+
+# 프로세스 공용 인스턴스
+indicator_cache = IndicatorCache()
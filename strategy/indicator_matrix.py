@@ -0,0 +1,120 @@
+"""
+다중 파라미터 지표 행렬
+- RSI 기간 여러 개 / MACD (fast, slow, signal) 조합 여러 개를 종가 배열 한 번 순회로 계산
+- 결과는 (봉 수, 변형 수) 2차원 배열 -> 최적화에서 지표 파라미터를 바꿔도 열 선택만 하면 됨
+- 계산식은 TechnicalIndicators 와 같음 (RSI: rolling 평균, MACD: ewm adjust=False)
+- RSI 는 누적합 1회로 모든 기간 계산, EMA 는 서로 다른 span 마다 한 번 (MACD 조합이 늘어도 중복 span 은 재사용)
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+MacdParams = Tuple[int, int, int]
+
+
+def rsi_matrix(close: np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    """
+    RSI 행렬 (봉 수 x len(periods))
+    상승/하락폭 누적합의 차로 모든 기간의 rolling 평균을 한 번에 계산 (앞 period-1 봉은 NaN)
+    누적합 방식이라 rolling 계산과는 부동소수점 오차(1e-9 수준) 차이가 날 수 있음
+    """
+    close = np.asarray(close, dtype=np.float64)
+    periods = np.asarray(periods, dtype=np.int64)
+    n = len(close)
+    out = np.full((n, len(periods)), np.nan)
+    if n < 2 or not len(periods):
+        return out
+    delta = np.diff(close)
+    gain_cs = np.concatenate(([0.0], np.cumsum(np.where(delta > 0, delta, 0.0))))
+    loss_cs = np.concatenate(([0.0], np.cumsum(np.where(delta < 0, -delta, 0.0))))
+    # 봉 t 의 창: 직전 p 개 변화량 (첫 봉 변화량은 0 으로 간주 -> t >= p-1 부터 유효, calculate_rsi 와 동일)
+    rows = np.arange(n)[:, None]
+    start = np.clip(rows - periods[None, :], 0, None)
+    gain = (gain_cs[rows] - gain_cs[start]) / periods
+    loss = (loss_cs[rows] - loss_cs[start]) / periods
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + gain / loss))
+    valid = rows >= periods[None, :] - 1
+    out[valid] = rsi[valid]
+    return out
+
+
+def ema_matrix(values: np.ndarray, spans: Sequence[int]) -> np.ndarray:
+    """
+    EMA(adjust=False) 행렬 (봉 수 x len(spans))
+    values 가 1차원이면 모든 span 에 같은 입력, 2차원이면 열마다 해당 span 적용
+    같은 span 의 열은 pandas ewm 한 번으로 묶어서 계산 (TechnicalIndicators 와 같은 값)
+    """
+    spans = np.asarray(spans, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty((len(values), len(spans)))
+    for span in np.unique(spans):
+        cols = np.flatnonzero(spans == span)
+        if values.ndim == 1:
+            ema = pd.Series(values).ewm(span=int(span), adjust=False).mean().to_numpy()
+            out[:, cols] = ema[:, None]
+        else:
+            out[:, cols] = pd.DataFrame(values[:, cols]).ewm(span=int(span), adjust=False).mean().to_numpy()
+    return out
+
+
+def macd_matrix(close: np.ndarray, params: Sequence[MacdParams]) -> Dict[str, np.ndarray]:
+    """
+    MACD 행렬 (봉 수 x len(params)): macd / signal / histogram
+    fast/slow EMA 는 중복 span 을 한 번만 계산
+    """
+    params = [tuple(int(v) for v in p) for p in params]
+    if not params:
+        empty = np.empty((len(close), 0))
+        return {"macd": empty, "signal": empty, "histogram": empty}
+    spans = sorted({p[0] for p in params} | {p[1] for p in params})
+    column = {span: j for j, span in enumerate(spans)}
+    emas = ema_matrix(close, spans)
+    macd = np.column_stack([emas[:, column[fast]] - emas[:, column[slow]] for fast, slow, _ in params])
+    signal = ema_matrix(macd, [p[2] for p in params])
+    return {"macd": macd, "signal": signal, "histogram": macd - signal}
+
+
+class IndicatorMatrix:
+    """RSI / MACD 변형 행렬 + 파라미터 -> 열 위치"""
+
+    def __init__(self, rsi_periods: Iterable[int], macd_params: Iterable[MacdParams], columns: Dict[str, np.ndarray]):
+        self.rsi_periods: List[int] = [int(p) for p in rsi_periods]
+        self.macd_params: List[MacdParams] = [tuple(int(v) for v in p) for p in macd_params]
+        self.columns = columns
+        self._rsi_col = {p: j for j, p in enumerate(self.rsi_periods)}
+        self._macd_col = {p: j for j, p in enumerate(self.macd_params)}
+
+    @classmethod
+    def compute(cls, data: pd.DataFrame, rsi_periods: Iterable[int], macd_params: Iterable[MacdParams]) -> "IndicatorMatrix":
+        """종가 기준 전체 변형 계산"""
+        rsi_periods = list(rsi_periods)
+        macd_params = [tuple(p) for p in macd_params]
+        close = (data['close'] if 'close' in data.columns else data['Close']).to_numpy(dtype=np.float64)
+        columns = {"rsi": rsi_matrix(close, rsi_periods)}
+        columns.update(macd_matrix(close, macd_params))
+        return cls(rsi_periods, macd_params, columns)
+
+    @property
+    def rsi(self) -> np.ndarray:
+        return self.columns["rsi"]
+
+    @property
+    def macd(self) -> np.ndarray:
+        return self.columns["macd"]
+
+    def variant(self, rsi_period: int, macd: MacdParams) -> Optional[Dict[str, np.ndarray]]:
+        """
+        한 조합의 지표 (SignalGenerator.precompute_indicators 와 같은 형식, 복사 없는 열 뷰)
+        행렬에 없는 조합이면 None
+        """
+        rsi_col = self._rsi_col.get(int(rsi_period))
+        macd_col = self._macd_col.get(tuple(int(v) for v in macd))
+        if rsi_col is None or macd_col is None:
+            return None
+        return {
+            "rsi": self.columns["rsi"][:, rsi_col],
+            "macd": self.columns["macd"][:, macd_col],
+            "signal": self.columns["signal"][:, macd_col],
+            "histogram": self.columns["histogram"][:, macd_col],
+        }
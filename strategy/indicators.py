@@ -1,8 +1,13 @@
 """
 기술적 지표 계산 모듈
+- TechnicalIndicators: DataFrame 입력 / Series 출력 (RSI, MACD, ATR, 볼린저, VWAP, ADX, OBV, 변동성, 거래량 z-score)
+- *_kernel 함수: NumPy 배열 입력 / 배열 출력 벡터 연산 (워밍업 구간은 NaN, pandas_ta 없이 동작)
+- Streaming*: 봉 1개씩 갱신하는 실시간용 버전 (같은 입력이면 커널의 마지막 값과 동일)
 """
+from collections import deque
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Optional, Tuple
 import sys
 import os
@@ -13,6 +18,172 @@ from config.settings import (
     MACD_FAST, MACD_SLOW, MACD_SIGNAL
 )
 
+
+# ========== NumPy 커널 ==========
+
+def _as_float(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def rolling_mean_kernel(values, window: int) -> np.ndarray:
+    """단순 이동평균 (앞 window-1 개는 NaN)"""
+    values = _as_float(values)
+    out = np.full(len(values), np.nan)
+    if window <= len(values):
+        out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+
+def rolling_std_kernel(values, window: int, ddof: int = 1) -> np.ndarray:
+    """이동 표준편차 (창별 직접 계산, 누적합 방식의 정밀도 손실 없음)"""
+    values = _as_float(values)
+    out = np.full(len(values), np.nan)
+    if window <= len(values) and window > ddof:
+        out[window - 1:] = sliding_window_view(values, window).std(axis=1, ddof=ddof)
+    return out
+
+
+def wilder_kernel(values, period: int) -> np.ndarray:
+    """
+    Wilder 평활 (RMA, alpha = 1/period) - NaN 은 건너뛰고 유효값 period 개 이후부터 출력
+    """
+    series = pd.Series(_as_float(values))
+    return series.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean().to_numpy()
+
+
+def true_range_kernel(high, low, close) -> np.ndarray:
+    """True Range (첫 봉은 고가 - 저가)"""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    tr = high - low
+    if len(close) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum.reduce([tr[1:], np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)])
+    return tr
+
+
+def atr_kernel(high, low, close, period: int = 14) -> np.ndarray:
+    """ATR = True Range 의 Wilder 평활"""
+    return wilder_kernel(true_range_kernel(high, low, close), period)
+
+
+def bollinger_kernel(close, period: int = 20, num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """볼린저 밴드 (하단, 중심, 상단) - 모표준편차(ddof=0)"""
+    mid = rolling_mean_kernel(close, period)
+    std = rolling_std_kernel(close, period, ddof=0)
+    return mid - num_std * std, mid, mid + num_std * std
+
+
+def vwap_kernel(high, low, close, volume, groups=None) -> np.ndarray:
+    """
+    VWAP (전형가격 (H+L+C)/3 의 거래량 가중 누적평균)
+    :param groups: 구간 번호 배열 (예: 날짜) - 값이 바뀌면 누적을 새로 시작, None 이면 전체 누적
+    """
+    high, low, close, volume = _as_float(high), _as_float(low), _as_float(close), _as_float(volume)
+    pv = np.cumsum((high + low + close) / 3.0 * volume)
+    vol = np.cumsum(volume)
+    if groups is not None and len(close):
+        groups = np.asarray(groups)
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        seg = np.repeat(starts, np.diff(np.r_[starts, len(close)]))
+        pv_base = np.where(seg > 0, pv[seg - 1], 0.0)
+        vol_base = np.where(seg > 0, vol[seg - 1], 0.0)
+        pv, vol = pv - pv_base, vol - vol_base
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(vol > 0, pv / vol, np.nan)
+
+
+def adx_kernel(high, low, close, period: int = 14) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ADX, +DI, -DI (Wilder 방식)"""
+    high, low = _as_float(high), _as_float(low)
+    n = len(high)
+    plus_dm = np.full(n, np.nan)
+    minus_dm = np.full(n, np.nan)
+    if n > 1:
+        up = high[1:] - high[:-1]
+        down = low[:-1] - low[1:]
+        plus_dm[1:] = np.where((up > down) & (up > 0), up, 0.0)
+        minus_dm[1:] = np.where((down > up) & (down > 0), down, 0.0)
+    tr = true_range_kernel(high, low, close)
+    tr[0] = np.nan  # 방향성 지표와 같은 봉부터 평활
+    atr = wilder_kernel(tr, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100 * wilder_kernel(plus_dm, period) / atr
+        minus_di = 100 * wilder_kernel(minus_dm, period) / atr
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return wilder_kernel(dx, period), plus_di, minus_di
+
+
+def obv_kernel(close, volume) -> np.ndarray:
+    """OBV (첫 봉은 +거래량, 이후 종가 방향에 따라 누적)"""
+    close, volume = _as_float(close), _as_float(volume)
+    direction = np.ones(len(close))
+    if len(close) > 1:
+        direction[1:] = np.sign(np.diff(close))
+    return np.cumsum(direction * volume)
+
+
+def returns_kernel(close) -> np.ndarray:
+    """봉간 수익률 (첫 봉은 NaN)"""
+    close = _as_float(close)
+    returns = np.full(len(close), np.nan)
+    if len(close) > 1:
+        returns[1:] = close[1:] / close[:-1] - 1
+    return returns
+
+
+def volatility_kernel(close, window: int = 20, periods_per_year: Optional[float] = None) -> np.ndarray:
+    """수익률 이동 표준편차 (periods_per_year 가 주어지면 연율화)"""
+    vol = rolling_std_kernel(returns_kernel(close), window)
+    return vol * np.sqrt(periods_per_year) if periods_per_year else vol
+
+
+def volume_zscore_kernel(volume, window: int = 20) -> np.ndarray:
+    """거래량 z-score ((현재 - 이동평균) / 이동 표준편차)"""
+    volume = _as_float(volume)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (volume - rolling_mean_kernel(volume, window)) / rolling_std_kernel(volume, window)
+
+
+def sma_seeded_ema_kernel(values, length: int) -> np.ndarray:
+    """
+    pandas_ta ema 와 같은 EMA: 첫 유효값부터 length 개 단순평균을 시작값으로 사용 (adjust=False)
+    """
+    values = _as_float(values)
+    out = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if not len(valid) or len(values) - valid[0] < length:
+        return out
+    start = valid[0]
+    segment = values[start:].copy()
+    seed = np.nanmean(segment[:length])
+    segment[:length - 1] = np.nan
+    segment[length - 1] = seed
+    out[start:] = pd.Series(segment).ewm(span=length, adjust=False).mean().to_numpy()
+    return out
+
+
+def ta_rsi_kernel(close, length: int = 14) -> np.ndarray:
+    """
+    pandas_ta rsi 와 같은 RSI (상승/하락폭의 RMA, ewm adjust=True, 유효값 length 개부터 출력)
+    calculate_rsi (단순 이동평균 방식) 와는 값이 다름
+    """
+    delta = np.diff(_as_float(close), prepend=np.nan)
+    moves = pd.DataFrame({"up": np.where(delta > 0, delta, 0.0), "down": np.where(delta < 0, -delta, 0.0)})
+    moves[np.isnan(delta)] = np.nan
+    avg = moves.ewm(alpha=1.0 / length, min_periods=length).mean().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 * avg[:, 0] / (avg[:, 0] + avg[:, 1])
+
+
+def ta_macd_kernel(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    pandas_ta macd 와 같은 MACD (macd, signal, histogram) - 각 EMA 는 단순평균 시작값 사용
+    """
+    macd = sma_seeded_ema_kernel(close, fast) - sma_seeded_ema_kernel(close, slow)
+    signal_line = sma_seeded_ema_kernel(macd, signal)
+    return macd, signal_line, macd - signal_line
+
+
 class TechnicalIndicators:
     """기술적 지표 계산 클래스"""
     
@@ -73,6 +244,130 @@ class TechnicalIndicators:
             logger.error(f"MACD 계산 실패: {e}")
             return None
     
+    @staticmethod
+    def continue_ema(values: np.ndarray, seed: float, span: int) -> np.ndarray:
+        """
+        EMA(adjust=False) 이어서 계산 (seed = 직전 EMA 값)
+        pandas ewm(span, adjust=False).mean() 의 갱신식과 같은 연산 순서 -> 전체 재계산과 동일한 값
+        """
+        alpha = 2.0 / (span + 1.0)
+        old_wt = 1.0 - alpha
+        out = np.empty(len(values), dtype=np.float64)
+        weighted = seed
+        for k, cur in enumerate(values):
+            if weighted != cur:
+                weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+            out[k] = weighted
+        return out
+
+    @staticmethod
+    def _column(data: pd.DataFrame, name: str) -> pd.Series:
+        return data[name] if name in data.columns else data[name.capitalize()]
+
+    @staticmethod
+    def calculate_atr(data: pd.DataFrame, period: int = 14) -> Optional[pd.Series]:
+        """ATR 계산"""
+        try:
+            if len(data) < period + 1:
+                logger.warning(f"ATR 계산: 데이터 부족 (필요: {period + 1}, 현재: {len(data)})")
+                return None
+            col = TechnicalIndicators._column
+            atr = atr_kernel(col(data, 'high'), col(data, 'low'), col(data, 'close'), period)
+            return pd.Series(atr, index=data.index, name="atr")
+        except Exception as e:
+            logger.error(f"ATR 계산 실패: {e}")
+            return None
+
+    @staticmethod
+    def calculate_bollinger(
+        data: pd.DataFrame,
+        period: int = 20,
+        num_std: float = 2.0
+    ) -> Optional[Tuple[pd.Series, pd.Series, pd.Series]]:
+        """볼린저 밴드 계산 (하단, 중심, 상단)"""
+        try:
+            if len(data) < period:
+                logger.warning(f"볼린저 밴드 계산: 데이터 부족")
+                return None
+            lower, mid, upper = bollinger_kernel(TechnicalIndicators._column(data, 'close'), period, num_std)
+            return (
+                pd.Series(lower, index=data.index, name="bb_lower"),
+                pd.Series(mid, index=data.index, name="bb_mid"),
+                pd.Series(upper, index=data.index, name="bb_upper")
+            )
+        except Exception as e:
+            logger.error(f"볼린저 밴드 계산 실패: {e}")
+            return None
+
+    @staticmethod
+    def calculate_vwap(data: pd.DataFrame, reset: Optional[str] = "D") -> Optional[pd.Series]:
+        """
+        VWAP 계산
+        :param reset: "D" 면 인덱스 시간대 기준 날짜마다 누적 초기화, None 이면 전체 누적
+        """
+        try:
+            col = TechnicalIndicators._column
+            groups = None
+            if reset == "D" and isinstance(data.index, pd.DatetimeIndex):
+                groups = data.index.normalize().asi8
+            vwap = vwap_kernel(col(data, 'high'), col(data, 'low'), col(data, 'close'), col(data, 'volume'), groups)
+            return pd.Series(vwap, index=data.index, name="vwap")
+        except Exception as e:
+            logger.error(f"VWAP 계산 실패: {e}")
+            return None
+
+    @staticmethod
+    def calculate_adx(data: pd.DataFrame, period: int = 14) -> Optional[Tuple[pd.Series, pd.Series, pd.Series]]:
+        """ADX 계산 (ADX, +DI, -DI)"""
+        try:
+            if len(data) < 2 * period:
+                logger.warning(f"ADX 계산: 데이터 부족 (필요: {2 * period}, 현재: {len(data)})")
+                return None
+            col = TechnicalIndicators._column
+            adx, plus_di, minus_di = adx_kernel(col(data, 'high'), col(data, 'low'), col(data, 'close'), period)
+            return (
+                pd.Series(adx, index=data.index, name="adx"),
+                pd.Series(plus_di, index=data.index, name="plus_di"),
+                pd.Series(minus_di, index=data.index, name="minus_di")
+            )
+        except Exception as e:
+            logger.error(f"ADX 계산 실패: {e}")
+            return None
+
+    @staticmethod
+    def calculate_obv(data: pd.DataFrame) -> Optional[pd.Series]:
+        """OBV 계산"""
+        try:
+            col = TechnicalIndicators._column
+            return pd.Series(obv_kernel(col(data, 'close'), col(data, 'volume')), index=data.index, name="obv")
+        except Exception as e:
+            logger.error(f"OBV 계산 실패: {e}")
+            return None
+
+    @staticmethod
+    def calculate_rolling_volatility(
+        data: pd.DataFrame,
+        window: int = 20,
+        periods_per_year: Optional[float] = None
+    ) -> Optional[pd.Series]:
+        """수익률 이동 표준편차 계산"""
+        try:
+            vol = volatility_kernel(TechnicalIndicators._column(data, 'close'), window, periods_per_year)
+            return pd.Series(vol, index=data.index, name="volatility")
+        except Exception as e:
+            logger.error(f"변동성 계산 실패: {e}")
+            return None
+
+    @staticmethod
+    def calculate_volume_zscore(data: pd.DataFrame, window: int = 20) -> Optional[pd.Series]:
+        """거래량 z-score 계산"""
+        try:
+            zscore = volume_zscore_kernel(TechnicalIndicators._column(data, 'volume'), window)
+            return pd.Series(zscore, index=data.index, name="volume_zscore")
+        except Exception as e:
+            logger.error(f"거래량 z-score 계산 실패: {e}")
+            return None
+
     @staticmethod
     def get_latest_rsi(data: pd.DataFrame, period: int = RSI_PERIOD) -> Optional[float]:
         """최신 RSI 값 반환"""
@@ -101,3 +396,151 @@ class TechnicalIndicators:
             "histogram": float(histogram.iloc[-1])
         }
 
+
+# ========== 스트리밍 (봉 1개씩 갱신) ==========
+
+class _Wilder:
+    """Wilder 평활 상태 (wilder_kernel 과 같은 갱신식)"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 1.0 / period
+        self.count = 0
+        self.value = np.nan
+
+    def update(self, x: float) -> float:
+        if x != x:  # NaN 은 건너뜀
+            return self.value if self.count >= self.period else np.nan
+        self.count += 1
+        if self.count == 1:
+            self.value = x
+        elif self.value != x:
+            old_wt = 1.0 - self.alpha
+            self.value = (old_wt * self.value + self.alpha * x) / (old_wt + self.alpha)
+        return self.value if self.count >= self.period else np.nan
+
+
+class StreamingATR:
+    """실시간 ATR"""
+
+    def __init__(self, period: int = 14):
+        self._rma = _Wilder(period)
+        self._prev_close = None
+        self.value = np.nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = high - low
+        if self._prev_close is not None:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self.value = self._rma.update(tr)
+        return self.value
+
+
+class StreamingBollinger:
+    """실시간 볼린저 밴드 (최근 period 개 창)"""
+
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        self.num_std = num_std
+        self._window = deque(maxlen=period)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        self._window.append(close)
+        if len(self._window) < self._window.maxlen:
+            return np.nan, np.nan, np.nan
+        values = np.fromiter(self._window, dtype=np.float64)
+        mid, std = values.mean(), values.std()
+        return mid - self.num_std * std, mid, mid + self.num_std * std
+
+
+class StreamingVWAP:
+    """실시간 VWAP (reset() 으로 세션 초기화)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._pv = 0.0
+        self._volume = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        self._pv += (high + low + close) / 3.0 * volume
+        self._volume += volume
+        return self._pv / self._volume if self._volume > 0 else np.nan
+
+
+class StreamingADX:
+    """실시간 ADX (adx, +DI, -DI)"""
+
+    def __init__(self, period: int = 14):
+        self._atr = _Wilder(period)
+        self._plus = _Wilder(period)
+        self._minus = _Wilder(period)
+        self._adx = _Wilder(period)
+        self._prev = None
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float, float]:
+        if self._prev is None:
+            self._prev = (high, low, close)
+            return np.nan, np.nan, np.nan
+        prev_high, prev_low, prev_close = self._prev
+        self._prev = (high, low, close)
+        up, down = high - prev_high, prev_low - low
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        atr = self._atr.update(tr)
+        plus = self._plus.update(up if (up > down and up > 0) else 0.0)
+        minus = self._minus.update(down if (down > up and down > 0) else 0.0)
+        if atr != atr or not atr:
+            return np.nan, np.nan, np.nan
+        plus_di, minus_di = 100 * plus / atr, 100 * minus / atr
+        total = plus_di + minus_di
+        dx = 100 * abs(plus_di - minus_di) / total if total else np.nan
+        return self._adx.update(dx), plus_di, minus_di
+
+
+class StreamingOBV:
+    """실시간 OBV"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._prev_close = None
+
+    def update(self, close: float, volume: float) -> float:
+        if self._prev_close is None:
+            self.value = volume
+        else:
+            self.value += np.sign(close - self._prev_close) * volume
+        self._prev_close = close
+        return self.value
+
+
+class StreamingVolatility:
+    """실시간 수익률 이동 표준편차"""
+
+    def __init__(self, window: int = 20, periods_per_year: Optional[float] = None):
+        self._returns = deque(maxlen=window)
+        self._prev_close = None
+        self._scale = np.sqrt(periods_per_year) if periods_per_year else 1.0
+
+    def update(self, close: float) -> float:
+        if self._prev_close is not None:
+            self._returns.append(close / self._prev_close - 1)
+        self._prev_close = close
+        if len(self._returns) < self._returns.maxlen:
+            return np.nan
+        return float(np.fromiter(self._returns, dtype=np.float64).std(ddof=1)) * self._scale
+
+
+class StreamingVolumeZScore:
+    """실시간 거래량 z-score"""
+
+    def __init__(self, window: int = 20):
+        self._window = deque(maxlen=window)
+
+    def update(self, volume: float) -> float:
+        self._window.append(volume)
+        if len(self._window) < self._window.maxlen:
+            return np.nan
+        values = np.fromiter(self._window, dtype=np.float64)
+        std = values.std(ddof=1)
+        return float((volume - values.mean()) / std) if std else np.nan
@@ -2,7 +2,6 @@
 전환 매매 전략 (Reverse/Flip Trading Strategy)
 손실 포지션을 반대로 뒤집는 전략을 파라미터 기반으로 구현
 """
-from pickle import TRUE
 import pandas as pd
 import numpy as np
 from typing import Optional, Dict, List, Tuple
@@ -36,7 +35,7 @@ from config.settings import (
     REVERSAL_MARKET_SENTIMENT_INDEX,
     get_etf_by_original
 )
-from strategy.indicators import TechnicalIndicators
+from strategy.indicators import TechnicalIndicators, returns_kernel, rolling_mean_kernel, volatility_kernel
 from strategy.signal_generator import SignalGenerator, SignalType
 from utils.logger import logger
 
@@ -61,7 +60,13 @@ class ReversalStrategy:
         # SignalGenerator에 rsi_oversold 파라미터 전달
         # optimize_rsi_threshold.py 등에서 "rsi_oversold" 키로 값을 넘길 예정
         rsi_oversold = self.params.get("rsi_oversold")
-        self.signal_generator = SignalGenerator(rsi_oversold=rsi_oversold)
+        # 지표 파라미터 (없으면 settings 기본값) / 최적화용 지표 변형 묶음
+        self.signal_generator = SignalGenerator(
+            rsi_oversold=rsi_oversold,
+            rsi_period=self.params.get("rsi_period"),
+            macd_params=self.params.get("macd"),
+            indicator_grid=self.params.get("indicator_grid")
+        )
         
         # 전략 상태
         self.current_position = None  # "LONG", "SHORT", None
@@ -141,23 +146,19 @@ class ReversalStrategy:
         return True
 
     def calculate_volatility(self, data: pd.DataFrame) -> float:
-        """변동성 계산"""
+        """변동성 계산 (전체 구간 수익률 표준편차)"""
         if len(data) < 2:
             return 0.0
         
-        returns = data['close'].pct_change().dropna()
-        volatility = returns.std()
-        return float(volatility)
+        close = data['close'].to_numpy(dtype=float)
+        return float(volatility_kernel(close, window=len(close) - 1)[-1])
     
     def calculate_price_momentum(self, data: pd.DataFrame) -> float:
         """가격 모멘텀 계산 (전일 대비 상승률)"""
         if len(data) < 2:
             return 0.0
         
-        current_price = data['close'].iloc[-1]
-        previous_price = data['close'].iloc[-2]
-        momentum = (current_price - previous_price) / previous_price
-        return float(momentum)
+        return float(returns_kernel(data['close'].to_numpy(dtype=float)[-2:])[-1])
     
     def calculate_volume_ratio(self, data: pd.DataFrame) -> float:
         """거래량 비율 계산 (평균 대비)"""
@@ -165,13 +166,13 @@ class ReversalStrategy:
             return 1.0
         
         lookback = self.params.get("lookback_window", 10)
-        current_volume = data['volume'].iloc[-1]
-        avg_volume = data['volume'].tail(lookback).mean()
+        volume = data['volume'].to_numpy(dtype=float)[-lookback:]
+        avg_volume = rolling_mean_kernel(volume, lookback)[-1]
         
         if avg_volume == 0:
             return 1.0
         
-        return float(current_volume / avg_volume)
+        return float(volume[-1] / avg_volume)
     
     def check_market_conditions(
         self,
@@ -304,7 +305,8 @@ class ReversalStrategy:
         etf_long_price: float,
         etf_short_price: float,
         current_time: datetime,
-        reason: str = "전환 매매"
+        reason: str = "전환 매매",
+        apply_delay: bool = True
     ) -> Optional[Dict]:
         """
         전환 매매 실행
@@ -318,6 +320,7 @@ class ReversalStrategy:
             etf_short_price: 숏 ETF 현재가
             current_time: 
             reason: 전환 이유
+            apply_delay: 반전 지연 적용 여부 (실거래는 주문 파이프라인이 처리하므로 False)
         
         Returns:
             거래 결과 딕셔너리 또는 None
@@ -335,7 +338,7 @@ class ReversalStrategy:
         
         # 반전 확인 조건 체크
         target_side = "SHORT" if self.current_position == "LONG" else "LONG"
-        confirmed = TRUE
+        confirmed = True
         confirm_reason = "STOP LOSS REVERSE"
         #confirmed, confirm_reason = self.check_reverse_confirmation(original_data, target_side)
         
@@ -394,7 +397,7 @@ class ReversalStrategy:
             )
         
         # 반전 지연 시간 적용
-        if self.params.get("reverse_delay", 0) > 0:
+        if apply_delay and self.params.get("reverse_delay", 0) > 0:
             delay_seconds = self.params.get("reverse_delay", 60)
             logger.info(f"반전 지연: {delay_seconds}초 대기")
             time.sleep(min(delay_seconds, 5))  # 최대 5초만 대기 (테스트용)
@@ -503,7 +506,11 @@ class ReversalStrategy:
         if not self.current_position or not self.entry_price:
             return None
         
-        print(f"self.entry_time: {self.entry_time.strftime('%Y-%m-%d %H:%M')}, self.current_etf_symbol: {self.current_etf_symbol}, self.current_position: {self.current_position}, self.entry_price: {self.entry_price:.2f}, current_price: {current_price:.2f}")
+        # 봉 단위 디버그 출력 (레벨 미달 시 포맷 생략)
+        logger.debug(
+            "self.entry_time: %s, self.current_etf_symbol: %s, self.current_position: %s, self.entry_price: %.2f, current_price: %.2f",
+            self.entry_time, self.current_etf_symbol, self.current_position, self.entry_price, current_price
+        )
         pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
         #if self.current_position == "LONG":
         #    pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
@@ -1,6 +1,7 @@
 """
 매매 신호 생성 모듈
 """
+import numpy as np
 import pandas as pd
 from typing import Optional, Dict
 from enum import Enum
@@ -8,11 +9,14 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from strategy.indicators import TechnicalIndicators
+from strategy.indicator_cache import indicator_cache
+from strategy.indicator_matrix import IndicatorMatrix
 from config.settings import (
     RSI_PERIOD, RSI_OVERSOLD, RSI_OVERBOUGHT, RSI_MIDDLE,
     MACD_FAST, MACD_SLOW, MACD_SIGNAL
 )
 from utils.logger import logger
+from utils.latency import timer, timed
 
 class SignalType(Enum):
     """매매 신호 타입"""
@@ -31,12 +35,22 @@ class PositionSignalType(Enum):
 class SignalGenerator:
     """매매 신호 생성 클래스"""
     
-    def __init__(self, rsi_oversold=None):
+    def __init__(self, rsi_oversold=None, rsi_period=None, macd_params=None, indicator_grid=None):
+        """
+        :param rsi_period: RSI 기간 (기본: RSI_PERIOD)
+        :param macd_params: (fast, slow, signal) (기본: MACD_FAST, MACD_SLOW, MACD_SIGNAL)
+        :param indicator_grid: 백테스트 지표 변형 묶음 {"rsi_periods": [...], "macd": [(f, s, g), ...]}
+                               주어지면 전체 변형을 한 번에 계산(캐시)하고 이 조합의 열만 사용
+        """
         self.indicators = TechnicalIndicators()
+        self.rsi_period = int(rsi_period) if rsi_period else RSI_PERIOD
+        self.macd_params = tuple(int(v) for v in macd_params) if macd_params else (MACD_FAST, MACD_SLOW, MACD_SIGNAL)
+        self.indicator_grid = indicator_grid
         # 기본값은 설정파일의 RSI_OVERSOLD(30) + 10 = 40.
         # 파라미터로 전달된 값이 있으면 그 값을 그대로 임계값으로 사용.
         self.rsi_oversold = rsi_oversold if rsi_oversold is not None else (RSI_OVERSOLD + 10)
     
+    @timed("signal.generate_signal")
     def generate_signal(
         self, 
         data: pd.DataFrame,
@@ -68,13 +82,14 @@ class SignalGenerator:
                     "reason": "데이터 부족"
                 }
             
-            # RSI 계산
-            rsi = self.indicators.get_latest_rsi(data, RSI_PERIOD)
-            
-            # MACD 계산
-            macd_data = self.indicators.get_latest_macd(
-                data, MACD_FAST, MACD_SLOW, MACD_SIGNAL
-            )
+            with timer("signal.indicators"):
+                # RSI 계산
+                rsi = self.indicators.get_latest_rsi(data, self.rsi_period)
+                
+                # MACD 계산
+                macd_data = self.indicators.get_latest_macd(
+                    data, *self.macd_params
+                )
             
             if rsi is None or macd_data is None:
                 return {
@@ -107,6 +122,128 @@ class SignalGenerator:
                 "reason": f"오류: {str(e)}"
             }
     
+    def precompute_indicators(self, data: pd.DataFrame, cache_key: tuple = None) -> Optional[Dict[str, np.ndarray]]:
+        """
+        백테스트용: 전체 구간 RSI/MACD 를 한 번에 계산
+        RSI(rolling)/MACD(ewm, adjust=False)는 과거 값만 사용하므로
+        i 번째 값 = data[:i+1] 로 generate_signal 을 호출했을 때의 최신값
+        :param cache_key: (source, symbol, interval) 가 주어지면 지표 디스크 캐시 사용 (봉 추가 시 꼬리만 계산)
+        """
+        if data is None or len(data) < 50:
+            return None
+        if self.indicator_grid:
+            matrix = self.precompute_indicator_matrix(data, self.indicator_grid, cache_key)
+            variant = matrix.variant(self.rsi_period, self.macd_params)
+            if variant is not None:
+                return variant
+            logger.warning(f"지표 행렬에 없는 조합: RSI {self.rsi_period}, MACD {self.macd_params} -> 단일 계산")
+        if cache_key is None:
+            return self._compute_indicators(data)
+        source, symbol, interval = cache_key
+        return indicator_cache.load_or_compute(
+            data, source, symbol, interval, "signal",
+            {"rsi": self.rsi_period, "macd": list(self.macd_params)},
+            compute=self._compute_indicators,
+            extend=self._extend_indicators,
+        )
+
+    @staticmethod
+    def precompute_indicator_matrix(data: pd.DataFrame, grid: dict, cache_key: tuple = None) -> IndicatorMatrix:
+        """
+        지표 변형 행렬 (RSI 기간 x MACD 조합) 계산 - 같은 데이터/묶음이면 디스크 캐시에서 로드
+        최적화에서 지표 파라미터를 바꿔도 첫 조합만 계산하고 나머지는 열 선택
+        """
+        rsi_periods = [int(p) for p in grid.get("rsi_periods", [RSI_PERIOD])]
+        macd_params = [tuple(int(v) for v in p) for p in grid.get("macd", [(MACD_FAST, MACD_SLOW, MACD_SIGNAL)])]
+
+        def compute(frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+            return IndicatorMatrix.compute(frame, rsi_periods, macd_params).columns
+
+        if cache_key is None:
+            columns = compute(data)
+        else:
+            source, symbol, interval = cache_key
+            columns = indicator_cache.load_or_compute(
+                data, source, symbol, interval, "signal_matrix",
+                {"rsi_periods": rsi_periods, "macd": macd_params},
+                compute=compute,
+            )
+        return IndicatorMatrix(rsi_periods, macd_params, columns)
+
+    def _compute_indicators(self, data: pd.DataFrame) -> Optional[Dict[str, np.ndarray]]:
+        rsi = self.indicators.calculate_rsi(data, self.rsi_period)
+        macd = self.indicators.calculate_macd(data, *self.macd_params)
+        if rsi is None or macd is None:
+            return None
+        macd_line, signal_line, histogram = macd
+        close = data['close']
+        fast, slow, _ = self.macd_params
+        return {
+            "rsi": rsi.to_numpy(dtype=float),
+            "macd": macd_line.to_numpy(dtype=float),
+            "signal": signal_line.to_numpy(dtype=float),
+            "histogram": histogram.to_numpy(dtype=float),
+            # 캐시 확장용 EMA 상태
+            "ema_fast": close.ewm(span=fast, adjust=False).mean().to_numpy(dtype=float),
+            "ema_slow": close.ewm(span=slow, adjust=False).mean().to_numpy(dtype=float),
+        }
+
+    def _extend_indicators(self, data: pd.DataFrame, cached: Dict[str, np.ndarray], rows: int) -> Optional[Dict[str, np.ndarray]]:
+        """캐시된 앞 rows 봉 이후 구간만 계산 (RSI 는 직전 구간 포함 rolling, EMA 는 직전 값에서 이어서)"""
+        period = self.rsi_period
+        fast, slow, signal = self.macd_params
+        if rows < period + 1:
+            return None
+        rsi = self.indicators.calculate_rsi(data.iloc[rows - period - 1:], period)
+        if rsi is None:
+            return None
+        close = data['close'].to_numpy(dtype=float)[rows:]
+        ema_fast = self.indicators.continue_ema(close, cached["ema_fast"][-1], fast)
+        ema_slow = self.indicators.continue_ema(close, cached["ema_slow"][-1], slow)
+        macd_line = ema_fast - ema_slow
+        signal_line = self.indicators.continue_ema(macd_line, cached["signal"][-1], signal)
+        return {
+            "rsi": rsi.to_numpy(dtype=float)[period + 1:],
+            "macd": macd_line,
+            "signal": signal_line,
+            "histogram": macd_line - signal_line,
+            "ema_fast": ema_fast,
+            "ema_slow": ema_slow,
+        }
+
+    def generate_signal_at(
+        self,
+        indicators: Optional[Dict[str, np.ndarray]],
+        length: int,
+        current_position: Optional[str] = None
+    ) -> Dict[str, any]:
+        """
+        precompute_indicators 결과로 신호 생성 (generate_signal(data[:length]) 과 동일)
+        """
+        if indicators is None or length < 50:
+            return {
+                "signal": SignalType.HOLD,
+                "rsi": None,
+                "macd": None,
+                "confidence": 0.0,
+                "reason": "데이터 부족"
+            }
+        pos = length - 1
+        rsi = float(indicators["rsi"][pos])
+        macd_data = {
+            "macd": float(indicators["macd"][pos]),
+            "signal": float(indicators["signal"][pos]),
+            "histogram": float(indicators["histogram"][pos])
+        }
+        signal, confidence, reason = self._analyze_signals_only_long(rsi, macd_data, current_position)
+        return {
+            "signal": signal,
+            "rsi": rsi,
+            "macd": macd_data,
+            "confidence": confidence,
+            "reason": reason
+        }
+
     def _analyze_signals(
         self,
         rsi: float,
@@ -8,6 +8,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from tesla_reversal_trading_bot import TeslaReversalTradingBot
 from utils.logger import logger
+from utils.state_manager import TradeStateManager
 
 def test_restoration():
     # 1. 가짜 상태 파일 생성
@@ -20,6 +21,8 @@ def test_restoration():
         "capital": 59.98
     }
     
+    # 이전 실행의 저널이 남아 있으면 제거 후 스냅샷만 생성
+    TradeStateManager().clear_state()
     with open("bot_state.json", "w", encoding="utf-8") as f:
         json.dump(mock_state, f, indent=4)
         
@@ -43,9 +46,8 @@ def test_restoration():
         logger.info("계좌 동기화 로직 실행 (경고가 발생해야 정상)...")
         bot.sync_internal_state_with_account()
         
-        # 다시 상태 로드해서 지워졌는지 확인 (지워지면 안됨)
-        with open("bot_state.json", "r", encoding="utf-8") as f:
-            final_state = json.load(f)
+        # 다시 상태 로드해서 지워졌는지 확인 (지워지면 안됨, 스냅샷 + 저널 기준)
+        final_state = TradeStateManager().load_state() or {}
             
         if final_state.get('current_position') == "SHORT":
             logger.info("✅ 비파괴적 동기화 성공 (정보가 유지됨)")
@@ -22,7 +22,8 @@ def test_telegram():
         return
 
     print("🚀 Telegram 테스트 메시지 전송 시도...")
-    notifier = TelegramNotifier(token=token, chat_id=chat_id)
+    # 발송 결과를 바로 확인하기 위해 동기 발송 사용
+    notifier = TelegramNotifier(token=token, chat_id=chat_id, async_send=False)
     
     # 일반 메시지 테스트
     success = notifier.send_message("🔔 <b>테스트 메시지</b>\n이 메시지가 보이면 설정이 완료된 것입니다.")
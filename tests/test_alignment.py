@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtester.alignment import align_asof, build_index, exact_positions
+
+
+class TestAsofAlignment(unittest.TestCase):
+    def setUp(self):
+        hours = pd.date_range("2024-01-02 00:00", periods=6, freq="h", tz="UTC")
+        self.a = pd.DataFrame({"close": np.arange(6, dtype=float)}, index=hours)
+        # 01:00, 04:00 봉 누락
+        self.b = pd.DataFrame({"close": [10.0, 12.0, 13.0, 15.0]}, index=hours[[0, 2, 3, 5]])
+        # 02:00 부터 시작
+        self.c = pd.DataFrame({"close": [20.0, 21.0]}, index=hours[[2, 4]])
+
+    def test_union_forward_fill_and_staleness(self):
+        aligned = align_asof({"a": self.a, "b": self.b, "c": self.c}, how="union")
+        self.assertEqual(len(aligned.index), 6)
+        np.testing.assert_array_equal(aligned["b", "close"], [10, 10, 12, 13, 13, 15])
+        np.testing.assert_array_equal(aligned["c", "close"], [np.nan, np.nan, 20, 20, 21, 21])
+        np.testing.assert_array_equal(aligned.counts("b"), [1, 1, 2, 3, 3, 4])
+        self.assertEqual(list(aligned.stale("b")), [False, True, False, False, True, False])
+        self.assertEqual(list(aligned.stale("b", max_age=pd.Timedelta(hours=1))), [False] * 6)
+        self.assertEqual(list(aligned.stale("c", max_age="1h")), [True, True, False, False, False, False])
+        self.assertEqual(aligned.age("b")[1], np.timedelta64(3600, "s"))
+
+    def test_intersection_and_exact_positions(self):
+        aligned = align_asof({"a": self.a, "b": self.b, "c": self.c})
+        self.assertEqual(list(aligned.index), [self.a.index[2]])
+        master = build_index([self.b.index, self.c.index], how="union")
+        self.assertEqual(list(exact_positions(self.c.index, master)), [-1, 0, -1, 1, -1])
+        with self.assertRaises(ValueError):
+            build_index([self.a.index], how="outer")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+import asyncio
+import sys
+import os
+from datetime import datetime
+import pytz
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.async_scheduler import (
+    AsyncScheduler, CronTrigger, IntervalTrigger, ManualClock,
+    OVERLAP_SKIP, OVERLAP_QUEUE, OVERLAP_CONCURRENT
+)
+
+KST = pytz.timezone("Asia/Seoul")
+EASTERN = pytz.timezone("US/Eastern")
+
+class TestCronTrigger(unittest.TestCase):
+    def test_hourly_kst(self):
+        trigger = CronTrigger(minute=31, second=20, timezone="Asia/Seoul")
+        after = KST.localize(datetime(2024, 7, 1, 10, 40))
+        self.assertEqual(trigger.next_fire(after), KST.localize(datetime(2024, 7, 1, 11, 31, 20)))
+
+    def test_eastern_market_open_follows_dst(self):
+        # 09:30 ET = 22:30 KST (서머타임) / 23:30 KST (표준시)
+        trigger = CronTrigger(minute=30, hour=9, day_of_week="0-4", timezone="US/Eastern")
+        summer = trigger.next_fire(KST.localize(datetime(2024, 7, 1, 12, 0)))
+        winter = trigger.next_fire(KST.localize(datetime(2024, 12, 2, 12, 0)))
+        self.assertEqual(summer.astimezone(KST).hour, 22)
+        self.assertEqual(winter.astimezone(KST).hour, 23)
+
+    def test_dst_gap_and_repeat(self):
+        # 2024-03-10 02:30 ET 는 존재하지 않음 -> 다음날로
+        trigger = CronTrigger(minute=30, hour=2, timezone="US/Eastern")
+        fire = trigger.next_fire(EASTERN.localize(datetime(2024, 3, 10, 0, 0)))
+        self.assertEqual(fire.date().day, 11)
+        # 2024-11-03 01:30 ET 는 두 번 존재 -> 한 번만 실행
+        trigger = CronTrigger(minute=30, hour=1, timezone="US/Eastern")
+        first = trigger.next_fire(EASTERN.localize(datetime(2024, 11, 3, 0, 0)))
+        second = trigger.next_fire(first)
+        self.assertEqual(second.astimezone(EASTERN).day, 4)
+
+    def test_invalid_field(self):
+        with self.assertRaises(ValueError):
+            CronTrigger(minute=61)
+
+class TestAsyncScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clock = ManualClock(KST.localize(datetime(2024, 7, 1, 10, 0, 0)))
+        self.scheduler = AsyncScheduler(clock=self.clock)
+
+    def _run(self, scenario):
+        async def main():
+            runner = asyncio.ensure_future(self.scheduler.run())
+            await asyncio.sleep(0)
+            await scenario()
+            self.scheduler.stop()
+            await self.clock.advance(1000)
+            await runner
+        asyncio.run(main())
+
+    def test_interval_runs(self):
+        calls = []
+
+        async def job():
+            calls.append(self.clock.now())
+
+        self.scheduler.add_job(job, IntervalTrigger(seconds=60))
+
+        async def scenario():
+            await self.clock.advance(180)
+
+        self._run(scenario)
+        self.assertEqual(len(calls), 3)
+
+    def _slow_job(self, duration, log):
+        async def job():
+            log.append("start")
+            await self.clock.sleep(duration)
+            log.append("end")
+        return job
+
+    def test_overlap_skip(self):
+        log = []
+        job = self.scheduler.add_job(self._slow_job(90, log), IntervalTrigger(seconds=60), overlap=OVERLAP_SKIP)
+
+        async def scenario():
+            await self.clock.advance(150)
+
+        self._run(scenario)
+        self.assertEqual(job.skip_count, 1)
+
+    def test_overlap_queue_and_concurrent(self):
+        queued_log, concurrent_log = [], []
+        self.scheduler.add_job(self._slow_job(90, queued_log), IntervalTrigger(seconds=60), overlap=OVERLAP_QUEUE)
+        self.scheduler.add_job(self._slow_job(90, concurrent_log), IntervalTrigger(seconds=60), overlap=OVERLAP_CONCURRENT)
+
+        async def scenario():
+            await self.clock.advance(130)
+
+        self._run(scenario)
+        # queue: 두 번째 실행은 첫 번째 종료 후 시작
+        self.assertEqual(queued_log[:3], ["start", "end", "start"])
+        # concurrent: 두 실행이 겹침
+        self.assertEqual(concurrent_log[:2], ["start", "start"])
+
+    def test_timeout_cancels_coroutine(self):
+        log = []
+        job = self.scheduler.add_job(self._slow_job(120, log), IntervalTrigger(seconds=60), timeout=30)
+
+        async def scenario():
+            await self.clock.advance(100)
+
+        self._run(scenario)
+        self.assertEqual(job.timeout_count, 1)
+        self.assertNotIn("end", log)
+
+    def test_group_serializes(self):
+        log = []
+
+        def make(name):
+            async def job():
+                log.append(f"{name}-start")
+                await self.clock.sleep(10)
+                log.append(f"{name}-end")
+            return job
+
+        self.scheduler.add_job(make("a"), IntervalTrigger(seconds=60), group="bot")
+        self.scheduler.add_job(make("b"), IntervalTrigger(seconds=60), group="bot")
+
+        async def scenario():
+            await self.clock.advance(75)
+
+        self._run(scenario)
+        self.assertEqual(log, ["a-start", "a-end", "b-start", "b-end"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_fetcher.catalog as catalog_module
+from data_fetcher.catalog import DataCatalog
+from data_fetcher.bar_pyramid import BarPyramid, can_derive
+from data_fetcher.resampler import convert_interval
+
+
+def _minutes(bars: int) -> pd.DataFrame:
+    rng = np.random.default_rng(9)
+    index = pd.date_range("2024-05-01 09:00", periods=bars, freq="5min", name="datetime")
+    close = 100 + np.cumsum(rng.normal(0, 0.1, bars))
+    return pd.DataFrame({
+        "open": close, "high": close + 1, "low": close - 1, "close": close + 0.5,
+        "volume": rng.integers(1, 100, bars)
+    }, index=index)
+
+
+class TestBarPyramid(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        catalog = DataCatalog(db_path=os.path.join(self.tmp.name, "catalog.db"), root=self.tmp.name)
+        patcher = patch.object(catalog_module, "_catalog", catalog)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pyramid = BarPyramid("kis", "TEST", root=self.tmp.name)
+        os.makedirs(os.path.dirname(self.pyramid.path("5m")))
+        self.data = _minutes(5000)
+
+    def _read(self, interval):
+        return pd.read_csv(self.pyramid.path(interval), index_col="datetime", parse_dates=True)
+
+    def test_incremental_update_matches_full_build(self):
+        self.data.iloc[:3001].to_csv(self.pyramid.path("5m"))
+        first = self.pyramid.update(["15m", "1h", "1d", "1m"])
+        self.assertNotIn("1m", first)
+
+        # New bars arrive (the last 1h / 1d bars of the first pass were partial)
+        self.data.iloc[3001:].to_csv(self.pyramid.path("5m"), mode="a", header=False)
+        second = self.pyramid.update(["15m", "1h", "1d"])
+        self.assertLess(second["1h"], len(convert_interval(self.data, "1h")))
+
+        for interval in ("15m", "1h", "1d"):
+            expected = convert_interval(self.data, interval)
+            stored = self._read(interval)
+            self.assertTrue(stored.index.equals(expected.index), interval)
+            np.testing.assert_allclose(stored.to_numpy(float), expected.to_numpy(float))
+
+    def test_ensure_derives_missing_interval(self):
+        self.data.to_csv(self.pyramid.path("5m"))
+        self.assertEqual(self.pyramid.available(), ["5m"])
+        hourly = self.pyramid.load("1h")
+        self.assertEqual(len(hourly), len(convert_interval(self.data, "1h")))
+        self.assertEqual(self.pyramid.available(), ["5m", "1h"])
+        with self.assertRaises(FileNotFoundError):
+            self.pyramid.ensure("1m")
+
+    def test_update_never_rebuilds_downloaded_files(self):
+        self.data.iloc[:200].to_csv(self.pyramid.path("5m"))
+        hourly = convert_interval(self.data, "1h")
+        hourly["rsi"] = 50.0  # downloaded, then rewritten with indicator columns
+        hourly.to_csv(self.pyramid.path("1h"))
+        before = open(self.pyramid.path("1h")).read()
+
+        written = self.pyramid.update(["15m", "1h"])
+        self.assertNotIn("1h", written)
+        self.assertIn("15m", written)
+        self.assertEqual(open(self.pyramid.path("1h")).read(), before)
+
+        # Plain OHLCV download of the fetched interval: protected by keep
+        convert_interval(self.data, "30m").to_csv(self.pyramid.path("30m"))
+        before = open(self.pyramid.path("30m")).read()
+        self.assertNotIn("30m", self.pyramid.update(["30m"], keep=["30m"]))
+        self.assertEqual(open(self.pyramid.path("30m")).read(), before)
+
+    def test_can_derive(self):
+        self.assertTrue(can_derive("5m", "1h"))
+        self.assertTrue(can_derive("1h", "1w"))
+        self.assertFalse(can_derive("10m", "15m"))
+        self.assertFalse(can_derive("1h", "5m"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_fetcher.catalog as catalog_module
+from data_fetcher.catalog import DataCatalog
+from data_fetcher.resampler import resample_csv
+
+
+def _write_minutes(path: str, bars: int, drop=()) -> pd.DataFrame:
+    index = pd.date_range("2024-06-03 09:00", periods=bars, freq="5min", name="datetime")
+    close = np.linspace(100, 110, bars)
+    frame = pd.DataFrame({"open": close, "high": close, "low": close, "close": close, "volume": 10}, index=index)
+    frame = frame.drop(frame.index[list(drop)])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    frame.to_csv(path)
+    return frame
+
+
+class TestDataCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, "data")
+        self.catalog = DataCatalog(db_path=os.path.join(self.root, "catalog.db"), root=self.root)
+        self.addCleanup(setattr, catalog_module, "_catalog", catalog_module._catalog)
+        catalog_module._catalog = self.catalog
+
+    def test_record_and_stats(self):
+        path = os.path.join(self.root, "kis", "TEST", "5m.csv")
+        frame = _write_minutes(path, 60, drop=(10, 11, 30))
+        entry = self.catalog.record_path(path)
+        self.assertEqual(entry["rows"], len(frame))
+        self.assertEqual((entry["gaps"], entry["max_gap_min"]), (2, 15.0))
+        self.assertEqual(entry["tz"], "Asia/Seoul")
+        self.assertEqual(pd.Timestamp(entry["first_ts"]), pd.Timestamp("2024-06-03 09:00", tz="Asia/Seoul"))
+        self.assertEqual(self.catalog.list(source="kis")[0]["checksum"], entry["checksum"])
+
+    def test_writes_update_catalog_and_stale_entries_rescan(self):
+        src = os.path.join(self.root, "kis", "TEST", "5m.csv")
+        _write_minutes(src, 120)
+        dest = os.path.join(self.root, "kis", "TEST", "1h.csv")
+        resample_csv(src, {"1h": dest})
+        self.assertEqual(self.catalog.get("kis", "TEST", "1h", refresh=False)["rows"], 10)
+
+        _write_minutes(dest, 3)  # changed outside the catalog
+        self.assertIsNone(self.catalog.fresh("kis", "TEST", "1h"))
+        self.assertEqual(self.catalog.get("kis", "TEST", "1h")["rows"], 3)
+
+    def test_paths_outside_root_are_not_recorded(self):
+        with tempfile.TemporaryDirectory() as other:
+            path = os.path.join(other, "5m.csv")
+            _write_minutes(path, 5)
+            catalog_module.record_write(path)
+            with self.assertRaises(ValueError):
+                self.catalog.record_path(path)
+        self.assertEqual(self.catalog.list(), [])
+
+    def test_rebuild_drops_missing_files(self):
+        path = os.path.join(self.root, "yfinance", "AAA", "1d.csv")
+        _write_minutes(path, 5)
+        self.assertEqual(self.catalog.rebuild()["recorded"], 1)
+        os.remove(path)
+        self.assertEqual(self.catalog.rebuild()["removed"], 1)
+        self.assertEqual(self.catalog.list(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_fetcher.catalog as catalog_module
+from data_fetcher.catalog import DataCatalog
+from backtester.engine import dataset_info, prepare_dataset
+from backtester.csv_range import read_range
+
+
+def _write_hourly(path: str, bars: int, shuffle: bool = False) -> pd.DataFrame:
+    rng = np.random.default_rng(2)
+    index = pd.date_range("2024-01-02 09:00", periods=bars, freq="h", name="datetime")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    frame = pd.DataFrame({
+        "open": close, "high": close + 1, "low": close - 1, "close": close,
+        "volume": rng.integers(100, 1000, bars)
+    }, index=index)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    (frame.sample(frac=1, random_state=0) if shuffle else frame).to_csv(path)
+    return frame
+
+
+class TestDatasetLoading(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp.name)
+        catalog = DataCatalog(db_path=os.path.join(self.tmp.name, "data", "catalog.db"), root="data")
+        patcher = patch.object(catalog_module, "_catalog", catalog)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.frame = _write_hourly("data/kis/TEST/1h.csv", 3000)
+
+    def test_range_matches_full_load(self):
+        full = prepare_dataset("TEST", "1h")
+        ranged = prepare_dataset("TEST", "1h", start="2024-02-01", end="2024-03-01")
+        expected = full[(full.index >= "2024-02-01") & (full.index <= "2024-03-01")]
+        self.assertTrue(ranged.index.equals(expected.index))
+        np.testing.assert_array_equal(ranged["close"], expected["close"])
+        # Warm-up rows make the indicators match the full-history values
+        np.testing.assert_allclose(ranged["rsi"], expected["rsi"], rtol=0, atol=1e-4)
+        np.testing.assert_allclose(ranged["macd_signal"], expected["macd_signal"], rtol=0, atol=1e-4)
+
+    def test_columns_and_warmup_rows(self):
+        raw = read_range("data/kis/TEST/1h.csv", pd.Timestamp("2024-02-01", tz="Asia/Seoul"), None, warmup=5)
+        self.assertEqual(raw["datetime"].iloc[5], "2024-02-01 00:00:00")
+        ranged = prepare_dataset("TEST", "1h", tz=None, start="2024-02-01 00:00", columns=["close"])
+        self.assertEqual(list(ranged.columns), ["close"])
+        self.assertEqual(ranged.index[0], pd.Timestamp("2024-02-01", tz="Asia/Seoul"))
+
+    def test_dataset_info(self):
+        info = dataset_info("TEST", "1h")
+        self.assertEqual(info["start"], self.frame.index[0].tz_localize("Asia/Seoul").tz_convert("UTC"))
+        self.assertEqual(info["end"], self.frame.index[-1].tz_localize("Asia/Seoul").tz_convert("UTC"))
+        self.assertEqual(info["columns"], ["open", "high", "low", "close", "volume"])
+
+    def test_unsorted_file_falls_back_to_full_read(self):
+        _write_hourly("data/kis/MESS/1h.csv", 500, shuffle=True)
+        info = dataset_info("MESS", "1h", tz=None)
+        self.assertEqual(info["start"], pd.Timestamp("2024-01-02 09:00", tz="Asia/Seoul"))
+        ranged = prepare_dataset("MESS", "1h", tz=None, start="2024-01-05", end="2024-01-06")
+        self.assertEqual(len(ranged), 25)
+        self.assertTrue(ranged.index.is_monotonic_increasing)
+
+
+if __name__ == '__main__':
+    unittest.main()
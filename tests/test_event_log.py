@@ -0,0 +1,63 @@
+import unittest
+import tempfile
+import sys
+import os
+from datetime import datetime
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtester.event_log import TradeEventLog, merge_event_logs, EVENT_COMBO, EVENT_START, EVENT_ENTRY, EVENT_EXIT
+from analyze_optimization_log import load_events, analyze_events
+
+
+class TestTradeEventLog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "events.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_analyze_capital_and_drawdown(self):
+        with TradeEventLog(self.path, buffer_size=2) as log:
+            log.set_context(combo=1)
+            log.emit(EVENT_COMBO, params={"take_profit": 0.1})
+            log.emit(EVENT_START, symbol="TSLA", capital=1000.0)
+            log.emit(EVENT_ENTRY, symbol="TSLA", time=datetime(2025, 1, 2, 23, 30), fee=5.0, delta=-5.0)
+            log.emit(EVENT_EXIT, symbol="TSLA", fee=5.0, pnl=-95.0, delta=-95.0, reason="STOP_LOSS")
+            log.emit(EVENT_ENTRY, symbol="TSLA", fee=4.0, delta=-4.0)
+            log.emit(EVENT_EXIT, symbol="TSLA", fee=6.0, pnl=200.0, delta=200.0, reason="TAKE_PROFIT")
+            # 거래 없는 조합
+            log.set_context(combo=2)
+            log.emit(EVENT_COMBO, params={"take_profit": 0.2})
+            log.emit(EVENT_START, symbol="TSLA", capital=1000.0)
+
+        summary = analyze_events(load_events(self.path)).set_index("combo")
+        self.assertAlmostEqual(summary.loc[1, "final_capital"], 1096.0)
+        self.assertAlmostEqual(summary.loc[1, "min_capital"], 896.0)
+        self.assertAlmostEqual(summary.loc[1, "max_drawdown_pct"], -10.4)
+        self.assertEqual(summary.loc[1, "trades"], 2)
+        self.assertAlmostEqual(summary.loc[1, "total_fee"], 20.0)
+        self.assertEqual(summary.loc[1, "params"], "take_profit:10.0%")
+        self.assertAlmostEqual(summary.loc[2, "final_capital"], 1000.0)
+        self.assertEqual(summary.loc[2, "trades"], 0)
+
+    def test_merge_parts_in_order(self):
+        parts = []
+        for i, symbol in enumerate(["TSLA", "NVDA"]):
+            part = f"{self.path}.{i}.part"
+            with TradeEventLog(part) as log:
+                log.emit(EVENT_START, symbol=symbol, capital=1000.0)
+                log.emit(EVENT_EXIT, symbol=symbol, delta=10.0)
+            parts.append(part)
+
+        merge_event_logs(parts, self.path)
+        events = load_events(self.path)
+        self.assertEqual(list(events["seq"]), [1, 2, 3, 4])
+        self.assertEqual(list(events["symbol"]), ["TSLA", "TSLA", "NVDA", "NVDA"])
+        self.assertFalse(any(os.path.exists(p) for p in parts))
+
+
+if __name__ == '__main__':
+    unittest.main()
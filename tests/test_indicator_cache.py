@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategy.indicator_cache import IndicatorCache
+import strategy.signal_generator as signal_generator
+from strategy.signal_generator import SignalGenerator
+
+
+def _frame(bars: int, seed: int = 0) -> pd.DataFrame:
+    index = pd.date_range("2024-01-02", periods=bars, freq="h", tz="UTC")
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, bars)))
+    return pd.DataFrame({"close": close}, index=index)
+
+
+class TestIndicatorCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = IndicatorCache(root=self.tmp.name, enabled=True)
+        self.calls = 0
+
+    def _compute(self, data):
+        self.calls += 1
+        return {"double": data["close"].to_numpy() * 2}
+
+    def _get(self, data, extend=None):
+        return self.cache.load_or_compute(data, "kis", "TSLA", "1h", "double", {"k": 2}, self._compute, extend)
+
+    def test_hit_and_invalidate(self):
+        data = _frame(100)
+        first = self._get(data)
+        again = self._get(data)
+        np.testing.assert_array_equal(first["double"], again["double"])
+        self.assertEqual((self.calls, self.cache.hits), (1, 1))
+
+        changed = data.copy()
+        changed.iloc[10, 0] += 1.0
+        self._get(changed)
+        self.assertEqual(self.calls, 2)
+
+    def test_append_extends_tail_only(self):
+        data = _frame(120)
+        self._get(data.iloc[:100])
+        extended = self._get(data, extend=lambda d, cached, rows: {"double": d["close"].to_numpy()[rows:] * 2})
+        self.assertEqual((self.calls, self.cache.extends), (1, 1))
+        np.testing.assert_array_equal(extended["double"], data["close"].to_numpy() * 2)
+
+
+class TestSignalIndicatorCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.original = signal_generator.indicator_cache
+        signal_generator.indicator_cache = IndicatorCache(root=self.tmp.name, enabled=True)
+        self.addCleanup(setattr, signal_generator, "indicator_cache", self.original)
+
+    def test_incremental_matches_full_compute(self):
+        generator = SignalGenerator()
+        data = _frame(400, seed=3)
+        key = ("kis", "TSLA", "1h")
+        generator.precompute_indicators(data.iloc[:300], cache_key=key)
+        extended = generator.precompute_indicators(data, cache_key=key)
+        self.assertEqual(signal_generator.indicator_cache.extends, 1)
+
+        full = generator.precompute_indicators(data)
+        for name in ("rsi", "macd", "signal", "histogram"):
+            np.testing.assert_allclose(extended[name], full[name], rtol=0, atol=1e-9, equal_nan=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
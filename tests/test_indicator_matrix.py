@@ -0,0 +1,50 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategy.indicators import TechnicalIndicators
+from strategy.indicator_matrix import IndicatorMatrix, rsi_matrix
+from strategy.signal_generator import SignalGenerator
+
+
+class TestIndicatorMatrix(unittest.TestCase):
+    def setUp(self):
+        close = 100 * np.exp(np.cumsum(np.random.default_rng(7).normal(0, 0.01, 2000)))
+        self.data = pd.DataFrame({"close": close})
+        self.macd_params = [(12, 26, 9), (8, 21, 5), (12, 21, 9)]
+        self.matrix = IndicatorMatrix.compute(self.data, range(3, 31), self.macd_params)
+
+    def test_shapes(self):
+        self.assertEqual(self.matrix.rsi.shape, (2000, 28))
+        self.assertEqual(self.matrix.macd.shape, (2000, 3))
+        self.assertIsNone(self.matrix.variant(2, (12, 26, 9)))
+
+    def test_matches_single_calculation(self):
+        for period in (3, 5, 14, 30):
+            expected = TechnicalIndicators.calculate_rsi(self.data, period).to_numpy()
+            np.testing.assert_allclose(self.matrix.variant(period, (12, 26, 9))["rsi"], expected, atol=1e-8, equal_nan=True)
+        for params in self.macd_params:
+            macd, signal, histogram = TechnicalIndicators.calculate_macd(self.data, *params)
+            variant = self.matrix.variant(5, params)
+            np.testing.assert_array_equal(variant["macd"], macd.to_numpy())
+            np.testing.assert_array_equal(variant["signal"], signal.to_numpy())
+            np.testing.assert_array_equal(variant["histogram"], histogram.to_numpy())
+
+    def test_signal_generator_grid(self):
+        grid = {"rsi_periods": [5, 7], "macd": [(12, 26, 9), (8, 21, 5)]}
+        from_grid = SignalGenerator(rsi_period=7, macd_params=(8, 21, 5), indicator_grid=grid).precompute_indicators(self.data)
+        single = SignalGenerator(rsi_period=7, macd_params=(8, 21, 5)).precompute_indicators(self.data)
+        np.testing.assert_allclose(from_grid["rsi"], single["rsi"], atol=1e-8, equal_nan=True)
+        np.testing.assert_array_equal(from_grid["signal"], single["signal"])
+
+    def test_short_input(self):
+        self.assertTrue(np.isnan(rsi_matrix([1.0], [3])).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategy.indicators import (
+    TechnicalIndicators, StreamingATR, StreamingBollinger, StreamingVWAP, StreamingADX,
+    StreamingOBV, StreamingVolatility, StreamingVolumeZScore, obv_kernel, vwap_kernel,
+    sma_seeded_ema_kernel, ta_macd_kernel, ta_rsi_kernel
+)
+from backtester.engine import _indicator_backend
+from strategy.reversal_strategy import ReversalStrategy
+
+try:
+    import pandas_ta  # noqa: F401
+    HAS_PANDAS_TA = True
+except ImportError:
+    HAS_PANDAS_TA = False
+
+
+def _ohlcv(bars: int, seed: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    spread = np.abs(rng.normal(0, 0.5, bars))
+    index = pd.date_range("2024-01-02 09:30", periods=bars, freq="h")
+    return pd.DataFrame({
+        "open": close,
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.integers(100, 1000, bars).astype(float),
+    }, index=index)
+
+
+class TestNativeIndicators(unittest.TestCase):
+    def setUp(self):
+        self.data = _ohlcv(300)
+
+    def test_known_values(self):
+        np.testing.assert_array_equal(obv_kernel([10, 11, 11, 9], [5, 3, 4, 2]), [5, 8, 8, 6])
+        vwap = vwap_kernel([2, 4, 6], [2, 4, 6], [2, 4, 6], [1, 1, 2], groups=[0, 0, 1])
+        np.testing.assert_allclose(vwap, [2, 3, 6])
+
+        lower, mid, upper = TechnicalIndicators.calculate_bollinger(self.data, 20)
+        close = self.data["close"]
+        np.testing.assert_allclose(mid, close.rolling(20).mean(), equal_nan=True)
+        np.testing.assert_allclose(upper - mid, 2 * close.rolling(20).std(ddof=0), equal_nan=True)
+
+        vol = TechnicalIndicators.calculate_rolling_volatility(self.data, 20)
+        np.testing.assert_allclose(vol, close.pct_change().rolling(20).std(), equal_nan=True)
+
+    def test_adx_range(self):
+        adx, plus_di, minus_di = TechnicalIndicators.calculate_adx(self.data, 14)
+        valid = adx.dropna()
+        self.assertEqual(adx.first_valid_index(), self.data.index[2 * 14 - 1])
+        self.assertTrue(((valid >= 0) & (valid <= 100)).all())
+
+    def test_streaming_matches_vectorized(self):
+        data = self.data
+        atr = TechnicalIndicators.calculate_atr(data, 14).to_numpy()
+        bands = np.column_stack(TechnicalIndicators.calculate_bollinger(data, 20))
+        vwap = TechnicalIndicators.calculate_vwap(data, reset=None).to_numpy()
+        adx = np.column_stack(TechnicalIndicators.calculate_adx(data, 14))
+        obv = TechnicalIndicators.calculate_obv(data).to_numpy()
+        vol = TechnicalIndicators.calculate_rolling_volatility(data, 20).to_numpy()
+        zscore = TechnicalIndicators.calculate_volume_zscore(data, 20).to_numpy()
+
+        s_atr, s_bb, s_vwap, s_adx = StreamingATR(14), StreamingBollinger(20), StreamingVWAP(), StreamingADX(14)
+        s_obv, s_vol, s_z = StreamingOBV(), StreamingVolatility(20), StreamingVolumeZScore(20)
+        for i, (high, low, close, volume) in enumerate(data[["high", "low", "close", "volume"]].to_numpy()):
+            np.testing.assert_allclose(s_atr.update(high, low, close), atr[i], rtol=1e-10, equal_nan=True)
+            np.testing.assert_allclose(s_bb.update(close), bands[i], rtol=1e-10, equal_nan=True)
+            np.testing.assert_allclose(s_vwap.update(high, low, close, volume), vwap[i], rtol=1e-10)
+            np.testing.assert_allclose(s_adx.update(high, low, close), adx[i], rtol=1e-9, equal_nan=True)
+            self.assertEqual(s_obv.update(close, volume), obv[i])
+            np.testing.assert_allclose(s_vol.update(close), vol[i], rtol=1e-9, equal_nan=True)
+            np.testing.assert_allclose(s_z.update(volume), zscore[i], rtol=1e-9, equal_nan=True)
+
+    def test_insufficient_data(self):
+        self.assertIsNone(TechnicalIndicators.calculate_atr(self.data.iloc[:5], 14))
+        self.assertIsNone(TechnicalIndicators.calculate_adx(self.data.iloc[:20], 14))
+
+
+class TestStrategyMarketStats(unittest.TestCase):
+    def test_matches_pandas_formulas(self):
+        # ReversalStrategy 시장 조건 통계가 커널로 바뀌어도 기존 pandas 계산값과 동일
+        strategy = ReversalStrategy()
+        lookback = strategy.params.get("lookback_window", 10)
+        for bars in (2, 3, lookback, 200):
+            data = _ohlcv(bars, seed=bars)
+            close, volume = data['close'], data['volume']
+            np.testing.assert_allclose(strategy.calculate_volatility(data), close.pct_change().dropna().std(),
+                                       rtol=1e-12, equal_nan=True)
+            self.assertAlmostEqual(strategy.calculate_price_momentum(data),
+                                   (close.iloc[-1] - close.iloc[-2]) / close.iloc[-2], places=15)
+            if bars >= lookback:
+                self.assertAlmostEqual(strategy.calculate_volume_ratio(data),
+                                       volume.iloc[-1] / volume.tail(lookback).mean(), places=12)
+
+
+class TestPandasTaCompatibleKernels(unittest.TestCase):
+    def setUp(self):
+        self.data = _ohlcv(500, seed=4)
+
+    def test_known_values(self):
+        np.testing.assert_allclose(sma_seeded_ema_kernel([1, 2, 3, 4], 3), [np.nan, np.nan, 2, 3], equal_nan=True)
+        rsi = ta_rsi_kernel(self.data["close"], 14)
+        self.assertEqual(int(np.isnan(rsi).sum()), 14)
+        macd, signal, hist = ta_macd_kernel(self.data["close"], 12, 26, 9)
+        self.assertEqual(int(np.isnan(macd).sum()), 25)
+        self.assertEqual(int(np.isnan(signal).sum()), 25 + 8)
+        np.testing.assert_allclose(hist, macd - signal, equal_nan=True)
+
+    def test_backend_columns(self):
+        columns = _indicator_backend("native", 14, 12, 26, 9)(self.data)
+        self.assertEqual(sorted(columns), ["macd", "macd_hist", "macd_signal", "rsi"])
+        if not HAS_PANDAS_TA:
+            self.assertEqual(_indicator_backend("pandas_ta", 14, 12, 26, 9).__name__, "native")
+
+    @unittest.skipUnless(HAS_PANDAS_TA, "pandas_ta not installed")
+    def test_matches_pandas_ta(self):
+        for params in ((14, 12, 26, 9), (5, 8, 21, 5)):
+            native = _indicator_backend("native", *params)(self.data)
+            reference = _indicator_backend("pandas_ta", *params)(self.data)
+            for name, values in reference.items():
+                np.testing.assert_allclose(native[name], values, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import json
+import sys
+import os
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.latency import LatencyRecorder
+
+
+class TestLatencyRecorder(unittest.TestCase):
+    def setUp(self):
+        self.recorder = LatencyRecorder(enabled=True)
+
+    def test_quantiles_within_bucket_error(self):
+        for ms in range(1, 101):
+            self.recorder.record("kis.http", ms / 1000)
+        s = self.recorder.snapshot()["kis.http"]
+        self.assertEqual(s["count"], 100)
+        self.assertAlmostEqual(s["max_sec"], 0.1)
+        # 버킷 상대 오차 25% 이내
+        self.assertTrue(0.05 <= s["p50_sec"] <= 0.05 * 1.25)
+        self.assertTrue(0.095 <= s["p95_sec"] <= 0.1)
+        self.assertLessEqual(s["p99_sec"], s["max_sec"])
+
+    def test_timer_and_decorator(self):
+        @self.recorder.timed("stage.func")
+        def func(x):
+            return x * 2
+
+        self.assertEqual(func(3), 6)
+        with self.assertRaises(ValueError):
+            with self.recorder.timer("stage.block"):
+                raise ValueError("boom")
+        snapshot = self.recorder.snapshot()
+        self.assertEqual(snapshot["stage.func"]["count"], 1)
+        self.assertEqual(snapshot["stage.block"]["count"], 1)
+
+    def test_disabled_records_nothing(self):
+        recorder = LatencyRecorder(enabled=False)
+        with recorder.timer("x"):
+            pass
+        self.assertEqual(recorder.snapshot(), {})
+
+    def test_exports(self):
+        self.recorder.record("telegram.send_message", 0.2)
+        data = json.loads(self.recorder.to_json())
+        self.assertIn("telegram.send_message", data)
+        prom = self.recorder.to_prometheus()
+        self.assertIn('trading_bot_stage_latency_seconds{stage="telegram.send_message",quantile="0.99"}', prom)
+        self.assertIn('trading_bot_stage_latency_seconds_count{stage="telegram.send_message"} 1', prom)
+
+
+if __name__ == '__main__':
+    unittest.main()
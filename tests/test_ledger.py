@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtester.ledger import EquityCurve, TradeLedger, SIDE_LONG, SIDE_SHORT
+from backtester.metrics import compute_metrics, trade_metrics
+
+
+class TestEquityCurve(unittest.TestCase):
+    def test_append_grows_and_round_trips(self):
+        times = pd.date_range("2024-01-01", periods=100, freq="h", tz="Asia/Seoul")
+        curve = EquityCurve(capacity=4)
+        for i, t in enumerate(times):
+            curve.append(t, 1000.0 + i)
+        self.assertEqual(len(curve), 100)
+        self.assertEqual(curve[-1], {'time': times[-1], 'capital': 1099.0})
+        self.assertEqual(str(curve[0]['time'].tzinfo), "Asia/Seoul")
+        np.testing.assert_array_equal(curve.times_ns, times.as_unit("ns").asi8)
+        frame = curve.to_frame()
+        self.assertTrue(frame.index.equals(times))
+        self.assertEqual(frame['capital'].iloc[10], 1010.0)
+
+    def test_dict_append_compat(self):
+        curve = EquityCurve()
+        curve.append({'time': pd.Timestamp("2024-01-01", tz="UTC"), 'capital': 5.0})
+        self.assertEqual([e['capital'] for e in curve], [5.0])
+
+
+class TestTradeLedger(unittest.TestCase):
+    def setUp(self):
+        self.t0 = pd.Timestamp("2024-01-02 10:00", tz="UTC")
+        self.ledger = TradeLedger(capacity=1)
+        self.ledger.record(self.t0, self.t0 + pd.Timedelta(hours=2), "TSLL", "LONG", 10.0, 11.0, 5, 4.0, 10.0, 1.0, "TAKE_PROFIT")
+        self.ledger.append({
+            'entry_time': self.t0, 'exit_time': self.t0 + pd.Timedelta(hours=5), 'symbol': "TSLZ", 'side': "SHORT",
+            'entry_price': 20.0, 'exit_price': 19.0, 'quantity': 2, 'pnl': -3.0, 'pnl_pct': -5.0, 'fee': 1.0,
+            'reason': "CUSTOM_EXIT"
+        })
+
+    def test_records_are_typed_rows(self):
+        rows = self.ledger.rows
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(list(rows['side']), [SIDE_LONG, SIDE_SHORT])
+        self.assertEqual(self.ledger[0]['reason'], "TAKE_PROFIT")
+        self.assertEqual(self.ledger[-1]['reason'], "CUSTOM_EXIT")
+        self.assertEqual(self.ledger[-1]['symbol'], "TSLZ")
+        self.assertEqual(self.ledger[0]['exit_time'], self.t0 + pd.Timedelta(hours=2))
+
+    def test_to_frame(self):
+        frame = self.ledger.to_frame()
+        self.assertEqual(list(frame['side']), ["LONG", "SHORT"])
+        self.assertEqual(list(frame['reason']), ["TAKE_PROFIT", "CUSTOM_EXIT"])
+        self.assertEqual(frame['pnl'].sum(), 1.0)
+
+    def test_metrics_match_dict_history(self):
+        from_ledger = trade_metrics(self.ledger)
+        from_dicts = trade_metrics(list(self.ledger))
+        self.assertEqual(from_ledger, from_dicts)
+
+        curve = EquityCurve()
+        for i in range(8):
+            curve.append(self.t0 + pd.Timedelta(hours=i), 100.0 + i)
+        m = compute_metrics(curve, self.ledger, initial_capital=100.0)
+        self.assertAlmostEqual(m['exposure_pct'], 6 / 9 * 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
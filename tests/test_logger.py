@@ -0,0 +1,103 @@
+import unittest
+import logging
+import json
+import queue
+import tempfile
+import time
+import sys
+import os
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.logger as logger_module
+from utils.logger import (
+    SizedTimedRotatingFileHandler, JsonLinesFormatter, LazyQueueHandler, set_quiet, logger,
+    flush_logging, disable_file_logging
+)
+
+
+class SlowHandler(logging.Handler):
+    """기록에 시간이 걸리는 핸들러 (큐가 비어도 마지막 레코드는 아직 쓰는 중)"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        time.sleep(0.05)
+        self.records.append(record)
+
+
+class TestLogger(unittest.TestCase):
+    def test_size_rotation(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bot.log")
+            handler = SizedTimedRotatingFileHandler(path, max_bytes=200, when="midnight", backupCount=3, encoding="utf-8")
+            test_logger = logging.getLogger("test_size_rotation")
+            test_logger.addHandler(handler)
+            test_logger.setLevel(logging.INFO)
+            for i in range(30):
+                test_logger.info("line %d %s", i, "x" * 20)
+            handler.close()
+            test_logger.removeHandler(handler)
+            # 현재 파일 + 교체된 백업 파일
+            self.assertEqual(len(os.listdir(tmpdir)), 4)
+
+    def test_json_lines_formatter(self):
+        record = logging.LogRecord("trading_bot", logging.INFO, __file__, 1, "entry %s @ %.2f", ("TSLL", 10.5), None)
+        record.event = {"type": "ENTRY", "symbol": "TSLL"}
+        entry = json.loads(JsonLinesFormatter().format(record))
+        self.assertEqual(entry["message"], "entry TSLL @ 10.50")
+        self.assertEqual(entry["event"]["symbol"], "TSLL")
+
+    def test_queue_handler_defers_formatting(self):
+        self.assertTrue(any(isinstance(h, LazyQueueHandler) for h in logger.handlers))
+        record = logging.LogRecord("trading_bot", logging.INFO, __file__, 1, "value %s", ([1],), None)
+        prepared = LazyQueueHandler(None).prepare(record)
+        self.assertEqual(prepared.msg, "value %s")
+
+    def test_quiet_mode_gates_backtest_logger(self):
+        bar_logger = logger.getChild("backtest")
+        try:
+            set_quiet(True)
+            self.assertFalse(bar_logger.isEnabledFor(logging.INFO))
+            self.assertTrue(bar_logger.isEnabledFor(logging.WARNING))
+            self.assertTrue(logger.isEnabledFor(logging.INFO))
+        finally:
+            set_quiet(False)
+        self.assertTrue(bar_logger.isEnabledFor(logging.INFO))
+
+    def test_flush_waits_for_last_record(self):
+        handler = SlowHandler()
+        log_queue = queue.Queue()
+        listener = logging.handlers.QueueListener(log_queue, handler)
+        listener.start()
+        logger_module._listeners["test_flush"] = listener
+        try:
+            for i in range(3):
+                log_queue.put(logging.LogRecord("test_flush", logging.INFO, __file__, 1, "line %d", (i,), None))
+            flush_logging()
+            self.assertEqual(len(handler.records), 3)
+        finally:
+            logger_module._listeners.pop("test_flush").stop()
+
+    def test_disable_file_logging_keeps_console(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            file_handler = logging.FileHandler(os.path.join(tmpdir, "bot.log"), delay=True)
+            console_handler = logging.StreamHandler()
+            listener = logging.handlers.QueueListener(queue.Queue(), file_handler, console_handler)
+            logger_module._listeners["test_worker"] = listener
+            try:
+                disable_file_logging("test_worker")
+                self.assertEqual(listener.handlers, (console_handler,))
+                self.assertIn(logger_module.LOG_FILE, [os.path.basename(h.baseFilename) for h in
+                                                        logger_module._listeners["trading_bot"].handlers
+                                                        if isinstance(h, logging.FileHandler)])
+            finally:
+                logger_module._listeners.pop("test_worker")
+            self.assertEqual(os.listdir(tmpdir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+from datetime import date, datetime
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.market_calendar as market_calendar
+from utils.market_calendar import (
+    MarketCalendar, SESSION_LABELS, classify_minute, classify_sessions, get_calendar, is_us_dst, session_mask, us_dst_mask
+)
+
+
+class TestSessionLabels(unittest.TestCase):
+    def setUp(self):
+        self.calendar = MarketCalendar("US", np.array([], dtype="datetime64[D]"), "2024-01-01", "2024-12-31")
+
+    def test_vectorized_matches_scalar_rule(self):
+        # 서머타임 시작(3/10)/종료(11/3) 주변 포함
+        index = pd.date_range("2024-03-08", "2024-03-12", freq="7min", tz="UTC").append(
+            pd.date_range("2024-11-01", "2024-11-05", freq="7min", tz="UTC"))
+        labels = self.calendar.session_labels(index)
+        expected = [self.calendar.session_of(t.to_pydatetime()) for t in index]
+        self.assertEqual(list(labels), expected)
+
+    def test_dst_shifts_regular_session(self):
+        # 23:00 KST: 서머타임에는 정규장, 겨울에는 프리마켓
+        index = pd.DatetimeIndex(["2024-07-01 23:00", "2024-01-02 23:00"]).tz_localize("Asia/Seoul")
+        self.assertEqual(list(us_dst_mask(index)), [True, False])
+        self.assertEqual(list(self.calendar.session_labels(index)), ["REGULAR", "PREMARKET"])
+        self.assertEqual(classify_minute("KR", 9 * 60, False), "REGULAR")
+
+    def test_dst_table_matches_timezone(self):
+        # 2007년 이전(4월/10월) 규칙 포함, 전환 전후 1시간 간격
+        index = pd.DatetimeIndex([])
+        for start, end in (("2005-04-02", "2005-04-04"), ("2005-10-29", "2005-10-31"),
+                           ("2024-03-09", "2024-03-11"), ("2024-11-02", "2024-11-04")):
+            index = index.append(pd.date_range(start, end, freq="h", tz="UTC"))
+        expected = [is_us_dst(t.to_pydatetime()) for t in index]
+        self.assertEqual(list(us_dst_mask(index)), expected)
+        self.assertGreater(sum(expected), 0)
+
+    def test_categorical_and_mask(self):
+        # naive 시각은 KST 로 간주
+        index = pd.DatetimeIndex(["2024-01-02 08:45", "2024-01-02 10:00", "2024-01-02 16:00"])
+        sessions = classify_sessions(index, "KR")
+        self.assertEqual(tuple(sessions.categories), SESSION_LABELS)
+        self.assertEqual(list(sessions), ["PREMARKET", "REGULAR", "AFTERMARKET"])
+        self.assertEqual(list(session_mask(sessions)), [False, True, False])
+        self.assertEqual(list(session_mask(sessions, allowed=("PREMARKET", "REGULAR"))), [True, True, False])
+
+
+class TestTradingDays(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = patch.object(market_calendar, "CALENDAR_CACHE_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        market_calendar._CALENDARS.clear()
+        self.addCleanup(market_calendar._CALENDARS.clear)
+
+    def test_add_trading_days_skips_weekend_and_holidays(self):
+        days = np.array(["2024-01-02", "2024-01-03", "2024-01-05", "2024-01-08"], dtype="datetime64[D]")
+        calendar = MarketCalendar("US", days, "2024-01-01", "2024-01-08")
+        self.assertEqual(calendar.add_trading_days(date(2024, 1, 2), 2), date(2024, 1, 5))
+        self.assertEqual(calendar.add_trading_days(date(2024, 1, 6), 1), date(2024, 1, 8))
+        # 유효 구간 이후는 평일 기준
+        self.assertEqual(calendar.add_trading_days(date(2024, 1, 5), 3), date(2024, 1, 10))
+        self.assertEqual(list(calendar.ordinals(pd.DatetimeIndex(["2024-01-03 10:00", "2024-01-04"]))), [1, -1])
+
+    def test_disk_cache_is_reused(self):
+        calendar = get_calendar("US", "2024-01-01", "2024-12-31")
+        self.assertIn(date(2024, 7, 3), calendar.trading_days(date(2024, 7, 1), date(2024, 7, 5)))
+        self.assertFalse(calendar.is_trading_day(datetime(2024, 7, 4)))  # 독립기념일
+
+        market_calendar._CALENDARS.clear()
+        with patch.object(MarketCalendar, "build", side_effect=AssertionError("rebuilt")):
+            cached = get_calendar("US", "2024-01-01", "2024-12-31")
+        np.testing.assert_array_equal(cached.days, calendar.days)
+
+
+if __name__ == '__main__':
+    unittest.main()
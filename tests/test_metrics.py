@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backtester.metrics import (
+    trade_metrics, equity_metrics, compute_metrics, batch_equity_metrics, rank_results, exposure
+)
+
+
+def _trade(side, pnl, reason, entry, exit_, qty=10.0, entry_price=10.0, exit_price=11.0, fee=1.0):
+    return {
+        'side': side, 'pnl': pnl, 'reason': reason, 'entry_time': entry, 'exit_time': exit_,
+        'quantity': qty, 'entry_price': entry_price, 'exit_price': exit_price, 'fee': fee
+    }
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.times = pd.date_range("2024-01-01", periods=10, freq="h", tz="UTC")
+        self.trades = [
+            _trade("LONG", 50.0, "TAKE_PROFIT", self.times[1], self.times[3]),
+            _trade("LONG", -20.0, "STOP_LOSS", self.times[4], self.times[5]),
+            _trade("SHORT", -10.0, "FORCE_CLOSE_TRADING_DAY_LIMIT", self.times[6], self.times[8]),
+        ]
+
+    def test_trade_metrics(self):
+        m = trade_metrics(self.trades)
+        self.assertEqual(m['trades'], 3)
+        self.assertAlmostEqual(m['win_rate'], 100 / 3)
+        self.assertEqual(m['avg_profit'], 50.0)
+        self.assertEqual(m['avg_loss'], -15.0)
+        self.assertEqual(m['max_profit'], 50.0)
+        self.assertEqual(m['max_loss'], -20.0)
+        self.assertAlmostEqual(m['profit_factor'], 50.0 / 30.0)
+        self.assertEqual(m['long_take_profit_win'], 1)
+        self.assertEqual(m['long_stop_loss_loss'], 1)
+        self.assertEqual(m['short_force_close_loss'], 1)
+        self.assertEqual(m['short_win_rate'], 0.0)
+        self.assertEqual(m['total_fee'], 3.0)
+
+    def test_equity_metrics_drawdown(self):
+        m = equity_metrics([100, 120, 90, 110, 130], periods_per_year=252)
+        self.assertAlmostEqual(m['max_drawdown_pct'], -25.0)
+        self.assertAlmostEqual(m['max_drawdown_amount'], -30.0)
+        self.assertAlmostEqual(m['total_return_pct'], 30.0)
+        returns = np.diff([100, 120, 90, 110, 130]) / np.array([100, 120, 90, 110])
+        expected = returns.mean() / returns.std(ddof=1) * np.sqrt(252)
+        self.assertAlmostEqual(m['sharpe'], expected)
+
+    def test_exposure_counts_bars_in_position(self):
+        # 진입 <= t < 청산: 1,2 / 4 / 6,7 -> 5/10
+        value = exposure(self.times, [t['entry_time'] for t in self.trades], [t['exit_time'] for t in self.trades])
+        self.assertAlmostEqual(value, 0.5)
+
+    def test_compute_metrics(self):
+        curve = [{'time': t, 'capital': 1000 + i} for i, t in enumerate(self.times)]
+        m = compute_metrics(curve, self.trades, initial_capital=1000)
+        self.assertEqual(m['trades'], 3)
+        self.assertGreater(m['sharpe'], 0)
+        self.assertEqual(m['max_drawdown_pct'], 0.0)
+        self.assertGreater(m['turnover'], 0)
+
+    def test_batch_matches_single(self):
+        rng = np.random.default_rng(0)
+        curves = 1000 * np.cumprod(1 + rng.normal(0, 0.01, size=(50, 200)), axis=1)
+        batch = batch_equity_metrics(curves, periods_per_year=252)
+        for i in (0, 17, 49):
+            single = equity_metrics(curves[i], periods_per_year=252)
+            self.assertAlmostEqual(batch['sharpe'][i], single['sharpe'])
+            self.assertAlmostEqual(batch['max_drawdown_pct'][i], single['max_drawdown_pct'])
+
+    def test_rank_results(self):
+        df = pd.DataFrame({'sharpe': [1.0, 2.0, 2.0, np.nan], 'total_pnl': [5.0, 1.0, 3.0, 9.0]})
+        ranked = rank_results(df, by=("sharpe", "total_pnl"))
+        self.assertEqual(list(ranked['total_pnl']), [3.0, 1.0, 5.0, 9.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
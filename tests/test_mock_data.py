@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_fetcher.catalog as catalog_module
+import utils.market_calendar as market_calendar
+from data_fetcher.catalog import DataCatalog
+from generate_mock_data import EtfTripleGenerator, MockDataGenerator, generate_benchmark_store, synthetic_targets
+from data_fetcher.quality import validate_file
+
+TARGET = {"ORIGINAL": "AAA", "LONG": "AAAL", "LONG_MULTIPLE": "2", "SHORT": "AAAS", "SHORT_MULTIPLE": "-1"}
+
+
+class TestMockDataGenerator(unittest.TestCase):
+    def test_session_timestamps(self):
+        hourly = MockDataGenerator(days=3, interval="1h")
+        self.assertEqual(len(hourly.dates), 21)
+        self.assertEqual(hourly.dates[0], pd.Timestamp("2024-01-01 09:30"))
+        self.assertEqual(hourly.dates[6], pd.Timestamp("2024-01-01 15:30"))
+        self.assertEqual(hourly.dates[7], pd.Timestamp("2024-01-02 09:30"))
+        self.assertEqual(len(MockDataGenerator(days=2, interval="1m").dates), 780)
+        with self.assertRaises(ValueError):
+            MockDataGenerator(interval="3m")
+
+
+class TestEtfTripleGenerator(unittest.TestCase):
+    def setUp(self):
+        calendar_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(calendar_dir.cleanup)
+        calendar_patch = patch.object(market_calendar, "CALENDAR_CACHE_DIR", calendar_dir.name)
+        calendar_patch.start()
+        self.addCleanup(calendar_patch.stop)
+        market_calendar._CALENDARS.clear()
+        self.addCleanup(market_calendar._CALENDARS.clear)
+        self.generator = EtfTripleGenerator(days=60, interval="30m", seed=7)
+
+    def test_daily_reset_leverage(self):
+        legs = self.generator.generate_triple(0, TARGET)
+        closes = {s: df["close"].to_numpy()[self.generator.last_bar] for s, df in legs.items()}
+        base = np.diff(closes["AAA"]) / closes["AAA"][:-1]
+        fee = self.generator.expense_ratio / 252
+        for symbol, multiple in (("AAAL", 2), ("AAAS", -1)):
+            daily = np.diff(closes[symbol]) / closes[symbol][:-1]
+            np.testing.assert_allclose(daily, multiple * base - fee, atol=1e-12)
+        for df in legs.values():
+            self.assertTrue((df["high"] >= df[["open", "close"]].max(axis=1) - 1e-9).all())
+            self.assertTrue((df["low"] <= df[["open", "close"]].min(axis=1) + 1e-9).all())
+
+    def test_seeded_and_order_independent(self):
+        first = self.generator.generate_triple(1, TARGET)["AAA"]
+        again = EtfTripleGenerator(days=60, interval="30m", seed=7).generate_triple(1, TARGET)["AAA"]
+        pd.testing.assert_frame_equal(first, again)
+        other = EtfTripleGenerator(days=60, interval="30m", seed=8).generate_triple(1, TARGET)["AAA"]
+        self.assertFalse(np.allclose(first["close"], other["close"]))
+
+    def test_store_layout(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp.name)
+        catalog = DataCatalog(db_path=os.path.join(tmp.name, "data", "catalog.db"), root="data")
+        patcher = patch.object(catalog_module, "_catalog", catalog)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        targets = generate_benchmark_store(targets=[], synthetic=2, years=0.1, interval="15m")
+        self.assertEqual(targets, synthetic_targets(2))
+        path = "data/mock/SYN001L/15m.csv"
+        self.assertEqual(open(path).readline().strip(), "datetime,open,high,low,close,volume")
+        report = validate_file(path)
+        self.assertTrue(report.ok, report.issues)
+        self.assertEqual(report.off_session, 0)
+
+        existing = "data/mock/SYN000/15m.csv"
+        before = open(existing).read()
+        with self.assertRaises(FileExistsError):
+            generate_benchmark_store(targets=[], synthetic=1, years=0.1, interval="15m", seed=1)
+        self.assertEqual(open(existing).read(), before)
+        generate_benchmark_store(targets=[], synthetic=1, years=0.1, interval="15m", seed=1, force=True)
+        self.assertNotEqual(open(existing).read(), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
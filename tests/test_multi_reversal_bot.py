@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import TARGET_SYMBOLS
+from trading.order_executor import OrderResult
+from multi_reversal_trading_bot import MultiReversalTradingBot, get_state_file
+
+TARGETS = [
+    {"ORIGINAL": "TSLA", "LONG": "TSLL", "LONG_MULTIPLE": "2", "SHORT": "TSLZ", "SHORT_MULTIPLE": "-2"},
+    {"ORIGINAL": "NVDA", "LONG": "NVDX", "LONG_MULTIPLE": "2", "SHORT": "NVDQ", "SHORT_MULTIPLE": "-2",
+     "LONG_HOLD_DAYS": 5, "SHORT_HOLD_DAYS": 1, "EXIT_ALLOWED_STATUSES": ["REGULAR"]},
+]
+
+class TestMultiReversalBot(unittest.TestCase):
+    @patch('multi_reversal_trading_bot.TradeStateManager')
+    @patch('multi_reversal_trading_bot.KisApi')
+    def setUp(self, mock_kis_api, mock_state_manager):
+        mock_state_manager.return_value.load_state.return_value = None
+        self.kis = mock_kis_api.return_value
+        self.kis._guess_exch_code.return_value = "NAS"
+        self.engine = MultiReversalTradingBot(target_symbols=TARGETS)
+
+    def test_shared_resources(self):
+        self.assertEqual(len(self.engine.bots), 2)
+        for bot in self.engine.bots:
+            self.assertIs(bot.kis, self.engine.kis)
+            self.assertIs(bot.data_fetcher, self.engine.data_fetcher)
+            self.assertIs(bot.notifier, self.engine.notifier)
+        self.assertEqual([b.strategy.params["symbol"] for b in self.engine.bots], ["TSLA", "NVDA"])
+
+    def test_per_pair_overrides(self):
+        tsla, nvda = self.engine.bots
+        self.assertEqual((nvda.long_hold_days, nvda.short_hold_days), (5, 1))
+        self.assertEqual(nvda.exit_allowed_statuses, ["REGULAR"])
+        self.assertEqual(tsla.long_hold_days, tsla.strategy.params.get("long_max_hold_days", 3))
+        self.assertIsNone(tsla.exit_allowed_statuses)
+
+    @patch('multi_reversal_trading_bot.TradeStateManager')
+    @patch('multi_reversal_trading_bot.KisApi')
+    def test_configured_hold_days(self, mock_kis_api, mock_state_manager):
+        # 종목별 봇(tesla/nvda_reversal_trading_bot)에서 통합 엔진으로 옮겨도 보유 기간/청산 제한 유지
+        mock_state_manager.return_value.load_state.return_value = None
+        bots = {b.original_symbol: b for b in MultiReversalTradingBot(target_symbols=TARGET_SYMBOLS).bots}
+        self.assertEqual((bots["TSLA"].long_hold_days, bots["TSLA"].short_hold_days), (3, 1))
+        self.assertIsNone(bots["TSLA"].exit_allowed_statuses)
+        self.assertEqual((bots["NVDA"].long_hold_days, bots["NVDA"].short_hold_days), (5, 1))
+        self.assertEqual(bots["NVDA"].exit_allowed_statuses, ["REGULAR"])
+
+    def test_state_file_per_pair(self):
+        self.assertEqual(get_state_file(TARGETS[0]), "bot_state_TSLA_TSLL_TSLZ.json")
+        self.assertNotEqual(get_state_file(TARGETS[0]), get_state_file(TARGETS[1]))
+
+    def test_sync_fetches_balance_once(self):
+        self.kis.get_overseas_stock_balance.return_value = {"holdings": [], "assets": {}}
+        self.kis.get_balance.return_value = 1000.0
+
+        self.engine.sync_all_with_account()
+
+        self.kis.get_overseas_stock_balance.assert_called_once()
+        self.kis.get_balance.assert_called_once()
+        for bot in self.engine.bots:
+            self.assertEqual(bot.strategy.capital, 500.0)
+
+    def test_price_cache_shared(self):
+        self.kis.get_current_price.return_value = 10.0
+        self.engine.bots[0]._get_current_price("TSLL")
+        self.engine.bots[1]._get_current_price("TSLL")
+        self.kis.get_current_price.assert_called_once_with("TSLL")
+
+    def test_short_close_realizes_inverse_etf_sale(self):
+        # A SHORT position is a bought inverse ETF: PnL = (exit - entry) x qty, capital receives the sale proceeds
+        bot = self.engine.bots[0]
+        bot.strategy.current_position = "SHORT"
+        bot.strategy.current_etf_symbol = "TSLZ"
+        bot.strategy.entry_price = 20.0
+        bot.strategy.entry_quantity = 10
+        bot.strategy.capital = 100.0
+        fill = OrderResult("TSLZ", "SELL", 10, quoted_price=22.0)
+        fill.filled_qty, fill.avg_price = 10, 22.0
+        with patch.object(bot.order_executor, "execute", return_value=fill), patch.object(bot, "_save_state"):
+            bot._close_position(22.0, "take profit")
+
+        trade = bot.strategy.trade_history[-1]
+        self.assertEqual(trade["side"], "SHORT")
+        self.assertAlmostEqual(trade["pnl"], 20.0)
+        self.assertAlmostEqual(trade["pnl_pct"], 10.0)
+        self.assertAlmostEqual(bot.strategy.capital, 320.0)
+        self.assertIsNone(bot.strategy.current_position)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trading.order_executor import (
+    OrderExecutor, ORDER_FILLED, ORDER_PARTIAL, ORDER_UNFILLED, ORDER_REJECTED
+)
+
+
+def make_fill(filled_qty, avg_price, ordered_qty=10, rejected=False):
+    return {
+        "order_no": "0001",
+        "ordered_qty": ordered_qty,
+        "filled_qty": filled_qty,
+        "unfilled_qty": ordered_qty - filled_qty,
+        "avg_price": avg_price,
+        "status_name": "",
+        "rejected": rejected,
+    }
+
+
+class TestOrderExecutor(unittest.TestCase):
+    def setUp(self):
+        self.kis = MagicMock()
+        self.kis.place_order.return_value = {"ODNO": "0001"}
+        self.executor = OrderExecutor(
+            self.kis, fill_timeout=4, poll_initial=0.5, poll_max=2, submit_retries=3, sleep=lambda s: None
+        )
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_full_fill_records_actual_price(self):
+        self.kis.get_order_fill.side_effect = [make_fill(4, 10.0), make_fill(10, 10.2)]
+        result = self.executor.execute("TSLL", "BUY", 10, quoted_price=10.0)
+        self.assertEqual(result.status, ORDER_FILLED)
+        self.assertEqual(result.filled_qty, 10)
+        self.assertAlmostEqual(result.avg_price, 10.2)
+        self.assertAlmostEqual(result.filled_amount, 102.0)
+        self.kis.cancel_order.assert_not_called()
+
+    def test_partial_fill_cancels_remainder(self):
+        self.kis.get_order_fill.return_value = make_fill(6, 9.9)
+        result = self.executor.execute("TSLL", "SELL", 10, quoted_price=10.0)
+        self.assertEqual(result.status, ORDER_PARTIAL)
+        self.assertEqual(result.filled_qty, 6)
+        self.assertEqual(result.unfilled_qty, 4)
+        self.kis.cancel_order.assert_called_once_with("TSLL", "0001", 4)
+
+    def test_no_fill_is_unfilled(self):
+        self.kis.get_order_fill.return_value = make_fill(0, 0)
+        result = self.executor.execute("TSLL", "BUY", 10, quoted_price=10.0)
+        self.assertEqual(result.status, ORDER_UNFILLED)
+        self.assertFalse(result.has_fill)
+
+    def test_submit_rejection_retries(self):
+        self.kis.place_order.return_value = None
+        result = self.executor.execute("TSLL", "BUY", 10, quoted_price=10.0)
+        self.assertEqual(result.status, ORDER_REJECTED)
+        self.assertEqual(self.kis.place_order.call_count, 3)
+        self.kis.get_order_fill.assert_not_called()
+
+    def test_lookup_failure_assumes_quote(self):
+        self.kis.get_order_fill.return_value = None
+        result = self.executor.execute("TSLL", "BUY", 10, quoted_price=10.0)
+        self.assertEqual(result.status, ORDER_FILLED)
+        self.assertFalse(result.fill_confirmed)
+        self.assertAlmostEqual(result.avg_price, 10.0)
+
+    def test_track_runs_in_background(self):
+        self.kis.get_order_fill.return_value = make_fill(10, 10.1)
+        placed = self.executor.place("TSLL", "BUY", 10, quoted_price=10.0)
+        self.assertEqual(placed.order_no, "0001")
+        result = self.executor.track(placed).result(timeout=5)
+        self.assertEqual(result.status, ORDER_FILLED)
+        self.assertIn(result, self.executor.history)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import patch
+import contextlib
+import io
+import tempfile
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.market_calendar as market_calendar
+from strategy.indicator_cache import IndicatorCache
+from reversal_backtest import ReversalBacktester, PortfolioBacktester
+from config.settings import REVERSAL_STRATEGY_PARAMS
+
+
+def _make_frames(n_pairs: int, bars: int = 24 * 60):
+    """원본/2x 롱/1x 숏 가격 시계열 (UTC 1시간 봉)"""
+    index = pd.date_range("2024-01-02 00:00", periods=bars, freq="h", tz="UTC")
+    frames = {}
+    for k in range(n_pairs):
+        rng = np.random.default_rng(k)
+        log_ret = rng.normal(0, 0.01, bars)
+        for suffix, mult in (("", 1), ("L", 2), ("S", -1)):
+            close = (100 if mult == 1 else 20) * np.exp(np.cumsum(log_ret * mult))
+            frames[f"P{k}{suffix}"] = pd.DataFrame({
+                "open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+                "volume": rng.integers(1000, 5000, bars)
+            }, index=index)
+    return frames
+
+
+def _window(frame: pd.DataFrame, start=None, end=None, columns=None) -> pd.DataFrame:
+    """prepare_dataset 의 start/end 필터 (양 끝 포함) + 컬럼 선택"""
+    mask = np.ones(len(frame), dtype=bool)
+    if start is not None:
+        mask &= frame.index >= start
+    if end is not None:
+        mask &= frame.index <= end
+    if columns is not None:
+        frame = frame[[c for c in columns if c in frame.columns]]
+    return frame.loc[mask].copy()
+
+
+def _targets(n_pairs: int):
+    return [
+        {"ORIGINAL": f"P{k}", "LONG": f"P{k}L", "LONG_MULTIPLE": "2", "SHORT": f"P{k}S", "SHORT_MULTIPLE": "-1"}
+        for k in range(n_pairs)
+    ]
+
+
+class TestPortfolioBacktest(unittest.TestCase):
+    def setUp(self):
+        calendar_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(calendar_dir.cleanup)
+        calendar_patch = patch.object(market_calendar, "CALENDAR_CACHE_DIR", calendar_dir.name)
+        calendar_patch.start()
+        self.addCleanup(calendar_patch.stop)
+        market_calendar._CALENDARS.clear()
+        self.addCleanup(market_calendar._CALENDARS.clear)
+        cache_patch = patch("strategy.signal_generator.indicator_cache", IndicatorCache(root=os.path.join(calendar_dir.name, "indicator_cache")))
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+        self.frames = _make_frames(3)
+        patcher = patch(
+            "reversal_backtest.prepare_dataset",
+            side_effect=lambda symbol, interval, source="kis", start=None, end=None, columns=None: _window(
+                self.frames[symbol], start, end, columns
+            )
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.params = REVERSAL_STRATEGY_PARAMS.copy()
+        self.params.update({"capital": 2300, "max_drawdown": 0.9, "reverse_trigger": False})
+
+    def _quiet(self, fn, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args, **kwargs)
+
+    def test_single_symbol_matches_isolated_backtest(self):
+        params = dict(self.params, symbol="P0")
+        single = self._quiet(
+            ReversalBacktester(params=params).run_backtest, "P0", "P0L", "2", "P0S", "-1", "2024-01-01", "2024-12-31"
+        )
+        portfolio = PortfolioBacktester(_targets(1), params=self.params, capital=2300, position_budget_pct=1.0)
+        result = self._quiet(portfolio.run, "2024-01-01", "2024-12-31")
+
+        self.assertGreater(len(single['trades']), 0)
+        self.assertEqual(len(result['trades']), len(single['trades']))
+        self.assertAlmostEqual(result['final_capital'], single['final_capital'], places=6)
+        np.testing.assert_allclose(result['equity_curve'].values, single['equity_curve'].values)
+
+    def test_shared_pool_respects_position_limit(self):
+        portfolio = PortfolioBacktester(_targets(3), params=self.params, capital=6900, max_positions=1)
+        result = self._quiet(portfolio.run, "2024-01-01", "2024-12-31")
+
+        trades = result['trades'].to_frame()
+        self.assertGreater(len(trades), 0)
+        # 최대 1개 심볼만 동시 보유 -> 거래 구간이 겹치지 않음
+        ordered = trades.sort_values("entry_time")
+        self.assertTrue((ordered['entry_time'].iloc[1:].to_numpy() >= ordered['exit_time'].iloc[:-1].to_numpy()).all())
+        self.assertEqual(set(result['symbols']), {"P0", "P1", "P2"})
+        self.assertAlmostEqual(result['total_pnl'], result['final_capital'] - 6900)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import asyncio
+import sys
+import os
+import tempfile
+from unittest.mock import AsyncMock, MagicMock, patch
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_fetcher.catalog as catalog_module
+import utils.market_calendar as market_calendar
+from data_fetcher.catalog import DataCatalog
+from data_fetcher.quality import merge_bars, plan_refetch, validate_file, validate_frame
+from data_fetcher.fetcher import KisFetcher
+
+
+def _us_hourly(start="2024-01-02", end="2024-03-29") -> pd.DataFrame:
+    """Regular-session hourly bars (09:30 ~ 15:30 ET) stored the KIS way: naive KST"""
+    days = pd.bdate_range(start, end)
+    et = pd.DatetimeIndex([d + pd.Timedelta(minutes=570 + 60 * h) for d in days for h in range(7)])
+    et = et.tz_localize("America/New_York")
+    close = np.linspace(100, 120, len(et))
+    return pd.DataFrame(
+        {"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 10},
+        index=pd.Index(et.tz_convert("Asia/Seoul").tz_localize(None), name="datetime")
+    )
+
+
+class TestQualityReport(unittest.TestCase):
+    def setUp(self):
+        calendar_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(calendar_dir.cleanup)
+        calendar_patch = patch.object(market_calendar, "CALENDAR_CACHE_DIR", calendar_dir.name)
+        calendar_patch.start()
+        self.addCleanup(calendar_patch.stop)
+        market_calendar._CALENDARS.clear()
+        self.addCleanup(market_calendar._CALENDARS.clear)
+        self.frame = _us_hourly()
+
+    def test_missing_ranges_and_refetch_windows(self):
+        clean = validate_frame(self.frame, "1h", "TSLA", "kis")
+        holes = validate_frame(self.frame.drop(self.frame.index[[50, 51, 52, 300]]), "1h", "TSLA", "kis")
+        self.assertEqual(holes.missing - clean.missing, 4)
+        self.assertIn({"start": "2024-01-12T00:30:00+09:00", "end": "2024-01-12T03:30:00+09:00", "bars": 3},
+                      holes.missing_ranges)
+
+        windows = plan_refetch(holes, pad_bars=1)
+        self.assertIn((pd.Timestamp("2024-01-11 23:30", tz="Asia/Seoul"), pd.Timestamp("2024-01-12 04:30", tz="Asia/Seoul")),
+                      windows)
+        self.assertEqual(len(plan_refetch(holes, max_windows=1)), 1)
+
+    def test_timezone_and_dst_slips(self):
+        et = self.frame.index.tz_localize("Asia/Seoul").tz_convert("America/New_York").tz_localize(None)
+        shifted = self.frame.set_axis(pd.Index(et, name="datetime"))  # exchange time saved as if it were KST
+        self.assertIn(validate_frame(shifted, "1h", "TSLA", "kis").tz_offset_hours, (13, 14))
+
+        fixed = self.frame.set_axis(pd.Index(et + pd.Timedelta(hours=14), name="datetime"))  # DST ignored
+        report = validate_frame(fixed, "1h", "TSLA", "kis")
+        self.assertGreater(report.dst_shift_days, 0)
+        self.assertFalse(report.ok)
+
+    def test_anomalies(self):
+        bad = self.frame.copy()
+        bad.iloc[10, bad.columns.get_loc("close")] = 0
+        bad.iloc[20, bad.columns.get_loc("high")] = 50
+        bad.iloc[30, bad.columns.get_loc("close")] = 400
+        bad = pd.concat([bad, bad.iloc[[5]]])
+        report = validate_frame(bad, "1h", "TSLA", "kis")
+        self.assertEqual((report.duplicates, report.unsorted, report.bad_prices), (1, 1, 1))
+        self.assertGreaterEqual(report.ohlc_errors, 2)
+        self.assertGreaterEqual(report.spikes, 1)
+
+
+class TestRefetch(unittest.TestCase):
+    def setUp(self):
+        calendar_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(calendar_dir.cleanup)
+        calendar_patch = patch.object(market_calendar, "CALENDAR_CACHE_DIR", calendar_dir.name)
+        calendar_patch.start()
+        self.addCleanup(calendar_patch.stop)
+        market_calendar._CALENDARS.clear()
+        self.addCleanup(market_calendar._CALENDARS.clear)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.tmp.name)
+        catalog = DataCatalog(db_path=os.path.join(self.tmp.name, "data", "catalog.db"), root="data")
+        patcher = patch.object(catalog_module, "_catalog", catalog)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.full = _us_hourly()
+        self.path = "data/kis/TSLA/1h.csv"
+        os.makedirs(os.path.dirname(self.path))
+        self.full.drop(self.full.index[[50, 51, 52, 300]]).to_csv(self.path)
+
+    def test_merge_only_fills_windows(self):
+        windows = plan_refetch(validate_file(self.path))
+        changed = self.full.copy()
+        changed["close"] += 1000  # re-fetched rows outside the gaps must not replace stored ones
+        self.assertEqual(merge_bars(self.path, changed, windows), 4)
+        stored = pd.read_csv(self.path, index_col="datetime", parse_dates=True)
+        self.assertTrue(stored.index.equals(self.full.index))
+        self.assertEqual(int((stored["close"] > 1000).sum()), 4)
+        self.assertEqual(merge_bars(self.path, changed, windows), 0)
+
+    def test_kis_refetch_requests_window_span_only(self):
+        fetcher = KisFetcher(MagicMock())
+        fetcher._fetch_range = AsyncMock(return_value=self.full)
+        windows = plan_refetch(validate_file(self.path))
+        added = asyncio.run(fetcher.refetch_ranges("TSLA", "1h", windows))
+        self.assertEqual(added, 4)
+
+        _, _, start, end = fetcher._fetch_range.call_args.args
+        self.assertEqual(start, windows[0][0].tz_localize(None).to_pydatetime())
+        self.assertEqual(end, windows[-1][1].tz_localize(None).to_pydatetime())
+        self.assertFalse(fetcher._fetch_range.call_args.kwargs["save_batches"])
+        self.assertEqual(validate_file(self.path).missing, validate_frame(self.full, "1h", "TSLA").missing)
+
+
+if __name__ == '__main__':
+    unittest.main()
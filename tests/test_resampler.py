@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_fetcher.catalog as catalog_module
+from data_fetcher.catalog import DataCatalog
+from data_fetcher.resampler import ChunkedResampler, US_REGULAR, convert_interval, resample_csv
+
+
+def _minutes(bars: int, tz="Asia/Seoul") -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    index = pd.date_range("2024-03-01", periods=bars, freq="min", tz=tz)
+    index = index[rng.random(bars) > 0.2]  # gaps
+    close = 100 + np.cumsum(rng.normal(0, 0.1, len(index)))
+    return pd.DataFrame({
+        "open": close, "high": close + 1, "low": close - 1, "close": close + 0.5,
+        "volume": rng.integers(1, 100, len(index))
+    }, index=index)
+
+
+def _run(resampler: ChunkedResampler, data: pd.DataFrame, chunk: int) -> dict:
+    parts = {interval: [] for interval in resampler.targets}
+    for start in range(0, len(data), chunk):
+        for interval, frame in resampler.update(data.iloc[start:start + chunk]).items():
+            parts[interval].append(frame)
+    for interval, frame in resampler.finish().items():
+        parts[interval].append(frame)
+    return {interval: pd.concat(frames) for interval, frames in parts.items()}
+
+
+class TestChunkedResampler(unittest.TestCase):
+    def test_matches_full_resample(self):
+        data = _minutes(60 * 24 * 40)
+        intervals = ["5m", "30m", "1h", "1d", "1w", "1mo"]
+        result = _run(ChunkedResampler(intervals), data, chunk=997)
+        for interval in intervals:
+            expected = convert_interval(data, interval)
+            self.assertTrue(result[interval].index.equals(expected.index), interval)
+            np.testing.assert_allclose(result[interval].to_numpy(float), expected.to_numpy(float))
+
+    def test_session_anchored(self):
+        # US DST starts 2024-03-10: bars must stay at 09:30 ET on both sides
+        data = _minutes(60 * 24 * 14, tz="UTC")
+        result = _run(ChunkedResampler(["1h", "1d"], session=US_REGULAR), data, chunk=1500)
+        hourly = result["1h"].index.tz_convert("America/New_York")
+        self.assertEqual(sorted(set(hourly.strftime("%H:%M"))), [f"{h:02d}:30" for h in range(9, 16)])
+        self.assertEqual(len(result["1d"]), len(set(hourly.date)))
+
+        local = data.tz_convert("America/New_York")
+        minute = local.index.hour * 60 + local.index.minute
+        session = local[(minute >= 570) & (minute < 960)]
+        self.assertEqual(result["1d"]["volume"].sum(), session["volume"].sum())
+
+    def test_resample_csv_keeps_naive_timestamps(self):
+        data = _minutes(3000).tz_localize(None)
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "1m.csv")
+            data.rename_axis("datetime").to_csv(src)
+            targets = {"5m": os.path.join(tmp, "5m.csv"), "1h": os.path.join(tmp, "1h.csv")}
+            catalog = DataCatalog(db_path=os.path.join(tmp, "catalog.db"), root=tmp)
+            with patch.object(catalog_module, "_catalog", catalog):
+                written = resample_csv(src, targets, chunksize=500)
+            hourly = pd.read_csv(targets["1h"], index_col="datetime", parse_dates=True)
+        expected = convert_interval(data, "1h")
+        self.assertEqual(written["1h"], len(expected))
+        self.assertTrue(hourly.index.equals(expected.index))
+
+
+if __name__ == '__main__':
+    unittest.main()
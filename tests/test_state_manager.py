@@ -0,0 +1,91 @@
+import unittest
+import tempfile
+import json
+import sys
+import os
+from datetime import datetime, date
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.state_manager import TradeStateManager
+
+
+class TestTradeStateManager(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "bot_state.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make(self, **kwargs):
+        return TradeStateManager(self.path, fsync_mode="never", **kwargs)
+
+    def test_saves_append_deltas_and_recover(self):
+        manager = self.make()
+        manager.save_state({"capital": 1000, "current_position": None})
+        manager.save_state({"capital": 1000, "current_position": "LONG", "entry_time": datetime(2025, 1, 2, 3, 4)})
+        manager.save_state({"capital": 900, "current_position": "LONG", "entry_time": datetime(2025, 1, 2, 3, 4)})
+        manager.close()
+
+        with open(manager.journal_file, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[1]["set"], {"capital": 900})
+
+        state = self.make().load_state()
+        self.assertEqual(state["capital"], 900)
+        self.assertEqual(state["current_position"], "LONG")
+        self.assertEqual(state["entry_time"], datetime(2025, 1, 2, 3, 4))
+        self.assertNotIn("_journal_id", state)
+
+    def test_torn_tail_is_ignored(self):
+        manager = self.make()
+        manager.save_state({"capital": 1000})
+        manager.save_state({"capital": 950})
+        manager.close()
+        with open(manager.journal_file, "a", encoding="utf-8") as f:
+            f.write('{"id": "x", "seq": 2, "set": {"capi')
+
+        recovered = self.make()
+        self.assertEqual(recovered.load_state()["capital"], 950)
+        # 손상된 꼬리는 잘라내고 이어서 기록
+        recovered.save_state({"capital": 975})
+        recovered.close()
+        self.assertEqual(self.make().load_state()["capital"], 975)
+
+    def test_compaction_rewrites_snapshot(self):
+        manager = self.make(compact_every=3)
+        for capital in range(1000, 1005):
+            manager.save_state({"capital": capital, "force_close_date": date(2025, 1, 3)})
+        manager.close()
+        with open(self.path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        self.assertEqual(snapshot["capital"], 1003)
+        state = self.make().load_state()
+        self.assertEqual(state["capital"], 1004)
+        self.assertEqual(state["force_close_date"], date(2025, 1, 3))
+
+    def test_legacy_snapshot_and_stale_journal(self):
+        manager = self.make()
+        manager.save_state({"capital": 1})
+        manager.save_state({"capital": 2})
+        manager.close()
+        # 외부에서 스냅샷을 덮어쓰면 이전 저널은 무시
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"capital": 500, "current_position": "SHORT"}, f)
+        state = self.make().load_state()
+        self.assertEqual(state["capital"], 500)
+
+    def test_clear_state(self):
+        manager = self.make()
+        manager.save_state({"capital": 1})
+        manager.save_state({"capital": 2})
+        manager.clear_state()
+        self.assertIsNone(self.make().load_state())
+        self.assertFalse(os.path.exists(manager.journal_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
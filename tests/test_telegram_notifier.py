@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import threading
+import sys
+import os
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.telegram_notifier import (
+    TelegramNotifier, _NotificationQueue, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+)
+
+
+class TestNotificationQueue(unittest.TestCase):
+    def test_priority_order_and_coalescing(self):
+        q = _NotificationQueue(maxsize=10)
+        q.put("update-1", PRIORITY_LOW, "strategy:TSLA")
+        q.put("order-1", PRIORITY_HIGH)
+        q.put("update-2", PRIORITY_LOW, "strategy:TSLA")
+        q.put("order-2", PRIORITY_HIGH)
+        self.assertEqual(q.coalesced, 1)
+        self.assertEqual(q.take_batch(max_chars=1000, timeout=0), ["order-1", "order-2", "update-2"])
+
+    def test_full_queue_drops_low_first_and_keeps_high(self):
+        q = _NotificationQueue(maxsize=2)
+        q.put("low", PRIORITY_LOW, "a")
+        q.put("normal", PRIORITY_NORMAL)
+        self.assertTrue(q.put("high-1", PRIORITY_HIGH))
+        self.assertTrue(q.put("high-2", PRIORITY_HIGH))
+        self.assertFalse(q.put("low-2", PRIORITY_LOW, "b"))
+        self.assertEqual(q.take_batch(max_chars=1000, timeout=0), ["high-1", "high-2"])
+
+    def test_batch_respects_max_chars(self):
+        q = _NotificationQueue(maxsize=10)
+        for i in range(3):
+            q.put("x" * 10, PRIORITY_NORMAL)
+        self.assertEqual(len(q.take_batch(max_chars=25, timeout=0)), 2)
+        self.assertEqual(len(q.take_batch(max_chars=25, timeout=0)), 1)
+
+
+class TestTelegramNotifier(unittest.TestCase):
+    @patch('utils.telegram_notifier.requests.post')
+    def test_async_send_does_not_block_caller(self, mock_post):
+        release = threading.Event()
+
+        def slow_post(*args, **kwargs):
+            release.wait(5)
+            response = MagicMock()
+            response.status_code = 200
+            return response
+
+        mock_post.side_effect = slow_post
+        notifier = TelegramNotifier(token="t", chat_id="c", async_send=True, rate_per_sec=100)
+        self.assertTrue(notifier.send_order_alert("TSLL", "BUY", 10.0, 5, "test"))
+        self.assertTrue(notifier.send_error_alert("boom"))
+        release.set()
+        self.assertTrue(notifier.flush(timeout=5))
+        notifier.close()
+        sent = " ".join(call.kwargs["json"]["text"] for call in mock_post.call_args_list)
+        self.assertLess(sent.index("주문 알림"), sent.index("오류 발생"))
+
+    @patch('utils.telegram_notifier.requests.post')
+    def test_sync_mode_returns_result(self, mock_post):
+        mock_post.return_value.status_code = 200
+        notifier = TelegramNotifier(token="t", chat_id="c", async_send=False)
+        self.assertTrue(notifier.send_message("hello"))
+        mock_post.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,18 +2,29 @@ import unittest
 from unittest.mock import MagicMock, patch
 import sys
 import os
-from datetime import datetime, timedelta
+import tempfile
+from datetime import date, datetime, timedelta
+import numpy as np
 import pytz
 
 # Add root directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import utils.market_calendar as market_calendar
+from utils.market_calendar import MarketCalendar
 from tesla_reversal_trading_bot import TeslaReversalTradingBot
 
 class TestTeslaBotLogic(unittest.TestCase):
     @patch('tesla_reversal_trading_bot.KisApi')
     @patch('tesla_reversal_trading_bot.DataFetcher')
     def setUp(self, mock_data_fetcher, mock_kis_api):
+        calendar_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(calendar_dir.cleanup)
+        calendar_patch = patch.object(market_calendar, "CALENDAR_CACHE_DIR", calendar_dir.name)
+        calendar_patch.start()
+        self.addCleanup(calendar_patch.stop)
+        market_calendar._CALENDARS.clear()
+        self.addCleanup(market_calendar._CALENDARS.clear)
         self.bot = TeslaReversalTradingBot()
         # Disable scheduler for unit tests
         self.bot.scheduler = MagicMock()
@@ -24,7 +35,7 @@ class TestTeslaBotLogic(unittest.TestCase):
         eastern = pytz.timezone('US/Eastern')
         
         # Winter date
-        with patch('tesla_reversal_trading_bot.datetime') as mock_datetime:
+        with patch('trading.symbol_reversal_bot.datetime') as mock_datetime:
             # We must return a datetime that behaves like now(tz)
             # US/Eastern in Winter (Jan 1)
             winter_dt = eastern.localize(datetime(2024, 1, 1, 12, 0))
@@ -32,7 +43,7 @@ class TestTeslaBotLogic(unittest.TestCase):
             self.assertFalse(self.bot._is_dst())
             
         # Summer date
-        with patch('tesla_reversal_trading_bot.datetime') as mock_datetime:
+        with patch('trading.symbol_reversal_bot.datetime') as mock_datetime:
             # US/Eastern in Summer (Jul 1)
             summer_dt = eastern.localize(datetime(2024, 7, 1, 12, 0))
             mock_datetime.now.return_value = summer_dt
@@ -41,7 +52,7 @@ class TestTeslaBotLogic(unittest.TestCase):
     def test_market_status_winter(self):
         # Mock _is_dst to False (Winter)
         with patch.object(self.bot, '_is_dst', return_value=False):
-            with patch('tesla_reversal_trading_bot.datetime') as mock_datetime:
+            with patch('trading.symbol_reversal_bot.datetime') as mock_datetime:
                 # 10:00 -> DAYTIME
                 mock_datetime.now.return_value = datetime(2024, 1, 1, 10, 30)
                 self.assertEqual(self.bot._get_market_status(), "DAYTIME")
@@ -57,7 +68,7 @@ class TestTeslaBotLogic(unittest.TestCase):
     def test_market_status_summer(self):
         # Mock _is_dst to True (Summer)
         with patch.object(self.bot, '_is_dst', return_value=True):
-            with patch('tesla_reversal_trading_bot.datetime') as mock_datetime:
+            with patch('trading.symbol_reversal_bot.datetime') as mock_datetime:
                 # 10:00 -> DAYTIME
                 mock_datetime.now.return_value = datetime(2024, 7, 1, 10, 30)
                 self.assertEqual(self.bot._get_market_status(), "DAYTIME")
@@ -129,6 +140,15 @@ class TestTeslaBotLogic(unittest.TestCase):
         # Should Call _close_position, NOT _execute_reversal
         self.bot._close_position.assert_called_with(100.0, "STOP_LOSS")
         self.bot._execute_reversal.assert_not_called()
+    def test_forced_close_date_skips_us_holidays(self):
+        # 추수감사절(11/28) 전날 진입: 주말만 건너뛰던 기존 계산은 11/29, NYSE 휴장일 반영 시 12/2
+        days = np.arange("2024-11-01", "2025-01-01", dtype="datetime64[D]")
+        days = days[np.is_busday(days, holidays=["2024-11-28", "2024-12-25"])]
+        calendar = MarketCalendar("US", days, "2024-11-01", "2024-12-31")
+        with patch('trading.symbol_reversal_bot.get_calendar', return_value=calendar):
+            self.assertEqual(self.bot.long_hold_days, 3)
+            self.assertEqual(self.bot._calculate_trading_day_limit(date(2024, 11, 26), 3), date(2024, 12, 2))
+            self.assertEqual(self.bot._calculate_trading_day_limit(date(2024, 11, 27), 1), date(2024, 11, 29))
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,20 +4,28 @@ import time
 from datetime import datetime, timedelta
 import os
 import sys
+import threading
 
 # 프로젝트 루트 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import (
     KIS_REAL_APP_KEY, KIS_REAL_APP_SECRET, KIS_REAL_ACCOUNT_NO, KIS_REAL_BASE_URL,
-    KIS_PAPER_APP_KEY, KIS_PAPER_APP_SECRET, KIS_PAPER_ACCOUNT_NO, KIS_PAPER_BASE_URL
+    KIS_PAPER_APP_KEY, KIS_PAPER_APP_SECRET, KIS_PAPER_ACCOUNT_NO, KIS_PAPER_BASE_URL,
+    KIS_RATE_LIMIT_PER_SEC, KIS_PAPER_RATE_LIMIT_PER_SEC
 )
 from utils.logger import logger
+from utils.rate_limiter import RateLimiter
+from utils.latency import timer, timed
 
 class KisApi:
     """한국투자증권 OpenAPI 래퍼 클래스"""
     
-    def __init__(self, is_paper_trading=False):
+    def __init__(self, is_paper_trading=False, rate_limiter: RateLimiter = None):
+        """
+        :param is_paper_trading: 모의투자 여부
+        :param rate_limiter: 공유 호출 제한기 (없으면 계정 종류별 기본값으로 생성)
+        """
         if is_paper_trading:
             self.app_key = KIS_PAPER_APP_KEY
             self.app_secret = KIS_PAPER_APP_SECRET
@@ -32,6 +40,13 @@ class KisApi:
         self.access_token = None
         self.token_expiry = None
         self.is_paper_trading = is_paper_trading
+
+        # 여러 봇이 같은 인스턴스를 공유하므로 토큰 발급과 호출 속도를 한 곳에서 관리
+        self._token_lock = threading.Lock()
+        if rate_limiter is None:
+            rate = KIS_PAPER_RATE_LIMIT_PER_SEC if is_paper_trading else KIS_RATE_LIMIT_PER_SEC
+            rate_limiter = RateLimiter(rate)
+        self.rate_limiter = rate_limiter
         
         # 계좌번호 분리 (앞 8자리 + 뒤 2자리)
         if '-' in self.account_no:
@@ -51,6 +66,14 @@ class KisApi:
             logger.error(f"KIS API 초기화 중 토큰 발급 실패: {e}")
 
     def _get_access_token(self):
+        """접근 토큰 발급/갱신 (동시 발급 방지)"""
+        if self.access_token and self.token_expiry and datetime.now() < self.token_expiry:
+            return self.access_token
+        with self._token_lock:
+            return self._get_access_token_locked()
+
+    @timed("kis.token_refresh")
+    def _get_access_token_locked(self):
         """접근 토큰 발급/갱신 (파일 캐시 지원)"""
         # 1. 메모리 캐시 확인
         if self.access_token and self.token_expiry and datetime.now() < self.token_expiry:
@@ -92,9 +115,12 @@ class KisApi:
             body["env_dv"] = "demo"
         
         try:
-            res = requests.post(url, headers=headers, data=json.dumps(body))
+            self._throttle()
+            with timer("kis.http"):
+                res = requests.post(url, headers=headers, data=json.dumps(body))
             res.raise_for_status()
-            data = res.json()
+            with timer("kis.json"):
+                data = res.json()
             
             self.access_token = data['access_token']
             # 토큰 유효기간 설정 (여유있게 3시간 줄임)
@@ -129,6 +155,12 @@ class KisApi:
         # 만료 3시간 이내인지 확인 (이미 _get_access_token에서 3시간을 뺐으므로 현재 시간이 token_expiry를 지났다면 갱신 필요)
         return self.access_token
 
+    def _throttle(self):
+        """공유 호출 제한기 대기"""
+        if self.rate_limiter:
+            with timer("kis.throttle_wait"):
+                self.rate_limiter.acquire()
+
     def _get_common_headers(self, tr_id):
         """공통 헤더 생성"""
         token = self._get_access_token()
@@ -153,6 +185,7 @@ class KisApi:
             return "AMS"
         return "NAS"
 
+    @timed("kis.get_current_price")
     def get_current_price(self, symbol: str):
         """현재가 상세 조회 (국내/해외 분기)"""
         exch_code = self._guess_exch_code(symbol)
@@ -186,14 +219,17 @@ class KisApi:
                 # API 호출 간격 조절
                 if i > 0: time.sleep(2)
                 
-                res = requests.get(url, headers=headers, params=params)
+                self._throttle()
+                with timer("kis.http"):
+                    res = requests.get(url, headers=headers, params=params)
                 
                 if res.status_code == 500:
                     logger.warning(f"시세 조회 500 Error ({symbol}), retrying {i+1}/{max_retries}...")
                     continue
                 
                 res.raise_for_status()
-                data = res.json()
+                with timer("kis.json"):
+                    data = res.json()
                 
                 if data['rt_cd'] != '0':
                     logger.error(f"시세 조회 실패 ({symbol}): {data['msg1']}")
@@ -213,6 +249,7 @@ class KisApi:
                 return None
         return None
 
+    @timed("kis.get_daily_price")
     def get_daily_price(self, symbol: str, period_code="D"):
         """
         해외주식 기간별 시세 (일/주/월)
@@ -276,9 +313,12 @@ class KisApi:
             }
 
         try:
-            res = requests.get(url, headers=headers, params=params)
+            self._throttle()
+            with timer("kis.http"):
+                res = requests.get(url, headers=headers, params=params)
             res.raise_for_status()
-            data = res.json()
+            with timer("kis.json"):
+                data = res.json()
             
             if data['rt_cd'] != '0':
                 logger.error(f"일별 시세 조회 실패 ({symbol}): {data['msg1']}")
@@ -310,6 +350,7 @@ class KisApi:
             logger.error(f"API 호출 오류 (get_daily_price): {e}")
             return None
 
+    @timed("kis.get_minute_price")
     def get_minute_price(self, symbol: str, interval_min: int = 60):
         """
         분봉 시세 조회 (국내/해외 통합)
@@ -358,7 +399,9 @@ class KisApi:
                 # Rate Limit 등을 고려한 미세 지연
                 time.sleep(2) 
                 
-                res = requests.get(url, headers=headers, params=params)
+                self._throttle()
+                with timer("kis.http"):
+                    res = requests.get(url, headers=headers, params=params)
                 
                 if res.status_code == 500:
                     logger.warning(f"API 500 Error ({symbol}), retrying {i+1}/{max_retries}...")
@@ -366,7 +409,8 @@ class KisApi:
                     continue
                 
                 res.raise_for_status()
-                data = res.json()
+                with timer("kis.json"):
+                    data = res.json()
                 
                 if data['rt_cd'] != '0':
                     logger.error(f"분봉 시세 조회 실패 ({symbol}): {data['msg1']}")
@@ -397,6 +441,7 @@ class KisApi:
                 return None
         return None
 
+    @timed("kis.get_overseas_stock_balance")
     def get_overseas_stock_balance(self):
         """해외주식 체결기준 잔고 및 보유 종목 조회 (다중 거래소 순회)"""
         path = "/uapi/overseas-stock/v1/trading/inquire-balance"
@@ -434,14 +479,17 @@ class KisApi:
                 try:
                     if i > 0: time.sleep(2)
                     
-                    res = requests.get(url, headers=headers, params=params)
+                    self._throttle()
+                    with timer("kis.http"):
+                        res = requests.get(url, headers=headers, params=params)
                     
                     if res.status_code == 500:
                          logger.warning(f"잔고 조회 ({exch}) 500 Error, retrying {i+1}/{max_retries}...")
                          continue
                          
                     res.raise_for_status()
-                    data = res.json()
+                    with timer("kis.json"):
+                        data = res.json()
                     
                     if data['rt_cd'] != '0':
                          # 특정 거래소에 데이터가 없으면 에러가 날 수 있음 -> 로그만 남기고 다음 거래소로
@@ -487,33 +535,42 @@ class KisApi:
             "assets": last_assets
         }
 
-    def get_overseas_trades(self):
-        """체결 내역 확인 (즉시 반영)"""
+    @timed("kis.get_overseas_trades")
+    def get_overseas_trades(self, symbol: str = "", start_date: str = None, end_date: str = None, order_no: str = ""):
+        """
+        주문/체결 내역 조회 (즉시 반영)
+        :param symbol: 종목 코드 (모의투자는 전체 조회만 지원하므로 무시)
+        :param start_date: 조회 시작일 YYYYMMDD (기본값: 전일)
+        :param end_date: 조회 종료일 YYYYMMDD (기본값: 오늘)
+        :param order_no: 주문번호 (모의투자는 전체 조회만 지원하므로 무시)
+        """
         path = "/uapi/overseas-stock/v1/trading/inquire-ccnl"
         url = f"{self.base_url}{path}"
         
-        # 실전: TTTT3012R / 모의: VTTT3012R
+        # 실전: TTTS3035R / 모의: VTTS3035R
         tr_id = "VTTS3035R" if self.is_paper_trading else "TTTS3035R"
         
         headers = self._get_common_headers(tr_id)
+
+        now = datetime.now()
+        end_date = end_date or now.strftime("%Y%m%d")
+        start_date = start_date or (now - timedelta(days=1)).strftime("%Y%m%d")
+        if self.is_paper_trading:
+            symbol, order_no = "", ""
         
         params = {
             "CANO": self.account_front,
             "ACNT_PRDT_CD": self.account_back,
-            "OVRS_EXCG_CD": "NAS", # 거래소 코드 (NAS/AMS 등, 대표값 사용)
-            "TR_CRCY_CD": "USD",
-            "PDNO": "TSLS",
-            "ORD_DT": "20260108",
-            "ORD_STRT_DT": "20260101",  # ✅ 조회 시작일자
-            "ORD_END_DT": "20260108",     # ✅ 조회 종료일자
-            "INQR_DVSN": "01",          # ✅ 기간 조회 모드
-            "SLL_BUY_DVSN": "00",
-            "CCLD_NCCS_DVSN": "00",
+            "PDNO": symbol or "%",
+            "ORD_STRT_DT": start_date,  # 조회 시작일자
+            "ORD_END_DT": end_date,     # 조회 종료일자
+            "SLL_BUY_DVSN": "00",       # 00: 전체
+            "CCLD_NCCS_DVSN": "00",     # 00: 전체 (체결 + 미체결)
+            "OVRS_EXCG_CD": "%" if not self.is_paper_trading else "",
             "SORT_SQN": "DS", 
-            "ORD_GNO_BRNO": "000", 
-            "ODNO": "0000000000",
-            "CTX_AREA_FK100": "",
-            "CTX_AREA_NK100": "",
+            "ORD_DT": "",
+            "ORD_GNO_BRNO": "", 
+            "ODNO": order_no,
             "CTX_AREA_FK200": "",
             "CTX_AREA_NK200": ""
         }
@@ -526,32 +583,24 @@ class KisApi:
             try:
                 if i > 0: time.sleep(2)
                 
-                res = requests.get(url, headers=headers, params=params)
+                self._throttle()
+                with timer("kis.http"):
+                    res = requests.get(url, headers=headers, params=params)
                 
                 if res.status_code == 500:
                     logger.warning(f"체결 내역 확인 500 Error, retrying {i+1}/{max_retries}...")
                     continue
                     
                 res.raise_for_status()
-                data = res.json()
+                with timer("kis.json"):
+                    data = res.json()
                 
                 if data['rt_cd'] != '0':
                     logger.error(f"체결 내역 확인 실패: {data['msg1']}")
                     return None
                     
-                #{
-                #    "rt_cd": "0",
-                #    "msg_cd": "00000",
-                #    "msg1": "정상처리되었습니다.",
-                #    "output": [
-                #        {
-                #            "ovrs_pdno": "TSLS",
-                #            "ord_dvsn_name": "매수",
-                #            "ovrs_ccld_qty": "1",
-                #            "frcr_ccld_amt": "5.33"
-                #        }
-                #    ]
-                #}
+                # output 예시: odno(주문번호), pdno(종목), ft_ord_qty(주문수량), ft_ccld_qty(체결수량),
+                #             ft_ccld_unpr3(체결단가), ft_ccld_amt3(체결금액), nccs_qty(미체결수량), prcs_stat_name(처리상태)
                 logger.debug(f"[API] get_overseas_trades Response - Data: {data}")
 
                 return {
@@ -565,6 +614,79 @@ class KisApi:
                 return None
         return None
 
+    @timed("kis.get_order_fill")
+    def get_order_fill(self, symbol: str, order_no: str):
+        """
+        주문번호 기준 체결 현황 조회
+        :return: {"order_no", "ordered_qty", "filled_qty", "unfilled_qty", "avg_price", "status_name", "rejected"} 또는 None
+        """
+        trades = self.get_overseas_trades(symbol=symbol, order_no=order_no)
+        if not trades:
+            return None
+
+        for row in trades.get("output", []):
+            # 주문번호는 앞자리 0 생략 여부가 응답마다 달라 정수 비교
+            try:
+                if int(row.get("odno", -1)) != int(order_no):
+                    continue
+            except (TypeError, ValueError):
+                continue
+
+            filled_qty = float(row.get("ft_ccld_qty") or 0)
+            filled_amt = float(row.get("ft_ccld_amt3") or 0)
+            avg_price = float(row.get("ft_ccld_unpr3") or 0)
+            if avg_price <= 0 and filled_qty > 0:
+                avg_price = filled_amt / filled_qty
+            return {
+                "order_no": row.get("odno"),
+                "ordered_qty": float(row.get("ft_ord_qty") or 0),
+                "filled_qty": filled_qty,
+                "unfilled_qty": float(row.get("nccs_qty") or 0),
+                "avg_price": avg_price,
+                "status_name": row.get("prcs_stat_name", ""),
+                "rejected": bool(row.get("rjct_rson"))
+            }
+        return None
+
+    @timed("kis.cancel_order")
+    def cancel_order(self, symbol: str, order_no: str, qty):
+        """해외주식 미체결 주문 취소"""
+        path = "/uapi/overseas-stock/v1/trading/order-rvsecncl"
+        url = f"{self.base_url}{path}"
+        # 실전: TTTT1004U / 모의: VTTT1004U
+        tr_id = "VTTT1004U" if self.is_paper_trading else "TTTT1004U"
+        headers = self._get_common_headers(tr_id)
+
+        order_exch_map = {"NAS": "NASD", "AMS": "AMEX", "NYS": "NYSE"}
+        ovs_excd = self._guess_exch_code(symbol)
+        body = {
+            "CANO": self.account_front,
+            "ACNT_PRDT_CD": self.account_back,
+            "OVRS_EXCG_CD": order_exch_map.get(ovs_excd, ovs_excd),
+            "PDNO": symbol,
+            "ORGN_ODNO": order_no,
+            "RVSE_CNCL_DVSN_CD": "02",  # 01: 정정, 02: 취소
+            "ORD_QTY": str(int(qty)),
+            "OVRS_ORD_UNPR": "0",
+            "ORD_SVR_DVSN_CD": "0"
+        }
+
+        try:
+            self._throttle()
+            with timer("kis.http"):
+                res = requests.post(url, headers=headers, data=json.dumps(body))
+            with timer("kis.json"):
+                data = res.json()
+            if data['rt_cd'] != '0':
+                logger.error(f"주문 취소 실패 ({symbol} {order_no}): {data['msg1']}")
+                return None
+            logger.info(f"주문 취소 성공: {symbol} {order_no} ({int(qty)}주)")
+            return data.get('output', {})
+        except Exception as e:
+            logger.error(f"API 호출 오류 (cancel_order): {e}")
+            return None
+
+    @timed("kis.get_balance")
     def get_balance(self):
         """해외주식 USD 예수금 조회 (get_overseas_stock_balance -> frcr_dncl_amt_2)"""
         # KIS OpenAPI 공식 가이드: frcr_dncl_amt_2 사용
@@ -579,6 +701,7 @@ class KisApi:
                 pass
         return 0.0 
 
+    @timed("kis.place_order")
     def place_order(self, symbol, side, qty, price=0, order_type="00"):
         """해외주식 주문"""
         # (기존 코드 유지, is_paper_trading 속성 사용하도록 수정)
@@ -671,8 +794,11 @@ class KisApi:
 
                 logger.debug(f"[API] place_order Request - URL: {url}, Body: {json.dumps(body)}")
                 
-                res = requests.post(url, headers=headers, data=json.dumps(body))
-                data = res.json()
+                self._throttle()
+                with timer("kis.http"):
+                    res = requests.post(url, headers=headers, data=json.dumps(body))
+                with timer("kis.json"):
+                    data = res.json()
                 
                 # 초당 거래건수 초과 등 (rt_cd != 0)
                 if data['rt_cd'] != '0':
@@ -0,0 +1,223 @@
+"""
+주문 실행 파이프라인
+- 주문 제출을 스레드 풀에서 비동기로 처리 (Future 반환)
+- 주문번호 기준 체결 조회를 지수 백오프로 폴링하여 실제 체결가/체결수량 기록
+- 제한 시간 내 미체결 잔량은 취소 후 부분 체결로 확정
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime
+from typing import Optional
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import (
+    ORDER_FILL_TIMEOUT_SEC, ORDER_POLL_INITIAL_SEC, ORDER_POLL_MAX_SEC, ORDER_SUBMIT_RETRIES
+)
+from utils.logger import logger
+
+# 주문 결과 상태
+ORDER_SUBMITTED = "SUBMITTED"  # 접수 완료 (체결 추적 중)
+ORDER_FILLED = "FILLED"        # 전량 체결
+ORDER_PARTIAL = "PARTIAL"      # 부분 체결 (잔량 취소)
+ORDER_UNFILLED = "UNFILLED"    # 미체결 (전량 취소)
+ORDER_REJECTED = "REJECTED"    # 주문 접수 실패
+
+
+class OrderResult:
+    """주문 결과 (실제 체결 기준)"""
+
+    __slots__ = (
+        "symbol", "side", "requested_qty", "quoted_price", "order_no",
+        "filled_qty", "avg_price", "status", "submitted_at", "completed_at", "fill_confirmed"
+    )
+
+    def __init__(self, symbol: str, side: str, requested_qty: float, quoted_price: Optional[float] = None):
+        self.symbol = symbol
+        self.side = side
+        self.requested_qty = requested_qty
+        self.quoted_price = quoted_price
+        self.order_no = None
+        self.filled_qty = 0.0
+        self.avg_price = None
+        self.status = ORDER_REJECTED
+        self.submitted_at = None
+        self.completed_at = None
+        # 체결 조회로 확인된 값인지 (False면 조회 실패로 호가 기준 추정)
+        self.fill_confirmed = False
+
+    @property
+    def has_fill(self) -> bool:
+        return self.filled_qty > 0
+
+    @property
+    def unfilled_qty(self) -> float:
+        return max(0.0, self.requested_qty - self.filled_qty)
+
+    @property
+    def filled_amount(self) -> float:
+        return self.filled_qty * (self.avg_price or 0.0)
+
+    def to_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __repr__(self):
+        return (f"OrderResult({self.side} {self.symbol} {self.filled_qty}/{self.requested_qty} "
+                f"@ {self.avg_price} {self.status})")
+
+
+class OrderExecutor:
+    """KIS 주문 제출 + 체결 추적"""
+
+    def __init__(
+        self,
+        kis,
+        fill_timeout: float = ORDER_FILL_TIMEOUT_SEC,
+        poll_initial: float = ORDER_POLL_INITIAL_SEC,
+        poll_max: float = ORDER_POLL_MAX_SEC,
+        submit_retries: int = ORDER_SUBMIT_RETRIES,
+        max_workers: int = 4,
+        sleep=time.sleep
+    ):
+        """
+        :param kis: KisApi 인스턴스 (place_order / get_order_fill / cancel_order 사용)
+        :param fill_timeout: 체결 대기 제한 시간(초), 초과 시 잔량 취소
+        :param poll_initial: 첫 체결 조회 간격(초), 이후 2배씩 증가
+        :param poll_max: 체결 조회 최대 간격(초)
+        :param submit_retries: 주문 접수 실패 시 재시도 횟수
+        :param sleep: 대기 함수 (테스트 시 대체)
+        """
+        self.kis = kis
+        self.fill_timeout = fill_timeout
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.submit_retries = submit_retries
+        self._sleep = sleep
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="order")
+        self._lock = threading.Lock()
+        self.history = []
+
+    def place(self, symbol: str, side: str, qty: float, quoted_price: Optional[float] = None,
+              price: float = 0, order_type: str = "01") -> OrderResult:
+        """주문 접수만 수행 (체결 추적 전, 접수 실패 시 status=REJECTED)"""
+        result = OrderResult(symbol, side, int(qty), quoted_price)
+        if result.requested_qty <= 0:
+            logger.warning(f"주문 수량 0: {side} {symbol}")
+            return result
+        if self._place(result, price, order_type) is None:
+            result.completed_at = datetime.now()
+            self._record(result)
+        return result
+
+    def track(self, result: OrderResult) -> Future:
+        """접수된 주문의 체결 추적을 백그라운드에서 실행 (Future[OrderResult] 반환)"""
+        if result.order_no is None:
+            future = Future()
+            future.set_result(result)
+            return future
+        return self._pool.submit(self._finish, result)
+
+    def submit(self, symbol: str, side: str, qty: float, quoted_price: Optional[float] = None,
+               price: float = 0, order_type: str = "01") -> Future:
+        """주문 제출 + 체결 추적을 백그라운드에서 실행 (Future[OrderResult] 반환)"""
+        return self._pool.submit(self.execute, symbol, side, qty, quoted_price, price, order_type)
+
+    def execute(self, symbol: str, side: str, qty: float, quoted_price: Optional[float] = None,
+                price: float = 0, order_type: str = "01") -> OrderResult:
+        """주문 제출 후 체결 확정까지 대기 (블로킹)"""
+        result = self.place(symbol, side, qty, quoted_price, price, order_type)
+        if result.order_no is None:
+            return result
+        return self._finish(result)
+
+    def _finish(self, result: OrderResult) -> OrderResult:
+        self._track_fill(result)
+        result.completed_at = datetime.now()
+        self._record(result)
+        return result
+
+    def _place(self, result: OrderResult, price: float, order_type: str) -> Optional[str]:
+        """주문 접수 (실패 시 재시도), 주문번호 반환"""
+        for attempt in range(1, self.submit_retries + 1):
+            logger.info(f"[KIS] 주문 제출 ({attempt}/{self.submit_retries}): {result.side} {result.symbol} {result.requested_qty}주")
+            output = self.kis.place_order(result.symbol, result.side, result.requested_qty, price=price, order_type=order_type)
+            if output:
+                result.submitted_at = datetime.now()
+                result.status = ORDER_SUBMITTED
+                result.order_no = (output.get("ODNO") or output.get("odno")) if isinstance(output, dict) else None
+                if not result.order_no:
+                    logger.warning(f"주문번호 없음 - 체결 추적 불가: {result.symbol}")
+                    result.order_no = ""
+                return result.order_no
+            if attempt < self.submit_retries:
+                self._sleep(self.poll_initial * attempt)
+        logger.error(f"주문 접수 최종 실패: {result.side} {result.symbol}")
+        result.status = ORDER_REJECTED
+        return None
+
+    def _apply_fill(self, result: OrderResult, fill: dict):
+        result.filled_qty = float(fill.get("filled_qty", 0))
+        if result.filled_qty > 0:
+            result.avg_price = float(fill.get("avg_price") or 0) or result.quoted_price
+        result.fill_confirmed = True
+
+    def _track_fill(self, result: OrderResult):
+        """체결 조회 폴링 (지수 백오프), 제한 시간 초과 시 잔량 취소 후 확정"""
+        if not result.order_no:
+            self._assume_filled(result)
+            return
+
+        waited = 0.0
+        interval = self.poll_initial
+        lookup_failures = 0
+        while True:
+            self._sleep(interval)
+            waited += interval
+            fill = self.kis.get_order_fill(result.symbol, result.order_no)
+            if fill is None:
+                lookup_failures += 1
+            else:
+                self._apply_fill(result, fill)
+                if fill.get("rejected"):
+                    logger.error(f"주문 거부: {result.symbol} {result.order_no} ({fill.get('status_name')})")
+                    result.status = ORDER_REJECTED if not result.has_fill else ORDER_PARTIAL
+                    return
+                if result.filled_qty >= result.requested_qty:
+                    result.status = ORDER_FILLED
+                    logger.info(f"[KIS] 체결 완료: {result}")
+                    return
+
+            if waited >= self.fill_timeout:
+                break
+            interval = min(interval * 2, self.poll_max)
+
+        if lookup_failures and not result.fill_confirmed:
+            # 체결 조회 자체가 불가능하면 (국내 종목/조회 장애) 기존 방식대로 호가 체결 가정
+            logger.warning(f"체결 조회 실패 - 호가 기준 체결 가정: {result.symbol} {result.order_no}")
+            self._assume_filled(result)
+            return
+
+        # 미체결 잔량 취소 후 체결분만 확정
+        remaining = result.unfilled_qty
+        logger.warning(f"체결 대기 시간 초과: {result} - 잔량 {remaining}주 취소")
+        self.kis.cancel_order(result.symbol, result.order_no, remaining)
+        # 취소 직전 추가 체결 반영
+        fill = self.kis.get_order_fill(result.symbol, result.order_no)
+        if fill is not None:
+            self._apply_fill(result, fill)
+        result.status = ORDER_PARTIAL if result.has_fill else ORDER_UNFILLED
+        logger.info(f"[KIS] 주문 확정: {result}")
+
+    def _assume_filled(self, result: OrderResult):
+        result.filled_qty = float(result.requested_qty)
+        result.avg_price = result.quoted_price
+        result.status = ORDER_FILLED
+        result.fill_confirmed = False
+
+    def _record(self, result: OrderResult):
+        with self._lock:
+            self.history.append(result)
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
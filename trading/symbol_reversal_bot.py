@@ -0,0 +1,846 @@
+"""
+종목 쌍 전환 매매 봇 (KIS API 버전)
+원본 주식 + 롱/숏 ETF 한 쌍에 대한 전환 매매 상태와 로직을 담당
+- 단독 실행: Tesla/Nvda 봇이 상속하여 사용
+- 통합 실행: multi_reversal_trading_bot 이 여러 쌍을 생성하고 KIS 클라이언트/가격 캐시/알림을 공유
+"""
+from datetime import datetime, timedelta
+import sys
+import os
+import pytz
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, SCHEDULER_JOB_TIMEOUT_SEC
+from data.data_fetcher import DataFetcher
+from strategy.reversal_strategy import ReversalStrategy
+from strategy.signal_generator import SignalType
+from utils.logger import logger
+from utils.telegram_notifier import TelegramNotifier
+from utils.async_scheduler import AsyncScheduler, CronTrigger, IntervalTrigger
+from utils.latency import register_report_job
+from utils.market_calendar import get_calendar
+from trading.kis_api import KisApi
+from trading.order_executor import OrderExecutor
+from utils.state_manager import TradeStateManager
+
+
+class SymbolReversalTradingBot:
+    """종목 쌍(원본/롱 ETF/숏 ETF) 전환 매매 거래 봇 (KIS 연동)"""
+
+    def __init__(
+        self,
+        target_config: dict,
+        params: dict = None,
+        is_paper_trading: bool = True,
+        kis: KisApi = None,
+        data_fetcher: DataFetcher = None,
+        notifier: TelegramNotifier = None,
+        state_manager: TradeStateManager = None,
+        order_executor: OrderExecutor = None,
+        long_hold_days: int = None,
+        short_hold_days: int = None,
+        exit_allowed_statuses: list = None,
+        bot_name: str = None,
+        notify_init: bool = True
+    ):
+        """
+        전환 매매 봇 초기화
+        :param target_config: TARGET_SYMBOLS 항목 (ORIGINAL/LONG/LONG_MULTIPLE/SHORT/SHORT_MULTIPLE)
+        :param is_paper_trading: 모의투자 여부
+        :param kis: 공유 KisApi 인스턴스 (없으면 내부 생성)
+        :param data_fetcher: 공유 DataFetcher 인스턴스 (없으면 kis 기반으로 생성)
+        :param notifier: 공유 텔레그램 알림 인스턴스 (없으면 내부 생성)
+        :param state_manager: 상태 관리자 (종목 쌍별로 별도 파일 사용)
+        :param order_executor: 주문 실행/체결 추적기 (없으면 kis 기반으로 생성)
+        :param long_hold_days: LONG 최대 보유 거래일 (기본값: params의 long_max_hold_days)
+        :param short_hold_days: SHORT 최대 보유 거래일 (기본값: params의 short_max_hold_days)
+        :param exit_allowed_statuses: 손절/익절 청산을 허용할 장 상태 목록 (None이면 제한 없음)
+        :param bot_name: 로그/알림에 표시할 봇 이름 (기본값: 원본 종목 코드)
+        :param notify_init: 초기화 알림 전송 여부
+        """
+        self.target_config = dict(target_config)
+
+        self.original_symbol = self.target_config["ORIGINAL"]
+        self.etf_long = self.target_config["LONG"]
+        self.etf_long_multiple = self.target_config["LONG_MULTIPLE"]
+        self.etf_short = self.target_config["SHORT"]
+        self.etf_short_multiple = self.target_config["SHORT_MULTIPLE"]
+        self.bot_name = bot_name or self.original_symbol
+
+        # 강제청산 날짜 (거래일 기준) - 초기화
+        self.forced_close_date = None
+
+        self.kis = kis if kis is not None else KisApi(is_paper_trading=is_paper_trading)
+
+        # DataFetcher 초기화 (KIS 인스턴스 공유)
+        self.data_fetcher = data_fetcher if data_fetcher is not None else DataFetcher(kis_client=self.kis)
+
+        # 주문 실행기 (체결 추적)
+        self.order_executor = order_executor if order_executor is not None else OrderExecutor(self.kis)
+
+        # 상태 관리자 초기화
+        self.state_manager = state_manager if state_manager is not None else TradeStateManager()
+
+        # 전략 초기화
+        self.strategy = ReversalStrategy(params=params)
+
+        # 최대 보유 기간 (거래일)
+        strategy_params = self.strategy.params
+        self.long_hold_days = long_hold_days if long_hold_days is not None else strategy_params.get("long_max_hold_days", 3)
+        self.short_hold_days = short_hold_days if short_hold_days is not None else strategy_params.get("short_max_hold_days", 1)
+        self.exit_allowed_statuses = exit_allowed_statuses
+
+        # === 거래소별 시장 시간대 설정 (먼저 설정해야 _calculate_trading_day_limit 사용 가능) ===
+        self.exchange = self.kis._guess_exch_code(self.original_symbol)
+        if self.exchange == "KRX":
+            self.market_timezone = pytz.timezone("Asia/Seoul")
+        else:
+            self.market_timezone = pytz.timezone("US/Eastern")
+
+        # [State Persistence] 저장된 상태가 있으면 복원 (자본금, 포지션, 쿨다운 정보)
+        self.cooldown_until_date = None
+        saved_state = self.state_manager.load_state()
+        if saved_state:
+            if 'capital' in saved_state:
+                self.strategy.capital = float(saved_state['capital'])
+                logger.info(f"💾 [{self.bot_name}] 저장된 자본금 복원: ${self.strategy.capital:.2f}")
+
+            if saved_state.get('cooldown_until_date'):
+                self.cooldown_until_date = saved_state['cooldown_until_date']
+                logger.info(f"💾 [{self.bot_name}] 저장된 STOP_LOSS 쿨다운 복원: ~ {self.cooldown_until_date}")
+
+            if saved_state.get('current_position'):
+                self.strategy.current_position = saved_state['current_position']
+                self.strategy.current_etf_symbol = saved_state.get('current_etf_symbol')
+                self.strategy.entry_price = saved_state.get('entry_price')
+                self.strategy.entry_quantity = saved_state.get('entry_quantity')
+                self.strategy.entry_time = saved_state.get('entry_time')
+                logger.info(f"💾 [{self.bot_name}] 저장된 포지션 상태 복원: {self.strategy.current_position} ({self.strategy.current_etf_symbol})")
+
+                # 강제 청산 날짜 재계산 (저장된 상태 기반)
+                if self.strategy.entry_time and self.strategy.current_position:
+                    target_days = self._get_hold_days(self.strategy.current_position)
+                    # entry_time은 state_manager에서 datetime으로 변환됨
+                    entry_date = self.strategy.entry_time.date()
+                    self.forced_close_date = self._calculate_trading_day_limit(entry_date, target_days)
+                    logger.info(f"💾 [{self.bot_name}] 저장된 상태 기반 강제 청산 날짜 복원: {self.forced_close_date}")
+
+                    # [State Persistence] 초기화 시 계산된 날짜 저장 (누락 방지)
+                    self._save_state()
+
+        self.async_scheduler = None
+
+        # 텔레그램 알림 말머리 설정 (모의투자/실전투자 구분)
+        if notifier is None:
+            prefix = "모의 투자" if is_paper_trading else "실 투자"
+            notifier = TelegramNotifier(token=TELEGRAM_BOT_TOKEN, chat_id=TELEGRAM_CHAT_ID, prefix=prefix)
+        self.notifier = notifier
+        self.timezone = pytz.timezone("Asia/Seoul")
+
+        self.is_running = False
+
+        logger.info(f"{self.bot_name} 전환 매매 봇 초기화 (KIS API): {self.original_symbol} -> {self.etf_long}/{self.etf_short}")
+
+        if notify_init:
+            # 텔레그램으로도 초기화 알림 전송
+            mode_str = "모의 투자" if is_paper_trading else "실전 투자"
+            self.notifier.send_message(
+                f"🚀 <b>{self.bot_name} 전환 매매 봇 초기화 ({mode_str})</b>\n\n"
+                f"• 종목: {self.original_symbol}\n"
+                f"• ETF: {self.etf_long} / {self.etf_short}\n"
+                f"• 시간: {datetime.now(self.timezone).strftime('%Y-%m-%d %H:%M:%S')}"
+            )
+
+    def _get_hold_days(self, position_side: str) -> int:
+        """포지션 방향별 최대 보유 거래일"""
+        return self.long_hold_days if position_side == "LONG" else self.short_hold_days
+
+    def _save_state(self, **overrides):
+        """현재 포지션/자본금/쿨다운 상태 저장 (overrides로 일부 값 대체)"""
+        state = {
+            "current_position": self.strategy.current_position,
+            "current_etf_symbol": self.strategy.current_etf_symbol,
+            "entry_price": self.strategy.entry_price,
+            "entry_time": self.strategy.entry_time,
+            "entry_quantity": self.strategy.entry_quantity,
+            "capital": self.strategy.capital,
+            "force_close_date": self.forced_close_date,
+            "cooldown_until_date": self.cooldown_until_date
+        }
+        state.update(overrides)
+        self.state_manager.save_state(state)
+
+    def _is_dst(self):
+        """미국 서머타임 체킹 (US/Eastern 기준)"""
+        eastern = pytz.timezone('US/Eastern')
+        now_eastern = datetime.now(eastern)
+        return bool(now_eastern.dst())
+
+    def _market(self) -> str:
+        """공용 캘린더 시장 구분 (KRX -> KR, 그 외 -> US)"""
+        return "KR" if self.exchange == "KRX" else "US"
+
+    def _calculate_trading_day_limit(self, start_date, days):
+        """
+        거래일 기준 날짜 계산 (공용 캘린더: 주말 + 거래소 휴장일 + KRX 수동 휴장일 제외)
+        """
+        return get_calendar(self._market()).add_trading_days(start_date, days)
+
+    def _get_market_status(self):
+        """현재 시간 기준 장 상태 반환 (미국/한국 거래소별 분기)"""
+        now = datetime.now(self.timezone)
+
+        # === 주말 체크 (시장 시간대 기준) ===
+        now_market = datetime.now(self.market_timezone)
+
+        if now_market.weekday() >= 5:
+            return "CLOSED"
+
+        current_time = now.time()
+        curr_min = current_time.hour * 60 + current_time.minute
+        calendar = get_calendar(self._market())
+
+        # --- 한국 주식 (KRX) ---
+        if self.exchange == "KRX":
+            # 휴장일 체크
+            if not calendar.is_trading_day(now.date()):
+                return "CLOSED"
+
+            # 정규장: 09:00 ~ 15:30 (장전/장후 시간외는 거래 안 함)
+            if calendar.session_at(curr_min) == "REGULAR":
+                return "REGULAR"
+            return "CLOSED"
+
+        # --- 미국 주식 (NAS/AMS 등): 서머타임 여부에 따라 KST 구간이 1시간씩 이동 ---
+        return calendar.session_at(curr_min, self._is_dst())
+
+    def _get_current_price(self, symbol: str):
+        """현재가 조회 (DataFetcher 경유 - 통합 실행 시 봇 간 가격 캐시 공유)"""
+        price = self.data_fetcher.get_realtime_price(symbol)
+        if price:
+            return price
+
+        raise Exception(f"KIS API 가격 조회 실패: {symbol}")
+
+    def monitor_position(self):
+        """포지션 모니터링 및 전환 조건 확인"""
+        if not self.strategy.current_position:
+            return
+
+        try:
+            # 현재 ETF 가격 조회
+            target_symbol = self.etf_long if self.strategy.current_position == "LONG" else self.etf_short
+            current_price = self._get_current_price(target_symbol)
+
+            if not current_price:
+                return
+
+            # 손절/익절 확인
+            multiple = self.etf_long_multiple if self.strategy.current_position == "LONG" else self.etf_short_multiple
+            exit_reason = self.strategy.check_stop_loss_take_profit2(current_price, multiple)
+
+            if exit_reason:
+                # 청산 허용 장 상태가 지정된 경우에만 시간 확인 (예: 정규장만 허용)
+                market_status = None
+                if self.exit_allowed_statuses is not None:
+                    market_status = self._get_market_status()
+
+                if market_status is None or market_status in self.exit_allowed_statuses:
+                    logger.info(f"{self.strategy.current_etf_symbol} {exit_reason} 조건 충족")
+
+                    self._close_position(current_price, exit_reason)
+
+                    # === STOP_LOSS 쿨다운 설정 (4일) ===
+                    if exit_reason == "STOP_LOSS":
+                        now = datetime.now(self.timezone)
+                        self.cooldown_until_date = (now + timedelta(days=4)).date()
+                        logger.info(f"⛔ [{self.bot_name}] STOP_LOSS 쿨다운 시작 -> {self.cooldown_until_date} 까지 거래 중단")
+
+                        # [State Persistence] 쿨다운 상태 즉시 저장
+                        self._save_state()
+                else:
+                    logger.info(f"🛑 {exit_reason} 조건 충족되었으나 비거래 시간 ({market_status}) - 청산 보류")
+
+            # 최대 보유 기간 확인 (거래일 수 기준, reversal_backtest.py와 동일)
+            if self.forced_close_date:
+                # 시장 날짜 기준으로 비교
+                market_date = datetime.now(self.market_timezone).date()
+                if market_date >= self.forced_close_date:
+                    # [Request] 거래 가능한 시간인지 확인
+                    market_status = self._get_market_status()
+                    # 정규장만 허용 (필요시 PRE/AFTER 추가 가능하나 안전하게 정규장 권장)
+                    allowed_statuses = ["REGULAR"]
+                    # 모의투자는 유연하게
+                    if self.kis.is_paper_trading:
+                        allowed_statuses.extend(["PREMARKET", "AFTERMARKET", "daytime"])
+
+                    if market_status in allowed_statuses:
+                        self._close_position(current_price, "FORCE_CLOSE_TRADING_DAY_LIMIT")
+
+                        # === FORCE_CLOSE 후 처리 ===
+                        # 1. 이익이면 연속 손절 카운트 리셋 (기존 로직)
+                        if self.strategy.trade_history:
+                            last_trade = self.strategy.trade_history[-1]
+                            if last_trade['pnl'] > 0:
+                                self.strategy.consecutive_stop_losses = 0
+                                self.strategy.stop_loss_cooldown_until = None
+                                logger.info("✅ FORCE_CLOSE 이익 실현으로 연속 손절 카운트 초기화")
+                    else:
+                        logger.info(f"⏳ 강제 청산 날짜 도달 ({self.forced_close_date})했으나 비거래 시간 ({market_status}) - 대기")
+
+            # 최대 자본 손실률 확인
+            if self.strategy.check_max_drawdown(current_price):
+                logger.error(f"[{self.bot_name}] 최대 자본 손실률 초과 - 거래 중단")
+                self.stop()
+
+        except Exception as e:
+            logger.error(f"[{self.bot_name}] 포지션 모니터링 실패: {e}")
+            self.notifier.send_error_alert(f"[{self.bot_name}] 포지션 모니터링 중 오류 발생: {e}")
+
+    def _execute_reversal(self, reason: str = "손절 전환"):
+        """
+        전환 매매 실행 (청산 -> 반대 ETF 진입 파이프라인)
+        - 청산 주문 접수 직후 진입 주문을 접수하고, 두 주문의 체결은 병렬로 추적
+        - 체결 확정 후 실제 체결가/수량으로 자본금과 진입가 보정
+        """
+        try:
+            # 원본 주식 데이터 수집 (지표 계산용)
+            original_data = self.data_fetcher.get_intraday_data(
+                self.original_symbol,
+                interval="1h"
+            )
+
+            if original_data is None or len(original_data) < 50:
+                logger.warning(f"{self.original_symbol} 데이터 부족")
+                return
+
+            # ETF 가격 조회
+            etf_long_price = self._get_current_price(self.etf_long)
+            etf_short_price = self._get_current_price(self.etf_short)
+
+            if not etf_long_price or not etf_short_price:
+                logger.warning("ETF 가격 조회 실패")
+                return
+
+            # 1. 기존 포지션 청산 주문 접수 (체결 대기 없이 다음 단계 진행)
+            close_order = None
+            close_fill = None
+            close_price = None
+            if self.strategy.current_position:
+                close_symbol = self.strategy.current_etf_symbol
+                close_qty = self.strategy.entry_quantity
+                close_price = etf_long_price if self.strategy.current_position == "LONG" else etf_short_price
+                logger.info(f"[KIS] 청산 주문 실행: {close_symbol} {int(close_qty)}주")
+                close_order = self.order_executor.place(close_symbol, "SELL", close_qty, quoted_price=close_price)
+                if close_order.order_no is None:
+                    logger.error("청산 주문 실패, 전환 중단")
+                    return
+                close_fill = self.order_executor.track(close_order)
+
+            # 2. 전환 로직 실행 (호가 기준 상태 업데이트, 주문 파이프라인이 지연을 대신하므로 반전 지연 생략)
+            result = self.strategy.execute_reversal(
+                original_symbol=self.original_symbol,
+                etf_long=self.etf_long,
+                etf_short=self.etf_short,
+                original_data=original_data,
+                etf_long_price=etf_long_price,
+                etf_short_price=etf_short_price,
+                current_time=datetime.now(),
+                reason=reason,
+                apply_delay=False
+            )
+
+            # 3. 신규 진입 주문 접수 (청산 체결과 병렬 추적)
+            open_fill = None
+            if result:
+                new_symbol = result['to_etf']
+                new_qty = int(result['quantity'])
+                logger.info(f"[KIS] 진입 주문 실행: {new_symbol} {new_qty}주")
+                open_order = self.order_executor.place(new_symbol, "BUY", new_qty, quoted_price=result['entry_price'])
+                open_fill = self.order_executor.track(open_order)
+
+            # 4. 체결 확정 및 보정
+            if close_fill is not None:
+                self._reconcile_reversal_close(close_fill.result(), close_price, reason)
+                if not result:
+                    # 진입 수량 부족 등으로 전환이 성립하지 않으면 청산만 반영
+                    self._reset_position()
+
+            if result:
+                open_result = self._reconcile_reversal_open(open_fill.result(), result)
+                if open_result.has_fill:
+                    self.notifier.send_order_alert(
+                        symbol=open_result.symbol,
+                        side="BUY",
+                        price=open_result.avg_price,
+                        quantity=open_result.filled_qty,
+                        reason=reason
+                    )
+                    logger.info(f"✅ 전환 매매 성공: {result['from_etf']} -> {result['to_etf']}")
+
+                    # === 강제 청산 날짜 설정 ===
+                    position_side = "LONG" if result['to_etf'] == self.etf_long else "SHORT"
+                    target_days = self._get_hold_days(position_side)
+                    # 시장 날짜 기준으로 진입일 설정
+                    entry_date = datetime.now(self.market_timezone).date()
+                    self.forced_close_date = self._calculate_trading_day_limit(entry_date, target_days)
+                    logger.info(f"📅 강제 청산 날짜 설정: {self.forced_close_date} ({target_days} 거래일 후)")
+                else:
+                    logger.error("진입 주문 실패")
+                    self.notifier.send_error_alert(f"진입 주문 실패: {result['to_etf']}")
+            else:
+                logger.info("전환 매매 조건 미충족 (Strategy 내부 로직)")
+
+            # [State Persistence] 전환 후 상태 저장
+            self._save_state()
+
+        except Exception as e:
+            logger.error(f"[{self.bot_name}] 전환 매매 실행 실패: {e}")
+            self.notifier.send_error_alert(f"[{self.bot_name}] 전환 매매 실행 중 오류 발생: {e}")
+
+    def _reconcile_reversal_close(self, fill, quoted_price: float, reason: str):
+        """전환 시 청산 주문의 실제 체결로 자본금/거래 기록 보정 (전략은 호가 전량 체결로 가정)"""
+        assumed = fill.requested_qty * quoted_price
+        actual = fill.filled_amount
+        self.strategy.capital += actual - assumed
+
+        if self.strategy.trade_history:
+            record = self.strategy.trade_history[-1]
+            record['exit_price'] = fill.avg_price
+            record['quantity'] = fill.filled_qty
+            record['pnl'] = record.get('pnl', 0) + (actual - assumed)
+
+        if fill.has_fill:
+            self.notifier.send_order_alert(
+                symbol=fill.symbol,
+                side="SELL",
+                price=fill.avg_price,
+                quantity=fill.filled_qty,
+                reason=reason
+            )
+        if fill.unfilled_qty > 0:
+            logger.error(f"⚠️ 전환 청산 잔량 발생: {fill} - 계좌 확인 필요")
+            self.notifier.send_error_alert(
+                f"[{self.bot_name}] 전환 청산 미체결 잔량: {fill.symbol} {int(fill.unfilled_qty)}주 (수동 확인 필요)"
+            )
+
+    def _reconcile_reversal_open(self, fill, reversal_record: dict):
+        """전환 진입 주문의 실제 체결로 진입가/수량/자본금 보정"""
+        assumed = reversal_record['quantity'] * reversal_record['entry_price']
+        self.strategy.capital += assumed - fill.filled_amount
+
+        if fill.has_fill:
+            self.strategy.entry_price = fill.avg_price
+            self.strategy.entry_quantity = fill.filled_qty
+            reversal_record['entry_price'] = fill.avg_price
+            reversal_record['quantity'] = fill.filled_qty
+            if fill.unfilled_qty > 0:
+                logger.warning(f"전환 진입 부분 체결: {fill}")
+        else:
+            # 체결 없음 -> 수수료 환원 후 무포지션
+            self.strategy.capital += reversal_record.get('fee', 0)
+            self._reset_position()
+        return fill
+
+    def _reset_position(self):
+        """전략 포지션 초기화"""
+        self.strategy.current_position = None
+        self.strategy.current_etf_symbol = None
+        self.strategy.entry_price = None
+        self.strategy.entry_time = None
+        self.strategy.entry_quantity = None
+        self.forced_close_date = None
+
+    def _close_position(self, current_price: float, reason: str):
+        """포지션 청산 (전환 없이, 실제 체결 기준으로 자본금 반영)"""
+        if not self.strategy.current_position:
+            return
+
+        # KIS 주문 (접수 재시도 + 체결 추적)
+        symbol = self.strategy.current_etf_symbol
+        qty = int(self.strategy.entry_quantity)
+        logger.info(f"[KIS] 청산 주문: {symbol} {qty}주 ({reason})")
+
+        fill = self.order_executor.execute(symbol, "SELL", qty, quoted_price=current_price)
+
+        if not fill.has_fill:
+            logger.error(f"청산 주문 최종 실패 ({fill.status})")
+            self.notifier.send_error_alert(f"청산 주문 최종 실패: {symbol} ({fill.status})")
+            return
+
+        exit_price = fill.avg_price
+        closed_qty = fill.filled_qty
+
+        # 청산 알림 전송
+        self.notifier.send_order_alert(
+            symbol=symbol,
+            side="SELL",
+            price=exit_price,
+            quantity=closed_qty,
+            reason=reason
+        )
+
+        # 전략 상태 업데이트 (보유 ETF 매도 대금 기준, ReversalStrategy에는 청산용 퍼블릭 메서드가 없으므로 직접 처리)
+        pnl_pct = ((exit_price - self.strategy.entry_price) / self.strategy.entry_price) * 100
+        pnl = closed_qty * (exit_price - self.strategy.entry_price)
+        self.strategy.capital += closed_qty * exit_price
+
+        trade_record = {
+            'entry_time': self.strategy.entry_time,
+            'exit_time': datetime.now(),
+            'symbol': self.strategy.current_etf_symbol,
+            'side': self.strategy.current_position,
+            'entry_price': self.strategy.entry_price,
+            'exit_price': exit_price,
+            'quantity': closed_qty,
+            'pnl': pnl,
+            'pnl_pct': pnl_pct,
+            'reason': reason
+        }
+        self.strategy.trade_history.append(trade_record)
+
+        logger.info(
+            f"포지션 청산: {self.strategy.current_etf_symbol} {self.strategy.current_position} "
+            f"@ ${exit_price:.2f} x {closed_qty} (손익: {pnl_pct:.2f}%) - {reason}"
+        )
+
+        if fill.unfilled_qty > 0:
+            # 부분 체결: 잔량은 포지션으로 유지하고 다음 모니터링에서 재청산
+            self.strategy.entry_quantity = fill.unfilled_qty
+            logger.warning(f"부분 청산: 잔량 {fill.unfilled_qty}주 보유 유지")
+            self.notifier.send_error_alert(f"[{self.bot_name}] 부분 청산: {symbol} 잔량 {int(fill.unfilled_qty)}주")
+        else:
+            self._reset_position()
+
+        # [State Persistence] 청산 후 상태 업데이트 (자본금/쿨다운 유지)
+        self._save_state()
+
+    def execute_trading_strategy(self):
+        """거래 전략 실행 (정규장)"""
+        market_status = self._get_market_status()
+
+        # 정규장 시간 부터 시작 (모의투자는 프리마켓도 허용)
+        allowed_statuses = ["REGULAR"]
+        if self.kis.is_paper_trading:
+            allowed_statuses.append("PREMARKET")
+
+        if market_status in allowed_statuses:
+            logger.info(f"[{self.bot_name}] 거래 전략 실행 중 (Status: {market_status})")
+
+            # 0. 쿨다운 체크
+            if self.cooldown_until_date:
+                today = datetime.now(self.timezone).date()
+                if today <= self.cooldown_until_date:
+                    logger.info(f"⛔ [{self.bot_name}] STOP_LOSS 쿨다운 중입니다. (해제일: {self.cooldown_until_date} 이후) - 거래 스킵")
+                    return
+                else:
+                    logger.info(f"🟢 [{self.bot_name}] STOP_LOSS 쿨다운 해제됨 ({self.cooldown_until_date} 지남)")
+                    self.cooldown_until_date = None
+                    # 상태 업데이트 (쿨다운 해제 저장)
+                    self._save_state()
+
+            # 이미 포지션이 있으면 스킵
+            if self.strategy.current_position:
+                # [Request] 이미 포지션이 있어도, 강제 청산 날짜가 지났으면 모니터링 로직 태워서 청산 시도
+                if self.forced_close_date:
+                    market_date = datetime.now(self.market_timezone).date()
+
+                    if market_date >= self.forced_close_date:
+                        logger.info(f"⏳ 강제 청산 날짜 도달 ({self.forced_close_date}) -> 모니터링(청산로직) 실행")
+                        self.monitor_position()
+
+                # 청산 후 포지션이 없어졌는지 재확인
+                if self.strategy.current_position:
+                    logger.info(f"이미 포지션 보유 중: {self.strategy.current_etf_symbol} {self.strategy.current_position}")
+                    return
+
+            try:
+                # 원본 주식 데이터 수집 (지표용, 1시간 간격 실행이므로 1시간봉 사용)
+                original_data = self.data_fetcher.get_intraday_data(
+                    self.original_symbol,
+                    interval="1h"
+                )
+
+                if original_data is None or len(original_data) < 50:
+                    logger.warning(f"{self.original_symbol} 데이터 부족 또는 조회 실패")
+                    self.notifier.send_error_alert(f"데이터 조회 실패: {self.original_symbol}\n(토큰 만료 또는 서버 오류 가능성)")
+                    return
+
+                # 신호 생성
+                signal_data = self.strategy.signal_generator.generate_signal(
+                    original_data,
+                    None
+                )
+
+                signal = signal_data["signal"]
+                confidence = signal_data["confidence"]
+
+                # 진입 조건 확인
+                target_etf = None
+                position_side = None
+                action_result = "신호 없음 / 관망"
+
+                if signal == SignalType.BUY and confidence > 0.5:
+                    target_etf = self.etf_long
+                    position_side = "LONG"
+                elif signal == SignalType.SELL and confidence > 0.5:
+                    target_etf = self.etf_short
+                    position_side = "SHORT"
+
+                if target_etf:
+                    # ETF 가격 조회
+                    etf_price = self._get_current_price(target_etf)
+
+                    if etf_price:
+                        quantity = self.strategy.calculate_position_size(etf_price, is_reversal=False)
+                        if quantity > 0:
+                            # KIS 주문 (체결 확정까지 추적)
+                            logger.info(f"[KIS] 진입 주문: {target_etf} {int(quantity)}주")
+                            fill = self.order_executor.execute(target_etf, "BUY", quantity, quoted_price=etf_price)
+
+                            if fill.has_fill:
+                                # 실제 체결 금액/체결가/체결 수량 반영
+                                self.strategy.capital -= fill.filled_amount
+
+                                self.strategy.current_position = position_side
+                                self.strategy.current_etf_symbol = target_etf
+                                self.strategy.entry_price = fill.avg_price
+                                self.strategy.entry_time = datetime.now()
+                                self.strategy.entry_quantity = fill.filled_qty
+                                etf_price = fill.avg_price
+                                quantity = fill.filled_qty
+
+                                # === 강제 청산 날짜 설정 ===
+                                target_days = self._get_hold_days(position_side)
+                                entry_date = datetime.now(self.market_timezone).date()
+                                self.forced_close_date = self._calculate_trading_day_limit(entry_date, target_days)
+                                logger.info(f"📅 강제 청산 날짜 설정: {self.forced_close_date} ({target_days} 거래일 후)")
+
+                                # [State Persistence] 진입 후 상태 저장
+                                self._save_state()
+
+                                logger.info(
+                                    f"{position_side} 포지션 진입: {target_etf} @ ${etf_price:.2f} x {int(quantity)} "
+                                    f"(신뢰도: {confidence:.2f})"
+                                )
+                                action_result = f"진입 성공 ({target_etf})"
+                            else:
+                                logger.error(f"진입 주문 실패 ({fill.status})")
+                                action_result = "진입 주문 실패"
+
+                rsi = signal_data.get("rsi")
+                macd = signal_data.get("macd")
+
+                logger.info(f"텔레그램 알림 전송 시도: Signal={signal}, Action={action_result}")
+
+                # 전략 실행 결과 텔레그램 전송
+                res = self.notifier.send_strategy_update(
+                    symbol=self.original_symbol,
+                    market_status=market_status,
+                    signal=str(signal).split(".")[-1], # SignalType.BUY -> BUY
+                    confidence=confidence if confidence else 0.0,
+                    current_position=self.strategy.current_position,
+                    action=action_result,
+                    rsi=rsi,
+                    macd=macd
+                )
+
+                if res:
+                    logger.info("텔레그램 알림 전송 성공")
+                else:
+                    logger.warning("텔레그램 알림 전송 실패 (send_strategy_update returned False)")
+
+            except Exception as e:
+                logger.error(f"[{self.bot_name}] 거래 전략 실행 실패: {e}")
+
+        # 포지션 모니터링 (항상 실행)
+        self.monitor_position()
+
+    def sync_internal_state_with_account(self, balance_data: dict = None, actual_balance: float = None):
+        """
+        계좌 잔고를 조회하여 봇 내부 상태 동기화
+        :param balance_data: 미리 조회한 해외 잔고 (통합 실행 시 1회 조회 후 공유)
+        :param actual_balance: 이 봇에 배정된 외화 예수금 (없으면 직접 조회)
+        """
+        logger.info(f"[{self.bot_name}] 계좌 정보 동기화 중...")
+        if balance_data is None:
+            balance_data = self.kis.get_overseas_stock_balance()
+
+        if not balance_data:
+            logger.warning("계좌 정보 동기화 실패 (API 응답 없음)")
+            return
+
+        holdings = balance_data.get('holdings', [])
+
+        # 저장된 상태 로드 시도
+        saved_state = self.state_manager.load_state()
+
+        # 1. 자본금 동기화 (실제 계좌 잔고 우선)
+        if actual_balance is None:
+            actual_balance = self.kis.get_balance()
+        if actual_balance > 0:
+            previous_capital = self.strategy.capital
+            self.strategy.capital = actual_balance
+            logger.info(f"💰 자본금 동기화: ${previous_capital:.2f} -> ${self.strategy.capital:.2f} (Actual Balance)")
+        elif saved_state and 'capital' in saved_state:
+            self.strategy.capital = float(saved_state['capital'])
+            logger.info(f"💰 자본금 복원 (상태파일): ${self.strategy.capital:.2f}")
+        else:
+            logger.info(f"💰 자본금 유지 (초기값): ${self.strategy.capital:.2f}")
+
+        # 2. 보유 종목 확인 (롱 / 숏 ETF)
+        target_found = False
+
+        for item in holdings:
+            # ovrs_pdno: 상품번호, ord_psbl_qty: 주문가능수량 (없으면 cclt_qty: 체결수량)
+            symbol = item.get('ovrs_pdno')
+            if symbol == self.etf_long:
+                position_side = "LONG"
+            elif symbol == self.etf_short:
+                position_side = "SHORT"
+            else:
+                continue
+
+            qty = float(item.get('ord_psbl_qty', 0))
+            if qty <= 0:
+                qty = float(item.get('cclt_qty', 0))
+
+            purch_avg_price = float(item.get('pchs_avg_pric', 0)) # 매입평균가격
+
+            self.strategy.current_position = position_side
+            self.strategy.current_etf_symbol = symbol
+            self.strategy.entry_price = purch_avg_price
+            self.strategy.entry_quantity = qty
+            self.strategy.entry_time = datetime.now() # 기본값
+
+            # [State Persistence] 저장된 상태가 있고, 보유 종목/수량이 일치하면 저장된 진입 시간 복원
+            if saved_state and saved_state.get('current_etf_symbol') == symbol:
+                saved_qty = saved_state.get('entry_quantity')
+                if saved_qty and abs(saved_qty - qty) < 1.0: # 오차 허용
+                    if saved_state.get('entry_time'):
+                        self.strategy.entry_time = saved_state['entry_time']
+                        logger.info(f"💾 저장된 진입 시간 복원: {self.strategy.entry_time}")
+
+            # 상태 파일이 없거나 안 맞으면 현재 상태로 다시 저장 (동기화)
+            if not saved_state or saved_state.get('current_etf_symbol') != symbol:
+                self._save_state()
+
+            target_found = True
+            logger.info(f"기존 포지션 복구: {position_side} ({symbol}) {qty}주 @ ${purch_avg_price}")
+
+            # === 강제 청산 날짜 재계산 (복구된 진입시간 기준) ===
+            # 저장된 강제 청산 날짜가 있으면 우선 사용
+            if saved_state and saved_state.get('force_close_date'):
+                self.forced_close_date = saved_state['force_close_date']
+                logger.info(f"💾 저장된 강제 청산 날짜 복원: {self.forced_close_date}")
+            elif self.strategy.entry_time:
+                target_days = self._get_hold_days(position_side)
+                entry_date = self.strategy.entry_time.date()
+                self.forced_close_date = self._calculate_trading_day_limit(entry_date, target_days)
+                logger.info(f"📅 강제 청산 날짜 재설정: {self.forced_close_date} ({target_days} 거래일 후)")
+
+                # [State Persistence] 재계산된 날짜 저장을 위해 강제 업데이트
+                self._save_state()
+
+            break
+
+        if not target_found:
+            logger.info(f"복구할 기존 포지션 없음 ({self.etf_long}/{self.etf_short} 미보유)")
+            # [Caution] KIS API 지연 등으로 종목이 안 보일 수 있으므로 로컬 상태를 함부로 지우지 않음.
+            if saved_state and saved_state.get('current_position'):
+                logger.warning(
+                    f"⚠️ 경고: 로컬 상태에는 {saved_state.get('current_position')} 포지션이 있으나 "
+                    f"실제 계좌에서는 조회되지 않습니다. 수동 확인이 필요합니다."
+                )
+
+    def check_token_renewal(self):
+        """KIS API 토큰 갱신 체크"""
+        logger.info("KIS API 토큰 유효성 체크 중...")
+        self.kis.ensure_valid_token()
+
+    def _guarded(self, func):
+        """봇이 중단(stop)된 뒤에는 실행하지 않는 작업 래퍼"""
+        def job():
+            if self.is_running:
+                func()
+        job.__name__ = func.__name__
+        return job
+
+    def register_jobs(self, scheduler: AsyncScheduler, include_token_check: bool = True):
+        """
+        스케줄 작업 등록 (단독/통합 실행 공용)
+        - 모니터링/전략 실행은 같은 포지션 상태를 다루므로 봇 단위 그룹으로 직렬화
+        - 서로 다른 봇의 작업은 동시에 실행됨
+        """
+        group = f"bot:{self.original_symbol}"
+
+        # 1. 포지션 모니터링: 매 시간 31분 00초에 실행 (KST)
+        scheduler.add_job(
+            self._guarded(self.monitor_position),
+            CronTrigger(minute=31, second=0, timezone="Asia/Seoul"),
+            name=f"{self.bot_name}.monitor_position",
+            timeout=SCHEDULER_JOB_TIMEOUT_SEC,
+            group=group
+        )
+
+        # 2. 거래 전략 실행: 매 시간 31분 20초에 실행 (KST)
+        scheduler.add_job(
+            self._guarded(self.execute_trading_strategy),
+            CronTrigger(minute=31, second=20, timezone="Asia/Seoul"),
+            name=f"{self.bot_name}.execute_trading_strategy",
+            timeout=SCHEDULER_JOB_TIMEOUT_SEC,
+            group=group
+        )
+
+        # 3. 토큰 갱신 체크: 11시간 마다 (만료 전 자동 갱신 보조)
+        if include_token_check:
+            scheduler.add_job(self.check_token_renewal, IntervalTrigger(hours=11), name="check_token_renewal")
+
+    def run(self):
+        """봇 단독 실행"""
+        logger.info(f"{self.bot_name} 전환 매매 봇 시작 (Target: {self.original_symbol})")
+
+        # 시작 시 계좌 상태 동기화
+        self.sync_internal_state_with_account()
+
+        self.is_running = True
+
+        self.async_scheduler = AsyncScheduler()
+        self.register_jobs(self.async_scheduler)
+        # 단계별 지연 시간 주기 보고 (로그 + logs/latency.json, latency.prom)
+        register_report_job(self.async_scheduler)
+
+        # 초기 1회 실행
+        logger.info("봇 시작 시 초기 1회 전략 실행...")
+        self.execute_trading_strategy()
+
+        # 메인 루프 (asyncio 스케줄러, stop 호출 시 종료)
+        try:
+            self.async_scheduler.run_forever()
+        except KeyboardInterrupt:
+            logger.info("봇 종료 요청")
+            self.stop()
+
+    def stop(self):
+        """봇 종료"""
+        logger.info(f"[{self.bot_name}] 봇 종료 중...")
+        self.is_running = False
+        if self.async_scheduler:
+            self.async_scheduler.stop()
+
+        # 모든 포지션 청산
+        if self.strategy.current_position:
+            target_symbol = self.strategy.current_etf_symbol
+            current_price = self._get_current_price(target_symbol)
+
+            if current_price:
+                self._close_position(current_price, "BOT_STOP")
+
+        status = self.strategy.get_strategy_status()
+        logger.info(f"[{self.bot_name}] 전략 최종 상태: {status}")
+        # 대기 중인 알림 발송 (프로세스 종료 전 청산 알림 유실 방지)
+        self.notifier.flush()
+        # 상태 저널 fsync 후 닫기
+        self.state_manager.close()
+        logger.info(f"[{self.bot_name}] 봇 종료 완료")
@@ -14,17 +14,23 @@ from config.settings import (
 from trading.position_manager import PositionManager, Position
 from utils.logger import logger
 
+# 포지션 반영 대상 주문 상태 (부분 체결은 체결 수량만 반영)
+FILLED_STATUSES = ("FILLED", "PARTIAL")
+
 class Trader:
     """거래 실행 클래스"""
     
-    def __init__(self, initial_capital: float = 2000.0):
+    def __init__(self, initial_capital: float = 2000.0, kis_client=None):
         self.position_manager = PositionManager()
         self.capital = initial_capital
         self.available_capital = initial_capital
         self.dry_run = DRY_RUN
         
-        # 실제 API 연결은 여기서 초기화
-        # 예: self.api = alpaca.REST(API_KEY, API_SECRET, BASE_URL)
+        # 실제 API 연결: KIS 클라이언트가 주어지면 주문 실행기(체결 추적) 사용
+        self.order_executor = None
+        if kis_client is not None and not self.dry_run:
+            from trading.order_executor import OrderExecutor
+            self.order_executor = OrderExecutor(kis_client)
         logger.info(f"Trader 초기화: 자본 ${self.capital:.2f}, DRY_RUN={self.dry_run}")
     
     def get_account_balance(self) -> float:
@@ -119,26 +125,24 @@ class Trader:
                     "status": "FILLED"
                 }
             
-            # 실제 주문 실행
-            # order = self.api.submit_order(
-            #     symbol=symbol,
-            #     qty=quantity,
-            #     side=side.lower(),
-            #     type=order_type.lower(),
-            #     time_in_force="day"
-            # )
-            # 
-            # return {
-            #     "order_id": order.id,
-            #     "symbol": symbol,
-            #     "side": side,
-            #     "quantity": quantity,
-            #     "filled_price": order.filled_avg_price,
-            #     "status": order.status
-            # }
+            if self.order_executor is None:
+                logger.warning("실제 거래 API 미구현")
+                return None
             
-            logger.warning("실제 거래 API 미구현")
-            return None
+            # 실제 주문 실행 (체결 확정까지 추적, 부분 체결은 체결 수량만 반영)
+            result = self.order_executor.execute(symbol, side, quantity)
+            if not result.has_fill:
+                logger.error(f"주문 미체결: {result}")
+                return None
+            
+            return {
+                "order_id": result.order_no,
+                "symbol": symbol,
+                "side": side,
+                "quantity": result.filled_qty,
+                "filled_price": result.avg_price,
+                "status": result.status
+            }
             
         except Exception as e:
             logger.error(f"주문 실행 실패: {e}")
@@ -153,11 +157,12 @@ class Trader:
         
         order = self.place_order(symbol, "BUY", quantity)
         
-        if order is None or order["status"] != "FILLED":
+        if order is None or order["status"] not in FILLED_STATUSES:
             logger.error(f"{symbol} 롱 포지션 오픈 실패")
             return None
         
         filled_price = order["filled_price"]
+        quantity = order["quantity"]
         position = self.position_manager.open_position(
             symbol=symbol,
             side="LONG",
@@ -181,11 +186,12 @@ class Trader:
         
         order = self.place_order(symbol, "SELL", quantity)
         
-        if order is None or order["status"] != "FILLED":
+        if order is None or order["status"] not in FILLED_STATUSES:
             logger.error(f"{symbol} 숏 포지션 오픈 실패")
             return None
         
         filled_price = order["filled_price"]
+        quantity = order["quantity"]
         position = self.position_manager.open_position(
             symbol=symbol,
             side="SHORT",
@@ -0,0 +1,375 @@
+"""
+asyncio 기반 스케줄러 모듈
+- schedule.run_pending + time.sleep(1) 폴링 대체
+- 시간대 인식 크론 트리거 (KST/ET, 서머타임 자동 반영)
+- 작업 중복 실행 정책(skip/queue/concurrent), 작업별 타임아웃, 그룹 단위 직렬화
+- Clock 추상화로 테스트에서 시간을 직접 진행 가능 (ManualClock)
+"""
+import asyncio
+import heapq
+import itertools
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+import pytz
+from utils.logger import logger
+from utils.latency import latency
+
+OVERLAP_SKIP = "skip"              # 이전 실행이 끝나지 않았으면 이번 실행 건너뜀
+OVERLAP_QUEUE = "queue"            # 이전 실행이 끝난 뒤 실행 (대기 1건까지)
+OVERLAP_CONCURRENT = "concurrent"  # 중복 실행 허용
+OVERLAP_POLICIES = (OVERLAP_SKIP, OVERLAP_QUEUE, OVERLAP_CONCURRENT)
+
+
+class Clock:
+    """실제 시간 시계"""
+
+    def now(self, tz=None) -> datetime:
+        """현재 시각 (tz 미지정 시 UTC)"""
+        return datetime.now(tz or pytz.utc)
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(max(0.0, seconds))
+
+    async def sleep_until(self, when: datetime):
+        """지정 시각까지 대기 (시스템 시간 변경에 대비해 최대 60초 단위로 재확인)"""
+        while True:
+            remaining = (when - self.now()).total_seconds()
+            if remaining <= 0:
+                return
+            await self.sleep(min(remaining, 60.0))
+
+
+class ManualClock(Clock):
+    """테스트용 수동 시계 (advance 호출로만 시간이 흐름)"""
+
+    def __init__(self, start: datetime):
+        if start.tzinfo is None:
+            raise ValueError("start must be timezone-aware")
+        self._now = start
+        self._sleepers = []
+        self._seq = itertools.count()
+
+    def now(self, tz=None) -> datetime:
+        return self._now.astimezone(tz) if tz else self._now
+
+    async def sleep(self, seconds: float):
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self._now + timedelta(seconds=seconds), next(self._seq), future))
+        await future
+
+    async def advance(self, seconds: float):
+        """시간을 seconds 만큼 진행하며 깨어날 시각이 된 대기 작업을 순서대로 실행"""
+        target = self._now + timedelta(seconds=seconds)
+        await self._settle()
+        while self._sleepers and self._sleepers[0][0] <= target:
+            wake_at, _, future = heapq.heappop(self._sleepers)
+            self._now = max(self._now, wake_at)
+            if not future.done():
+                future.set_result(None)
+            await self._settle()
+        self._now = target
+        await self._settle()
+
+    @staticmethod
+    async def _settle():
+        # 깨어난 작업들이 다음 대기 지점까지 진행하도록 이벤트 루프 양보
+        for _ in range(20):
+            await asyncio.sleep(0)
+
+
+def _parse_field(spec, low: int, high: int) -> tuple:
+    """크론 필드 파싱 ("*", "*/5", "1,15,30", "0-4", 정수) -> 정렬된 허용값"""
+    if isinstance(spec, int):
+        values = {spec}
+    else:
+        values = set()
+        for part in str(spec).split(","):
+            part = part.strip()
+            step = 1
+            if "/" in part:
+                part, step_str = part.split("/", 1)
+                step = int(step_str)
+            if part in ("*", ""):
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(v) for v in part.split("-", 1))
+            else:
+                start = end = int(part)
+                if step != 1:
+                    end = high
+            values.update(range(start, end + 1, step))
+    if not values or min(values) < low or max(values) > high:
+        raise ValueError(f"Invalid cron field: {spec} (allowed {low}-{high})")
+    return tuple(sorted(values))
+
+
+class CronTrigger:
+    """시간대 인식 크론 트리거 (지정 시간대의 벽시계 기준, 서머타임 반영)"""
+
+    def __init__(self, second=0, minute="*", hour="*", day_of_week="*", timezone: str = "Asia/Seoul"):
+        """
+        :param day_of_week: 0=월 ~ 6=일
+        :param timezone: 기준 시간대 (예: "Asia/Seoul", "US/Eastern")
+        """
+        self.seconds = _parse_field(second, 0, 59)
+        self.minutes = _parse_field(minute, 0, 59)
+        self.hours = _parse_field(hour, 0, 23)
+        self.days_of_week = set(_parse_field(day_of_week, 0, 6))
+        self.timezone = pytz.timezone(timezone) if isinstance(timezone, str) else timezone
+
+    def _localize(self, naive: datetime) -> Optional[datetime]:
+        try:
+            return self.timezone.localize(naive, is_dst=None)
+        except pytz.NonExistentTimeError:
+            # 서머타임 시작으로 건너뛰는 시각은 실행하지 않음
+            return None
+        except pytz.AmbiguousTimeError:
+            # 서머타임 종료로 반복되는 시각은 첫 번째에만 실행
+            return self.timezone.localize(naive, is_dst=True)
+
+    def next_fire(self, after: datetime) -> Optional[datetime]:
+        """after 이후 첫 실행 시각 (tz-aware)"""
+        local_after = after.astimezone(self.timezone).replace(tzinfo=None, microsecond=0)
+        day = local_after.date()
+        for _ in range(8 * 366):
+            if day.weekday() in self.days_of_week:
+                for hour in self.hours:
+                    if day == local_after.date() and hour < local_after.hour:
+                        continue
+                    for minute in self.minutes:
+                        for second in self.seconds:
+                            naive = datetime(day.year, day.month, day.day, hour, minute, second)
+                            if naive < local_after:
+                                continue
+                            fire = self._localize(naive)
+                            if fire is not None and fire > after:
+                                return fire
+            day += timedelta(days=1)
+        return None
+
+    def __repr__(self):
+        return f"CronTrigger(h={self.hours}, m={self.minutes}, s={self.seconds}, tz={self.timezone.zone})"
+
+
+class IntervalTrigger:
+    """고정 간격 트리거"""
+
+    def __init__(self, seconds: float = 0, minutes: float = 0, hours: float = 0, start: datetime = None):
+        self.interval = timedelta(seconds=seconds, minutes=minutes, hours=hours)
+        if self.interval.total_seconds() <= 0:
+            raise ValueError("interval must be positive")
+        self.start = start
+
+    def next_fire(self, after: datetime) -> datetime:
+        if self.start is None:
+            self.start = after
+        if after < self.start:
+            return self.start
+        elapsed = (after - self.start) // self.interval
+        return self.start + (elapsed + 1) * self.interval
+
+    def __repr__(self):
+        return f"IntervalTrigger({self.interval})"
+
+
+class ScheduledJob:
+    """스케줄러에 등록된 작업"""
+
+    def __init__(self, func: Callable, trigger, name: str, overlap: str, timeout: Optional[float], group: Optional[str]):
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"overlap must be one of {OVERLAP_POLICIES}")
+        self.func = func
+        self.trigger = trigger
+        self.name = name
+        self.overlap = overlap
+        self.timeout = timeout
+        self.group = group
+        self.is_coroutine = asyncio.iscoroutinefunction(func)
+        self.running = 0
+        self.pending = False
+        self.next_run = None
+        self.run_count = 0
+        self.skip_count = 0
+        self.timeout_count = 0
+        self.error_count = 0
+
+
+class AsyncScheduler:
+    """asyncio 기반 작업 스케줄러"""
+
+    def __init__(self, clock: Clock = None):
+        self.clock = clock or Clock()
+        self.jobs = []
+        self.is_running = False
+        self._group_locks = {}
+        self._loop = None
+        self._tasks = set()
+        self._loop_tasks = []
+
+    def add_job(
+        self,
+        func: Callable,
+        trigger,
+        name: str = None,
+        overlap: str = OVERLAP_SKIP,
+        timeout: float = None,
+        group: str = None
+    ) -> ScheduledJob:
+        """
+        작업 등록
+        :param func: 실행 함수 (일반 함수는 스레드에서, 코루틴 함수는 이벤트 루프에서 실행)
+        :param trigger: CronTrigger / IntervalTrigger
+        :param overlap: 이전 실행이 진행 중일 때 정책 (skip / queue / concurrent)
+        :param timeout: 실행 제한 시간(초). 코루틴은 취소, 스레드 작업은 경고 후 완료까지 대기
+        :param group: 같은 그룹의 작업은 동시에 실행되지 않음 (같은 상태를 다루는 작업 보호)
+        """
+        job = ScheduledJob(func, trigger, name or getattr(func, "__name__", "job"), overlap, timeout, group)
+        self.jobs.append(job)
+        logger.info(f"[스케줄러] 작업 등록: {job.name} ({trigger})")
+        return job
+
+    def _get_group_lock(self, group: str) -> asyncio.Lock:
+        if group not in self._group_locks:
+            self._group_locks[group] = asyncio.Lock()
+        return self._group_locks[group]
+
+    async def _call(self, job: ScheduledJob):
+        # 작업 1회(틱) 전체 소요 시간 집계
+        with latency.timer(f"job.{job.name}"):
+            if job.is_coroutine:
+                return await job.func()
+            return await asyncio.to_thread(job.func)
+
+    async def _execute(self, job: ScheduledJob):
+        """타임아웃을 적용하여 작업 1회 실행"""
+        task = asyncio.ensure_future(self._call(job))
+        if job.timeout is None:
+            await task
+            return
+
+        timer = asyncio.ensure_future(self.clock.sleep(job.timeout))
+        try:
+            done, _ = await asyncio.wait({task, timer}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            timer.cancel()
+        if task in done:
+            task.result()
+            return
+
+        job.timeout_count += 1
+        if job.is_coroutine:
+            task.cancel()
+            logger.error(f"[스케줄러] {job.name} 타임아웃 ({job.timeout}초) - 작업 취소")
+            return
+        # 스레드는 강제 종료할 수 없으므로 완료까지 기다려 중복 실행을 막음
+        logger.error(f"[스케줄러] {job.name} 타임아웃 ({job.timeout}초) - 작업 완료 대기 중")
+        await task
+
+    async def _run_instance(self, job: ScheduledJob):
+        """중복 실행 정책/그룹 잠금 적용 후 실행"""
+        if job.overlap == OVERLAP_QUEUE:
+            # 작업 자체 잠금으로 이전 실행 완료 후 순서대로 실행
+            async with self._get_group_lock(f"__job__:{id(job)}"):
+                await self._run_locked(job)
+        else:
+            await self._run_locked(job)
+
+    async def _run_locked(self, job: ScheduledJob):
+        job.running += 1
+        try:
+            if job.group:
+                async with self._get_group_lock(job.group):
+                    await self._execute(job)
+            else:
+                await self._execute(job)
+            job.run_count += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.error_count += 1
+            logger.error(f"[스케줄러] {job.name} 실행 실패: {e}")
+        finally:
+            job.running -= 1
+
+    def _dispatch(self, job: ScheduledJob):
+        """트리거 시각 도달 시 실행 인스턴스 생성"""
+        queued = False
+        if job.running:
+            if job.overlap == OVERLAP_SKIP:
+                job.skip_count += 1
+                logger.warning(f"[스케줄러] {job.name} 이전 실행 진행 중 - 이번 실행 건너뜀")
+                return
+            if job.overlap == OVERLAP_QUEUE:
+                if job.pending:
+                    job.skip_count += 1
+                    logger.warning(f"[스케줄러] {job.name} 대기 작업 존재 - 이번 실행 건너뜀")
+                    return
+                job.pending = True
+                queued = True
+
+        async def runner():
+            try:
+                await self._run_instance(job)
+            finally:
+                if queued:
+                    job.pending = False
+
+        task = asyncio.ensure_future(runner())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _job_loop(self, job: ScheduledJob):
+        """작업별 트리거 루프"""
+        while self.is_running:
+            job.next_run = job.trigger.next_fire(self.clock.now())
+            if job.next_run is None:
+                logger.info(f"[스케줄러] {job.name} 다음 실행 시각 없음 - 루프 종료")
+                return
+            await self.clock.sleep_until(job.next_run)
+            if not self.is_running:
+                return
+            self._dispatch(job)
+
+    async def run(self):
+        """스케줄러 실행 (stop 호출 시 종료)"""
+        self._loop = asyncio.get_running_loop()
+        self.is_running = True
+        logger.info(f"[스케줄러] 시작 ({len(self.jobs)}개 작업)")
+        self._loop_tasks = [asyncio.ensure_future(self._job_loop(job)) for job in self.jobs]
+        try:
+            await asyncio.gather(*self._loop_tasks)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            for task in self._loop_tasks:
+                task.cancel()
+            # 진행 중인 작업은 마무리될 때까지 대기
+            if self._tasks:
+                await asyncio.gather(*list(self._tasks), return_exceptions=True)
+            self.is_running = False
+            logger.info("[스케줄러] 종료")
+
+    def run_forever(self):
+        """동기 코드에서 스케줄러 실행 (블로킹)"""
+        asyncio.run(self.run())
+
+    def _cancel_loops(self):
+        for task in self._loop_tasks:
+            task.cancel()
+
+    def stop(self):
+        """스케줄러 종료 요청 (다른 스레드/작업 내부에서 호출 가능)"""
+        self.is_running = False
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._cancel_loops()
+        else:
+            self._loop.call_soon_threadsafe(self._cancel_loops)
@@ -0,0 +1,201 @@
+"""
+핫패스 지연 시간 계측 유틸리티
+- 단계(stage)별 지연 시간을 고정 로그 스케일 버킷 히스토그램으로 메모리에 집계 (기록 O(log B), 메모리 고정)
+- p50/p95/p99 요약을 로그, JSON, Prometheus 텍스트 포맷으로 노출
+- 컨텍스트 매니저(timer) 또는 데코레이터(timed)로 사용
+"""
+import bisect
+import functools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import LATENCY_METRICS_ENABLED, LATENCY_DUMP_DIR, LATENCY_REPORT_INTERVAL_MIN
+from utils.logger import logger
+
+# 버킷 경계 (초): 50us ~ 약 120초, 25% 간격 -> 상대 오차 최대 25%
+_BUCKET_MIN_SEC = 0.00005
+_BUCKET_GROWTH = 1.25
+_BUCKET_COUNT = 66
+BUCKET_BOUNDS = tuple(_BUCKET_MIN_SEC * (_BUCKET_GROWTH ** i) for i in range(_BUCKET_COUNT))
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencyHistogram:
+    """단일 단계 지연 시간 히스토그램 (스레드 안전)"""
+
+    __slots__ = ("counts", "count", "total", "max", "_lock")
+
+    def __init__(self):
+        # 마지막 칸은 최대 경계 초과분
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        idx = bisect.bisect_left(BUCKET_BOUNDS, seconds)
+        with self._lock:
+            self.counts[idx] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """버킷 상한 기준 분위수 (관측 최대값을 넘지 않음)"""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = max(1, math.ceil(q * self.count))
+            cumulative = 0
+            for idx, n in enumerate(self.counts):
+                cumulative += n
+                if cumulative >= rank:
+                    bound = BUCKET_BOUNDS[idx] if idx < len(BUCKET_BOUNDS) else self.max
+                    return min(bound, self.max)
+            return self.max
+
+    def summary(self) -> dict:
+        result = {
+            "count": self.count,
+            "sum_sec": self.total,
+            "mean_sec": self.total / self.count if self.count else 0.0,
+            "max_sec": self.max,
+        }
+        for q in QUANTILES:
+            result[f"p{int(q * 100)}_sec"] = self.quantile(q)
+        return result
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+
+class LatencyRecorder:
+    """단계별 지연 시간 집계기"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, stage: str) -> LatencyHistogram:
+        hist = self._histograms.get(stage)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(stage, LatencyHistogram())
+        return hist
+
+    def record(self, stage: str, seconds: float):
+        """지연 시간 1건 기록"""
+        if self.enabled:
+            self._histogram(stage).observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str):
+        """with latency.timer("stage"): ... 블록 소요 시간 기록 (예외 발생 시에도 기록)"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._histogram(stage).observe(time.perf_counter() - start)
+
+    def timed(self, stage: str = None):
+        """함수 소요 시간 기록 데코레이터 (stage 생략 시 모듈.함수명)"""
+        def decorator(func):
+            name = stage or f"{func.__module__}.{func.__qualname__}"
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._histogram(name).observe(time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> dict:
+        """단계별 요약 {stage: {count, sum_sec, mean_sec, max_sec, p50_sec, p95_sec, p99_sec}}"""
+        with self._lock:
+            items = list(self._histograms.items())
+        return {stage: hist.summary() for stage, hist in sorted(items)}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, ensure_ascii=False)
+
+    def to_prometheus(self, metric: str = "trading_bot_stage_latency_seconds") -> str:
+        """Prometheus 텍스트 노출 포맷 (summary 타입)"""
+        lines = [
+            f"# HELP {metric} Hot-path stage latency in seconds",
+            f"# TYPE {metric} summary",
+        ]
+        for stage, s in self.snapshot().items():
+            label = stage.replace("\\", "\\\\").replace('"', '\\"')
+            for q in QUANTILES:
+                lines.append(f'{metric}{{stage="{label}",quantile="{q}"}} {s[f"p{int(q * 100)}_sec"]:.6f}')
+            lines.append(f'{metric}_sum{{stage="{label}"}} {s["sum_sec"]:.6f}')
+            lines.append(f'{metric}_count{{stage="{label}"}} {s["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def log_summary(self):
+        """단계별 요약을 로그로 출력 (ms 단위)"""
+        snapshot = self.snapshot()
+        if not snapshot:
+            return
+        logger.info("⏱️ 단계별 지연 시간 (ms): stage | count | p50 | p95 | p99 | max")
+        for stage, s in snapshot.items():
+            logger.info(
+                f"  {stage} | {s['count']} | {s['p50_sec'] * 1000:.1f} | {s['p95_sec'] * 1000:.1f} | "
+                f"{s['p99_sec'] * 1000:.1f} | {s['max_sec'] * 1000:.1f}"
+            )
+
+    def dump(self, directory: str = LATENCY_DUMP_DIR):
+        """latency.json / latency.prom 파일로 저장 (임시 파일 후 교체)"""
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for filename, text in (("latency.json", self.to_json()), ("latency.prom", self.to_prometheus())):
+                path = os.path.join(directory, filename)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"지연 시간 덤프 실패: {e}")
+
+    def report(self):
+        """주기 보고 (로그 요약 + 파일 덤프), 스케줄 작업용"""
+        self.log_summary()
+        self.dump()
+
+
+def register_report_job(scheduler, interval_min: float = LATENCY_REPORT_INTERVAL_MIN, recorder: LatencyRecorder = None):
+    """AsyncScheduler 에 주기 보고 작업 등록"""
+    from utils.async_scheduler import IntervalTrigger
+    recorder = recorder or latency
+    scheduler.add_job(recorder.report, IntervalTrigger(minutes=interval_min), name="latency_report")
+
+
+# 프로세스 전역 집계기
+latency = LatencyRecorder(enabled=LATENCY_METRICS_ENABLED)
+timer = latency.timer
+timed = latency.timed
@@ -1,42 +1,226 @@
 """
 로깅 유틸리티
+- 거래 스레드는 QueueHandler 로 레코드만 큐에 넣고, 포맷/파일 쓰기는 전용 스레드(QueueListener)가 처리
+- %-스타일 인자(logger.info("... %s", x))는 쓰기 스레드에서 포맷 (레벨 미달 시 포맷 자체를 생략)
+- 파일은 크기/시간 기준으로 교체, 선택적으로 JSON lines 파일 동시 기록
+- 백테스트용 quiet 모드: 봉/거래 단위 로그(trading_bot.backtest)를 버리고 경고 이상만 출력
 """
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from config.settings import LOG_LEVEL, LOG_FILE
+from config.settings import (
+    LOG_LEVEL, LOG_FILE, LOG_DIR, LOG_MAX_BYTES, LOG_ROTATE_WHEN, LOG_BACKUP_COUNT,
+    LOG_JSON_ENABLED, LOG_JSON_FILE, LOG_QUEUE_SIZE
+)
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """시간 기준 + 크기 기준 교체 파일 핸들러"""
+
+    def __init__(self, filename, max_bytes: int = 0, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.max_bytes = max_bytes
+
+    def rotation_filename(self, default_name: str) -> str:
+        # 같은 시간 구간 내 크기 기준 교체가 반복되면 기존 백업을 덮어쓰지 않도록 번호 부여
+        name = super().rotation_filename(default_name)
+        if os.path.exists(name):
+            n = 1
+            while os.path.exists(f"{name}.{n}"):
+                n += 1
+            name = f"{name}.{n}"
+        return name
+
+    def shouldRollover(self, record) -> bool:
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes > 0 and self.stream is not None:
+            self.stream.seek(0, 2)
+            return self.stream.tell() >= self.max_bytes
+        return False
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """구조화 로그 포맷 (한 줄에 JSON 객체 1개)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        # logger.info("...", extra={"event": {...}}) 형태의 구조화 필드
+        event = getattr(record, "event", None)
+        if event is not None:
+            entry["event"] = event
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """레코드를 포맷하지 않고 큐에 적재 (포맷은 쓰기 스레드에서 수행)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 같은 프로세스 내 큐이므로 직렬화 불필요, 예외 정보만 문자열로 고정
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # 쓰기 스레드가 밀리면 거래 스레드를 막지 않고 디버그/정보 로그부터 버림
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record)
+
+
+_listeners = {}
+
+
+def _build_handlers() -> list:
+    if not os.path.exists(LOG_DIR):
+        os.makedirs(LOG_DIR)
 
-def setup_logger(name: str = "trading_bot") -> logging.Logger:
-    """로거 설정"""
-    logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, LOG_LEVEL))
-    
-    # 파일 핸들러
-    if not os.path.exists("logs"):
-        os.makedirs("logs")
-    
-    file_handler = logging.FileHandler(
-        f"logs/{LOG_FILE}",
-        encoding='utf-8'
-    )
-    file_handler.setLevel(logging.DEBUG)
-    
-    # 콘솔 핸들러
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    
     # 포맷터
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
+
+    # 파일 핸들러 (크기/시간 기준 교체)
+    file_handler = SizedTimedRotatingFileHandler(
+        os.path.join(LOG_DIR, LOG_FILE),
+        max_bytes=LOG_MAX_BYTES,
+        when=LOG_ROTATE_WHEN,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding='utf-8',
+        delay=True
+    )
+    file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
+
+    # 콘솔 핸들러
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
-    
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
+
+    handlers = [file_handler, console_handler]
+
+    # 구조화 JSON lines 핸들러 (선택)
+    if LOG_JSON_ENABLED:
+        json_handler = SizedTimedRotatingFileHandler(
+            os.path.join(LOG_DIR, LOG_JSON_FILE),
+            max_bytes=LOG_MAX_BYTES,
+            when=LOG_ROTATE_WHEN,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8',
+            delay=True
+        )
+        json_handler.setLevel(logging.DEBUG)
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
+
+    return handlers
+
+
+def setup_logger(name: str = "trading_bot") -> logging.Logger:
+    """로거 설정 (QueueHandler -> 전용 쓰기 스레드)"""
+    logger = logging.getLogger(name)
+    logger.setLevel(getattr(logging, LOG_LEVEL))
+    if name in _listeners:
+        return logger
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    listener = logging.handlers.QueueListener(log_queue, *_build_handlers(), respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
+
+    logger.addHandler(LazyQueueHandler(log_queue))
     return logger
 
-logger = setup_logger()
 
+def set_quiet(enabled: bool = True, name: str = "trading_bot.backtest"):
+    """
+    quiet 모드: 해당 로거는 경고 이상만 기록 (기본값: 백테스트 봉/거래 단위 로그)
+    레벨 미달 레코드는 생성 단계에서 버려지므로 포맷/큐 비용도 없음
+    """
+    logging.getLogger(name).setLevel(logging.WARNING if enabled else logging.NOTSET)
+
+
+def flush_logging(timeout: float = 5.0):
+    """
+    큐에 쌓인 레코드가 모두 기록될 때까지 대기 (timeout 을 가진 queue.join())
+    큐가 비어도 마지막 레코드는 아직 쓰는 중일 수 있으므로 QueueListener 의 task_done 기준으로 판단
+    """
+    deadline = time.monotonic() + timeout
+    for listener in list(_listeners.values()):
+        log_queue = listener.queue
+        with log_queue.all_tasks_done:
+            while log_queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                log_queue.all_tasks_done.wait(remaining)
+        for handler in listener.handlers:
+            handler.flush()
+
+
+def disable_file_logging(name: str = None):
+    """
+    파일/JSON 핸들러를 제거하고 콘솔 핸들러만 유지 (기본값: 모든 로거)
+    병렬 백테스트 작업 프로세스가 부모와 같은 로그 파일을 각자 열고 교체하지 않도록 사용
+    """
+    listeners = [_listeners[name]] if name is not None else list(_listeners.values())
+    for listener in listeners:
+        flush_logging()
+        files = [handler for handler in listener.handlers if isinstance(handler, logging.FileHandler)]
+        listener.handlers = tuple(handler for handler in listener.handlers if handler not in files)
+        for handler in files:
+            handler.close()
+
+
+@contextmanager
+def console_to(stream):
+    """
+    콘솔 핸들러 출력 대상을 임시로 변경 (병렬 백테스트의 심볼별 로그 분리용)
+    파일/JSON 핸들러는 그대로 유지
+    """
+    consoles = [
+        handler for listener in _listeners.values() for handler in listener.handlers
+        if type(handler) is logging.StreamHandler
+    ]
+    previous = [handler.setStream(stream) for handler in consoles]
+    try:
+        yield
+    finally:
+        flush_logging()
+        for handler, old in zip(consoles, previous):
+            if old is not None:
+                handler.setStream(old)
+
+
+def shutdown_logging():
+    """대기 중인 로그를 모두 기록하고 쓰기 스레드 종료"""
+    for listener in list(_listeners.values()):
+        try:
+            listener.stop()
+        except Exception:
+            pass
+        for handler in listener.handlers:
+            handler.close()
+    _listeners.clear()
+
+
+atexit.register(shutdown_logging)
+
+logger = setup_logger()
@@ -0,0 +1,321 @@
+"""
+거래일 / 장 구분 캘린더 (백테스트 · 실거래 봇 공용)
+- 거래소 달력(NYSE / XKRX)의 거래일을 한 번만 계산하여 디스크(.npz)에 캐시, 프로세스 안에서는 메모리 공유
+- 거래일 서수(ordinal): 날짜 -> 거래일 번호, N 거래일 뒤 날짜를 배열 인덱싱으로 조회
+- 장 구분: [서머타임 여부, KST 분(0~1439)] 조회표를 미리 만들어 DatetimeIndex 전체를 한 번에 분류
+  (서머타임은 미리 계산한 전환 시각에 searchsorted, KST 분은 UTC 초에서 정수 연산)
+- KR 시장은 config.holidays.KRX_HOLIDAYS (수동 관리 휴장일)를 함께 제외
+"""
+import os
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+import sys
+import warnings
+import numpy as np
+import pandas as pd
+import pytz
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import CALENDAR_CACHE_DIR, CALENDAR_START_DATE, CALENDAR_END_DATE
+from config.holidays import KRX_HOLIDAYS
+from utils.logger import logger
+
+try:
+    import pandas_market_calendars as mcal
+except ImportError:  # 실거래 환경에는 없을 수 있음 -> 주말 + 수동 휴장일만 제외
+    mcal = None
+
+warnings.filterwarnings("ignore", message=".*break_start.*break_end.*")
+
+# 장 구분 (조회표에는 인덱스 코드로 저장)
+SESSION_LABELS = ("CLOSED", "PREMARKET", "REGULAR", "AFTERMARKET", "DAYTIME", "EXTENDED")
+SESSION_CODES = {label: code for code, label in enumerate(SESSION_LABELS)}
+
+# 시장 -> 거래소 달력 이름
+EXCHANGE_CALENDARS = {"US": "NYSE", "KR": "XKRX"}
+
+# 캐시 파일 형식이 바뀌면 올려서 기존 캐시 무효화
+_CACHE_VERSION = 1
+_MINUTES_PER_DAY = 24 * 60
+_KST = pytz.timezone("Asia/Seoul")
+_EASTERN = pytz.timezone("US/Eastern")
+_EST_OFFSET_SEC = -5 * 3600  # US/Eastern 표준시 UTC 오프셋 (이보다 크면 서머타임)
+
+
+def classify_minute(market: str, minute: int, is_dst: bool) -> str:
+    """
+    KST 기준 분(00:00 = 0)과 미국 서머타임 여부로 장 상태 판별 (조회표 생성용 기준 규칙)
+    """
+    if market == "KR":
+        if 540 <= minute < 930: return "REGULAR"       # 09:00 ~ 15:30
+        if 510 <= minute < 540: return "PREMARKET"     # 08:30 ~ 09:00
+        if 930 <= minute < 1080: return "AFTERMARKET"  # 15:30 ~ 18:00
+        return "CLOSED"
+
+    if is_dst:  # Summer Time (09:30 ET = 22:30 KST)
+        if 600 <= minute < 1020: return "DAYTIME"            # 10:00 ~ 17:00
+        if 1020 <= minute < 1350: return "PREMARKET"         # 17:00 ~ 22:30
+        if 1350 <= minute or minute < 300: return "REGULAR"  # 22:30 ~ 05:00
+        if 300 <= minute < 420: return "AFTERMARKET"         # 05:00 ~ 07:00
+        if 420 <= minute < 540: return "EXTENDED"            # 07:00 ~ 09:00
+    else:  # Winter Time (09:30 ET = 23:30 KST)
+        if 600 <= minute < 1080: return "DAYTIME"            # 10:00 ~ 18:00
+        if 1080 <= minute < 1410: return "PREMARKET"         # 18:00 ~ 23:30
+        if 1410 <= minute or minute < 360: return "REGULAR"  # 23:30 ~ 06:00
+        if 360 <= minute < 420: return "AFTERMARKET"         # 06:00 ~ 07:00
+        if 420 <= minute < 540: return "EXTENDED"            # 07:00 ~ 09:00
+    return "CLOSED"
+
+
+def build_session_table(market: str) -> np.ndarray:
+    """[서머타임 여부(0/1), KST 분] -> 장 구분 코드 (2 x 1440, int8)"""
+    table = np.empty((2, _MINUTES_PER_DAY), dtype=np.int8)
+    for dst in (0, 1):
+        for minute in range(_MINUTES_PER_DAY):
+            table[dst, minute] = SESSION_CODES[classify_minute(market, minute, bool(dst))]
+    return table
+
+
+def is_us_dst(dt: datetime) -> bool:
+    """dt 가 미국 서머타임 기간인지 (naive 는 KST 로 간주)"""
+    if dt.tzinfo is None:
+        dt = _KST.localize(dt)
+    return bool(dt.astimezone(_EASTERN).dst())
+
+
+def _dst_transitions(start: str = "1970-01-01", end: str = "2100-01-01"):
+    """
+    US/Eastern 서머타임 전환 시각 (UTC epoch 초, 오름차순) + 각 구간의 서머타임 여부
+    공개 API(tz_convert)로 1시간 간격 UTC 시각의 오프셋 변화 지점을 찾음 (전환은 항상 정시)
+    첫 값은 구간 시작 시각 (이전 시각은 첫 구간 값 유지)
+    """
+    hours = pd.date_range(start, end, freq="h", tz="UTC")
+    seconds = hours.as_unit("s").asi8
+    offsets = hours.tz_convert(_EASTERN).tz_localize(None).as_unit("s").asi8 - seconds
+    is_dst = offsets > _EST_OFFSET_SEC
+    changes = np.flatnonzero(np.diff(is_dst)) + 1
+    return np.concatenate([seconds[:1], seconds[changes]]), np.concatenate([is_dst[:1], is_dst[changes]])
+
+
+# 서머타임 전환표 (모듈 로드 시 1회 계산)
+_DST_BOUNDS, _DST_FLAGS = _dst_transitions()
+_KST_OFFSET_SEC = 9 * 3600  # KST 는 1988년 이후 서머타임 없음 (UTC+9 고정)
+
+
+def _utc_seconds(index) -> np.ndarray:
+    """DatetimeIndex -> UTC epoch 초 (naive 는 KST 로 간주)"""
+    index = pd.DatetimeIndex(index)
+    seconds = index.as_unit("ns").asi8 // 10**9
+    if index.tz is None:
+        seconds = seconds - _KST_OFFSET_SEC
+    return seconds
+
+
+def us_dst_mask(index) -> np.ndarray:
+    """DatetimeIndex 전체의 미국 서머타임 여부 (미리 계산한 전환 시각에 searchsorted)"""
+    pos = np.searchsorted(_DST_BOUNDS, _utc_seconds(index), side="right") - 1
+    return _DST_FLAGS[np.clip(pos, 0, None)]
+
+
+def kst_minutes(index) -> np.ndarray:
+    """DatetimeIndex 전체의 KST 기준 분(0~1439)"""
+    return ((_utc_seconds(index) + _KST_OFFSET_SEC) // 60 % _MINUTES_PER_DAY).astype(np.int16)
+
+
+def classify_sessions(index, market: str, sessions: np.ndarray = None) -> pd.Categorical:
+    """
+    DatetimeIndex 전체의 장 구분 (봉마다 시간대 변환 없이 분 단위 조회표 인덱싱)
+    :param sessions: 장 구분 조회표 (없으면 생성)
+    :return: SESSION_LABELS 범주의 Categorical
+    """
+    if sessions is None:
+        sessions = build_session_table(market)
+    dst = us_dst_mask(index) if market == "US" else np.zeros(len(index), dtype=bool)
+    codes = sessions[dst.astype(np.intp), kst_minutes(index)]
+    return pd.Categorical.from_codes(codes, categories=SESSION_LABELS)
+
+
+def session_mask(sessions: pd.Categorical, allowed=("REGULAR",)) -> np.ndarray:
+    """장 구분 배열 -> 허용 구간 여부 (bool 배열)"""
+    allowed_codes = [SESSION_CODES[label] for label in allowed]
+    return np.isin(sessions.codes, allowed_codes)
+
+
+def _to_day(value) -> np.datetime64:
+    if isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, "D")
+
+
+def _to_days(values) -> np.ndarray:
+    """날짜 배열 / DatetimeIndex -> datetime64[D] (시각이 있으면 해당 시간대의 날짜)"""
+    if isinstance(values, pd.DatetimeIndex):
+        if values.tz is not None:
+            values = values.tz_localize(None)
+        return values.to_numpy().astype("datetime64[D]")
+    return np.array([_to_day(v) for v in values], dtype="datetime64[D]")
+
+
+class MarketCalendar:
+    """시장별 거래일 목록 + 장 구분 조회표"""
+
+    def __init__(self, market: str, days: np.ndarray, first: np.datetime64, last: np.datetime64,
+                 sessions: np.ndarray = None, holidays: np.ndarray = None):
+        """
+        :param days: 거래일 (datetime64[D], 오름차순)
+        :param first, last: 거래일 목록이 유효한 구간 (양 끝 포함)
+        :param sessions: 장 구분 조회표 (없으면 생성)
+        :param holidays: 거래소 달력 외에 추가로 제외한 휴장일
+        """
+        self.market = market
+        self.days = np.asarray(days, dtype="datetime64[D]")
+        self.first = np.datetime64(first, "D")
+        self.last = np.datetime64(last, "D")
+        self.holidays = np.asarray(holidays if holidays is not None else [], dtype="datetime64[D]")
+        self.sessions = sessions if sessions is not None else build_session_table(market)
+
+    # ----- 생성 / 캐시 -----
+    @classmethod
+    def build(cls, market: str, start, end, holidays: Iterable[date] = ()) -> "MarketCalendar":
+        """거래소 달력으로 거래일 계산 (pandas_market_calendars 가 없으면 평일 기준)"""
+        if market not in EXCHANGE_CALENDARS:
+            raise ValueError(f"Unsupported market: {market}")
+        first, last = _to_day(start), _to_day(end)
+        if mcal is not None:
+            schedule = mcal.get_calendar(EXCHANGE_CALENDARS[market]).schedule(
+                start_date=str(first), end_date=str(last)
+            )
+            days = schedule.index.to_numpy().astype("datetime64[D]")
+        else:
+            logger.warning("pandas_market_calendars 미설치: 주말/수동 휴장일만 제외한 거래일 사용")
+            all_days = np.arange(first, last + 1, dtype="datetime64[D]")
+            days = all_days[np.is_busday(all_days)]
+        holidays = np.unique(_to_days(list(holidays)))
+        if len(holidays):
+            days = days[~np.isin(days, holidays)]
+        return cls(market, days, first, last, holidays=holidays)
+
+    def save(self, path: str):
+        """원자적 저장 (임시 파일 -> 교체)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            version=_CACHE_VERSION,
+            days=self.days.astype(np.int64),
+            bounds=np.array([self.first, self.last]).astype(np.int64),
+            sessions=self.sessions,
+            holidays=self.holidays.astype(np.int64),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, market: str, path: str, holidays: Iterable[date] = ()) -> Optional["MarketCalendar"]:
+        """캐시 파일 로드 (없거나 형식 / 추가 휴장일이 다르면 None)"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as cached:
+                if int(cached["version"]) != _CACHE_VERSION:
+                    return None
+                cached_holidays = cached["holidays"].astype("datetime64[D]")
+                if not np.array_equal(cached_holidays, np.unique(_to_days(list(holidays)))):
+                    return None
+                first, last = cached["bounds"].astype("datetime64[D]")
+                return cls(market, cached["days"].astype("datetime64[D]"), first, last,
+                           cached["sessions"], cached_holidays)
+        except Exception as e:
+            logger.warning(f"거래일 캘린더 캐시 로드 실패 ({path}): {e}")
+            return None
+
+    def covers(self, start, end) -> bool:
+        return self.first <= _to_day(start) and _to_day(end) <= self.last
+
+    # ----- 거래일 조회 -----
+    def trading_days(self, start, end) -> List[date]:
+        """[start, end] 구간 거래일 목록"""
+        lo = np.searchsorted(self.days, _to_day(start), side="left")
+        hi = np.searchsorted(self.days, _to_day(end), side="right")
+        return self.days[lo:hi].astype(object).tolist()
+
+    def is_trading_day(self, day) -> bool:
+        day = _to_day(day)
+        pos = np.searchsorted(self.days, day)
+        return bool(pos < len(self.days) and self.days[pos] == day)
+
+    def ordinals(self, dates) -> np.ndarray:
+        """날짜별 거래일 번호 (거래일이 아니면 -1, 벡터 연산)"""
+        days = _to_days(dates)
+        pos = np.searchsorted(self.days, days)
+        hit = pos < len(self.days)
+        hit[hit] = self.days[pos[hit]] == days[hit]
+        return np.where(hit, pos, -1)
+
+    def add_trading_days(self, start_date, days: int) -> date:
+        """start_date 이후 days 번째 거래일 (유효 구간을 넘으면 평일 기준으로 이어서 계산)"""
+        if days <= 0:
+            return start_date
+        pos = np.searchsorted(self.days, _to_day(start_date), side="right") + days - 1
+        if pos < len(self.days):
+            return self.days[pos].astype(object)
+        base = max(self.last, _to_day(start_date))
+        return np.busday_offset(base, pos - len(self.days) + 1, roll="backward").astype(object)
+
+    # ----- 장 구분 -----
+    def session_labels(self, index) -> pd.Categorical:
+        """DatetimeIndex 전체의 장 구분 (Categorical)"""
+        return classify_sessions(index, self.market, self.sessions)
+
+    def session_at(self, minute: int, is_dst: bool = False) -> str:
+        """KST 분 + 서머타임 여부 단건 조회"""
+        return SESSION_LABELS[self.sessions[int(bool(is_dst)), minute]]
+
+    def session_of(self, dt: datetime) -> str:
+        """시각 단건 조회 (naive 는 KST 로 간주)"""
+        if dt.tzinfo is None:
+            dt = _KST.localize(dt)
+        kst = dt.astimezone(_KST)
+        return self.session_at(kst.hour * 60 + kst.minute, self.market == "US" and is_us_dst(dt))
+
+
+_CALENDARS: Dict[str, MarketCalendar] = {}
+_LOCK = threading.Lock()
+
+
+def _cache_path(market: str) -> str:
+    return os.path.join(CALENDAR_CACHE_DIR, f"{EXCHANGE_CALENDARS[market]}.npz")
+
+
+def get_calendar(market: str, start=None, end=None) -> MarketCalendar:
+    """
+    시장별 공용 캘린더 (메모리 -> 디스크 캐시 -> 거래소 달력 순으로 조회)
+    요청 구간이 캐시 범위를 벗어나면 범위를 넓혀 다시 계산 후 저장
+    :param market: "US" (NYSE) / "KR" (XKRX)
+    """
+    if market not in EXCHANGE_CALENDARS:
+        raise ValueError(f"Unsupported market: {market}")
+    start = _to_day(start if start is not None else CALENDAR_START_DATE)
+    end = _to_day(end if end is not None else CALENDAR_END_DATE)
+
+    with _LOCK:
+        calendar = _CALENDARS.get(market)
+        if calendar is not None and calendar.covers(start, end):
+            return calendar
+
+        path = _cache_path(market)
+        holidays = KRX_HOLIDAYS if market == "KR" else ()
+        if calendar is None:
+            calendar = MarketCalendar.load(market, path, holidays)
+        if calendar is None or not calendar.covers(start, end):
+            first = min(start, _to_day(CALENDAR_START_DATE), calendar.first if calendar else start)
+            last = max(end, _to_day(CALENDAR_END_DATE), calendar.last if calendar else end)
+            calendar = MarketCalendar.build(market, first, last, holidays=holidays)
+            try:
+                calendar.save(path)
+            except OSError as e:
+                logger.warning(f"거래일 캘린더 캐시 저장 실패 ({path}): {e}")
+        _CALENDARS[market] = calendar
+        return calendar
@@ -0,0 +1,39 @@
+"""
+API 호출 속도 제한 유틸리티
+- 여러 봇/스레드가 하나의 KIS 계정을 공유할 때 초당 호출 수를 일괄 제한
+"""
+import threading
+import time
+
+
+class RateLimiter:
+    """토큰 버킷 방식 호출 제한기 (스레드 안전)"""
+
+    def __init__(self, rate_per_sec: float, burst: int = None):
+        """
+        :param rate_per_sec: 초당 허용 호출 수
+        :param burst: 순간 허용 호출 수 (기본값: rate_per_sec 올림)
+        """
+        if rate_per_sec <= 0:
+            raise ValueError("rate_per_sec must be positive")
+        self.rate = float(rate_per_sec)
+        self.capacity = float(burst if burst is not None else max(1, int(rate_per_sec + 0.999)))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
@@ -1,19 +1,19 @@
 """
 스케줄러 모듈
 """
-import schedule
-import time
 from datetime import datetime
 import pytz
-from config.settings import TRADING_START_HOUR, TRADING_END_HOUR, TRADING_TIMEZONE
+from config.settings import TRADING_START_HOUR, TRADING_END_HOUR, TRADING_TIMEZONE, SCHEDULER_JOB_TIMEOUT_SEC
 from utils.logger import logger
+from utils.async_scheduler import AsyncScheduler, CronTrigger, IntervalTrigger, Clock
 
 class TradingScheduler:
-    """거래 스케줄러"""
+    """거래 스케줄러 (AsyncScheduler 기반)"""
     
-    def __init__(self):
+    def __init__(self, clock: Clock = None):
         self.timezone = pytz.timezone(TRADING_TIMEZONE)
         self.is_trading_time = False
+        self.async_scheduler = AsyncScheduler(clock=clock)
     
     def is_within_trading_hours(self) -> bool:
         """거래 시간 확인"""
@@ -26,19 +26,37 @@ class TradingScheduler:
         return False
     
     def schedule_daily_tasks(self, trading_func, monitoring_func, force_close_func):
-        """일일 거래 작업 스케줄링"""
+        """일일 거래 작업 스케줄링 (거래/청산/모니터링은 같은 포지션을 다루므로 같은 그룹으로 직렬화)"""
+        scheduler = self.async_scheduler
+        
         # 거래 시작 시간 (오후 5시)
-        schedule.every().day.at("17:00").do(self._start_trading, trading_func)
+        scheduler.add_job(
+            lambda: self._start_trading(trading_func),
+            CronTrigger(hour=TRADING_START_HOUR, minute=0, timezone=TRADING_TIMEZONE),
+            name="start_trading", timeout=SCHEDULER_JOB_TIMEOUT_SEC, group="positions"
+        )
         
         # 새벽 05:00 강제 청산
         if force_close_func:
-            schedule.every().day.at("05:00").do(force_close_func)
+            scheduler.add_job(
+                force_close_func,
+                CronTrigger(hour=TRADING_END_HOUR, minute=0, timezone=TRADING_TIMEZONE),
+                name="force_close", timeout=SCHEDULER_JOB_TIMEOUT_SEC, group="positions"
+            )
         
         # 거래 종료 시간 (새벽 5시)
-        schedule.every().day.at("05:00").do(self._end_trading)
+        scheduler.add_job(
+            self._end_trading,
+            CronTrigger(hour=TRADING_END_HOUR, minute=0, timezone=TRADING_TIMEZONE),
+            name="end_trading"
+        )
         
-        # 모니터링 (1분마다)
-        schedule.every(1).minutes.do(monitoring_func)
+        # 모니터링 (1분마다, 이전 모니터링이 길어지면 건너뜀)
+        scheduler.add_job(
+            monitoring_func,
+            IntervalTrigger(minutes=1),
+            name="monitoring", timeout=SCHEDULER_JOB_TIMEOUT_SEC, group="positions"
+        )
         
         logger.info("스케줄러 설정 완료")
     
@@ -54,9 +72,10 @@ class TradingScheduler:
         self.is_trading_time = False
     
     def run(self):
-        """스케줄러 실행"""
+        """스케줄러 실행 (stop 호출 전까지 블로킹)"""
         logger.info("스케줄러 시작")
-        while True:
-            schedule.run_pending()
-            time.sleep(1)
+        self.async_scheduler.run_forever()
 
+    def stop(self):
+        """스케줄러 종료"""
+        self.async_scheduler.stop()
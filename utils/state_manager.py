@@ -1,43 +1,246 @@
+"""
+봇 상태 영구 저장
+- 스냅샷(bot_state.json) + 추가 전용 저널(bot_state.json.wal)
+- 저장 시 이전 상태와의 차이(delta)만 저널에 한 줄 추가 -> 저장 비용 O(delta)
+- 저널이 일정 길이를 넘으면 스냅샷으로 압축 (임시 파일 + fsync + 원자적 교체)
+- 복구: 스냅샷 로드 후 저널 꼬리 재생, 기록 도중 중단된 마지막 줄은 버림
+"""
 import json
 import os
+import threading
+import time
+import uuid
 from datetime import datetime, date
+from config.settings import STATE_FSYNC_MODE, STATE_FSYNC_INTERVAL_SEC, STATE_COMPACT_EVERY
 from utils.logger import logger
+from utils.latency import timed
 
 STATE_FILE = "bot_state.json"
+JOURNAL_SUFFIX = ".wal"
+
+# 스냅샷 메타데이터 키 (상태 데이터와 함께 저장, load_state 결과에서는 제외)
+_META_JOURNAL_ID = "_journal_id"
+_META_SEQ = "_seq"
+
+# fsync 정책
+FSYNC_ALWAYS = "always"   # 저장마다 fsync (전원 장애까지 보호)
+FSYNC_BATCH = "batch"     # STATE_FSYNC_INTERVAL_SEC 마다 1회 fsync (프로세스 장애 보호 + 낮은 지연)
+FSYNC_NEVER = "never"     # OS 버퍼에 맡김
+
+_MISSING = object()
+
+
+def _serialize(state_data: dict) -> dict:
+    """datetime 객체 직렬화 처리"""
+    serializable_data = {}
+    for k, v in state_data.items():
+        if isinstance(v, (datetime, date)):
+            serializable_data[k] = v.isoformat()
+        else:
+            serializable_data[k] = v
+    return serializable_data
+
+
+def _fsync_dir(path: str):
+    """파일 교체(rename) 결과를 디렉터리 엔트리까지 디스크에 반영"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 
 class TradeStateManager:
     """봇 상태(매매 정보) 영구 저장 관리자"""
-    
-    def __init__(self, state_file=STATE_FILE):
+
+    def __init__(self, state_file=STATE_FILE, fsync_mode: str = STATE_FSYNC_MODE,
+                 fsync_interval: float = STATE_FSYNC_INTERVAL_SEC, compact_every: int = STATE_COMPACT_EVERY):
+        """
+        :param state_file: 스냅샷 파일 경로 (저널은 같은 경로 + .wal)
+        :param fsync_mode: always / batch / never
+        :param fsync_interval: batch 모드 fsync 간격(초)
+        :param compact_every: 저널 기록 수가 이 값을 넘으면 스냅샷으로 압축
+        """
         self.state_file = state_file
+        self.journal_file = state_file + JOURNAL_SUFFIX
+        self.fsync_mode = fsync_mode
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self._state = None          # 마지막으로 저장/복구된 직렬화 상태
+        self._journal_id = None     # 현재 스냅샷과 짝을 이루는 저널 식별자
+        self._seq = 0
+        self._journal_entries = 0
+        self._journal = None
+        self._last_fsync = 0.0
+        self._dirty = False
 
+    # ---------- 저장 ----------
+
+    @timed("state.save_state")
     def save_state(self, state_data: dict):
-        """상태 저장"""
+        """상태 저장 (변경된 키만 저널에 추가)"""
         try:
-            # datetime 객체 직렬화 처리
-            serializable_data = {}
-            for k, v in state_data.items():
-                if isinstance(v, (datetime, date)):
-                    serializable_data[k] = v.isoformat()
-                else:
-                    serializable_data[k] = v
-            
-            # 절대 경로 사용이 안전할 수 있으나, 실행 위치 기준 루트에 저장
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(serializable_data, f, indent=4, ensure_ascii=False)
-            logger.info("봇 상태 저장 완료")
+            with self._lock:
+                new_state = _serialize(state_data)
+                if self._state is None:
+                    self._recover()
+                if self._journal_id is None:
+                    # 저널 기준 스냅샷이 없으면 전체 상태로 스냅샷 생성
+                    self._compact(new_state)
+                    logger.info("봇 상태 저장 완료")
+                    return
+
+                changed = {k: v for k, v in new_state.items() if self._state.get(k, _MISSING) != v}
+                removed = [k for k in self._state if k not in new_state]
+                if not changed and not removed:
+                    return
+
+                self._seq += 1
+                entry = {"id": self._journal_id, "seq": self._seq, "set": changed}
+                if removed:
+                    entry["unset"] = removed
+                self._append(json.dumps(entry, ensure_ascii=False))
+                self._state = new_state
+                self._journal_entries += 1
+
+                if self._journal_entries >= self.compact_every:
+                    self._compact(new_state)
+            logger.debug("봇 상태 저장 완료")
         except Exception as e:
             logger.error(f"봇 상태 저장 실패: {e}")
 
-    def load_state(self):
-        """상태 로드"""
+    def _append(self, line: str):
+        if self._journal is None:
+            self._journal = open(self.journal_file, "a", encoding="utf-8")
+        self._journal.write(line + "\n")
+        self._journal.flush()
+        self._dirty = True
+        if self.fsync_mode == FSYNC_ALWAYS:
+            self.sync()
+        elif self.fsync_mode == FSYNC_BATCH and time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        """저널 fsync (batch 모드에서 종료 직전 등 명시 호출용)"""
+        with self._lock:
+            if self._journal is not None and self._dirty:
+                os.fsync(self._journal.fileno())
+                self._dirty = False
+            self._last_fsync = time.monotonic()
+
+    def _compact(self, state: dict):
+        """현재 상태를 새 스냅샷으로 기록하고 저널 초기화"""
+        journal_id = uuid.uuid4().hex
+        snapshot = dict(state)
+        snapshot[_META_JOURNAL_ID] = journal_id
+        snapshot[_META_SEQ] = 0
+
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=4, ensure_ascii=False)
+            f.flush()
+            if self.fsync_mode != FSYNC_NEVER:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_file)
+        if self.fsync_mode != FSYNC_NEVER:
+            _fsync_dir(self.state_file)
+
+        # 스냅샷 교체 후 저널 비우기 (중간에 중단되어도 이전 저널은 id 불일치로 무시됨)
+        self._close_journal()
+        with open(self.journal_file, "w", encoding="utf-8"):
+            pass
+
+        self._state = dict(state)
+        self._journal_id = journal_id
+        self._seq = 0
+        self._journal_entries = 0
+
+    def compact(self):
+        """저널을 스냅샷으로 즉시 압축"""
+        with self._lock:
+            if self._state is None:
+                self._recover()
+            if self._state is not None:
+                self._compact(self._state)
+
+    # ---------- 복구 ----------
+
+    def _read_snapshot(self):
         if not os.path.exists(self.state_file):
             return None
-            
         try:
             with open(self.state_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"봇 상태 스냅샷 손상: {e}")
+            return None
+
+    def _recover(self):
+        """스냅샷 + 저널 꼬리 재생으로 마지막 저장 상태 복원"""
+        snapshot = self._read_snapshot()
+        if snapshot is None:
+            self._state = {}
+            self._journal_id = None
+            return
+
+        journal_id = snapshot.pop(_META_JOURNAL_ID, None)
+        self._seq = snapshot.pop(_META_SEQ, 0)
+        state = snapshot
+        entries = 0
+
+        if journal_id and os.path.exists(self.journal_file):
+            valid_bytes = 0
+            with open(self.journal_file, 'rb') as f:
+                for raw in f:
+                    try:
+                        if not raw.endswith(b"\n"):
+                            raise ValueError("incomplete line")
+                        entry = json.loads(raw.decode("utf-8"))
+                    except (ValueError, UnicodeDecodeError):
+                        # 기록 도중 중단된 마지막 줄
+                        logger.warning("상태 저널 꼬리 손상 - 마지막 기록 무시")
+                        break
+                    valid_bytes += len(raw)
+                    if entry.get("id") != journal_id or entry.get("seq", 0) <= self._seq:
+                        continue
+                    state.update(entry.get("set", {}))
+                    for k in entry.get("unset", []):
+                        state.pop(k, None)
+                    self._seq = entry["seq"]
+                    entries += 1
+            if valid_bytes < os.path.getsize(self.journal_file):
+                with open(self.journal_file, 'r+b') as f:
+                    f.truncate(valid_bytes)
+
+        self._state = state
+        # 외부에서 만든 스냅샷(메타데이터 없음)은 다음 저장 시 새 스냅샷으로 전환
+        self._journal_id = journal_id
+        self._journal_entries = entries
+
+    @timed("state.load_state")
+    def load_state(self):
+        """상태 로드"""
+        with self._lock:
+            self._close_journal()
+            self._state = None
+            try:
+                self._recover()
+            except Exception as e:
+                logger.error(f"봇 상태 로드 실패: {e}")
+                self._state = None
+                return None
+
+            if not self._state:
+                return None
+            data = dict(self._state)
+
+        try:
             # datetime 복원
             if 'entry_time' in data and data['entry_time']:
                 try:
@@ -51,31 +254,46 @@ class TradeStateManager:
                     try:
                         data[date_field] = datetime.fromisoformat(data[date_field]).date()
                     except ValueError:
-                        try: 
+                        try:
                             data[date_field] = datetime.strptime(data[date_field], "%Y-%m-%d").date()
                         except:
                             pass
-                    
-            # date 복원 (cooldown_until_date)
-            if 'cooldown_until_date' in data and data['cooldown_until_date']:
-                try:
-                    data['cooldown_until_date'] = datetime.fromisoformat(data['cooldown_until_date']).date()
-                except ValueError:
-                    try:
-                        data['cooldown_until_date'] = datetime.strptime(data['cooldown_until_date'], "%Y-%m-%d").date()
-                    except:
-                        pass
-                    
+
             return data
         except Exception as e:
             logger.error(f"봇 상태 로드 실패: {e}")
             return None
 
+    # ---------- 정리 ----------
+
+    def _close_journal(self):
+        if self._journal is not None:
+            try:
+                if self._dirty and self.fsync_mode != FSYNC_NEVER:
+                    os.fsync(self._journal.fileno())
+            finally:
+                self._journal.close()
+                self._journal = None
+                self._dirty = False
+
+    def close(self):
+        """저널 fsync 후 닫기"""
+        with self._lock:
+            self._close_journal()
+
     def clear_state(self):
         """상태 초기화 (파일 삭제 or 빈 값 저장)"""
         try:
-            if os.path.exists(self.state_file):
-                os.remove(self.state_file)
-                logger.info("봇 상태 파일 삭제 (초기화)")
+            with self._lock:
+                self._close_journal()
+                for path in (self.state_file, self.journal_file):
+                    if os.path.exists(path):
+                        os.remove(path)
+                self._state = {}
+                self._journal_id = None
+                self._seq = 0
+                self._journal_entries = 0
+            logger.info("봇 상태 파일 삭제 (초기화)")
         except Exception as e:
             logger.error(f"봇 상태 초기화 실패: {e}")
+
@@ -1,40 +1,265 @@
+"""
+Telegram 알림 발송 유틸리티
+- 기본은 백그라운드 스레드 발송: 호출자는 큐에 넣고 즉시 반환 (매매 흐름을 막지 않음)
+- 우선순위: 주문/오류 알림(HIGH) > 일반(NORMAL) > 전략 실행 결과(LOW)
+- 같은 종목의 전략 실행 결과는 최신 1건만 남김 (coalescing)
+- 발송 속도 제한 내에서 대기 메시지를 한 번에 묶어 발송, 429 응답 시 retry_after 준수
+"""
 import requests
 import logging
+import threading
+import time
+from collections import deque, OrderedDict
 from typing import Optional
+from config.settings import (
+    TELEGRAM_ASYNC_SEND, TELEGRAM_QUEUE_SIZE, TELEGRAM_RATE_LIMIT_PER_SEC,
+    TELEGRAM_BATCH_MAX_CHARS, TELEGRAM_SEND_RETRIES
+)
+from utils.latency import timed
+from utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# 메시지 우선순위 (작을수록 먼저 발송)
+PRIORITY_HIGH = 0      # 주문/오류 알림: 버리지 않음
+PRIORITY_NORMAL = 1    # 일반 메시지
+PRIORITY_LOW = 2       # 전략 실행 결과: 큐가 가득 차면 가장 먼저 버림
+
+BATCH_SEPARATOR = "\n\n"
+
+
+class _NotificationQueue:
+    """우선순위별 FIFO + coalescing 큐 (스레드 안전)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._queues = {PRIORITY_HIGH: deque(), PRIORITY_NORMAL: deque()}
+        # LOW 는 coalesce 키 -> 메시지 (삽입 순서 유지, 같은 키는 최신 값으로 교체)
+        self._low = OrderedDict()
+        self._low_seq = 0
+        self._cond = threading.Condition()
+        self.dropped = 0
+        self.coalesced = 0
+        self._in_flight = 0
+
+    def __len__(self):
+        return sum(len(q) for q in self._queues.values()) + len(self._low)
+
+    def put(self, text: str, priority: int, coalesce_key: Optional[str] = None):
+        with self._cond:
+            if priority == PRIORITY_LOW:
+                if coalesce_key is None:
+                    self._low_seq += 1
+                    coalesce_key = f"#{self._low_seq}"
+                if coalesce_key in self._low:
+                    # 발송 전 상태 업데이트는 최신 값만 의미 있음 (대기 순서는 유지)
+                    self._low[coalesce_key] = text
+                    self.coalesced += 1
+                    return True
+            if len(self) >= self.maxsize and not self._evict(priority):
+                self.dropped += 1
+                return False
+            if priority == PRIORITY_LOW:
+                self._low[coalesce_key] = text
+            else:
+                self._queues[priority].append(text)
+            self._cond.notify()
+            return True
+
+    def _evict(self, priority: int) -> bool:
+        """새 메시지 자리 확보: 낮은 우선순위의 가장 오래된 메시지부터 버림 (HIGH 는 항상 수용)"""
+        if self._low and priority <= PRIORITY_LOW:
+            self._low.popitem(last=False)
+            self.dropped += 1
+            return True
+        if self._queues[PRIORITY_NORMAL] and priority < PRIORITY_NORMAL:
+            self._queues[PRIORITY_NORMAL].popleft()
+            self.dropped += 1
+            return True
+        return priority == PRIORITY_HIGH
+
+    def take_batch(self, max_chars: int, timeout: Optional[float] = None) -> list:
+        """우선순위 순서로 max_chars 이내의 메시지 묶음 반환 (없으면 timeout 까지 대기)"""
+        with self._cond:
+            if not len(self):
+                self._cond.wait(timeout)
+            batch = []
+            size = 0
+            for priority in (PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW):
+                while True:
+                    if priority == PRIORITY_LOW:
+                        if not self._low:
+                            break
+                        text = next(iter(self._low.values()))
+                    else:
+                        if not self._queues[priority]:
+                            break
+                        text = self._queues[priority][0]
+                    added = len(text) + (len(BATCH_SEPARATOR) if batch else 0)
+                    if batch and size + added > max_chars:
+                        break
+                    if priority == PRIORITY_LOW:
+                        self._low.popitem(last=False)
+                    else:
+                        self._queues[priority].popleft()
+                    batch.append(text)
+                    size += added
+                if batch and size >= max_chars:
+                    break
+            self._in_flight += len(batch)
+            return batch
+
+    def task_done(self, n: int):
+        with self._cond:
+            self._in_flight -= n
+            self._cond.notify_all()
+
+    def wait_empty(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while len(self) or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def wake(self):
+        with self._cond:
+            self._cond.notify_all()
+
+
 class TelegramNotifier:
     """Telegram 알림 발송 유틸리티"""
     
-    def __init__(self, token: Optional[str] = None, chat_id: Optional[str] = None, prefix: str = ""):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        chat_id: Optional[str] = None,
+        prefix: str = "",
+        async_send: bool = TELEGRAM_ASYNC_SEND,
+        queue_size: int = TELEGRAM_QUEUE_SIZE,
+        rate_per_sec: float = TELEGRAM_RATE_LIMIT_PER_SEC,
+        batch_max_chars: int = TELEGRAM_BATCH_MAX_CHARS
+    ):
+        """
+        :param async_send: True면 백그라운드 스레드로 발송 (send_* 는 큐 적재 여부 반환)
+        :param queue_size: 대기 메시지 최대 개수
+        :param rate_per_sec: 발송 속도 제한 (묶음 1건 기준)
+        :param batch_max_chars: 묶음 발송 최대 길이
+        """
         self.token = token
         self.chat_id = chat_id
         self.prefix = prefix
         self.base_url = f"https://api.telegram.org/bot{self.token}" if self.token else None
+        self.async_send = async_send
+        self.batch_max_chars = batch_max_chars
+        self._queue = _NotificationQueue(queue_size)
+        self._rate_limiter = RateLimiter(rate_per_sec)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._closed = False
         
         if not self.token or not self.chat_id:
             logger.warning("Telegram Bot Token 또는 Chat ID가 설정되지 않았습니다. 알림이 발송되지 않습니다.")
 
-    def send_message(self, message: str) -> bool:
-        """일반 메시지 발송"""
-        if not self.token or not self.chat_id:
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token and self.chat_id)
+
+    def send_message(self, message: str, priority: int = PRIORITY_NORMAL, coalesce_key: Optional[str] = None) -> bool:
+        """
+        일반 메시지 발송
+        - async_send: 큐에 적재 후 즉시 반환 (적재 성공 여부)
+        - 동기 모드: 발송 결과 반환
+        """
+        if not self.enabled:
             return False
-            
-        try:
-            url = f"{self.base_url}/sendMessage"
-            prefix_str = f"[{self.prefix}] " if self.prefix else ""
-            payload = {
-                "chat_id": self.chat_id,
-                "text": f"{prefix_str}{message}",
-                "parse_mode": "HTML" # HTML 포맷 지원
-            }
-            response = requests.post(url, json=payload, timeout=5)
-            response.raise_for_status()
+
+        prefix_str = f"[{self.prefix}] " if self.prefix else ""
+        text = f"{prefix_str}{message}"
+
+        if not self.async_send or self._closed:
+            return self._post(text, retries=1)
+
+        self._ensure_worker()
+        queued = self._queue.put(text, priority, coalesce_key)
+        if not queued:
+            logger.warning("Telegram 대기열 가득 참 - 메시지 폐기")
+        return queued
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="telegram-sender", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        """백그라운드 발송 루프: 속도 제한 내에서 대기 메시지를 묶어 발송"""
+        while True:
+            batch = self._queue.take_batch(self.batch_max_chars, timeout=1.0)
+            if not batch:
+                if self._closed:
+                    return
+                continue
+            try:
+                self._rate_limiter.acquire()
+                self._post(BATCH_SEPARATOR.join(batch), retries=TELEGRAM_SEND_RETRIES)
+            except Exception as e:
+                logger.error(f"Telegram 발송 스레드 오류: {e}")
+            finally:
+                self._queue.task_done(len(batch))
+
+    @timed("telegram.send_message")
+    def _post(self, text: str, retries: int = 1) -> bool:
+        """sendMessage 호출 (429 응답은 retry_after 만큼 대기 후 재시도)"""
+        url = f"{self.base_url}/sendMessage"
+        payload = {
+            "chat_id": self.chat_id,
+            "text": text,
+            "parse_mode": "HTML" # HTML 포맷 지원
+        }
+        for attempt in range(1, retries + 1):
+            try:
+                response = requests.post(url, json=payload, timeout=5)
+                if response.status_code == 429:
+                    try:
+                        retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                    except ValueError:
+                        retry_after = 1
+                    logger.warning(f"Telegram 발송 제한 (429) - {retry_after}초 후 재시도")
+                    if attempt < retries:
+                        time.sleep(retry_after)
+                        continue
+                response.raise_for_status()
+                return True
+            except Exception as e:
+                logger.error(f"Telegram 메시지 발송 실패 ({attempt}/{retries}): {e}")
+                if attempt < retries:
+                    time.sleep(attempt)
+        return False
+
+    def flush(self, timeout: Optional[float] = 10) -> bool:
+        """대기 메시지 발송 완료까지 대기"""
+        if self._worker is None:
             return True
-        except Exception as e:
-            logger.error(f"Telegram 메시지 발송 실패: {e}")
-            return False
+        return self._queue.wait_empty(timeout)
+
+    def close(self, timeout: Optional[float] = 10):
+        """대기 메시지 발송 후 발송 스레드 종료 (이후 발송은 동기 처리)"""
+        self.flush(timeout)
+        self._closed = True
+        self._queue.wake()
+
+    def stats(self) -> dict:
+        """대기열 상태 (대기/폐기/병합 건수)"""
+        return {
+            "pending": len(self._queue),
+            "dropped": self._queue.dropped,
+            "coalesced": self._queue.coalesced,
+        }
 
     def send_order_alert(self, symbol: str, side: str, price: float, quantity: float, reason: str = ""):
         """주문 체결 알림"""
@@ -50,7 +275,7 @@ class TelegramNotifier:
             f"• 사유: {reason}\n"
             f"• 시간: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         )
-        return self.send_message(message)
+        return self.send_message(message, priority=PRIORITY_HIGH)
 
     def send_error_alert(self, error_msg: str):
         """에러 알림"""
@@ -60,7 +285,7 @@ class TelegramNotifier:
             f"{error_msg}\n"
             f"• 시간: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         )
-        return self.send_message(message)
+        return self.send_message(message, priority=PRIORITY_HIGH)
 
     def send_strategy_update(self, 
                              symbol: str, 
@@ -96,4 +321,5 @@ class TelegramNotifier:
             f"• 결정: {action}\n"
             f"• 시간: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         )
-        return self.send_message(message)
+        # 같은 종목의 미발송 결과는 최신 값으로 교체
+        return self.send_message(message, priority=PRIORITY_LOW, coalesce_key=f"strategy:{symbol}")